@@ -5,15 +5,14 @@ BatchForge / AdminSeed 專案入口檔
 """
 
 import argparse
-from workspace.config.task_registry import get_task
-from workspace.config.print_registry import PRINT_REGISTRY
-from workspace.tools.loader.print_rule_loader import apply_global_print_rules
+import inspect
+from workspace.config import task_registry
 
 
 def main():
     parser = argparse.ArgumentParser(description="🔧 後台批次建立工具入口檔")
     parser.add_argument("category", choices=["task", "controller", "tool", "list"], help="任務類型或 'list'")
-    parser.add_argument("id", nargs="?", help="任務/控制器/工具 ID（list 模式可省略）")
+    parser.add_argument("id", nargs="?", help="任務/控制器/工具 ID（list 模式可省略；task/tool 可用逗號組合多個）")
 
     # 仍保留 CLI 旗標；實際判斷交由 debug_helper.is_debug() 在各層處理
     debug_group = parser.add_mutually_exclusive_group()
@@ -27,39 +26,116 @@ def main():
         choices=[1, 2],
         help="指定總控執行到的步驟（僅在 controller main 有效）"
     )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="增量模式：與上次執行結果比對，只處理新增或變更的名稱（controller main 與 task 有效）"
+    )
+
+    # 輸出後端（覆寫 print_registry 的 OUTPUT 設定）
+    parser.add_argument("--output", choices=["console", "buffered", "thread"], help="輸出模式（預設依 print_registry）")
+    parser.add_argument("--log-file", help="另外將輸出寫入純文字檔")
+    parser.add_argument("--log-jsonl", help="另外將輸出寫入 JSON Lines 檔")
+    parser.add_argument("--no-dashboard", action="store_true", help="不顯示批次請求即時儀表板")
+    parser.add_argument("--run-log", help="結構化執行紀錄檔路徑（預設 .logs/run_log.jsonl；寫入與查詢皆適用）")
+
+    # task / tool 專用參數
+    parser.add_argument("--concurrency", type=int, help="同時執行的任務節點上限（預設不限）")
+    parser.add_argument("--address", action="append", default=[], help="balance_scan：錢包地址（可重複）")
+    parser.add_argument("--contract", action="append", default=[], help="balance_scan：TRC20 合約地址（可重複，預設 USDT）")
+    parser.add_argument("--node-url", help="balance_scan：TRON 節點 URL（預設讀 .env 的 TRON_NODE_URL）")
+    parser.add_argument("--stage", help="run_log：步驟篩選（例如 OPS 或 OPS.4）")
+    parser.add_argument("--code", type=int, help="run_log：ResultCode 篩選")
+    parser.add_argument("--name", help="run_log：名稱篩選")
+    parser.add_argument("--run", help="run_log：執行 ID 篩選（last = 最後一次執行）")
 
     args = parser.parse_args()
 
-    # 列表模式
-    from workspace.config import task_registry
+    # 列表模式（只讀註冊名稱，不 import 任何任務）
     if args.category == "list":
+        task_registry.discover_plugins()
         print("\n📜 可用任務清單：\n")
         for cat, mapping in task_registry.TASK_REGISTRY.items():
             if mapping:
                 print(f"[{cat}]")
-                for name in mapping.keys():
-                    print(f"  - {name}")
+                for name, entry in mapping.items():
+                    desc = entry.get("help", "") if isinstance(entry, dict) else ""
+                    print(f"  - {name:<18}{desc}")
         print()
         return
 
+    # task / tool：交由 Task 控制器展開相依並以 DAG 執行（可用逗號組合多個節點）
+    if args.category in ("task", "tool"):
+        targets = [name.strip() for name in (args.id or "").split(",") if name.strip()]
+        unknown = [name for name in targets
+                   if task_registry.get_spec("task", name) is None and task_registry.get_spec("tool", name) is None]
+        if not targets or unknown:
+            print(f"❌ 找不到 {args.category}:{args.id}")
+            return
+
+        _apply_print_rules(args)
+        from workspace.controllers.task_controller import run_task_controller
+        run_task_controller(
+            targets,
+            incremental=args.incremental,
+            options={
+                "addresses": args.address,
+                "contracts": args.contract,
+                "node_url": args.node_url,
+                "run_log": args.run_log,
+                "stage": args.stage,
+                "code": args.code,
+                "name": args.name,
+                "run": args.run,
+            },
+            max_concurrency=args.concurrency,
+        )
+        return
+
     # 取得任務/控制器
-    task_func = get_task(args.category, args.id)
+    task_func = task_registry.get_task(args.category, args.id)
     if not task_func:
         print(f"❌ 找不到 {args.category}:{args.id}")
         return
 
-    # 初始化 Printer 規則
-    apply_global_print_rules(PRINT_REGISTRY)
-
-    # ✅ 執行：僅在 controller main 考慮 --step；其餘完全不動
-    if args.category == "controller" and args.id == "main" and args.step is not None:
-        # 為了相容尚未改簽名的總控：若不接受 max_step，就退回不帶參數
-        try:
-            task_func(max_step=args.step)
-        except TypeError:
-            task_func()
-    else:
-        task_func()
+    # 初始化 Printer 規則（確定要執行才載入）
+    _apply_print_rules(args)
+
+    # ✅ 執行：僅在 controller main 考慮 --step / --incremental；其餘完全不動
+    main_kwargs = {}
+    if args.category == "controller" and args.id == "main":
+        if args.step is not None:
+            main_kwargs["max_step"] = args.step
+        if args.incremental:
+            main_kwargs["incremental"] = True
+
+    # 為了相容尚未改簽名的總控：只傳入函式宣告的參數（不以 except TypeError 重跑，避免重複建立資料）
+    params = inspect.signature(task_func).parameters
+    accepts_any = any(p.kind is inspect.Parameter.VAR_KEYWORD for p in params.values())
+    task_func(**{k: v for k, v in main_kwargs.items() if accepts_any or k in params})
+
+
+def _apply_print_rules(args):
+    from workspace.config.print_registry import PRINT_REGISTRY
+    from workspace.tools.loader.print_rule_loader import apply_global_print_rules
+
+    output = dict(PRINT_REGISTRY.get("output") or {})
+    if args.output:
+        output["mode"] = args.output
+    if args.log_file:
+        output["file"] = args.log_file
+    if args.log_jsonl:
+        output["jsonl"] = args.log_jsonl
+    dashboard = dict(PRINT_REGISTRY.get("dashboard") or {})
+    if args.no_dashboard:
+        dashboard["enabled"] = False
+    run_log = dict(PRINT_REGISTRY.get("run_log") or {})
+    if args.run_log:
+        run_log["file"] = args.run_log
+    # 查詢執行紀錄本身不寫入紀錄
+    if args.category == "tool" and args.id == "run_log":
+        run_log["enabled"] = False
+    apply_global_print_rules({**PRINT_REGISTRY, "output": output, "dashboard": dashboard, "run_log": run_log})
 
 
 if __name__ == "__main__":
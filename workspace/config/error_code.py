@@ -40,11 +40,13 @@ class ResultCode:
     tools_currency_fetch_error       = 1061
     tools_currency_not_supported     = 1062
     tools_currency_convert_error     = 1063
+    tools_currency_rates_expired     = 1064  # 舊匯率超過可沿用上限且無法更新
 
     # --- request 工具 (1081-1100) ---
     tools_request_error              = 1081
     tools_request_timeout            = 1082
     tools_request_put_error          = 1083 
+    tools_request_unauthorized       = 1084  # HTTP 401 / 403（Session 失效或未授權）
 
     # --- response 工具 (1101-1120) ---
     tools_response_none              = 1101
@@ -95,6 +97,29 @@ class ResultCode:
     tools_file_list_failed          = 1244  # 讀取或列出資料夾內容失敗
     tools_file_no_files_found       = 1245  # 沒有找到任何符合條件的檔案
     tools_file_unknown_error        = 1246  # 未知例外錯誤（捕捉 fallback）
+    tools_file_not_found            = 1247  # 目標檔案不存在
+    tools_file_read_failed          = 1248  # 讀取或解析檔案失敗
+    tools_file_write_failed         = 1249  # 寫入檔案失敗
+
+    # --- cache 工具 (1261–1280) ---
+    tools_cache_miss                = 1261  # 無快取或來源檔已變動
+    tools_cache_read_failed         = 1262  # 快取檔損毀或無法讀取
+    tools_cache_write_failed        = 1263  # 快取檔寫入失敗
+
+    # --- graph 工具 (1281–1300) ---
+    tools_graph_unknown_node        = 1281  # 節點或相依節點未註冊
+    tools_graph_cycle               = 1282  # 相依關係有循環
+    tools_graph_skipped             = 1283  # 前置節點失敗，本節點未執行
+    tools_graph_node_exception      = 1284  # 節點執行時發生未預期例外
+
+    # --- poll 工具 (1301–1320) ---
+    tools_poll_timeout              = 1301  # 超過等待上限仍未就緒
+    tools_poll_probe_error          = 1302  # 探測持續失敗（最後一次探測發生例外）
+
+    # --- session 工具 (1321–1340) ---
+    tools_session_miss              = 1321  # 無保存的 Session（或已過期、憑證已變更）
+    tools_session_read_failed       = 1322  # Session 檔損毀或無法讀取
+    tools_session_write_failed      = 1323  # Session 檔寫入失敗
 
     # ---------------- 任務錯誤碼 (2000-2999) ----------------
 
@@ -114,7 +139,7 @@ class ResultCode:
     task_env_missing_key              = 2023  # 系統設定 (.env) 缺少必要欄位或值為空
     task_name_empty_value             = 2024  # 名稱值為空
     task_name_file_missing            = 2025  # 找不到任何名稱設定檔
-    task_name_multiple_files_detected = 2026  # 偵測到多個名稱設定檔
+    task_name_multiple_files_detected = 2026  # ⚠ 已停用：舊版「偵測到多個名稱設定檔」，代碼保留不再重用
 
     # 密碼 / 信箱驗證
     task_password_missing             = 2027  # 密碼為空
@@ -125,6 +150,7 @@ class ResultCode:
     task_mode_type_missing            = 2032  # 運營模式欄位缺失或無值
     task_mode_type_invalid_format     = 2033  # 運營模式欄位非數字格式
     task_mode_type_invalid_value      = 2034  # 運營模式欄位值僅允許 0 或 1
+    task_name_duplicate               = 2035  # 名稱重複（同檔或跨分片檔）
 
     # --- create_agent 任務 (2041–2060) ---
     task_create_agent_failed           = 2041  # API 回傳 Code ≠ 0
@@ -184,11 +210,13 @@ TOOL_ERROR_CODES = {
     ResultCode.tools_currency_fetch_error,
     ResultCode.tools_currency_not_supported,
     ResultCode.tools_currency_convert_error,
+    ResultCode.tools_currency_rates_expired,
 
     # Request / Response
     ResultCode.tools_request_error,
     ResultCode.tools_request_timeout,
     ResultCode.tools_request_put_error,
+    ResultCode.tools_request_unauthorized,
     ResultCode.tools_response_none,
     ResultCode.tools_response_bad_status,
     ResultCode.tools_response_json_error,
@@ -237,6 +265,29 @@ TOOL_ERROR_CODES = {
     ResultCode.tools_file_list_failed,
     ResultCode.tools_file_no_files_found,
     ResultCode.tools_file_unknown_error,
+    ResultCode.tools_file_not_found,
+    ResultCode.tools_file_read_failed,
+    ResultCode.tools_file_write_failed,
+
+    # Cache
+    ResultCode.tools_cache_miss,
+    ResultCode.tools_cache_read_failed,
+    ResultCode.tools_cache_write_failed,
+
+    # Graph
+    ResultCode.tools_graph_unknown_node,
+    ResultCode.tools_graph_cycle,
+    ResultCode.tools_graph_skipped,
+    ResultCode.tools_graph_node_exception,
+
+    # Poll
+    ResultCode.tools_poll_timeout,
+    ResultCode.tools_poll_probe_error,
+
+    # Session
+    ResultCode.tools_session_miss,
+    ResultCode.tools_session_read_failed,
+    ResultCode.tools_session_write_failed,
 
 }
 
@@ -263,6 +314,7 @@ TASK_ERROR_CODES = {
     ResultCode.task_name_empty_value,
     ResultCode.task_name_file_missing,
     ResultCode.task_name_multiple_files_detected,
+    ResultCode.task_name_duplicate,
 
     # loader 任務 - 運營模式檢查
     ResultCode.task_mode_type_missing,
@@ -342,11 +394,13 @@ ERROR_MESSAGES = {
     ResultCode.tools_currency_fetch_error: "Currency 工具：幣別匯率獲取失敗",
     ResultCode.tools_currency_not_supported: "Currency 工具：幣別不支援",
     ResultCode.tools_currency_convert_error: "Currency 工具：幣別轉換錯誤",
+    ResultCode.tools_currency_rates_expired: "Currency 工具：匯率過舊且無法更新",
 
     # --- tools_request_response (1081–1120) ---
     ResultCode.tools_request_error: "Request 工具：發送錯誤",
     ResultCode.tools_request_timeout: "Request 工具：請求逾時",
     ResultCode.tools_request_put_error: "Request 工具：PUT 請求錯誤",
+    ResultCode.tools_request_unauthorized: "Request 工具：未授權（HTTP 401 / 403，Session 失效）",
     ResultCode.tools_response_none: "Response 工具：回應為空",
     ResultCode.tools_response_bad_status: "Response 工具：HTTP 狀態不正確",
     ResultCode.tools_response_json_error: "Response 工具：解析 JSON 失敗",
@@ -395,6 +449,29 @@ ERROR_MESSAGES = {
     ResultCode.tools_file_list_failed: "File 工具：列出資料夾內容時發生錯誤",
     ResultCode.tools_file_no_files_found: "File 工具：未找到任何符合條件的檔案",
     ResultCode.tools_file_unknown_error: "File 工具：未知錯誤",
+    ResultCode.tools_file_not_found: "File 工具：目標檔案不存在",
+    ResultCode.tools_file_read_failed: "File 工具：讀取或解析檔案失敗",
+    ResultCode.tools_file_write_failed: "File 工具：寫入檔案失敗",
+
+    # --- tools_cache (1261–1280) ---
+    ResultCode.tools_cache_miss: "Cache 工具：無快取或來源檔已變動",
+    ResultCode.tools_cache_read_failed: "Cache 工具：快取檔損毀或無法讀取",
+    ResultCode.tools_cache_write_failed: "Cache 工具：快取檔寫入失敗",
+
+    # --- tools_graph (1281–1300) ---
+    ResultCode.tools_graph_unknown_node: "Graph 工具：節點或相依節點未註冊",
+    ResultCode.tools_graph_cycle: "Graph 工具：相依關係有循環",
+    ResultCode.tools_graph_skipped: "Graph 工具：前置節點失敗，本節點未執行",
+    ResultCode.tools_graph_node_exception: "Graph 工具：節點執行時發生未預期例外",
+
+    # --- tools_poll (1301–1320) ---
+    ResultCode.tools_poll_timeout: "Poll 工具：超過等待上限仍未就緒",
+    ResultCode.tools_poll_probe_error: "Poll 工具：探測發生例外",
+
+    # --- tools_session (1321–1340) ---
+    ResultCode.tools_session_miss: "Session 工具：無可沿用的 Session",
+    ResultCode.tools_session_read_failed: "Session 工具：Session 檔讀取失敗",
+    ResultCode.tools_session_write_failed: "Session 工具：Session 檔寫入失敗",
 
     # --- task_common (2001–2020) ---
     ResultCode.task_api_failed: "共用任務：API 呼叫失敗",
@@ -412,7 +489,8 @@ ERROR_MESSAGES = {
     ResultCode.task_env_missing_key:              "名稱設定任務：系統設定 (.env) 缺少必要欄位或為空",
     ResultCode.task_name_empty_value:             "名稱設定任務：名稱值為空，請提供有效名稱",
     ResultCode.task_name_file_missing:            "名稱設定任務：找不到任何名稱設定檔，請確認 profiles 資料夾內容",
-    ResultCode.task_name_multiple_files_detected: "名稱設定任務：偵測到多個名稱設定檔，請僅保留一份 (.env/.json/.xlsx/.csv)",
+    ResultCode.task_name_multiple_files_detected: "名稱設定任務：（已停用）偵測到多個名稱設定檔；目前版本已支援分片設定檔，不會再回傳此代碼",
+    ResultCode.task_name_duplicate:               "名稱設定任務：名稱重複，每個名稱在所有設定檔中只能出現一次",
 
     # 密碼 / 信箱
     ResultCode.task_password_missing:             "名稱設定任務：密碼欄位為空或缺失",
@@ -29,4 +29,19 @@ WORKSPACE_DIR = os.path.join(ROOT_DIR, "workspace")
 # --- 名稱設定檔路徑（profiles） ---
 PROFILES_DIR = os.path.join(ROOT_DIR, "profiles")           # 專放名稱設定檔的資料夾
 PROFILE_FILE_BASENAME = "names"                             # 固定名稱前綴
-PROFILE_FILE_PATH = os.path.join(PROFILES_DIR, PROFILE_FILE_BASENAME)  # 不含副檔名
\ No newline at end of file
+PROFILE_FILE_PATH = os.path.join(PROFILES_DIR, PROFILE_FILE_BASENAME)  # 不含副檔名
+
+# --- 執行期快取（匯率等，可隨時刪除） ---
+CACHE_DIR = os.path.join(ROOT_DIR, ".cache")
+RATE_CACHE_FILE = os.path.join(CACHE_DIR, "rates.json")
+PROFILE_CACHE_FILE = os.path.join(CACHE_DIR, "profile_index.pkl")  # 已驗證的 INDEX
+
+# --- 執行狀態（上次執行結果，供增量模式比對；請勿隨意刪除） ---
+STATE_DIR = os.path.join(ROOT_DIR, ".state")
+RUN_STATE_FILE = os.path.join(STATE_DIR, "last_run_index.json")
+STATE_SECRET_FILE = os.path.join(STATE_DIR, "state_secret")  # 狀態檔雜湊金鑰（每個安裝各自產生；刪除後上次紀錄視為全部變更）
+SESSION_FILE = os.path.join(STATE_DIR, "sessions.json")    # 登入 Session（僅擁有者可讀寫；刪除後下次重新登入）
+
+# --- 結構化執行紀錄（JSON Lines，超過大小自動輪替；可隨時刪除） ---
+LOG_DIR = os.path.join(ROOT_DIR, ".logs")
+RUN_LOG_FILE = os.path.join(LOG_DIR, "run_log.jsonl")
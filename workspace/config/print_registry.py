@@ -16,9 +16,10 @@ Printer 行為註冊表（支援數字縮排 + 開關集中版）
 # 每層縮排單位，可為數字（空格數）或字串（例如 "\t"）
 INDENT_UNIT = 2
 
-# 控制器層級（Main=0, Loader/OPS=1）
+# 控制器層級（Main/Task=0, Loader/OPS=1）
 CONTROLLER_LEVELS = {
     "Main": 0,
+    "Task": 0,
     "Loader": 1,
     "OPS": 1,
 }
@@ -28,6 +29,7 @@ LABEL_MAP = {
     "Main": "總控",
     "Loader": "loader子控",
     "OPS": "OPS子控",
+    "Task": "任務",
 }
 
 # === Printer 類型共通層級偏移 ===
@@ -42,6 +44,28 @@ DEBUG_ON    = True
 ERROR_ON    = True
 CONTEXT_ON  = True
 
+# === Context 變更輸出（debug 模式每步只印變更欄位）===
+CONTEXT_DIFF_MAX_ITEMS  = 50     # 每步最多列出幾個變更欄位，其餘只顯示筆數
+CONTEXT_VALUE_MAX_LEN   = 200    # 單一值顯示長度上限（超過截斷）
+CONTEXT_LIST_MAX_ITEMS  = 5      # list 值只列前幾項
+
+# === 輸出後端 ===
+# console：直接寫 stdout｜buffered：累積後批次寫出｜thread：背景執行緒寫出（不阻塞批次請求）
+OUTPUT_MODE  = "thread"
+OUTPUT_FILE  = None       # 另外寫入純文字檔（例如 ".state/run.log"）
+OUTPUT_JSONL = None       # 另外寫入 JSON Lines 檔（每行含 kind / prefix / text）
+
+# === 批次請求即時儀表板（僅終端機顯示；rich Live 固定頻率重繪） ===
+DASHBOARD_ON      = True
+DASHBOARD_REFRESH = 4          # 每秒重繪次數
+DASHBOARD_SAMPLES = 10_000     # 每階段保留的延遲樣本數（計算 p50 / p90 / p99）
+
+# === 結構化執行紀錄（每筆 record 一行 JSON，可用 `main.py tool run_log` 查詢） ===
+RUN_LOG_ON        = True
+RUN_LOG_FILE      = None               # None → paths.RUN_LOG_FILE（.logs/run_log.jsonl）
+RUN_LOG_MAX_BYTES = 5 * 1024 * 1024    # 單檔上限，超過即輪替
+RUN_LOG_BACKUPS   = 3                  # 保留的輪替檔數量
+
 # === 個別控制器開關 ===
 MAIN_STEP_ON   = False    # Main 的 Step
 LOADER_STEP_ON = True     # Loader 的 Step
@@ -94,4 +118,25 @@ PRINT_REGISTRY = {
     "printer_rules": DEFAULT_PRINTER_RULES,
     "overrides": PRINTER_OVERRIDES,
     "label_map": LABEL_MAP,   # ✅ 新增這個欄位
+    "context_diff": {
+        "max_items": CONTEXT_DIFF_MAX_ITEMS,
+        "max_value_len": CONTEXT_VALUE_MAX_LEN,
+        "max_list_items": CONTEXT_LIST_MAX_ITEMS,
+    },
+    "output": {
+        "mode": OUTPUT_MODE,
+        "file": OUTPUT_FILE,
+        "jsonl": OUTPUT_JSONL,
+    },
+    "dashboard": {
+        "enabled": DASHBOARD_ON,
+        "refresh_per_second": DASHBOARD_REFRESH,
+        "max_samples": DASHBOARD_SAMPLES,
+    },
+    "run_log": {
+        "enabled": RUN_LOG_ON,
+        "file": RUN_LOG_FILE,
+        "max_bytes": RUN_LOG_MAX_BYTES,
+        "backups": RUN_LOG_BACKUPS,
+    },
 }
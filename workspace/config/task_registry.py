@@ -3,33 +3,204 @@
 Task Registry (方法 A 架構版)
 
 這裡集中管理所有任務的註冊，分區如下：
-- task       : 一般任務
+- task       : 一般任務（可單獨執行，或組合成 DAG 同時執行）
 - controller : 控制器
 - tool       : 工具
+
+註冊方式：
+    - 以 "模組路徑:函式名" 字串登記，實際呼叫前才 import（lazy）
+    - `main.py list` 只讀取名稱，不會載入任何控制器 / 任務 / 第三方套件
+
+task / tool 節點規格（dict）：
+    target   : "模組路徑:函式名"，函式第一個參數為 context，
+               回傳 (context, code) 或 (context, code, records)，可為 async
+    requires : 硬相依節點（自動帶入且必須成功）
+    after    : 僅排序（兩者都被選取時才生效）
+    kwargs   : 呼叫時額外帶入的參數（例如 role）
+    saves_state : True → 完成後保存執行結果（增量模式用）
+    help     : `main.py list` 顯示的說明
+
+外掛（plugin）：
+    - 其他套件可在 entry point 群組 "walletmint.tasks" / "walletmint.tools" 登記節點，
+      值為 "模組路徑:函式名" 或指向上述規格 dict 的 "模組路徑:變數名"
+    - 程式內可呼叫 register_task() 動態註冊
 """
 
-# ===== 匯入區 =====
-from workspace.controllers.main_controller import run_main_controller
+import importlib
+
+
+PLUGIN_GROUPS = {
+    "task": "walletmint.tasks",
+    "tool": "walletmint.tools",
+}
 
 
 TASK_REGISTRY = {
     "task": {
-        # e.g. "loader": load_context,
+        "load": {
+            "target": "workspace.controllers.task_controller:load_context_node",
+            "help": "載入系統設定與名稱設定，組成 Context",
+        },
+        "otp": {
+            "target": "workspace.tasks.common.otp_task:generate_role_otp",
+            "requires": ("load",),
+            "kwargs": {"role": "OPS"},
+            "help": "產生登入用 OTP",
+        },
+        "login": {
+            "target": "workspace.tasks.common.session_task:ensure_session_pool",
+            "requires": ("load",),
+            "kwargs": {"role": "OPS"},
+            "help": "取得登入 Session（沿用已保存且有效的 Session，否則產生 OTP 並登入運營後台；帳號池同時登入）",
+        },
+        "create_agent": {
+            "target": "workspace.tasks.ops.create_agent_task:create_agent_task",
+            "requires": ("login",),
+            "saves_state": True,
+            "help": "批次新增代理商帳號",
+        },
+        "wait_sync": {
+            "target": "workspace.tasks.common.wait_for_sync_task:wait_for_sync",
+            "requires": ("login",),
+            "after": ("create_agent",),
+            "help": "等待後台同步（輪詢查詢 API，查到即返回，最長 140 秒）",
+        },
+        "query_agent": {
+            "target": "workspace.tasks.ops.query_agent_uuid_task:query_agent_uuid_task",
+            "requires": ("login",),
+            "after": ("create_agent", "wait_sync"),
+            "saves_state": True,
+            "help": "查詢代理帳號 UUID",
+        },
+        "create_merchant": {
+            "target": "workspace.tasks.ops.create_merchant_task:create_merchant_task",
+            "requires": ("login",),
+            "after": ("query_agent",),
+            "saves_state": True,
+            "help": "批次新增商戶帳號（需已取得代理 UUID）",
+        },
+        "query_merchant": {
+            "target": "workspace.tasks.ops.query_merchant_uuid_task:query_merchant_uuid_task",
+            "requires": ("login",),
+            "after": ("create_merchant",),
+            "saves_state": True,
+            "help": "查詢商戶帳號 UUID",
+        },
     },
     "controller": {
-        "main": run_main_controller,
+        "main": "workspace.controllers.main_controller:run_main_controller",
     },
     "tool": {
-        # e.g. "wallet": tool_wallet.run,
+        "balance_scan": {
+            "target": "workspace.tasks.chain.balance_scan_task:balance_scan_task",
+            "help": "批次查詢錢包 TRC20 餘額（--address / --contract / --node-url；不需名稱設定檔）",
+        },
+        "run_log": {
+            "target": "workspace.tasks.common.run_log_task:query_run_log_task",
+            "help": "查詢結構化執行紀錄（--stage / --code / --name / --run last）",
+        },
     },
 }
 
+_plugins_loaded = False
+
 
 def get_task(category: str, name: str):
     """
-    從註冊表取得對應的任務函式
+    從註冊表取得對應的任務函式（第一次取用時才 import）
     :param category: "task" | "controller" | "tool"
     :param name: 任務或工具 ID
     :return: 可執行的函式 or None
     """
-    return TASK_REGISTRY.get(category, {}).get(name)
+    spec = get_spec(category, name)
+    if spec is None:
+        return None
+    target = spec["target"]
+    if callable(target):
+        return target
+    return resolve_target(target)
+
+
+def get_spec(category: str, name: str) -> dict | None:
+    """取得節點規格（統一為 dict；找不到時會先載入外掛再查一次）"""
+    entry = TASK_REGISTRY.get(category, {}).get(name)
+    if entry is None and not _plugins_loaded:
+        discover_plugins()
+        entry = TASK_REGISTRY.get(category, {}).get(name)
+    if entry is None:
+        return None
+    return _normalize(entry)
+
+
+def node_specs() -> dict:
+    """task + tool 的所有節點規格（可互相組合成 DAG；名稱不可重複）"""
+    discover_plugins()
+    specs = {}
+    for category in PLUGIN_GROUPS:
+        for name, entry in TASK_REGISTRY.get(category, {}).items():
+            specs.setdefault(name, _normalize(entry))
+    return specs
+
+
+def register_task(category: str, name: str, target, requires=(), after=(), **options):
+    """
+    動態註冊節點（外掛模組使用）
+    :param target: 函式或 "模組路徑:函式名"
+    """
+    TASK_REGISTRY.setdefault(category, {})[name] = {
+        "target": target,
+        "requires": tuple(requires),
+        "after": tuple(after),
+        **options,
+    }
+
+
+def discover_plugins():
+    """
+    讀取 entry point 外掛（只讀取登記字串，不 import 外掛模組）
+    已註冊的名稱不會被外掛覆蓋
+    """
+    global _plugins_loaded
+    if _plugins_loaded:
+        return
+    _plugins_loaded = True
+
+    from importlib.metadata import entry_points
+
+    for category, group in PLUGIN_GROUPS.items():
+        for ep in entry_points(group=group):
+            TASK_REGISTRY.setdefault(category, {}).setdefault(ep.name, {"target": ep.value, "plugin": True})
+
+
+def resolve_target(target: str):
+    """
+    將 "模組路徑:函式名" 轉為函式
+    :return: 函式 or None（模組或屬性不存在時）
+    """
+    module_path, _, attr = target.partition(":")
+    try:
+        module = importlib.import_module(module_path)
+    except ModuleNotFoundError as e:
+        # 只吞掉「註冊的模組本身不存在」；模組內部缺少依賴仍照常拋出，方便排查
+        if e.name and (module_path == e.name or module_path.startswith(e.name + ".")):
+            return None
+        raise
+    return getattr(module, attr, None)
+
+
+def _normalize(entry) -> dict:
+    """字串 / 函式 / dict → 統一規格；外掛指向規格 dict 時在此載入"""
+    if not isinstance(entry, dict):
+        entry = {"target": entry}
+    if entry.get("plugin") and isinstance(entry["target"], str):
+        loaded = resolve_target(entry["target"])
+        if isinstance(loaded, dict):
+            entry = {**loaded, "plugin": True}
+    return {
+        "requires": (),
+        "after": (),
+        "kwargs": {},
+        "saves_state": False,
+        "help": "",
+        **entry,
+    }
@@ -2,70 +2,74 @@
 """
 Loader 控制器
 職責：
-    - Step 1: 讀取系統設定
-    - Step 2: 讀取名稱設定
+    - Step 1: 讀取系統設定（並解析本次執行設定 RunConfig → context["RUN"]）
+    - Step 2: 讀取名稱設定（失敗時列出所有錯誤列）
     - Step 3: 組合最終 Context
-    - 若開啟 Debug 模式，於每步印出完整 Context 狀態
+    - Step 4: （增量模式）比對上次執行結果，沿用已完成名稱的帳號 / UUID
+    - Step 1 與 Step 2 互不相依，由 step_engine 同時執行
+    - 若開啟 Debug 模式，於每步印出完整 Context 狀態與各步驟耗時
 """
 
-from workspace.tools.printer.step_printer import print_step
-from workspace.tools.printer.error_printer import print_result
-from workspace.tools.printer.context_printer import print_context
-from workspace.tools.helpers.debug_helper import is_debug
+from workspace.controllers.step_engine import run_steps
+from workspace.tools.helpers.debug_helper import resolve_run_config
 from workspace.tasks.loader.load_system_context_task import load_system_context
-from workspace.tasks.loader.load_profile_context_task import load_profile_context
+from workspace.tasks.loader.load_profile_context_task import load_profile_context_with_errors
 from workspace.tasks.loader.assemble_context_task import assemble_context
+from workspace.tasks.loader.run_state_task import apply_previous_run
 from workspace.config.error_code import ResultCode
 
 
-def run_loader_controller(branch_state=None, prefix="Loader"):
+def run_loader_controller(branch_state=None, prefix="Loader", incremental=False):
     branch_state = branch_state or []
 
-    # ============================================================
-    # Step 1. 讀取系統設定
-    # ============================================================
-    print_step(prefix, 1, "讀取系統設定", branch_state, is_last=False)
-    common_context, code1 = load_system_context()
-    print_result(code1, branch_state=branch_state + [True, True], prefix=prefix, is_last=False)
-    if code1 != ResultCode.SUCCESS:
-        return {}
+    steps = [
+        {"no": 1, "title": "讀取系統設定", "run": _load_system,
+         "outputs": ("COMMON", "RUN")},
+        {"no": 2, "title": "讀取名稱設定", "run": _load_profile,
+         "outputs": ("INDEX",)},
+        {"no": 3, "title": "組合最終 Context", "run": _assemble,
+         "inputs": ("COMMON", "INDEX"), "outputs": ("COMMON", "INDEX", "API")},
+        {"no": 4, "title": "比對上次執行結果（增量模式）", "run": _apply_previous_run,
+         "inputs": ("INDEX",), "outputs": ("INDEX.agent", "INDEX.merchant"), "enabled": incremental},
+    ]
 
-    # 🔹 Step 1 Debug：印出完整 Context（目前只有 COMMON）
-    context_step1 = {"COMMON": common_context}
-    if is_debug(context_step1):
-        print_context(context_step1, prefix, 1, branch_state + [True, True, True])
+    # 🔹 info 記錄（例如增量比對摘要）非 debug 模式也要顯示
+    context, code, _ = run_steps(steps, {}, prefix, branch_state, always_show=("error", "info"))
+    if code != ResultCode.SUCCESS:
+        return {}
 
     # ============================================================
-    # Step 2. 讀取名稱設定
+    # 回傳最終 Context 給 main_controller
     # ============================================================
-    print_step(prefix, 2, "讀取名稱設定", branch_state, is_last=False)
-    index_context, code2 = load_profile_context()
-    print_result(code2, branch_state=branch_state + [True, False], prefix=prefix, is_last=False)
-    if code2 != ResultCode.SUCCESS:
-        return {}
+    return context
 
-    # 🔹 Step 2 Debug：印出完整 Context（COMMON + INDEX）
-    context_step2 = {
-        "COMMON": common_context,
-        "INDEX": index_context,
-    }
-    if is_debug(context_step2):
-        print_context(context_step2, prefix, 2, branch_state + [True, True, True])
 
-    # ============================================================
-    # Step 3. 組合最終 Context
-    # ============================================================
-    print_step(prefix, 3, "組合最終 Context", branch_state, is_last=True)
-    context, code3 = assemble_context(common_context, index_context)
-    print_result(code3, branch_state=branch_state + [True, True], prefix=prefix, is_last=True)
-    if code3 != ResultCode.SUCCESS:
-        return {}
+# ============================================================
+# 步驟：將任務結果寫入共用 context，回傳 (code, records)
+# ============================================================
+def _load_system(context):
+    common_context, code = load_system_context()
+    if code == ResultCode.SUCCESS:
+        context["COMMON"] = common_context
+        context["RUN"] = resolve_run_config(context)  # debug 等設定只解析一次
+    return code, []
 
-    # 🔹 Step 3 Debug：印出完整最終 Context（COMMON + INDEX + API）
-    if is_debug(context):
-        print_context(context, prefix, 3, branch_state + [True, True, True])
 
-    # ============================================================
-    # 回傳最終 Context 給 main_controller
-    # ============================================================
-    return context
+def _load_profile(context):
+    # 🔹 失敗時回傳所有錯誤列（含筆數），方便一次修正設定檔
+    index_context, code, error_records = load_profile_context_with_errors()
+    if code == ResultCode.SUCCESS:
+        context["INDEX"] = index_context
+    return code, error_records
+
+
+def _assemble(context):
+    assembled, code = assemble_context(context.get("COMMON"), context.get("INDEX"))
+    if code == ResultCode.SUCCESS:
+        context.update(assembled)
+    return code, []
+
+
+def _apply_previous_run(context):
+    _, code, records = apply_previous_run(context)
+    return code, records
@@ -8,12 +8,12 @@ from workspace.controllers.loader_controller import run_loader_controller
 from workspace.controllers.ops_controller import run_ops_controller
 
 
-def run_main_controller(branch_state=None, prefix="Main", max_step=None):
+def run_main_controller(branch_state=None, prefix="Main", max_step=None, incremental=False):
     branch_state = branch_state or []
 
     # Step 1：呼叫 Loader 控制器
     print_step(prefix, 1, "呼叫 Loader 控制器", branch_state, is_last=False)
-    context = run_loader_controller(branch_state=branch_state + [True, True], prefix="Loader")
+    context = run_loader_controller(branch_state=branch_state + [True, True], prefix="Loader", incremental=incremental)
 
     # ✅ 若 CLI 指定只執行到 Step 1，這裡就結束（不印提示）
     if max_step == 1:
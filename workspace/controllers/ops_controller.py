@@ -2,118 +2,73 @@
 """
 OPS 控制器
 職責：
-    - Step 1：產生 OTP (登入用)
-    - Step 2：登入運營後台
-    - Step 3：重新產生 OTP（用於後續批次任務）
-    - Step 4：批次新增代理商帳號
-    - Step 5：查詢代理帳號（確認建立成功並取得 UUID）
+    - Step 1：取得登入 Session（沿用上次保存且仍有效的 Session，否則產生 OTP 並登入運營後台；帳號池同時登入）
+    - Step 2：批次新增代理商帳號（OTP 由共用層逐筆取用；Session 失效時自動重新登入）
+    - Step 3：查詢代理帳號（確認建立成功並取得 UUID）
+    - Step 4～5：新增 / 查詢商戶帳號
+    - 每個建立 / 查詢步驟後保存執行結果（供增量模式比對與中斷後接續）
+    - 批次請求期間顯示即時儀表板（完成 / 失敗 / 進行中、req/s、延遲百分位）
 """
 
-from workspace.tools.printer.step_printer import print_step
-from workspace.tools.printer.error_printer import print_result
 from workspace.tools.printer.debug_printer import debug_print
-from workspace.tools.printer.context_printer import print_context
+from workspace.tools.printer.output_sink import emit
+from workspace.tools.printer.batch_dashboard import batch_dashboard
 from workspace.tools.helpers.debug_helper import is_debug
+from workspace.controllers.step_engine import run_steps
 
-from workspace.tasks.common.otp_task import generate_role_otp
-from workspace.tasks.common.login_task import common_login
+from workspace.tasks.common.session_task import ensure_session_pool
 from workspace.tasks.ops.create_agent_task import create_agent_task
-from workspace.tasks.ops.query_agent_uuid_task import query_agent_uuid_task  
-from workspace.tasks.ops.create_merchant_task import create_merchant_task 
-from workspace.tasks.ops.query_merchant_uuid_task import query_merchant_uuid_task 
-from workspace.config.error_code import ResultCode
-import asyncio
+from workspace.tasks.ops.query_agent_uuid_task import query_agent_uuid_task
+from workspace.tasks.ops.create_merchant_task import create_merchant_task
+from workspace.tasks.ops.query_merchant_uuid_task import query_merchant_uuid_task
+from workspace.tasks.loader.run_state_task import save_run_state, count_pending
 
 
 def run_ops_controller(context, branch_state=None, prefix="OPS"):
     branch_state = branch_state or []
 
-    def handle_step_result(step_no, code, records):
-        """統一處理任務結果輸出與流程中斷邏輯"""
-        print_result(code, branch_state=branch_state + [True, True], prefix=prefix, is_last=False)
-
-        # 🧩 若 debug 模式 → 印所有記錄 + context
-        if is_debug(context):
-            if records:
-                _print_records(records, prefix, branch_state)
-            print_context(context, prefix, step_no, branch_state + [True, True, True])
-
-        # 🧩 若非 debug 模式但有錯誤 → 仍要印出錯誤訊息
-        elif code != ResultCode.SUCCESS and records:
-            error_records = [r for r in records if r.get("type") == "error"]
-            if error_records:
-                _print_records(error_records, prefix, branch_state)
-
-        # 若任務失敗則回傳 False → 中止後續流程
-        return code == ResultCode.SUCCESS
-
-    # ============================================================
-    # Step 1：產生 OTP（登入用）
-    # ============================================================
-    print_step(prefix, 1, "產生一次性登入碼 (OTP for Login)", branch_state, is_last=False)
-    context, code = generate_role_otp(context, "OPS")
-    if not handle_step_result(1, code, []):
-        return context
-
-    # ============================================================
-    # Step 2：登入運營後台
-    # ============================================================
-    print_step(prefix, 2, "登入運營後台", branch_state, is_last=False)
-    context, code, records = common_login(context=context, role="OPS", debug=is_debug(context))
-    if not handle_step_result(2, code, records):
-        return context
-
-    # ============================================================
-    # Step 3：重新產生 OTP（用於後續批次任務）
-    # ============================================================
-    print_step(prefix, 3, "重新產生一次性驗證碼 (OTP for Batch Tasks)", branch_state, is_last=False)
-    context, code = generate_role_otp(context, "OPS")
-    if not handle_step_result(3, code, []):
-        return context
-
-    # ============================================================
-    # Step 4：批次新增代理商帳號
-    # ============================================================
-    print_step(prefix, 4, "批次新增代理商帳號", branch_state, is_last=False)
-    context, code, records = asyncio.run(create_agent_task(context, debug=is_debug(context)))
-    if not handle_step_result(4, code, records):
+    # 🧩 所有名稱皆已完成（增量模式）→ 不需登入與打 API
+    if not count_pending(context.get("INDEX") or {}):
+        debug_print(True, "所有名稱皆已完成，無需執行 OPS 任務", prefix, branch_state)
         return context
 
     # ============================================================
-    # Step 5：查詢代理帳號（確認建立成功並取得 UUID）
-    # ============================================================
-    print_step(prefix, 5, "查詢代理帳號（確認建立成功並取得 UUID）", branch_state, is_last=False)
-    context, code, records = asyncio.run(query_agent_uuid_task(context, debug=is_debug(context)))
-    if not handle_step_result(5, code, records):
-        return context
-
-    # ============================================================
-    # Step 6：產生 OTP（用於新增商戶帳號）
-    # ============================================================
-    print_step(prefix, 6, "產生一次性驗證碼 (OTP for Merchant Creation)", branch_state, is_last=False)
-    context, code = generate_role_otp(context, "OPS")
-    if not handle_step_result(6, code, []):
-        return context
-
-    # ============================================================
-    # Step 7：批次新增商戶帳號
-    # ============================================================
-    print_step(prefix, 7, "批次新增商戶帳號", branch_state, is_last=False)
-    context, code, records = asyncio.run(create_merchant_task(context, debug=is_debug(context)))
-    if not handle_step_result(7, code, records):
-        return context
-
-    # ============================================================
-    # Step 8：查詢商戶帳號（確認建立成功並取得 MerUuid）
-    # ============================================================
-    print_step(prefix, 8, "查詢商戶帳號（確認建立成功並取得 MerUuid）", branch_state, is_last=True)
-    context, code, records = asyncio.run(query_merchant_uuid_task(context, debug=is_debug(context)))
-    handle_step_result(8, code, records)
-
+    # 步驟宣告：依讀寫路徑推導先後（Session 會被批次任務讀取，因此整體仍為依序執行）
+    # ============================================================
+    steps = [
+        {"no": 1, "title": "取得登入 Session（沿用或重新登入運營後台）", "run": _session,
+         "inputs": ("COMMON.OPS.OTP_SECRET", "API.LOGIN_PATHS", "API.ENDPOINTS"),
+         "outputs": ("COMMON.OPS.LOGIN_OTP", "COMMON.OPS.SSID", "COMMON.OPS.UUID", "COMMON.OPS.ACTIVE")},
+        {"no": 2, "title": "批次新增代理商帳號", "run": _with_state(create_agent_task),
+         "inputs": ("COMMON.OPS", "API.ENDPOINTS", "INDEX.agent"), "outputs": ("INDEX.agent.account",)},
+        {"no": 3, "title": "查詢代理帳號（確認建立成功並取得 UUID）", "run": _with_state(query_agent_uuid_task),
+         "inputs": ("COMMON.OPS", "API.ENDPOINTS", "INDEX.agent.account"), "outputs": ("INDEX.agent.uuid",)},
+        {"no": 4, "title": "批次新增商戶帳號", "run": _with_state(create_merchant_task),
+         "inputs": ("COMMON.OPS", "API.ENDPOINTS", "INDEX.agent.uuid", "INDEX.merchant"), "outputs": ("INDEX.merchant.account",)},
+        {"no": 5, "title": "查詢商戶帳號（確認建立成功並取得 MerUuid）", "run": _with_state(query_merchant_uuid_task),
+         "inputs": ("COMMON.OPS", "API.ENDPOINTS", "INDEX.merchant.account"), "outputs": ("INDEX.merchant.uuid",)},
+    ]
+
+    with batch_dashboard("OPS 批次請求"):
+        context, _, _ = run_steps(steps, context, prefix, branch_state, record_printer=_print_records)
     return context
 
 
+# ============================================================
+# 步驟：包裝任務為 (context) → (code, records)
+# ============================================================
+async def _session(context):
+    _, code, records = await ensure_session_pool(context=context, role="OPS", debug=is_debug(context))
+    return code, records
+
 
+def _with_state(task):
+    """批次任務：完成後（無論成敗）保存執行結果，供增量模式比對與中斷後接續"""
+    async def run(context):
+        _, code, records = await task(context, debug=is_debug(context))
+        save_run_state(context)
+        return code, records
+    return run
 
 
 # ============================================================
@@ -136,7 +91,7 @@ def _print_records(records, prefix, branch_state, name=None):
 
         # === 特殊分隔（每筆查詢成功後空一行）===
         if msg and ("查詢代理帳號成功" in msg or "查詢商戶帳號成功" in msg):
-            print()
+            emit("")
 
         # === 印出 Request ===
         if req:
@@ -167,7 +122,7 @@ def _print_records(records, prefix, branch_state, name=None):
                 # 🆕 不再截斷，完整輸出 JSON
                 debug_print(True, f"response: {text}", name_prefix, branch_state)
 
-    print()
+    emit("")
 
 
 
@@ -0,0 +1,165 @@
+# workspace/controllers/step_engine.py
+"""
+Step Engine（宣告式控制器步驟）
+職責：
+    - 控制器以步驟清單宣告流程，每個步驟標明讀取（inputs）與寫入（outputs）的 context 路徑
+    - 依宣告順序與讀寫關係推導相依，互不衝突的步驟同時執行，前置步驟完成即啟動下游
+    - 統一處理 print_step / print_result / 記錄輸出 / 各步驟耗時
+    - debug 模式只印出各步驟 outputs 路徑下變更的 Context 欄位（不再整份 dump）
+    - 每個步驟的 records 與耗時寫入結構化執行紀錄（run_log，未設定時略過）
+    - 任一步驟失敗 → 依賴它的步驟回報 tools_graph_skipped 不執行，不依賴它的步驟照常執行完成
+      （不再於第一個失敗時中止整個 controller；回傳碼仍為第一個失敗步驟的錯誤碼）
+
+步驟格式（dict）：
+    {
+        "no": 1,                         # 顯示用步驟編號（預設依清單順序）
+        "title": "讀取系統設定",
+        "run": func,                     # func(context) → (code, records)，可為 async
+        "inputs": ("COMMON.OPS",),       # 讀取的 context 路徑（以 "." 分層）
+        "outputs": ("COMMON.OPS.SSID",), # 寫入的 context 路徑
+        "enabled": True,                 # False → 不執行、不顯示
+    }
+    INDEX 路徑省略名稱層，例如 "INDEX.agent.account" 代表所有名稱的 agent.account
+
+相依推導（步驟 B 宣告在 A 之後）：
+    - B 讀取 A 寫入的路徑（先寫後讀）
+    - B 寫入 A 讀取或寫入的路徑（先讀後寫 / 先寫後寫）
+    路徑互為前綴即視為衝突（"COMMON" 與 "COMMON.OPS.SSID" 衝突）
+"""
+
+import asyncio
+import inspect
+import time
+from workspace.tools.printer.step_printer import print_step
+from workspace.tools.printer.error_printer import print_result
+from workspace.tools.printer.debug_printer import debug_print
+from workspace.tools.printer.context_printer import print_context_diff
+from workspace.tools.printer.context_diff import snapshot, diff_snapshots
+from workspace.tools.helpers.debug_helper import is_debug
+from workspace.tools.common.task_graph import run_graph
+from workspace.tools.file.run_log import log_records
+from workspace.config.error_code import ResultCode
+
+
+def derive_dependencies(steps: list[dict]) -> dict:
+    """
+    依宣告順序與讀寫路徑推導相依
+    :return: {步驟索引: set(前置步驟索引)}
+    """
+    graph = {}
+    for i, step in enumerate(steps):
+        reads = _paths(step.get("inputs"))
+        writes = _paths(step.get("outputs"))
+        deps = set()
+        for j in range(i):
+            prev_reads = _paths(steps[j].get("inputs"))
+            prev_writes = _paths(steps[j].get("outputs"))
+            if _overlap(reads, prev_writes) or _overlap(writes, prev_writes) or _overlap(writes, prev_reads):
+                deps.add(j)
+        graph[i] = deps
+    return graph
+
+
+def run_steps(
+    steps: list[dict],
+    context: dict,
+    prefix: str,
+    branch_state: list[bool],
+    record_printer=None,
+    always_show=("error",),
+    max_concurrency: int | None = None,
+):
+    """
+    執行步驟清單
+
+    Parameters
+    ----------
+    record_printer : 記錄輸出函式 (records, prefix, branch_state)，預設逐筆 debug_print
+    always_show : 非 debug 模式下仍要輸出的記錄類型（debug 模式輸出全部）
+
+    Returns
+    -------
+    (context, code, timings)
+        code 為第一個失敗步驟的錯誤碼；timings = [(步驟編號, 標題, 秒數, code), ...]
+    """
+    steps = [step for step in steps if step.get("enabled", True)]
+    for i, step in enumerate(steps):
+        step.setdefault("no", i + 1)
+    graph = derive_dependencies(steps)
+    last = len(steps) - 1
+    record_printer = record_printer or _print_records
+
+    # 同時執行時避免輸出交錯：只有單獨執行的步驟在開始時印標題；
+    # 完成時若上一個印出的不是自己的標題，再印一次標題後接結果
+    output = {"running": 0, "last": None}
+
+    def _header(i):
+        step = steps[i]
+        print_step(prefix, step["no"], step["title"], branch_state, is_last=i == last)
+        output["last"] = i
+
+    async def run_node(i):
+        step = steps[i]
+        if output["running"] == 0:
+            _header(i)
+        output["running"] += 1
+
+        func = step["run"]
+        # debug 模式：執行前先對本步驟的寫入路徑取快照（未宣告 outputs 時比對整份 Context）
+        watched = _paths(step.get("outputs")) or None
+        before = snapshot(context, watched) if is_debug(context) else None
+        started = time.perf_counter()
+        try:
+            if inspect.iscoroutinefunction(func):
+                code, records = await func(context)
+            else:
+                code, records = await asyncio.to_thread(func, context)
+        finally:
+            output["running"] -= 1
+        log_records(records, prefix, step["no"], step["title"], code, time.perf_counter() - started)
+
+        if output["last"] != i:
+            _header(i)
+        print_result(code, branch_state=branch_state + [True, True], prefix=prefix, is_last=i == last)
+        debug = is_debug(context)
+        shown = records if debug else [r for r in records or [] if r.get("type") in always_show]
+        if shown:
+            record_printer(shown, prefix, branch_state)
+        if debug:
+            changes = diff_snapshots(before or {}, snapshot(context, watched))
+            print_context_diff(changes, prefix, step["no"], branch_state + [True, True, True])
+        output["last"] = None
+        return code
+
+    results, code = asyncio.run(run_graph(graph, run_node, max_concurrency=max_concurrency))
+
+    timings = [
+        (steps[i]["no"], steps[i]["title"], results[i]["elapsed"], results[i]["code"])
+        for i in sorted(results)
+    ]
+    if is_debug(context):
+        for no, title, elapsed, step_code in timings:
+            mark = "⏭️" if step_code == ResultCode.tools_graph_skipped else "⏱"
+            debug_print(True, f"{mark} Step {no} {title}：{elapsed:.2f}s", prefix, branch_state)
+
+    return context, code, timings
+
+
+def _print_records(records, prefix, branch_state):
+    for record in records:
+        mark = "❌ " if record.get("type") == "error" else ""
+        debug_print(True, f"{mark}{record.get('message', '')}", prefix, branch_state)
+
+
+def _paths(paths) -> list[tuple]:
+    return [tuple(path.split(".")) for path in paths or ()]
+
+
+def _overlap(left: list[tuple], right: list[tuple]) -> bool:
+    """任一路徑互為前綴即視為衝突"""
+    for a in left:
+        for b in right:
+            n = min(len(a), len(b))
+            if a[:n] == b[:n]:
+                return True
+    return False
@@ -0,0 +1,144 @@
+# workspace/controllers/task_controller.py
+"""
+Task 控制器（單獨執行 / 組合任務）
+職責：
+    - 依 task_registry 的節點規格展開相依（例如 create_agent → load → login）
+    - 以 DAG 執行：前置節點完成即啟動下游，互不相依的節點同時執行
+    - 同步任務丟到執行緒執行、async 任務直接 await，兩者可同時進行
+    - 標記 saves_state 的節點完成後保存執行結果（與 OPS 控制器相同）
+    - 批次請求期間顯示即時儀表板；最後列出各節點耗時；各節點 records 寫入結構化執行紀錄（run_log）
+
+用法：
+    python main.py task create_agent
+    python main.py task query_agent,query_merchant --incremental
+    python main.py tool balance_scan --address T... --address T...
+"""
+
+import asyncio
+import inspect
+import time
+from workspace.tools.printer.step_printer import print_step
+from workspace.tools.printer.error_printer import print_result
+from workspace.tools.printer.debug_printer import debug_print
+from workspace.tools.printer.batch_dashboard import batch_dashboard
+from workspace.tools.helpers.debug_helper import is_debug
+from workspace.tools.common.task_graph import expand_requires, build_graph, topo_levels, run_graph
+from workspace.tools.file.run_log import log_records
+from workspace.config.task_registry import node_specs, resolve_target
+from workspace.config.error_code import ResultCode
+
+
+def run_task_controller(targets, branch_state=None, prefix="Task", incremental=False, options=None, max_concurrency=None):
+    """
+    :param targets: 節點名稱列表（task / tool 皆可）
+    :param options: CLI 參數（寫入 context["OPTIONS"] 供節點讀取）
+    :param max_concurrency: 同時執行的節點上限（None = 不限）
+    :return: context
+    """
+    branch_state = branch_state or []
+    context = {"OPTIONS": dict(options or {})}
+
+    # ============================================================
+    # 展開相依並建立 DAG
+    # ============================================================
+    specs = node_specs()
+    requires = {name: spec["requires"] for name, spec in specs.items()}
+    after = {name: spec["after"] for name, spec in specs.items()}
+
+    nodes, code = expand_requires(targets, requires)
+    if code == ResultCode.SUCCESS:
+        graph, code = build_graph(nodes, requires, after)
+    if code != ResultCode.SUCCESS:
+        unknown = [t for t in targets if t not in specs]
+        if unknown:
+            debug_print(True, f"❌ 未註冊的任務：{', '.join(unknown)}", prefix, branch_state)
+        print_result(code, branch_state=branch_state + [True, True], prefix=prefix, is_last=True)
+        return context
+
+    levels, _ = topo_levels(graph)
+    nodes = [name for level in levels for name in level]  # 依執行順序排列（摘要輸出用）
+
+    funcs = {}
+    for name in nodes:
+        target = specs[name]["target"]
+        funcs[name] = resolve_target(target) if isinstance(target, str) else target
+        if not callable(funcs[name]):
+            debug_print(True, f"❌ 任務 {name} 無法載入：{target}", prefix, branch_state)
+            print_result(ResultCode.tools_graph_unknown_node, branch_state=branch_state + [True, True], prefix=prefix, is_last=True)
+            return context
+
+    # ============================================================
+    # 執行節點
+    # ============================================================
+    started = []
+
+    async def run_node(name):
+        spec = specs[name]
+        func = funcs[name]
+        kwargs = dict(spec["kwargs"])
+        params = inspect.signature(func).parameters
+        if "debug" in params:
+            kwargs["debug"] = is_debug(context)
+        if "incremental" in params:
+            kwargs["incremental"] = incremental
+
+        started.append(name)
+        step_no = len(started)
+        label = f"{name}：{spec['help']}" if spec["help"] else name
+        print_step(prefix, step_no, label, branch_state, is_last=step_no == len(nodes))
+
+        started_at = time.perf_counter()
+        if inspect.iscoroutinefunction(func):
+            result = await func(context, **kwargs)
+        else:
+            result = await asyncio.to_thread(func, context, **kwargs)
+        _, node_code, *rest = result
+        records = rest[0] if rest else []
+        log_records(records, prefix, name, spec["help"], node_code, time.perf_counter() - started_at)
+
+        if spec["saves_state"]:
+            from workspace.tasks.loader.run_state_task import save_run_state
+            save_run_state(context)
+
+        print_result(node_code, branch_state=branch_state + [True, True], prefix=prefix, is_last=False)
+        _print_records(records, f"{prefix}-{name}", branch_state, is_debug(context))
+        return node_code
+
+    with batch_dashboard("任務批次請求"):
+        results, code = asyncio.run(run_graph(graph, run_node, requires=requires, max_concurrency=max_concurrency))
+
+    # ============================================================
+    # 各節點耗時
+    # ============================================================
+    for name in nodes:
+        result = results.get(name)
+        if result is None:
+            continue
+        mark = "✅" if result["code"] == ResultCode.SUCCESS else ("⏭️" if result["code"] == ResultCode.tools_graph_skipped else "❌")
+        debug_print(True, f"{mark} {name:<16}{result['elapsed']:>8.2f}s", prefix, branch_state)
+
+    return context
+
+
+def load_context_node(context: dict, incremental: bool = False):
+    """
+    DAG 節點：執行 Loader 控制器，將結果併入共用 context
+    :return: (context, code)
+    """
+    from workspace.controllers.loader_controller import run_loader_controller
+
+    loaded = run_loader_controller(branch_state=[True, True], prefix="Loader", incremental=incremental)
+    if not loaded:
+        return context, ResultCode.task_invalid_context
+    context.update(loaded)
+    return context, ResultCode.SUCCESS
+
+
+def _print_records(records, prefix, branch_state, debug):
+    """錯誤一律輸出；其餘記錄僅在 debug 模式輸出"""
+    for record in records or []:
+        rtype = record.get("type")
+        if rtype == "error":
+            debug_print(True, f"❌ {record.get('message', '')}", prefix, branch_state)
+        elif debug or rtype == "info":
+            debug_print(True, record.get("message", ""), prefix, branch_state)
@@ -0,0 +1,89 @@
+# workspace/tasks/chain/balance_scan_task.py
+"""
+Balance Scan 任務模組
+職責：
+    - 批次查詢多個錢包地址的 TRC20 餘額（同一地址多個 token 共用一次 Tronscan 備援查詢）
+    - 地址之間以執行緒池平行查詢（Ledger 共用連線池）
+    - 結果寫入 context["BALANCES"] = {address: {contract: balance | None}}
+
+輸入（context["OPTIONS"]，由 CLI 帶入）：
+    addresses : [地址, ...]
+    contracts : [合約地址, ...]（未指定時查 USDT 主網合約）
+    node_url  : 節點 URL（--node-url）
+節點：
+    依序取 --node-url → 系統設定 .env 的 TRON_NODE_URL；皆未設定時回傳錯誤（不退回測試網預設節點）
+    只讀取 .env 這一個欄位，不需要名稱設定檔與登入
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from workspace.tools.loader.loader import load_system_env
+from workspace.config import paths
+from workspace.config.error_code import ResultCode
+
+
+USDT_CONTRACT = "TR7NHqjeKQxGTCi8q8ZY4pL8otSzgjLj6t"
+BALANCE_SCAN_WORKERS = 16  # 與 Ledger 連線池大小一致
+
+
+def balance_scan_task(context: dict, debug: bool = False, ledger=None):
+    """
+    :param ledger: 測試用，可注入假 Ledger
+    :return: (context, code, records)
+    """
+    records = []
+    options = context.get("OPTIONS") or {}
+    addresses = list(dict.fromkeys(options.get("addresses") or []))
+    contracts = options.get("contracts") or [USDT_CONTRACT]
+    if not addresses:
+        records.append({"type": "error", "message": "[BalanceScan] 未指定任何地址（--address）"})
+        return context, ResultCode.task_invalid_context, records
+
+    if ledger is None:
+        node_url = options.get("node_url") or _env_node_url()
+        if not node_url:
+            records.append({
+                "type": "error",
+                "message": "[BalanceScan] 未指定節點 URL（--node-url 或 .env 的 TRON_NODE_URL）",
+            })
+            return context, ResultCode.task_env_missing_key, records
+
+        from workspace.tools.chain.client import TronClient
+        from workspace.tools.chain.ledger import Ledger
+
+        ledger = Ledger(TronClient(node_url))
+
+    tokens = [(contract, "USDT" if contract == USDT_CONTRACT else "") for contract in contracts]
+
+    def _scan(address):
+        return ledger.get_trc20_balances_with_fallback(address, tokens)
+
+    workers = min(BALANCE_SCAN_WORKERS, len(addresses))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        results = list(pool.map(_scan, addresses))
+
+    balances = {}
+    final_code = ResultCode.SUCCESS
+    for address, (values, code) in zip(addresses, results):
+        balances[address] = values
+        if code != ResultCode.SUCCESS:
+            if final_code == ResultCode.SUCCESS:
+                final_code = code  # 回傳第一個失敗的錯誤碼
+            records.append({"type": "error", "message": f"[BalanceScan] {address} 查詢失敗，ResultCode={code}"})
+        elif debug:
+            records.append({"type": "debug", "message": f"[BalanceScan] {address} → {values}"})
+
+    context["BALANCES"] = balances
+    records.append({
+        "type": "info",
+        "message": f"[BalanceScan] 共 {len(addresses)} 個地址，失敗 {sum(1 for r in records if r['type'] == 'error')} 個",
+    })
+    return context, final_code, records
+
+
+def _env_node_url() -> str | None:
+    """只讀取系統設定 .env 的 TRON_NODE_URL（不驗證其他欄位）"""
+    env_raw, code = load_system_env(paths.ENV_FILE)
+    if code != ResultCode.SUCCESS:
+        return None
+    recs = env_raw.get("records") or [{}]
+    return (recs[0] or {}).get("TRON_NODE_URL") or None
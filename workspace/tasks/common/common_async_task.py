@@ -3,17 +3,35 @@ common_async_task.py
 ------------------------------------------------
 📘 職責：
     - 從 context 依 mapping 自動組成 payload
-    - 支援單筆與批次併發 API 發送
-    - 回傳完整紀錄：method、url、headers、payload、response
+    - 批次發送可使用預編譯的 PayloadTemplate（每批只綁定一次 context）
+    - 批次發送時回報即時儀表板（batch_dashboard 啟用時）
+    - 批次發送可指定 otp_field：每筆發送前由 OtpProvider 取用仍有效的 OTP（長批次跨越時間窗也不會過期）
+    - 批次中遇到 HTTP 401 / 403（Session 失效）時自動重新登入（含新 OTP）並重試該筆一次
+    - 帳號池已登入多個帳號時（COMMON[role]["ACTIVE"]），批次請求依序輪流使用各帳號的 Session
+    - 支援單筆與批次併發 API 發送：同步的 Requester 交由執行緒執行，不阻塞事件迴圈；
+      批次同時送出的請求數以 MAX_CONCURRENT_REQUESTS（或 concurrency 參數）為上限
+    - 回傳完整紀錄：method、url、headers、payload、response、code、elapsed（批次另含 name）
+    - 不需要完整記錄時（debug 關閉），成功的請求只回傳精簡記錄（parsed / code / elapsed），
+      run_log 據此寫入每筆的名稱、錯誤碼與耗時，不含 request / response 內容
 ------------------------------------------------
 """
 
 import asyncio
+import time
+from collections.abc import Mapping
 from workspace.tools.request.requester import Requester
 from workspace.tools.response.parser import ResponseParser
+from workspace.tasks.common.payload_template import PayloadTemplate
+from workspace.tools.printer.batch_dashboard import get_batch_progress
+from workspace.tools.helpers.debug_helper import get_run_config
+from workspace.tools.otp.otp_generator import get_otp_provider
+from workspace.tasks.common.session_task import refresh_session
 from workspace.config.error_code import ResultCode
 
 
+MAX_CONCURRENT_REQUESTS = 16  # 單一批次同時送出的請求上限（避免壓垮後端與耗盡執行緒池）
+
+
 # ============================================================
 # 小工具：依路徑從 context 取值（支援直接值）
 # ============================================================
@@ -23,7 +41,7 @@ def _extract_from_context(context: dict, path):
         return path
     data = context
     for key in path:
-        if not isinstance(data, dict) or key not in data:
+        if not isinstance(data, Mapping) or key not in data:
             return None
         data = data[key]
     return data
@@ -37,14 +55,20 @@ async def send_api_request_async(
     role: str,
     api_group: str,
     path_key: str,
-    payload_source: dict,
+    payload_source: dict | None = None,
     method: str = "POST",
     use_header: bool = True,
     header_type: str = "Sid",
     timeout: int = 10,
+    payload: dict | None = None,
+    detail: bool = True,
 ) -> tuple[int, list]:
     """
     通用 API 發送器 (單筆)
+    Args:
+        payload_source: {欄位: context 路徑 | 字面值}，發送前逐欄解析
+        payload: 已組好的 payload（由 PayloadTemplate 產生時使用，優先於 payload_source）
+        detail: False → 成功時只回傳 {"type": "debug", "response": {"parsed": ...}, "code", "elapsed"}（錯誤記錄不受影響）
     Returns:
         (code, records)
     """
@@ -64,8 +88,9 @@ async def send_api_request_async(
 
         target_url = f"{base_url.rstrip('/')}/{api_path.lstrip('/')}"
 
-        # === Step 2. 自動組 Payload ===
-        payload = {field: _extract_from_context(context, path) for field, path in payload_source.items()}
+        # === Step 2. 自動組 Payload（已預先組好則直接使用）===
+        if payload is None:
+            payload = {field: _extract_from_context(context, path) for field, path in (payload_source or {}).items()}
 
         # === Step 3. 準備 Header ===
         headers = {}
@@ -83,14 +108,15 @@ async def send_api_request_async(
             "payload": payload,
         }
         response_info = None
+        started = time.perf_counter()
 
         try:
             if method.upper() == "POST":
-                resp, code = Requester.post(target_url, json=payload, headers=headers, timeout=timeout)
+                resp, code = await asyncio.to_thread(Requester.post, target_url, json=payload, headers=headers, timeout=timeout)
             elif method.upper() == "GET":
-                resp, code = Requester.get(target_url, params=payload, headers=headers, timeout=timeout)
+                resp, code = await asyncio.to_thread(Requester.get, target_url, params=payload, headers=headers, timeout=timeout)
             elif method.upper() == "PUT":
-                resp, code = Requester.put(target_url, json=payload, headers=headers, timeout=timeout)
+                resp, code = await asyncio.to_thread(Requester.put, target_url, json=payload, headers=headers, timeout=timeout)
             else:
                 records.append({
                     "type": "error",
@@ -109,9 +135,12 @@ async def send_api_request_async(
             records.append({
                 "type": "error",
                 "message": f"[{role}] 請求階段異常: {e}",
-                "request": request_info
+                "request": request_info,
+                "code": code,
+                "elapsed": time.perf_counter() - started,
             })
             return code, records
+        elapsed = time.perf_counter() - started
 
         # === Step 5. 檢查 HTTP 層結果 ===
         if code != ResultCode.SUCCESS or resp is None:
@@ -119,7 +148,9 @@ async def send_api_request_async(
                 "type": "error",
                 "message": f"[{role}] HTTP 請求失敗，ResultCode={code}",
                 "request": request_info,
-                "response": response_info
+                "response": response_info,
+                "code": code,
+                "elapsed": elapsed,
             })
             return code, records
 
@@ -130,11 +161,17 @@ async def send_api_request_async(
                 "type": "error",
                 "message": f"[{role}] 回傳非 JSON 格式",
                 "request": request_info,
-                "response": response_info
+                "response": response_info,
+                "code": ResultCode.task_api_failed,
+                "elapsed": elapsed,
             })
             return ResultCode.task_api_failed, records
 
-        # === Step 7. 成功紀錄 ===
+        # === Step 7. 成功紀錄（不需完整記錄時只保留任務層要用的 parsed）===
+        if not detail:
+            records.append({"type": "debug", "response": {"parsed": data}, "code": ResultCode.SUCCESS, "elapsed": elapsed})
+            return ResultCode.SUCCESS, records
+
         records.append({
             "type": "debug",
             "message": f"[{role}] API 請求完成 → {target_url}",
@@ -143,7 +180,9 @@ async def send_api_request_async(
                 "status_code": getattr(resp, "status_code", None),
                 "text": getattr(resp, "text", None),
                 "parsed": data
-            }
+            },
+            "code": ResultCode.SUCCESS,
+            "elapsed": elapsed,
         })
 
         return ResultCode.SUCCESS, records
@@ -164,33 +203,106 @@ async def send_batch_api_requests(
     role: str,
     api_group: str,
     path_key: str,
-    payload_sources: list[tuple[str, dict]],
+    payload_sources: list[tuple[str, dict]] | None = None,
     method: str = "POST",
     use_header: bool = True,
     header_type: str = "Sid",
     timeout: int = 10,
+    template: PayloadTemplate | None = None,
+    names: list[str] | None = None,
+    detail: bool | None = None,
+    otp_field: str | None = None,
+    relogin: bool = True,
+    concurrency: int | None = None,
 ) -> list[tuple[str, int, list]]:
     """
     批次併發 API 發送器
     Args:
-        payload_sources: [(name, payload_source), ...]
+        payload_sources: [(name, payload_source), ...]（逐筆解析路徑）
+        template + names: 預編譯 payload 定義 + 名稱清單（建議，大量批次較快）
+        detail: 是否組完整成功記錄；None → 依 RunConfig.records（每批只判斷一次）
+        otp_field: 需要 OTP 的欄位名稱；每筆發送前以 COMMON[role].OTP_SECRET 取用最新 OTP 覆寫
+                   （缺少 secret 時沿用 payload 原本的值）
+        relogin: 遇到 HTTP 401 / 403 時重新登入後重試一次（同一帳號只會重新登入一次）
+        concurrency: 同時送出的請求上限；None → MAX_CONCURRENT_REQUESTS
+        帳號池：第 i 筆使用 ACTIVE[i % 帳號數] 的 Session（與其 OTP）；未設定時全部使用 role
     Returns:
         [(name, code, records), ...]
     """
-    async def _run_single(name, payload_source):
-        code, records = await send_api_request_async(
-            context=context,
-            role=role,
-            api_group=api_group,
-            path_key=path_key,
-            payload_source=payload_source,
-            method=method,
-            use_header=use_header,
-            header_type=header_type,
-            timeout=timeout,
-        )
+    progress = get_batch_progress()
+    stage = f"{role}:{path_key}"
+    if detail is None:
+        detail = get_run_config(context).records
+    common = context.get("COMMON", {})
+    sessions = (common.get(role) or {}).get("ACTIVE") or [role]
+    providers = {}
+    if otp_field:
+        for session in sessions:
+            providers[session], _ = get_otp_provider((common.get(session) or {}).get("OTP_SECRET"))
+
+    limit = asyncio.Semaphore(concurrency or MAX_CONCURRENT_REQUESTS)
+
+    async def _run_single(name, payload_source, payload, session):
+        async with limit:
+            return await _send_one(name, payload_source, payload, session)
+
+    async def _send_one(name, payload_source, payload, session):
+        provider = providers.get(session)
+        if progress is not None:
+            progress.begin(stage)
+            started = time.perf_counter()
+        notes = []
+        for attempt in range(2):
+            if provider is not None:
+                otp, otp_code = await provider.fresh_async()
+                if otp_code == ResultCode.SUCCESS:
+                    if payload is not None:
+                        payload[otp_field] = otp
+                    else:
+                        payload_source = {**(payload_source or {}), otp_field: otp}
+            sid = (common.get(session) or {}).get("SSID")
+            code, records = await send_api_request_async(
+                context=context,
+                role=session,
+                api_group=api_group,
+                path_key=path_key,
+                payload_source=payload_source,
+                method=method,
+                use_header=use_header,
+                header_type=header_type,
+                timeout=timeout,
+                payload=payload,
+                detail=detail,
+            )
+            if code != ResultCode.tools_request_unauthorized or not relogin or attempt:
+                break
+            # Session 失效 → 重新登入（其他請求已重新登入則直接沿用）後重試
+            relogin_code, relogin_records = await refresh_session(context, session, sid)
+            notes.extend(r for r in relogin_records if r.get("type") == "error")
+            if relogin_code != ResultCode.SUCCESS:
+                break
+            notes.append({"type": "info", "message": f"[{session}] Session 失效，已重新登入並重試"})
+        records = notes + records
+        for record in records:
+            record["name"] = name
+        if progress is not None:
+            progress.finish(stage, _succeeded(code, records), time.perf_counter() - started)
         return name, code, records
 
-    tasks = [_run_single(name, src) for name, src in payload_sources]
+    if template is not None:
+        build = template.bind(context)
+        tasks = [_run_single(name, None, build(name), sessions[i % len(sessions)]) for i, name in enumerate(names or [])]
+    else:
+        tasks = [_run_single(name, src, None, sessions[i % len(sessions)]) for i, (name, src) in enumerate(payload_sources or [])]
+    if progress is not None and tasks:
+        progress.start_stage(stage, len(tasks))
     results = await asyncio.gather(*tasks)
     return results
+
+
+def _succeeded(code, records) -> bool:
+    """儀表板用：HTTP 成功且回應 Code 為 0（或沒有 Code 欄位）"""
+    if code != ResultCode.SUCCESS or not records:
+        return False
+    parsed = (records[-1].get("response") or {}).get("parsed")
+    return not isinstance(parsed, Mapping) or parsed.get("Code", 0) == 0
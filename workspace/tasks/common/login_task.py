@@ -34,7 +34,8 @@ def common_login(context: dict, role: str = "OPS", debug: bool = False):
 
         # === Step 1. 自動組合登入 URL ===
         base_url = context["COMMON"].get("BACKEND_RA_BASE_URL", "")
-        path = context.get("API", {}).get("LOGIN_PATHS", {}).get(role)
+        # 帳號池成員（例如 OPS2）以 LOGIN_ROLE 沿用主角色的登入路徑
+        path = context.get("API", {}).get("LOGIN_PATHS", {}).get(role_data.get("LOGIN_ROLE", role))
         if not base_url or not path:
             records.append({
                 "type": "error",
@@ -60,7 +61,8 @@ def common_login(context: dict, role: str = "OPS", debug: bool = False):
         }
 
         records.append({"type": "debug", "message": f"[{role}] 登入請求 → {login_url}"})
-        records.append({"type": "debug", "message": f"[{role}] Payload: {payload}"})
+        # 不輸出 Payload 本身（含密碼與 OTP），只列出登入帳號
+        records.append({"type": "debug", "message": f"[{role}] 登入帳號: {payload['Account']}"})
 
         # === Step 3. 發送登入 API ===
         data, code = send_api_request(
@@ -2,12 +2,14 @@
 共用任務模組：otp_task.py（新結構）
 功能：
     - 從 context["COMMON"][role] 中取出 OTP_SECRET
-    - 呼叫 otp_generator 產生 OTP
-    - 產生成功則寫回 LOGIN_OTP
-    - 若發生錯誤，回傳對應的 ResultCode
+    - 透過 otp_generator 的 OtpProvider 取得 OTP（快取 TOTP；剩餘有效時間不足時等下一個時間窗）
+    - 產生成功則寫回 LOGIN_OTP（登入用；批次請求改由共用層逐筆取用最新 OTP）
+    - 若發生錯誤，回傳對應的 ResultCode；未預期例外回傳 tools_otp_generate_error
+      （舊版回傳未定義的 ResultCode.EXCEPTION，實際上會在 except 內再拋 AttributeError）
 """
 
-from workspace.tools.otp.otp_generator import generate_otp
+from workspace.tools.otp.otp_generator import get_otp_provider
+from workspace.tools.printer.output_sink import emit
 from workspace.config.error_code import ResultCode
 
 
@@ -27,8 +29,10 @@ def generate_role_otp(context: dict, role: str, debug: bool = False):
         if not secret:
             return context, ResultCode.tools_otp_invalid_secret  # 缺少密鑰
 
-        # 呼叫工具層產生 OTP（會回傳 (otp, code)）
-        otp, code = generate_otp(secret)
+        # 呼叫工具層取得 OTP（會回傳 (otp, code)；確保登入時仍有效）
+        provider, code = get_otp_provider(secret)
+        if code == ResultCode.SUCCESS:
+            otp, code = provider.fresh()
 
         if code != ResultCode.SUCCESS:
             # 工具層若回傳失敗，直接轉傳
@@ -40,10 +44,11 @@ def generate_role_otp(context: dict, role: str, debug: bool = False):
         # 寫回 context
         target["LOGIN_OTP"] = otp
         if debug:
-            print(f"[DEBUG] 為 {role} 產生 OTP：{otp}")
+            emit(f"[DEBUG] 為 {role} 產生 OTP：{otp}", "debug", role)
 
         return context, ResultCode.SUCCESS
 
     except Exception as e:
-        print(f"[❌ OTP 任務例外] {role}: {e}")
-        return context, ResultCode.EXCEPTION
+        # 🔹 與工具層生成失敗同碼：呼叫端（session_task._login）原樣轉傳，執行紀錄可依此碼查詢
+        emit(f"[❌ OTP 任務例外] {role}: {e}", "error", role)
+        return context, ResultCode.tools_otp_generate_error
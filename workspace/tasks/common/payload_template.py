@@ -0,0 +1,136 @@
+"""
+payload_template.py
+------------------------------------------------
+📘 職責：
+    - 將「欄位 → context 路徑」的 payload 定義預先編譯成存取函式
+    - 批次發送時每個端點只編譯一次、每批只綁定一次 context，
+      組 payload 時不再逐欄逐層解析路徑
+
+📘 定義方式（與 payload_source 相同，名稱以 NAME 佔位）：
+    CREATE_AGENT = PayloadTemplate({
+        "Name": NAME,                                  # 名稱本身
+        "Password": ("INDEX", NAME, "agent", "password"),
+        "OtpCode": ("COMMON", "OPS", "LOGIN_OTP"),     # 不含 NAME → 每批只取一次
+        "Page": 1,                                     # 非 tuple/list → 字面值
+    })
+    build = CREATE_AGENT.bind(context)
+    payload = build("小明")
+------------------------------------------------
+"""
+
+from collections.abc import Mapping
+
+
+class _NamePlaceholder:
+    """payload 路徑中的名稱佔位符"""
+
+    __slots__ = ()
+
+    def __repr__(self):
+        return "NAME"
+
+
+NAME = _NamePlaceholder()
+
+
+class PayloadTemplate:
+    """預編譯的 payload 定義（可在模組層級建立並重複使用）"""
+
+    __slots__ = ("fields", "drop_empty", "_ops")
+
+    def __init__(self, fields: dict, drop_empty: bool = False):
+        """
+        Args:
+            fields: {欄位: 路徑 tuple | NAME | 字面值}
+            drop_empty: True → 結果中 None 或空字串的欄位不送出
+        """
+        self.fields = dict(fields)
+        self.drop_empty = drop_empty
+        self._ops = [_compile_field(field, path) for field, path in self.fields.items()]
+
+    def bind(self, context: dict):
+        """
+        綁定 context，回傳 build(name) → payload dict
+        不含 NAME 的路徑在此解析一次（同一批次內 context 不變）
+        """
+        index = context.get("INDEX") or {}
+        resolved = []
+        for field, kind, value in self._ops:
+            if kind == "static":
+                resolved.append((field, "const", _resolve(context, value)))
+            else:
+                resolved.append((field, kind, value))
+
+        drop_empty = self.drop_empty
+
+        def build(name: str) -> dict:
+            entry = index.get(name)
+            payload = {}
+            for field, kind, value in resolved:
+                if kind == "const":
+                    result = value
+                elif kind == "name":
+                    result = name
+                else:
+                    result = value(entry) if entry is not None else None
+                if drop_empty and result in (None, ""):
+                    continue
+                payload[field] = result
+            return payload
+
+        return build
+
+
+# ============================================================
+# 編譯：將路徑轉為存取函式
+# ============================================================
+def _compile_field(field: str, path):
+    """
+    回傳 (field, kind, value)
+        kind = "const"  → value 為字面值
+        kind = "name"   → 名稱本身
+        kind = "static" → value 為不含 NAME 的路徑（bind 時解析）
+        kind = "entry"  → value 為 INDEX[name] 之後的存取函式
+    """
+    if path is NAME:
+        return field, "name", None
+    if not isinstance(path, (tuple, list)):
+        return field, "const", path
+    if NAME not in path:
+        return field, "static", tuple(path)
+
+    if len(path) < 2 or path[0] != "INDEX" or path[1] is not NAME:
+        raise ValueError(f"NAME 只能出現在 INDEX 路徑的第二層：{field}={path!r}")
+    return field, "entry", _compile_getter(tuple(path[2:]))
+
+
+def _compile_getter(keys: tuple):
+    """依層數產生對應的存取函式（常見的兩層路徑直接展開，不走迴圈）"""
+    if len(keys) == 2:
+        k1, k2 = keys
+
+        def get(entry):
+            try:
+                return entry[k1][k2]
+            except (KeyError, TypeError, IndexError):
+                return None
+        return get
+
+    def get(entry):
+        data = entry
+        for key in keys:
+            if not isinstance(data, Mapping) or key not in data:
+                return None
+            data = data[key]
+        return data
+    return get
+
+
+def _resolve(context: dict, path: tuple):
+    """解析不含 NAME 的路徑（每批次一次）"""
+    data = context
+    for key in path:
+        if not isinstance(data, Mapping) or key not in data:
+            return None
+        data = data[key]
+    return data
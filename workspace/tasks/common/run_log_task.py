@@ -0,0 +1,68 @@
+"""
+Run Log 查詢任務
+------------------------------------------------
+職責：
+    - 讀取結構化執行紀錄（paths.RUN_LOG_FILE 或 --run-log 指定的檔案）
+    - 依 CLI 參數篩選：--stage / --code / --name / --run（"last" = 最後一次執行）
+    - 以 info 記錄輸出符合的紀錄與各 ResultCode 筆數，結果另寫入 context["RUN_LOG"]
+
+用法：
+    python main.py tool run_log --stage OPS.4 --code 2001
+    python main.py tool run_log --run last --name 小明
+"""
+
+from collections import Counter
+from workspace.config import paths
+from workspace.tools.file.run_log import query_run_log
+from workspace.config.error_code import ResultCode
+
+
+DEFAULT_LIMIT = 200
+
+
+def query_run_log_task(context: dict):
+    """
+    :return: (context, code, records)
+    """
+    options = context.get("OPTIONS") or {}
+    path = options.get("run_log") or paths.RUN_LOG_FILE
+    records = []
+
+    entries, code = query_run_log(
+        path,
+        stage=options.get("stage"),
+        code=options.get("code"),
+        name=options.get("name"),
+        run=options.get("run"),
+    )
+    if code == ResultCode.tools_file_not_found:
+        records.append({"type": "info", "message": f"尚無執行紀錄：{path}"})
+        return context, ResultCode.SUCCESS, records
+    if code != ResultCode.SUCCESS:
+        records.append({"type": "error", "message": f"讀取執行紀錄失敗：{path}"})
+        return context, code, records
+
+    context["RUN_LOG"] = entries
+    limit = options.get("limit") or DEFAULT_LIMIT
+    for entry in entries[-limit:]:
+        records.append({"type": "info", "message": _format(entry)})
+
+    counts = Counter(entry.get("code") for entry in entries)
+    summary = "、".join(f"{c}×{n}" for c, n in sorted(counts.items(), key=lambda x: (x[0] is None, x[0] or 0)))
+    shown = f"（顯示最後 {limit} 筆）" if len(entries) > limit else ""
+    records.append({"type": "info", "message": f"符合 {len(entries)} 筆{shown}；ResultCode：{summary or '-'}"})
+    return context, ResultCode.SUCCESS, records
+
+
+def _format(entry: dict) -> str:
+    parts = [f"{entry.get('stage')}.{entry.get('step')}", entry.get("type") or "-"]
+    if entry.get("name"):
+        parts.append(f"[{entry['name']}]")
+    parts.append(f"code={entry.get('code')}")
+    if entry.get("elapsed") is not None:
+        parts.append(f"{entry['elapsed']:.3f}s")
+    response = entry.get("response") or {}
+    if response.get("status_code") is not None:
+        parts.append(f"HTTP {response['status_code']}")
+    parts.append(entry.get("message") or "")
+    return " ".join(parts)
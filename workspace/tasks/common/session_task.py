@@ -0,0 +1,159 @@
+# workspace/tasks/common/session_task.py
+"""
+Session 任務模組（登入 Session 管理）
+------------------------------------------------
+職責：
+    - ensure_session：優先沿用上次保存的 Session（paths.SESSION_FILE），
+      驗證方式：先看保存時間（超過 SESSION_MAX_AGE 直接淘汰），再以一筆輕量查詢確認仍有效
+    - 無可用 Session 時：產生新 OTP → common_login → 保存 Session
+    - ensure_session_pool：帳號池（COMMON[role]["POOL"]，例如 OPS / OPS2 / OPS3）同時登入，
+      成功的帳號寫入 COMMON[role]["ACTIVE"]，共用層批次請求依此輪流分配 Session
+    - refresh_session：批次請求遇到 HTTP 401 / 403 時由共用層呼叫，重新登入（含新 OTP）後重試，
+      同一帳號同時只會重新登入一次（其他請求等待後直接沿用新的 Session）
+"""
+
+import asyncio
+import threading
+from workspace.tasks.common.common_task import send_api_request
+from workspace.tasks.common.login_task import common_login
+from workspace.tasks.common.otp_task import generate_role_otp
+from workspace.tools.file.session_store import session_key, load_session, save_session, clear_session
+from workspace.config import paths
+from workspace.config.error_code import ResultCode
+
+
+SESSION_MAX_AGE = 30 * 60  # 保存的 Session 最長沿用秒數
+
+# 驗證 Session 用的輕量查詢：角色 → (ENDPOINTS 鍵, 參數)；未列出的角色只看保存時間
+_PROBES = {
+    "OPS": ("QUERY_AGENT_ACCOUNT", {"Page": 1, "Limit": 1}),
+}
+
+_relogin_locks: dict[str, threading.Lock] = {}
+
+
+def ensure_session(context: dict, role: str = "OPS", debug: bool = False, reuse: bool = True):
+    """
+    取得可用的登入 Session（沿用或重新登入），並寫入 context["COMMON"][role] 的 SSID / UUID
+    :param reuse: False → 不沿用保存的 Session，一律重新登入
+    :return: (context, code, records)
+    """
+    records = []
+    role_data = context.get("COMMON", {}).get(role)
+    if not role_data:
+        records.append({"type": "error", "message": f"[{role}] 在 context['COMMON'] 中找不到登入資料"})
+        return context, ResultCode.task_invalid_context, records
+
+    key = _key(context, role)
+    if reuse:
+        stored, code = load_session(paths.SESSION_FILE, key, SESSION_MAX_AGE)
+        if code == ResultCode.SUCCESS:
+            role_data["SSID"], role_data["UUID"] = stored["SSID"], stored.get("UUID")
+            if _validate(context, role):
+                records.append({"type": "info", "message": f"[{role}] 沿用已保存的 Session"})
+                return context, ResultCode.SUCCESS, records
+            role_data.pop("SSID", None)
+            role_data.pop("UUID", None)
+            records.append({"type": "debug", "message": f"[{role}] 保存的 Session 已失效，重新登入"})
+
+    code, login_records = _login(context, role, key, debug)
+    records.extend(login_records)
+    return context, code, records
+
+
+async def ensure_session_pool(context: dict, role: str = "OPS", debug: bool = False):
+    """
+    帳號池同時取得 Session（未設定帳號池時等同 ensure_session）
+    - 部分帳號失敗：略過該帳號，以其餘帳號繼續
+    - 全部失敗：回傳第一個失敗的錯誤碼
+    :return: (context, code, records)
+    """
+    role_data = context.get("COMMON", {}).get(role)
+    if not role_data:
+        return ensure_session(context, role, debug)
+
+    pool = role_data.get("POOL") or [role]
+    results = await asyncio.gather(*(asyncio.to_thread(ensure_session, context, member, debug) for member in pool))
+
+    records, active, first_error = [], [], None
+    for member, (_, code, member_records) in zip(pool, results):
+        records.extend(member_records)
+        if code == ResultCode.SUCCESS:
+            active.append(member)
+        elif first_error is None:
+            first_error = code
+    role_data["ACTIVE"] = active
+
+    if not active:
+        return context, first_error, records
+    if len(pool) > 1:
+        skipped = [member for member in pool if member not in active]
+        message = f"[{role}] 帳號池 {len(active)}/{len(pool)} 個帳號已登入，批次請求將分散送出"
+        if skipped:
+            message += f"（略過：{', '.join(skipped)}）"
+        records.append({"type": "info", "message": message})
+    return context, ResultCode.SUCCESS, records
+
+
+async def refresh_session(context: dict, role: str, stale_sid: str | None):
+    """
+    Session 失效時重新登入（含新 OTP）；若其他請求已完成重新登入（SSID 已不是 stale_sid）則直接回傳
+    :return: (code, records)
+    """
+    return await asyncio.to_thread(_refresh, context, role, stale_sid)
+
+
+def _refresh(context: dict, role: str, stale_sid: str | None):
+    with _relogin_locks.setdefault(role, threading.Lock()):
+        role_data = context.get("COMMON", {}).get(role) or {}
+        if role_data.get("SSID") != stale_sid:
+            return ResultCode.SUCCESS, []
+        key = _key(context, role)
+        clear_session(paths.SESSION_FILE, key)
+        return _login(context, role, key)
+
+
+def _login(context: dict, role: str, key: str, debug: bool = False):
+    """產生新 OTP → 登入 → 保存 Session；:return: (code, records)"""
+    context, code = generate_role_otp(context, role, debug)
+    if code != ResultCode.SUCCESS:
+        return code, [{"type": "error", "message": f"[{role}] 產生登入 OTP 失敗，ResultCode={code}"}]
+
+    context, code, records = common_login(context=context, role=role, debug=debug)
+    if code != ResultCode.SUCCESS:
+        return code, records
+
+    role_data = context["COMMON"][role]
+    save_code = save_session(paths.SESSION_FILE, key, role_data["SSID"], role_data.get("UUID"))
+    if save_code != ResultCode.SUCCESS:
+        # 保存失敗不影響本次執行，下次重新登入即可
+        records.append({"type": "info", "message": f"[{role}] Session 保存失敗，ResultCode={save_code}"})
+    return ResultCode.SUCCESS, records
+
+
+def _validate(context: dict, role: str) -> bool:
+    """以一筆輕量查詢確認 Session 仍有效（未設定探測 API 的角色視為有效）"""
+    role_data = context.get("COMMON", {}).get(role) or {}
+    probe = _PROBES.get(role_data.get("LOGIN_ROLE", role))  # 帳號池成員（OPS2 …）沿用所屬角色的探測 API
+    if probe is None:
+        return True
+    path_key, params = probe
+    base_url = context["COMMON"].get("BACKEND_RA_BASE_URL", "")
+    api_path = context.get("API", {}).get("ENDPOINTS", {}).get(path_key, "")
+    if not base_url or not api_path:
+        return False
+    url = f"{base_url.rstrip('/')}/{api_path.lstrip('/')}"
+    data, code = send_api_request(context, role, url, payload=params, method="GET")
+    return code == ResultCode.SUCCESS and data.get("Code") == 0
+
+
+def _key(context: dict, role: str) -> str:
+    common = context.get("COMMON", {})
+    role_data = common.get(role) or {}
+    return session_key(
+        common.get("BACKEND_RA_BASE_URL"),
+        role,
+        role_data.get("USERNAME") or role_data.get("ACCOUNT"),
+        role_data.get("PASSWORD"),
+        role_data.get("OTP_SECRET"),
+    )
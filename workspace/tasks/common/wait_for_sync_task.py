@@ -1,22 +1,104 @@
-from workspace.tools.printer.live_display import run_live_display
+"""
+Wait For Sync 任務模組
+------------------------------------------------
+職責：
+    - 等待後台同步：以查詢 API 探測剛建立的資料是否已可查到，查到即返回
+    - 探測間隔指數退避（1s → 2s → 4s … 最多 15s），總等待不超過 wait_seconds（預設 140 秒，即原本的固定倒數）
+    - 預設探測最後建立的幾個代理帳號；可傳入自訂 probe（例如以 TransactionWatcher 查交易）
+"""
+
+import sys
+from collections.abc import Mapping
+from workspace.tasks.common.common_async_task import send_batch_api_requests
+from workspace.tasks.ops.query_agent_uuid_task import QUERY_AGENT_PAYLOAD
+from workspace.tools.common.readiness_poller import poll_until_ready
 from workspace.config.error_code import ResultCode
-from rich.table import Table
 
-def wait_for_sync(context: dict, wait_seconds: int = 140) -> tuple[dict, int]:
+
+def make_query_probe(
+    context: dict,
+    role: str = "agent",
+    path_key: str = "QUERY_AGENT_ACCOUNT",
+    template=QUERY_AGENT_PAYLOAD,
+    sample: int = 3,
+):
     """
-    任務模組: 等待後台同步寫入交易紀錄
+    建立查詢 API 探測：取最後建立（已有帳號）的 sample 個名稱，全部查得到才算就緒
+    :return: async probe() → (ready, 查到的筆數)
+    """
+    index = context.get("INDEX")
+    names = [name for name, data in index.items() if data[role].get("account")] if isinstance(index, Mapping) else []
+    names = names[-sample:]
+
+    async def probe():
+        if not names:
+            return True, 0
+        results = await send_batch_api_requests(
+            context=context,
+            role="OPS",
+            api_group="ENDPOINTS",
+            path_key=path_key,
+            template=template,
+            names=names,
+            method="GET",
+            use_header=True,
+            header_type="Sid",
+        )
+        visible = sum(1 for _, code, records in results if code == ResultCode.SUCCESS and _has_items(records))
+        return visible == len(names), visible
+
+    return probe
+
+
+async def wait_for_sync(
+    context: dict,
+    wait_seconds: int = 140,
+    probe=None,
+    interval: float = 1.0,
+    max_interval: float = 15.0,
+    show: bool | None = None,
+    debug: bool = False,
+):
+    """
+    任務模組: 等待後台同步寫入資料（就緒即返回）
     :param context: 總控傳入的上下文
-    :param wait_seconds: 等待秒數 (預設 140)
-    :return: (context, ResultCode.SUCCESS)
+    :param wait_seconds: 最長等待秒數 (預設 140)
+    :param probe: 自訂探測 probe() → (ready, value)；預設查詢最後建立的代理帳號
+    :param show: 是否顯示即時狀態表（預設僅在終端機顯示）
+    :return: (context, code, records)
     """
+    probe = probe or make_query_probe(context)
+    status = {"attempt": 0, "elapsed": 0.0, "value": None}
+
+    def on_attempt(attempt, elapsed, ready, value):
+        status.update(attempt=attempt, elapsed=elapsed, value=value)
+
+    poll = poll_until_ready(probe, timeout=wait_seconds, interval=interval, max_interval=max_interval, on_attempt=on_attempt)
+
+    if show if show is not None else sys.stdout.isatty():
+        from rich.table import Table
+        from workspace.tools.printer.live_display import run_live_display_async
+
+        def make_table() -> Table:
+            table = Table(title="後台同步等待")
+            table.add_column("狀態", justify="left")
+            table.add_column("探測次數", justify="right")
+            table.add_column("已等待 / 上限", justify="right")
+            table.add_row("等待寫入", str(status["attempt"]), f"{status['elapsed']:.0f} / {wait_seconds} 秒")
+            return table
+
+        value, code = await run_live_display_async(make_table, poll)
+    else:
+        value, code = await poll
 
-    def make_table(remaining: int) -> Table:
-        table = Table(title="後台同步倒數")
-        table.add_column("狀態", justify="left")
-        table.add_column("剩餘秒數", justify="right")
-        table.add_row("等待寫入", f"{remaining} 秒")
-        return table
+    summary = f"第 {status['attempt']} 次探測，等待 {status['elapsed']:.1f} 秒"
+    if code == ResultCode.SUCCESS:
+        return context, code, [{"type": "info", "message": f"後台同步完成（{summary}）"}]
+    return context, code, [{"type": "error", "message": f"後台同步逾時（{summary}，最後結果：{value}）"}]
 
-    run_live_display("後台同步倒數", make_table, wait_seconds)
 
-    return context, ResultCode.SUCCESS
+def _has_items(records) -> bool:
+    parsed = (records[-1].get("response") or {}).get("parsed") if records else None
+    if not isinstance(parsed, Mapping) or parsed.get("Code") != 0:
+        return False
+    return bool((parsed.get("Result") or {}).get("Items"))
@@ -1,11 +1,28 @@
 # workspace/tasks/loader/load_profile_context_task.py
 """
-Profile Context 任務模組（純資料直通版）
+Profile Context 任務模組（串流驗證版）
 ------------------------------------------------
 職責：
-    - 讀取 profiles 目錄下的名稱設定檔 (.env / .csv / .xlsx)
+    - 讀取 profiles 目錄下的名稱設定檔 (.env / .csv / .json / .xlsx)
     - 驗證欄位結構與值格式（不做欄位名轉換）
-    - 回傳 INDEX 結構（名稱為 key，內容為原始欄位值）
+    - 回傳 INDEX 結構（名稱為 key，內容為原始欄位值；以 CompactIndex 精簡保存，存取方式同 dict）
+
+流程（generator pipeline，記憶體不隨檔案大小成長）：
+    讀取（逐筆） → 分塊驗證（大檔交由多個 worker process） → 組 INDEX entry
+
+多檔分片：
+    - profiles 目錄可放多份設定檔（可混用 .csv / .json / .env / .xlsx），依檔名排序後合併為同一個 INDEX
+    - 單一檔案 → 檔內分塊平行驗證；多個檔案 → 以檔案為單位平行驗證
+    - 名稱重複（同檔或跨檔）一律列為錯誤，並標示首次出現位置
+
+快取：
+    - 驗證成功的 INDEX 會寫入 paths.PROFILE_CACHE_FILE（以檔案路徑 / 大小 / mtime / SHA-256 為鍵）
+    - 設定檔未變動時直接載入快取，跳過讀取與驗證
+    - 驗證規則變動時請調高 PROFILE_CACHE_VERSION，使舊快取失效
+
+錯誤處理：
+    - 不在第一筆錯誤就中止：收集所有錯誤列（含檔名與筆數），最多保留 MAX_ERROR_RECORDS 筆
+    - 回傳的 ResultCode 為「第一個錯誤列」的錯誤碼（與舊版單筆中止時相同）
 
 設計理念：
     ✅ Loader 層：只檢查結構，不改 key
@@ -13,15 +30,22 @@ Profile Context 任務模組（純資料直通版）
     ✅ 嚴格分層、資料原樣流通
 """
 
+import heapq
 import os
 import re
+from collections.abc import Mapping
+from itertools import islice, repeat
 from workspace.config import paths
 from workspace.tools.file.file_helper import list_files_by_ext
+from workspace.tools.file.cache_helper import load_parsed_cache, save_parsed_cache, fingerprint_sources
+from workspace.tools.common.compact_index import CompactIndex
 from workspace.tools.loader.loader import (
     load_profile_env,
     load_profile_file,
+    iter_profile_csv,
+    iter_profile_xlsx,
 )
-from workspace.config.error_code import ResultCode
+from workspace.config.error_code import ResultCode, ERROR_MESSAGES
 
 
 # ===========================================================
@@ -32,93 +56,341 @@ _NAME_RE = re.compile(r"^[A-Za-z\u4e00-\u9fa5]+$")
 _PASSWORD_ALLOWED_RE = re.compile(r"^[A-Za-z0-9!@#$%^&*()_+\-=\[\]{};:'\",.<>/?\\|`~]+$")
 _EMAIL_RE = re.compile(r"^[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}$")
 
+# ===========================================================
+# ⚙️ 串流 / 平行驗證參數
+# ===========================================================
+CHUNK_SIZE = 20_000          # 每個驗證區塊筆數
+PARALLEL_MIN_CHUNKS = 2      # 至少幾個區塊才啟用多行程（小檔直接在本行程驗證）
+PARALLEL_MIN_ROWS = 100_000  # 未指定 workers 時，單檔至少幾筆才啟動子行程（低於此數，行程啟動成本大於驗證本身）
+PARALLEL_MIN_BYTES = 8 << 20  # 未指定 workers 時，多檔合計至少幾個位元組才以子行程平行驗證
+MAX_ERROR_RECORDS = 1_000    # 最多保留幾筆錯誤明細（總數仍會完整計算）
+PROFILE_CACHE_VERSION = 3    # 驗證規則 / INDEX 結構變動時遞增
+
 
 def load_profile_context():
     """載入 profiles 設定檔，驗證結構與內容（不轉換欄位名）"""
+    index_dict, code, _ = load_profile_context_with_errors()
+    return index_dict, code
+
+
+def load_profile_context_with_errors(workers: int | None = None, chunk_size: int = CHUNK_SIZE, use_cache: bool = True):
+    """
+    同 load_profile_context，但額外回傳所有錯誤列
+    :param workers: 驗證用 process 數（None = 檔案夠大時才用 CPU 核心數，見 PARALLEL_MIN_ROWS / PARALLEL_MIN_BYTES；
+                    1 = 不開子行程；≥ 2 = 多個區塊 / 檔案即平行驗證）
+    :param chunk_size: 每個驗證區塊筆數
+    :param use_cache: 是否使用已驗證 INDEX 快取
+    :return: (index_dict, code, records)
+             records: [{"type": "error", "file": 檔名, "row": 筆數, "result_code": code, "message": ...}, ...]
+    """
     # -------------------------------------------------------
-    # 1️⃣ 搜尋 profiles 資料夾內可用檔案
+    # 1️⃣ 搜尋 profiles 資料夾內可用檔案（依檔名排序，合併順序固定）
     # -------------------------------------------------------
     profile_dir = os.path.dirname(paths.PROFILE_FILE_PATH)
     files, code = list_files_by_ext(profile_dir)
     if code not in (ResultCode.SUCCESS, ResultCode.tools_file_no_files_found):
-        return {}, code
+        return {}, code, []
     if not files:
-        return {}, ResultCode.task_name_file_missing
-    if len(files) > 1:
-        return {}, ResultCode.task_name_multiple_files_detected
+        return {}, ResultCode.task_name_file_missing, []
+    files = sorted(files)
 
-    file_path = files[0]
-    ext = os.path.splitext(file_path)[1].lower()
+    # -------------------------------------------------------
+    # 🔹 設定檔未變動 → 直接使用快取（跳過讀取與驗證）
+    # -------------------------------------------------------
+    if use_cache:
+        cached, code = load_parsed_cache(paths.PROFILE_CACHE_FILE, files, PROFILE_CACHE_VERSION)
+        if code == ResultCode.SUCCESS and isinstance(cached, Mapping):
+            return cached, ResultCode.SUCCESS, []
+        # 讀取前先取指紋：解析期間設定檔被修改時不寫入快取
+        sources, code = fingerprint_sources(files)
+        if code != ResultCode.SUCCESS:
+            use_cache = False
 
     # -------------------------------------------------------
-    # 2️⃣ 載入檔案內容（明確指定 required_fields）
+    # 2️⃣ 讀取 + 3️⃣ 分塊驗證 + 4️⃣ 組 INDEX
     # -------------------------------------------------------
+    builder = _IndexBuilder()
+    if len(files) == 1:
+        code = _collect_file(files[0], builder, workers, chunk_size)
+    else:
+        code = _collect_shards(files, builder, workers, chunk_size)
+
+    if code != ResultCode.SUCCESS:
+        return {}, code, builder.errors
+
+    if builder.error_total:
+        errors = builder.errors
+        if builder.error_total > len(errors):
+            errors.append({
+                "type": "error",
+                "message": f"其餘 {builder.error_total - len(errors)} 筆錯誤未列出（共 {builder.error_total} 筆）",
+            })
+        return {}, errors[0]["result_code"], errors
+
+    if use_cache:
+        # 寫入失敗不影響本次載入
+        save_parsed_cache(paths.PROFILE_CACHE_FILE, files, PROFILE_CACHE_VERSION, builder.index, sources=sources)
+
+    return builder.index, ResultCode.SUCCESS, []
+
+
+# ===========================================================
+# 🔹 讀取階段
+# ===========================================================
+def _open_records(file_path: str):
+    """
+    依副檔名取得 records 來源
+    :return: (iterable, stream | None, code)
+             CSV / XLSX 為串流（stream.code 於迭代結束後才確定），其餘格式為 list
+    """
+    ext = os.path.splitext(file_path)[1].lower()
+
+    if ext == ".csv":
+        stream, code = iter_profile_csv(file_path)
+        return stream, stream, code
+    if ext == ".xlsx":
+        stream, code = iter_profile_xlsx(file_path)
+        return stream, stream, code
+
+    # .env / .json 檔案本身不大，整批載入（明確指定 required_fields）
     if ext == ".env":
-        raw_data, code2 = load_profile_env(file_path, required_fields=_REQUIRED_FIELDS)
+        raw_data, code = load_profile_env(file_path, required_fields=_REQUIRED_FIELDS)
     else:
-        raw_data, code2 = load_profile_file(file_path)
-    if code2 != ResultCode.SUCCESS:
-        return {}, code2
+        raw_data, code = load_profile_file(file_path)
+    if code != ResultCode.SUCCESS:
+        return None, None, code
 
     if not isinstance(raw_data, dict) or "records" not in raw_data:
-        return {}, ResultCode.task_api_failed
-    records = raw_data["records"]
+        return None, None, ResultCode.task_api_failed
+    return raw_data["records"], None, ResultCode.SUCCESS
 
-    # -------------------------------------------------------
-    # 3️⃣ 驗證每筆欄位值內容（不改 key 名）
-    # -------------------------------------------------------
-    index_dict = {}
-    for rec in records:
-        name = str(rec.get("name", "")).strip()
-        password = str(rec.get("password", "")).strip()
-        email = str(rec.get("email", "")).strip()
-        modetype = str(rec.get("modetype", "")).strip()
-
-        # 名稱檢查
-        if not name:
-            return {}, ResultCode.task_name_empty_value
-        if not _NAME_RE.match(name):
-            return {}, ResultCode.task_name_invalid_key_format
-        if not (2 <= len(name) <= 20):
-            return {}, ResultCode.task_name_invalid_key_length
-
-        # 密碼檢查
-        if not password:
-            return {}, ResultCode.task_password_missing
-        if not (6 <= len(password) <= 20):
-            return {}, ResultCode.task_password_invalid_length
-        if not _PASSWORD_ALLOWED_RE.match(password):
-            return {}, ResultCode.task_password_invalid_charset
-
-        # 信箱檢查
-        if not email:
-            return {}, ResultCode.task_email_missing
-        if not _EMAIL_RE.match(email):
-            return {}, ResultCode.task_email_invalid_format
-
-        # 運營模式檢查
-        if not modetype:
-            return {}, ResultCode.task_mode_type_missing
-        if not modetype.isdigit():
-            return {}, ResultCode.task_mode_type_invalid_format
-        if modetype not in ("1", "2"):  # ✅ 改成檢查 1、2
-            return {}, ResultCode.task_mode_type_invalid_value
-
-        # ---------------------------------------------------
-        # 4️⃣ 組成 INDEX 結構（商戶與代理共用密碼/信箱）
-        # ---------------------------------------------------
-        index_dict[name] = {
-            "agent": {
-                "account": None,
-                "password": password,
-                "email": email,
-            },
-            "merchant": {
-                "account": None,
-                "password": password,  # ✅ 同 agent
-                "email": email,        # ✅ 同 agent
-                "modetype": int(modetype),
-            },
-        }
-
-    return index_dict, ResultCode.SUCCESS
+
+# ===========================================================
+# 🔹 驗證階段（單檔分塊 / 多檔分片）
+# ===========================================================
+def _iter_chunks(records, chunk_size: int):
+    """將 records 切成 (起始筆數, chunk) 區塊（筆數從 1 起算）"""
+    it = iter(records)
+    row = 1
+    while True:
+        chunk = list(islice(it, chunk_size))
+        if not chunk:
+            return
+        yield row, chunk
+        row += len(chunk)
+
+
+def _iter_validated_chunks(records, workers: int | None, chunk_size: int):
+    """
+    依序產出每個區塊的驗證結果 (entries, errors)
+    - 只有一個區塊（小檔），或未指定 workers 且不足 PARALLEL_MIN_ROWS 筆 → 本行程直接驗證，不啟動子行程
+    - 其餘 → ProcessPoolExecutor 平行驗證，同時在途區塊數有上限（記憶體固定）
+    """
+    chunks = _iter_chunks(records, chunk_size)
+    min_rows = PARALLEL_MIN_ROWS if workers is None else 0
+    pending, buffered = [], 0
+    for start_row, chunk in chunks:  # 先暫存開頭區塊，確定筆數夠多才啟動子行程
+        pending.append((start_row, chunk))
+        buffered += len(chunk)
+        if len(pending) >= PARALLEL_MIN_CHUNKS and buffered >= min_rows:
+            break
+    workers = workers or os.cpu_count() or 1
+
+    if len(pending) < PARALLEL_MIN_CHUNKS or buffered < min_rows or workers <= 1:
+        for start_row, chunk in pending:
+            yield validate_chunk(start_row, chunk)
+        for start_row, chunk in chunks:
+            yield validate_chunk(start_row, chunk)
+        return
+
+    from concurrent.futures import ProcessPoolExecutor  # 只有平行驗證才需要 multiprocessing
+
+    max_in_flight = workers * 2
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(validate_chunk, start_row, chunk) for start_row, chunk in pending]
+        for start_row, chunk in chunks:
+            futures.append(pool.submit(validate_chunk, start_row, chunk))
+            while len(futures) >= max_in_flight:
+                yield futures.pop(0).result()
+        for future in futures:
+            yield future.result()
+
+
+def _collect_file(file_path: str, builder, workers: int | None, chunk_size: int) -> int:
+    """單一設定檔：串流讀取 + 檔內分塊驗證，結果交給 builder"""
+    records, stream, code = _open_records(file_path)
+    if code != ResultCode.SUCCESS:
+        return code
+
+    for entries, errors in _iter_validated_chunks(records, workers, chunk_size):
+        builder.add(file_path, entries, errors)
+
+    if stream is not None and stream.code != ResultCode.SUCCESS:
+        return stream.code
+    return ResultCode.SUCCESS
+
+
+def _collect_shards(files: list[str], builder, workers: int | None, chunk_size: int) -> int:
+    """
+    多個設定檔：每個檔案交由一個 worker 驗證，依檔名順序合併
+    - 未指定 workers 且檔案合計小於 PARALLEL_MIN_BYTES → 本行程依序驗證
+    :return: 第一個讀檔失敗的錯誤碼；全部讀取成功為 SUCCESS
+    """
+    if workers is None and sum(os.path.getsize(path) for path in files) < PARALLEL_MIN_BYTES:
+        workers = 1
+    workers = min(workers or os.cpu_count() or 1, len(files))
+
+    if workers <= 1:
+        return _merge_shards(files, map(validate_shard, files, repeat(chunk_size)), builder)
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return _merge_shards(files, pool.map(validate_shard, files, repeat(chunk_size)), builder)
+
+
+def _merge_shards(files: list[str], results, builder) -> int:
+    for file_path, (code, chunk_results) in zip(files, results):
+        if code != ResultCode.SUCCESS:
+            return code
+        for entries, errors in chunk_results:
+            builder.add(file_path, entries, errors)
+    return ResultCode.SUCCESS
+
+
+def validate_shard(file_path: str, chunk_size: int = CHUNK_SIZE):
+    """
+    讀取並驗證單一分片檔（可於子行程執行）
+    :return: (code, [(entries, errors), ...])
+    """
+    records, stream, code = _open_records(file_path)
+    if code != ResultCode.SUCCESS:
+        return code, []
+
+    chunk_results = list(_iter_validated_chunks(records, 1, chunk_size))
+    if stream is not None and stream.code != ResultCode.SUCCESS:
+        return stream.code, []
+    return ResultCode.SUCCESS, chunk_results
+
+
+def validate_chunk(start_row: int, chunk: list[dict]):
+    """
+    驗證一個區塊（可於子行程執行，只回傳精簡結果以降低傳輸成本）
+    :return: (entries, errors)
+             entries: [(row, name, password, email, modetype:int), ...]
+             errors:  [(row, ResultCode), ...]
+    """
+    entries = []
+    errors = []
+    for offset, rec in enumerate(chunk):
+        code, entry = validate_record(rec)
+        if code != ResultCode.SUCCESS:
+            errors.append((start_row + offset, code))
+        else:
+            entries.append((start_row + offset, *entry))
+    return entries, errors
+
+
+def validate_record(rec: dict):
+    """
+    驗證單筆欄位值內容（不改 key 名）
+    :return: (ResultCode, (name, password, email, modetype:int) | None)
+    """
+    name = str(rec.get("name", "")).strip()
+    password = str(rec.get("password", "")).strip()
+    email = str(rec.get("email", "")).strip()
+    modetype = str(rec.get("modetype", "")).strip()
+
+    # 名稱檢查
+    if not name:
+        return ResultCode.task_name_empty_value, None
+    if not _NAME_RE.match(name):
+        return ResultCode.task_name_invalid_key_format, None
+    if not (2 <= len(name) <= 20):
+        return ResultCode.task_name_invalid_key_length, None
+
+    # 密碼檢查
+    if not password:
+        return ResultCode.task_password_missing, None
+    if not (6 <= len(password) <= 20):
+        return ResultCode.task_password_invalid_length, None
+    if not _PASSWORD_ALLOWED_RE.match(password):
+        return ResultCode.task_password_invalid_charset, None
+
+    # 信箱檢查
+    if not email:
+        return ResultCode.task_email_missing, None
+    if not _EMAIL_RE.match(email):
+        return ResultCode.task_email_invalid_format, None
+
+    # 運營模式檢查
+    if not modetype:
+        return ResultCode.task_mode_type_missing, None
+    if not modetype.isdigit():
+        return ResultCode.task_mode_type_invalid_format, None
+    if modetype not in ("1", "2"):  # ✅ 改成檢查 1、2
+        return ResultCode.task_mode_type_invalid_value, None
+
+    return ResultCode.SUCCESS, (name, password, email, int(modetype))
+
+
+# ===========================================================
+# 🔹 組 INDEX 階段（合併所有分片 + 重複名稱檢查）
+# ===========================================================
+class _IndexBuilder:
+    """依序接收各檔案的驗證結果，組出 INDEX 並收集錯誤"""
+
+    def __init__(self):
+        self.index = CompactIndex()
+        self.errors = []
+        self.error_total = 0
+        self._origin = {}  # name → (檔名, 筆數)，供重複名稱定位
+
+    def add(self, file_path: str, entries, errors):
+        """entries / errors 各自依筆數排序；合併後逐筆處理，錯誤順序（與回傳的錯誤碼）即檔案中的順序"""
+        file_name = os.path.basename(file_path)
+        rows = heapq.merge(
+            ((row, code, None) for row, code in errors),
+            ((entry[0], None, entry) for entry in entries),
+            key=lambda item: item[0],
+        )
+
+        for row, code, entry in rows:
+            if entry is None:
+                self._add_error(file_name, row, code)
+                continue
+
+            _, name, password, email, modetype = entry
+            first = self._origin.setdefault(name, (file_name, row))
+            if first != (file_name, row):
+                self._add_error(
+                    file_name, row, ResultCode.task_name_duplicate,
+                    f"（與 {first[0]} 第 {first[1]} 筆重複：{name}）",
+                )
+                continue
+
+            # 已有錯誤就不再組 INDEX（結果不會被使用），只繼續收集錯誤
+            if self.error_total:
+                continue
+
+            # ---------------------------------------------------
+            # 組成 INDEX 結構（商戶與代理共用密碼/信箱）
+            #   index[name] → {"agent": {account, password, email},
+            #                  "merchant": {account, password, email, modetype}}
+            # ---------------------------------------------------
+            self.index.add(name, password, email, modetype)
+
+        if self.error_total:
+            self.index.clear()
+
+    def _add_error(self, file_name: str, row: int, code: int, detail: str = ""):
+        self.error_total += 1
+        if len(self.errors) >= MAX_ERROR_RECORDS:
+            return
+        self.errors.append({
+            "type": "error",
+            "file": file_name,
+            "row": row,
+            "result_code": code,
+            "message": f"{file_name} 第 {row} 筆：{ERROR_MESSAGES.get(code, code)}{detail}",
+        })
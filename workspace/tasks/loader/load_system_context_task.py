@@ -4,10 +4,14 @@ System Context 任務模組
 職責：
     - 讀取系統設定 .env
     - 驗證必要欄位（DEBUG / OPS / BACKEND 等）
+    - 額外的運營帳號群組（OPS2_* / OPS3_* …）組成帳號池，登入後批次請求會分散到各帳號的 Session
     - 回傳 COMMON 結構
 """
 
+import re
+
 from workspace.tools.loader.loader import load_system_env
+from workspace.tools.printer.output_sink import emit
 from workspace.config import paths
 from workspace.config.error_code import ResultCode
 
@@ -23,6 +27,10 @@ REQUIRED_COMMON_KEYS = [
     "OPS_OTP_SECRET",
 ]
 
+# 帳號池：OPS<n>_USERNAME / OPS<n>_PASSWORD / OPS<n>_OTP_SECRET（n ≥ 2，三個欄位皆必填）
+_POOL_KEY = re.compile(r"^OPS(\d+)_(USERNAME|PASSWORD|OTP_SECRET)$")
+_POOL_FIELDS = ("USERNAME", "PASSWORD", "OTP_SECRET")
+
 
 def load_system_context():
     """載入系統設定 .env，回傳 COMMON 結構"""
@@ -42,7 +50,13 @@ def load_system_context():
     # 檢查必要欄位
     missing = [k for k in REQUIRED_COMMON_KEYS if not env_dict.get(k)]
     if missing:
-        print(f"[DEBUG] 系統設定缺少欄位: {missing}")
+        emit(f"[DEBUG] 系統設定缺少欄位: {missing}", "debug", "Loader")
+        return {}, ResultCode.task_env_missing_key
+
+    # 帳號池（額外的 OPS 群組）
+    pool, missing = _collect_pool(env_dict)
+    if missing:
+        emit(f"[DEBUG] 運營帳號池缺少欄位: {missing}", "debug", "Loader")
         return {}, ResultCode.task_env_missing_key
 
     # 組成 COMMON 結構
@@ -55,7 +69,29 @@ def load_system_context():
             "USERNAME": env_dict["OPS_USERNAME"],
             "PASSWORD": env_dict["OPS_PASSWORD"],
             "OTP_SECRET": env_dict["OPS_OTP_SECRET"],
+            "POOL": ["OPS", *pool],
         },
+        **pool,
     }
 
     return common_context, ResultCode.SUCCESS
+
+
+def _collect_pool(env_dict: dict):
+    """
+    收集額外的運營帳號群組
+    :return: ({"OPS2": {...}, ...}（依編號排序）, 缺少的欄位清單)
+    """
+    groups: dict[int, dict] = {}
+    for key, value in env_dict.items():
+        match = _POOL_KEY.match(key)
+        if match and int(match.group(1)) >= 2:
+            groups.setdefault(int(match.group(1)), {})[match.group(2)] = value
+
+    pool, missing = {}, []
+    for no in sorted(groups):
+        fields = groups[no]
+        missing.extend(f"OPS{no}_{field}" for field in _POOL_FIELDS if not fields.get(field))
+        # LOGIN_ROLE：登入時沿用 OPS 的登入路徑
+        pool[f"OPS{no}"] = {**{field: fields.get(field) for field in _POOL_FIELDS}, "LOGIN_ROLE": "OPS"}
+    return pool, missing
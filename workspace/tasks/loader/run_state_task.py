@@ -0,0 +1,169 @@
+# workspace/tasks/loader/run_state_task.py
+"""
+Run State 任務模組（增量模式）
+------------------------------------------------
+職責：
+    - 每次執行後保存 INDEX 的執行結果（帳號 / UUID）到 paths.RUN_STATE_FILE
+    - 增量模式下，將本次 INDEX 與上次結果比對，已完成的名稱直接帶入帳號 / UUID
+    - OPS 任務只處理尚未完成的欄位（account / uuid 為空者），因此只會對新增或變更的名稱打 API
+
+比對規則（依名稱）：
+    - 新增：上次沒有此名稱                  → 全部流程重跑
+    - 變更：密碼 / 信箱 / 運營模式任一不同   → 不沿用上次結果，全部流程重跑
+    - 未變動：帶入上次的帳號 / UUID          → 上次中斷的步驟會自動接續
+    - 已移除：上次有、本次沒有              → 僅計數，紀錄保留（避免重新加入時重複建立）
+
+注意：
+    - 狀態檔只保存欄位的 HMAC-SHA256（金鑰為每個安裝各自產生的 paths.STATE_SECRET_FILE），不保存密碼明文；
+      沒有金鑰時無法以字典攻擊反推密碼。狀態檔與金鑰檔權限皆為 0600
+    - 舊版（version 1）狀態檔的未加鹽 SHA-256 仍可比對，名稱下次保存時改寫為 HMAC；
+      本次未出現的名稱保留舊雜湊，直到重新加入
+"""
+
+import hashlib
+import hmac
+import json
+from collections.abc import Mapping
+from workspace.config import paths
+from workspace.tools.file.file_helper import read_json, write_json_atomic, load_or_create_secret
+from workspace.tools.common.compact_index import CompactIndex
+from workspace.config.error_code import ResultCode
+
+
+RUN_STATE_VERSION = 2
+_LEGACY_VERSION = 1  # 未加鹽 SHA-256（profile → legacy_profile）
+_ROLES = ("agent", "merchant")
+_RESULT_FIELDS = ("account", "uuid")
+
+
+def apply_previous_run(context: dict):
+    """
+    將上次執行結果套用到 context["INDEX"]
+    :return: (context, code, records)
+    """
+    records = []
+    index = context.get("INDEX")
+    if not isinstance(index, Mapping):
+        records.append({"type": "error", "message": "[Loader] 找不到 INDEX 結構"})
+        return context, ResultCode.task_invalid_context, records
+
+    secret, code = load_or_create_secret(paths.STATE_SECRET_FILE)
+    if code != ResultCode.SUCCESS:
+        records.append({"type": "error", "message": f"[Loader] 無法取得狀態檔金鑰，ResultCode={code}"})
+        return context, code, records
+
+    previous, code = _load_state()
+    if code == ResultCode.tools_file_not_found:
+        records.append({"type": "info", "message": f"無上次執行紀錄，{len(index)} 筆名稱全部視為新增"})
+        return context, ResultCode.SUCCESS, records
+    if code != ResultCode.SUCCESS:
+        return context, code, records
+
+    added = changed = unchanged = done = 0
+    for name, data in index.items():
+        prev = previous.get(name)
+        if prev is None:
+            added += 1
+            continue
+        if not _same_profile(prev, data, secret):
+            changed += 1
+            continue
+
+        unchanged += 1
+        for role in _ROLES:
+            for field in _RESULT_FIELDS:
+                value = prev.get(role, {}).get(field)
+                if value:
+                    data[role][field] = value
+        if not needs_work(data):
+            done += 1
+
+    removed = sum(1 for name in previous if name not in index)
+    records.append({
+        "type": "info",
+        "message": (
+            f"增量比對：新增 {added} / 變更 {changed} / 未變動 {unchanged}"
+            f"（已完成 {done}）/ 已移除 {removed} → 待處理 {len(index) - done} 筆"
+        ),
+    })
+    return context, ResultCode.SUCCESS, records
+
+
+def save_run_state(context: dict) -> int:
+    """
+    保存本次 INDEX 執行結果（與上次紀錄合併，本次未出現的名稱保留原紀錄）
+    :return: ResultCode
+    """
+    index = context.get("INDEX")
+    if not isinstance(index, Mapping):
+        return ResultCode.task_invalid_context
+
+    secret, code = load_or_create_secret(paths.STATE_SECRET_FILE)
+    if code != ResultCode.SUCCESS:
+        return code
+
+    previous, code = _load_state()
+    if code not in (ResultCode.SUCCESS, ResultCode.tools_file_not_found):
+        previous = {}
+
+    for name, data in index.items():
+        previous[name] = {
+            "profile": profile_hash(data, secret),
+            **{
+                role: {field: data.get(role, {}).get(field) for field in _RESULT_FIELDS}
+                for role in _ROLES
+            },
+        }
+
+    return write_json_atomic(paths.RUN_STATE_FILE, {"version": RUN_STATE_VERSION, "index": previous}, mode=0o600)
+
+
+def needs_work(data: dict) -> bool:
+    """名稱是否仍有未完成的步驟（任一 account / uuid 為空）"""
+    return not all(data.get(role, {}).get(field) for role in _ROLES for field in _RESULT_FIELDS)
+
+
+def count_pending(index: dict) -> int:
+    """INDEX 中仍需處理的名稱數"""
+    if isinstance(index, CompactIndex):
+        return len(index.names_incomplete())  # 直接掃欄位陣列，不建立 view
+    return sum(1 for data in index.values() if needs_work(data))
+
+
+def profile_hash(data: dict, secret: bytes) -> str:
+    """名稱設定欄位（密碼 / 信箱 / 運營模式）的 HMAC-SHA256，用於判斷是否變更"""
+    return hmac.new(secret, _profile_fields(data), hashlib.sha256).hexdigest()
+
+
+def _profile_fields(data: dict) -> bytes:
+    agent = data.get("agent", {})
+    merchant = data.get("merchant", {})
+    fields = [agent.get("password"), agent.get("email"), merchant.get("modetype")]
+    return json.dumps(fields, ensure_ascii=False).encode("utf-8")
+
+
+def _same_profile(prev: dict, data: dict, secret: bytes) -> bool:
+    if "profile" in prev:
+        return hmac.compare_digest(prev["profile"] or "", profile_hash(data, secret))
+    legacy = prev.get("legacy_profile")  # 舊版狀態檔：未加鹽 SHA-256
+    return bool(legacy) and hmac.compare_digest(legacy, hashlib.sha256(_profile_fields(data)).hexdigest())
+
+
+def _load_state():
+    """:return: ({name: {...}}, code)"""
+    state, code = read_json(paths.RUN_STATE_FILE)
+    if code != ResultCode.SUCCESS:
+        return {}, code
+    if not isinstance(state, dict):
+        return {}, ResultCode.tools_file_not_found
+    index = state.get("index") or {}
+    if state.get("version") == _LEGACY_VERSION:
+        # 舊雜湊改存在 legacy_profile，保存時不會被誤認為 HMAC
+        return {
+            name: {**{k: v for k, v in entry.items() if k != "profile"}, "legacy_profile": entry.get("profile")}
+            for name, entry in index.items() if isinstance(entry, dict)
+        }, ResultCode.SUCCESS
+    if state.get("version") != RUN_STATE_VERSION:
+        # 版本不符視為無紀錄
+        return {}, ResultCode.tools_file_not_found
+    return index, ResultCode.SUCCESS
@@ -7,10 +7,21 @@ Create Agent 任務模組（批次版）
     - 將每筆成功結果回寫至 Context INDEX[name]["agent"]["account"]
 """
 
+from collections.abc import Mapping
 from workspace.tasks.common.common_async_task import send_batch_api_requests
+from workspace.tasks.common.payload_template import PayloadTemplate, NAME
 from workspace.config.error_code import ResultCode
 
 
+# 預編譯 payload 定義（模組載入時編譯一次）
+CREATE_AGENT_PAYLOAD = PayloadTemplate({
+    "Name": NAME,  # 名稱本身是 key
+    "Password": ("INDEX", NAME, "agent", "password"),
+    "Mail": ("INDEX", NAME, "agent", "email"),
+    "OtpCode": ("COMMON", "OPS", "LOGIN_OTP"),  # 預設值；發送前由 otp_field 覆寫為最新 OTP
+})
+
+
 async def create_agent_task(context, debug: bool = False):
     """
     批次建立代理商帳號任務
@@ -24,22 +35,14 @@ async def create_agent_task(context, debug: bool = False):
     # Step 1. 基本檢查
     # ============================================================
     index = context.get("INDEX")
-    if not index or not isinstance(index, dict):
+    if not index or not isinstance(index, Mapping):
         records_all.append({"type": "error", "message": "[OPS] 找不到 INDEX 結構"})
         return context, ResultCode.task_invalid_context, records_all
 
     # ============================================================
-    # Step 2. 組出所有 payload_source
+    # Step 2. 篩選待建立名稱（已有帳號 → 增量模式沿用上次結果，不重複建立）
     # ============================================================
-    payload_sources = []
-    for name in index.keys():
-        payload_source = {
-            "Name": name,  # 名稱本身是 key
-            "Password": ("INDEX", name, "agent", "password"),
-            "Mail": ("INDEX", name, "agent", "email"),
-            "OtpCode": ("COMMON", "OPS", "LOGIN_OTP"),
-        }
-        payload_sources.append((name, payload_source))
+    names = [name for name in index.keys() if not index[name]["agent"].get("account")]
 
     # ============================================================
     # Step 3. 呼叫共用層批次執行
@@ -49,10 +52,12 @@ async def create_agent_task(context, debug: bool = False):
         role="OPS",
         api_group="ENDPOINTS",
         path_key="CREATE_AGENT_ACCOUNT",
-        payload_sources=payload_sources,
+        template=CREATE_AGENT_PAYLOAD,
+        names=names,
         method="POST",
         use_header=True,
         header_type="Sid",  # 明確指定 Sid header
+        otp_field="OtpCode",  # 每筆發送前取用仍有效的 OTP
     )
 
     # ============================================================
@@ -64,7 +69,9 @@ async def create_agent_task(context, debug: bool = False):
         if code != ResultCode.SUCCESS:
             records_all.append({
                 "type": "error",
-                "message": f"[{name}] HTTP 層執行失敗，ResultCode={code}"
+                "name": name,
+                "message": f"[{name}] HTTP 層執行失敗，ResultCode={code}",
+                "result_code": code,
             })
             continue
 
@@ -78,6 +85,7 @@ async def create_agent_task(context, debug: bool = False):
         if api_code != 0:
             records_all.append({
                 "type": "error",
+                "name": name,
                 "message": f"[{name}] API 回傳錯誤 Code={api_code}, Msg={api_msg}"
             })
             continue
@@ -87,6 +95,7 @@ async def create_agent_task(context, debug: bool = False):
         if not account:
             records_all.append({
                 "type": "error",
+                "name": name,
                 "message": f"[{name}] 回傳結果缺少 Account 欄位"
             })
             continue
@@ -96,6 +105,7 @@ async def create_agent_task(context, debug: bool = False):
 
         records_all.append({
             "type": "info",
+            "name": name,
             "message": f"[{name}] 建立代理帳號成功 → Account: {account}"
         })
 
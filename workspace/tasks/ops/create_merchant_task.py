@@ -8,10 +8,27 @@ Create Merchant Account 任務模組
     - 成功時回寫 Context["INDEX"][name]["merchant"]["account"]
 """
 
+from collections.abc import Mapping
 from workspace.tasks.common.common_async_task import send_batch_api_requests
+from workspace.tasks.common.payload_template import PayloadTemplate, NAME
 from workspace.config.error_code import ResultCode
 
 
+# 預編譯 payload 定義（模組載入時編譯一次）
+#    ⚠ Loader 已確保商戶欄位完整，可安全過濾空值（None 或空字串不送出）
+CREATE_MERCHANT_PAYLOAD = PayloadTemplate({
+    "AgUuid": ("INDEX", NAME, "agent", "uuid"),
+    "Name": NAME,
+    "Mail": ("INDEX", NAME, "merchant", "email"),
+    "Password": ("INDEX", NAME, "merchant", "password"),
+    "Mode": ("INDEX", NAME, "merchant", "modetype"),
+    "OtpCode": ("COMMON", "OPS", "LOGIN_OTP"),  # 預設值；發送前由 otp_field 覆寫為最新 OTP
+    "Remark": "",
+    "LineName": "",
+    "LineDomain": "",
+}, drop_empty=True)
+
+
 async def create_merchant_task(context, debug: bool = False):
     """
     新增商戶帳號任務
@@ -27,35 +44,14 @@ async def create_merchant_task(context, debug: bool = False):
     # Step 1. 基本檢查
     # ============================================================
     index = context.get("INDEX")
-    if not index or not isinstance(index, dict):
+    if not index or not isinstance(index, Mapping):
         records_all.append({"type": "error", "message": "[OPS] 找不到 INDEX 結構"})
         return context, ResultCode.task_invalid_context, records_all
 
     # ============================================================
-    # Step 2. 組出 payload_sources
-    #    ⚠ Loader 已確保商戶欄位完整，可安全過濾空值
+    # Step 2. 篩選待建立名稱（已有帳號 → 增量模式沿用上次結果，不重複建立）
     # ============================================================
-    payload_sources = []
-    for name, data in index.items():
-        agent_info = data.get("agent", {})
-        merchant_info = data.get("merchant", {})
-
-        payload = {
-            "AgUuid": agent_info.get("uuid"),
-            "Name": name,
-            "Mail": merchant_info.get("email"),
-            "Password": merchant_info.get("password"),
-            "Mode": merchant_info.get("modetype"),
-            "OtpCode": ("COMMON", "OPS", "LOGIN_OTP"),
-            "Remark": "",
-            "LineName": "",
-            "LineDomain": "",
-        }
-
-        # ✅ 過濾掉空值（None 或空字串）
-        clean_payload = {k: v for k, v in payload.items() if v not in [None, ""]}
-
-        payload_sources.append((name, clean_payload))
+    names = [name for name, data in index.items() if not data.get("merchant", {}).get("account")]
 
     # ============================================================
     # Step 3. 呼叫共用層批次執行 (POST)
@@ -65,10 +61,12 @@ async def create_merchant_task(context, debug: bool = False):
         role="OPS",
         api_group="ENDPOINTS",
         path_key="CREATE_MERCHANT_ACCOUNT",
-        payload_sources=payload_sources,
+        template=CREATE_MERCHANT_PAYLOAD,
+        names=names,
         method="POST",
         use_header=True,
         header_type="Sid",
+        otp_field="OtpCode",  # 每筆發送前取用仍有效的 OTP
     )
 
     # ============================================================
@@ -80,7 +78,9 @@ async def create_merchant_task(context, debug: bool = False):
         if code != ResultCode.SUCCESS:
             records_all.append({
                 "type": "error",
-                "message": f"[{name}] HTTP 層執行失敗，ResultCode={code}"
+                "name": name,
+                "message": f"[{name}] HTTP 層執行失敗，ResultCode={code}",
+                "result_code": code,
             })
             continue
 
@@ -88,6 +88,7 @@ async def create_merchant_task(context, debug: bool = False):
         if not isinstance(parsed, dict):
             records_all.append({
                 "type": "error",
+                "name": name,
                 "message": f"[{name}] 回傳格式錯誤，非 JSON",
                 "result_code": ResultCode.task_create_merchant_invalid_response
             })
@@ -101,6 +102,7 @@ async def create_merchant_task(context, debug: bool = False):
         if api_code != 0:
             records_all.append({
                 "type": "error",
+                "name": name,
                 "message": f"[{name}] 新增商戶帳號失敗 Code={api_code}, Msg={api_msg}",
                 "result_code": ResultCode.task_create_merchant_failed
             })
@@ -109,6 +111,7 @@ async def create_merchant_task(context, debug: bool = False):
         if api_msg != "Success":
             records_all.append({
                 "type": "error",
+                "name": name,
                 "message": f"[{name}] 回傳 Message 非 'Success'：{api_msg}",
                 "result_code": ResultCode.task_create_merchant_failed
             })
@@ -119,6 +122,7 @@ async def create_merchant_task(context, debug: bool = False):
         if not account_value:
             records_all.append({
                 "type": "error",
+                "name": name,
                 "message": f"[{name}] 回傳結果缺少 Account 欄位",
                 "result_code": ResultCode.task_create_merchant_missing_field
             })
@@ -131,6 +135,7 @@ async def create_merchant_task(context, debug: bool = False):
 
         records_all.append({
             "type": "info",
+            "name": name,
             "message": f"[{name}] 新增商戶帳號成功 → Account: {account_value}"
         })
 
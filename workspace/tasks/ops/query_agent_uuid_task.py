@@ -8,10 +8,20 @@ Query Agent UUID 任務模組
     - ⚠️ 注意：後端實際回傳 Message="Success"（前端顯示為「成功」）
 """
 
+from collections.abc import Mapping
 from workspace.tasks.common.common_async_task import send_batch_api_requests
+from workspace.tasks.common.payload_template import PayloadTemplate, NAME
 from workspace.config.error_code import ResultCode
 
 
+# 預編譯 payload 定義（模組載入時編譯一次）
+QUERY_AGENT_PAYLOAD = PayloadTemplate({
+    "Account": ("INDEX", NAME, "agent", "account"),
+    "Page": 1,
+    "Limit": 20,
+})
+
+
 async def query_agent_uuid_task(context, debug: bool = False):
     """
     查詢代理帳號 UUID 任務
@@ -27,22 +37,14 @@ async def query_agent_uuid_task(context, debug: bool = False):
     # Step 1. 基本檢查
     # ============================================================
     index = context.get("INDEX")
-    if not index or not isinstance(index, dict):
+    if not index or not isinstance(index, Mapping):
         records_all.append({"type": "error", "message": "[OPS] 找不到 INDEX 結構"})
         return context, ResultCode.task_invalid_context, records_all
 
     # ============================================================
-    # Step 2. 組出 payload_sources
+    # Step 2. 篩選待查詢名稱（已有 UUID → 增量模式沿用上次結果，不重複查詢）
     # ============================================================
-    payload_sources = []
-    for name in index.keys():
-        agent_info = index[name].get("agent", {})
-        payload_source = {
-            "Account": agent_info.get("account"),
-            "Page": 1,
-            "Limit": 20,
-        }
-        payload_sources.append((name, payload_source))
+    names = [name for name in index.keys() if not index[name].get("agent", {}).get("uuid")]
 
     # ============================================================
     # Step 3. 呼叫共用層批次執行 (GET)
@@ -52,7 +54,8 @@ async def query_agent_uuid_task(context, debug: bool = False):
         role="OPS",
         api_group="ENDPOINTS",
         path_key="QUERY_AGENT_ACCOUNT",
-        payload_sources=payload_sources,
+        template=QUERY_AGENT_PAYLOAD,
+        names=names,
         method="GET",
         use_header=True,
         header_type="Sid",
@@ -68,7 +71,9 @@ async def query_agent_uuid_task(context, debug: bool = False):
         if code != ResultCode.SUCCESS:
             records_all.append({
                 "type": "error",
-                "message": f"[{name}] HTTP 執行失敗，ResultCode={code}"
+                "name": name,
+                "message": f"[{name}] HTTP 執行失敗，ResultCode={code}",
+                "result_code": code,
             })
             continue
 
@@ -84,6 +89,7 @@ async def query_agent_uuid_task(context, debug: bool = False):
         if api_code != 0:
             records_all.append({
                 "type": "error",
+                "name": name,
                 "message": f"[{name}] 查詢代理帳號失敗 Code={api_code}",
                 "result_code": ResultCode.task_query_agent_code_invalid
             })
@@ -93,6 +99,7 @@ async def query_agent_uuid_task(context, debug: bool = False):
         if api_msg != "Success":
             records_all.append({
                 "type": "error",
+                "name": name,
                 "message": f"[{name}] 查詢代理帳號回傳 Message 非 'Success'：{api_msg}",
                 "result_code": ResultCode.task_query_agent_message_invalid
             })
@@ -102,6 +109,7 @@ async def query_agent_uuid_task(context, debug: bool = False):
         if not items:
             records_all.append({
                 "type": "error",
+                "name": name,
                 "message": f"[{name}] 查無 Items 結果",
                 "result_code": ResultCode.task_query_agent_uuid_missing
             })
@@ -123,6 +131,7 @@ async def query_agent_uuid_task(context, debug: bool = False):
         if account_value != expected_account:
             records_all.append({
                 "type": "error",
+                "name": name,
                 "message": f"[{name}] 回傳 Account 不符：{account_value} ≠ {expected_account}",
                 "result_code": ResultCode.task_query_agent_account_mismatch
             })
@@ -131,6 +140,7 @@ async def query_agent_uuid_task(context, debug: bool = False):
         if name_value != expected_name:
             records_all.append({
                 "type": "error",
+                "name": name,
                 "message": f"[{name}] 回傳 Name 不符：{name_value} ≠ {expected_name}",
                 "result_code": ResultCode.task_query_agent_name_mismatch
             })
@@ -139,6 +149,7 @@ async def query_agent_uuid_task(context, debug: bool = False):
         if mail_value != expected_mail:
             records_all.append({
                 "type": "error",
+                "name": name,
                 "message": f"[{name}] 回傳 Mail 不符：{mail_value} ≠ {expected_mail}",
                 "result_code": ResultCode.task_query_agent_mail_mismatch
             })
@@ -147,6 +158,7 @@ async def query_agent_uuid_task(context, debug: bool = False):
         if not uuid_value or not isinstance(uuid_value, str):
             records_all.append({
                 "type": "error",
+                "name": name,
                 "message": f"[{name}] Uuid 缺失或為空值",
                 "result_code": ResultCode.task_query_agent_uuid_missing
             })
@@ -158,6 +170,7 @@ async def query_agent_uuid_task(context, debug: bool = False):
         context["INDEX"][name]["agent"]["uuid"] = uuid_value
         records_all.append({
             "type": "info",
+            "name": name,
             "message": f"[{name}] 查詢代理帳號成功 → UUID: {uuid_value}"
         })
 
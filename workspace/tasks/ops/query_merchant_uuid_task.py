@@ -7,10 +7,20 @@ Query Merchant UUID 任務模組
     - 將取得的 MerUuid 寫入 Context["INDEX"][name]["merchant"]["uuid"]
 """
 
+from collections.abc import Mapping
 from workspace.tasks.common.common_async_task import send_batch_api_requests
+from workspace.tasks.common.payload_template import PayloadTemplate, NAME
 from workspace.config.error_code import ResultCode
 
 
+# 預編譯 payload 定義（模組載入時編譯一次）
+QUERY_MERCHANT_PAYLOAD = PayloadTemplate({
+    "MerAccount": ("INDEX", NAME, "merchant", "account"),
+    "Page": 1,
+    "Limit": 20,
+})
+
+
 async def query_merchant_uuid_task(context, debug: bool = False):
     """
     查詢商戶帳號 UUID 任務
@@ -26,22 +36,14 @@ async def query_merchant_uuid_task(context, debug: bool = False):
     # Step 1. 基本檢查
     # ============================================================
     index = context.get("INDEX")
-    if not index or not isinstance(index, dict):
+    if not index or not isinstance(index, Mapping):
         records_all.append({"type": "error", "message": "[OPS] 找不到 INDEX 結構"})
         return context, ResultCode.task_invalid_context, records_all
 
     # ============================================================
-    # Step 2. 組出 payload_sources
+    # Step 2. 篩選待查詢名稱（已有 MerUuid → 增量模式沿用上次結果，不重複查詢）
     # ============================================================
-    payload_sources = []
-    for name in index.keys():
-        merchant_info = index[name].get("merchant", {})
-        payload_source = {
-            "MerAccount": merchant_info.get("account"),
-            "Page": 1,
-            "Limit": 20,
-        }
-        payload_sources.append((name, payload_source))
+    names = [name for name in index.keys() if not index[name].get("merchant", {}).get("uuid")]
 
     # ============================================================
     # Step 3. 呼叫共用層批次執行 (GET)
@@ -51,7 +53,8 @@ async def query_merchant_uuid_task(context, debug: bool = False):
         role="OPS",
         api_group="ENDPOINTS",
         path_key="QUERY_MERCHANT_ACCOUNT",
-        payload_sources=payload_sources,
+        template=QUERY_MERCHANT_PAYLOAD,
+        names=names,
         method="GET",
         use_header=True,
         header_type="Sid",
@@ -67,7 +70,9 @@ async def query_merchant_uuid_task(context, debug: bool = False):
         if code != ResultCode.SUCCESS:
             records_all.append({
                 "type": "error",
-                "message": f"[{name}] HTTP 執行失敗，ResultCode={code}"
+                "name": name,
+                "message": f"[{name}] HTTP 執行失敗，ResultCode={code}",
+                "result_code": code,
             })
             continue
 
@@ -84,6 +89,7 @@ async def query_merchant_uuid_task(context, debug: bool = False):
         if api_code != 0:
             records_all.append({
                 "type": "error",
+                "name": name,
                 "message": f"[{name}] 查詢商戶帳號失敗 Code={api_code}",
                 "result_code": ResultCode.task_query_merchant_code_invalid
             })
@@ -92,6 +98,7 @@ async def query_merchant_uuid_task(context, debug: bool = False):
         if api_msg != "Success":
             records_all.append({
                 "type": "error",
+                "name": name,
                 "message": f"[{name}] 查詢商戶帳號回傳 Message 非 'Success'：{api_msg}",
                 "result_code": ResultCode.task_query_merchant_message_invalid
             })
@@ -100,6 +107,7 @@ async def query_merchant_uuid_task(context, debug: bool = False):
         if not items:
             records_all.append({
                 "type": "error",
+                "name": name,
                 "message": f"[{name}] 查無 Items 結果",
                 "result_code": ResultCode.task_query_merchant_account_empty
             })
@@ -115,6 +123,7 @@ async def query_merchant_uuid_task(context, debug: bool = False):
         if not target:
             records_all.append({
                 "type": "error",
+                "name": name,
                 "message": f"[{name}] 找不到對應的商戶帳號：{expected_account}",
                 "result_code": ResultCode.task_query_merchant_account_mismatch
             })
@@ -132,6 +141,7 @@ async def query_merchant_uuid_task(context, debug: bool = False):
         if not uuid_value or not isinstance(uuid_value, str):
             records_all.append({
                 "type": "error",
+                "name": name,
                 "message": f"[{name}] MerUuid 缺失或為空值",
                 "result_code": ResultCode.task_query_merchant_uuid_missing
             })
@@ -140,6 +150,7 @@ async def query_merchant_uuid_task(context, debug: bool = False):
         if account_value != expected_account:
             records_all.append({
                 "type": "error",
+                "name": name,
                 "message": f"[{name}] 回傳 MerAccount 不符：{account_value} ≠ {expected_account}",
                 "result_code": ResultCode.task_query_merchant_account_mismatch
             })
@@ -148,6 +159,7 @@ async def query_merchant_uuid_task(context, debug: bool = False):
         if mail_value != expected_mail:
             records_all.append({
                 "type": "error",
+                "name": name,
                 "message": f"[{name}] 回傳 Mail 不符：{mail_value} ≠ {expected_mail}",
                 "result_code": ResultCode.task_query_merchant_mail_mismatch
             })
@@ -156,6 +168,7 @@ async def query_merchant_uuid_task(context, debug: bool = False):
         if mode_value != expected_mode:
             records_all.append({
                 "type": "error",
+                "name": name,
                 "message": f"[{name}] 回傳 Mode 不符：{mode_value} ≠ {expected_mode}",
                 "result_code": ResultCode.task_query_merchant_mode_mismatch
             })
@@ -164,6 +177,7 @@ async def query_merchant_uuid_task(context, debug: bool = False):
         if status_value != 1:
             records_all.append({
                 "type": "error",
+                "name": name,
                 "message": f"[{name}] 商戶帳號狀態異常（Status ≠ 1）",
                 "result_code": ResultCode.task_query_merchant_status_invalid
             })
@@ -175,6 +189,7 @@ async def query_merchant_uuid_task(context, debug: bool = False):
         context["INDEX"][name]["merchant"]["uuid"] = uuid_value
         records_all.append({
             "type": "info",
+            "name": name,
             "message": f"[{name}] 查詢商戶帳號成功 → MerUuid: {uuid_value}"
         })
 
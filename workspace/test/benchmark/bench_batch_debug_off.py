@@ -0,0 +1,81 @@
+# workspace/test/benchmark/bench_batch_debug_off.py
+"""
+批次請求路徑（debug 關閉）的額外開銷：未開啟 run_log，以及預設設定（run_log 開啟，寫入暫存檔）
+以假的 Requester 立即回應，只量測任務層 / 共用層本身的成本（組 payload、建 records、判斷 debug、寫 run_log）。
+執行：
+    python -m workspace.test.benchmark.bench_batch_debug_off [筆數]
+"""
+
+import asyncio
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from workspace.tasks.common import common_async_task
+from workspace.tasks.ops.create_agent_task import create_agent_task
+from workspace.tools.common.compact_index import CompactIndex
+from workspace.tools.file.run_log import configure_run_log, log_records
+from workspace.tools.helpers.debug_helper import is_debug
+from workspace.config.error_code import ResultCode
+
+
+class _FakeResp:
+    status_code = 200
+    text = '{"Code": 0, "Message": "Success", "Result": {"Account": "acc"}}'
+
+    def json(self):
+        return {"Code": 0, "Message": "Success", "Result": {"Account": "acc"}}
+
+
+def _context(rows: int) -> dict:
+    index = CompactIndex()
+    for i in range(rows):
+        index.add(f"name{i}", "Pass@123", f"n{i}@example.com", 1)
+    return {
+        "COMMON": {"DEBUG": False, "BACKEND_RA_BASE_URL": "https://ra", "OPS": {"SSID": "sid", "LOGIN_OTP": "123456"}},
+        "INDEX": index,
+        "API": {"ENDPOINTS": {"CREATE_AGENT_ACCOUNT": "/operator/agent"}},
+    }
+
+
+def _run(rows: int):
+    context = _context(rows)
+    start = time.perf_counter()
+    _, code, records = asyncio.run(create_agent_task(context, debug=is_debug(context)))
+    log_records(records, "Task", "create_agent", "建立代理", code)
+    elapsed = time.perf_counter() - start
+    assert code == ResultCode.SUCCESS
+    return elapsed, records
+
+
+def main(rows: int = 20_000):
+    common_async_task.Requester.post = staticmethod(lambda *a, **k: (_FakeResp(), ResultCode.SUCCESS))
+
+    print(f"\n📊 rows = {rows:,}")
+    context = _context(rows)
+    start = time.perf_counter()
+    for _ in range(rows):
+        is_debug(context)
+    print(f"  {'is_debug() × rows':<28}{(time.perf_counter() - start) * 1000:>10.1f} ms")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for label, path in (("run_log 關閉", None), ("預設（run_log 開啟）", os.path.join(tmp, "run_log.jsonl"))):
+            configure_run_log(path)
+            elapsed, records = _run(rows)
+            size = os.path.getsize(path) if path else 0
+            print(f"  {'create_agent_task ' + label:<28}{elapsed * 1000:>10.1f} ms   records {len(records):,}   log {size / 1e6:.1f} MB")
+
+            # 記憶體另外量測（tracemalloc 會拖慢執行）
+            tracemalloc.start()
+            _run(rows)
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            print(f"  {'  peak memory':<28}{peak / 1e6:>10.1f} MB")
+        configure_run_log(None)
+    print()
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20_000)
@@ -0,0 +1,58 @@
+# workspace/test/benchmark/bench_bulk_money.py
+"""
+批次換算 / 手續費效能比較（逐筆迴圈 vs 向量化）
+執行：
+    python -m workspace.test.benchmark.bench_bulk_money [筆數]
+"""
+
+import random
+import sys
+import time
+
+import numpy as np
+
+from workspace.tools.common.fee_calculator import (
+    calc_fee_and_realquant,
+    calc_fee_and_realquant_bulk,
+    calc_fee_and_realquant_units_bulk,
+)
+from workspace.tools.common.money import FEE_DECIMALS
+from workspace.tools.common.currency_converter import CurrencyConverter
+from workspace.tools.common.rate_provider import RateProvider, StaticRateSource
+
+
+def _timeit(label: str, func):
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    print(f"  {label:<32}{elapsed * 1000:>10.1f} ms")
+    return elapsed
+
+
+def main(rows: int = 300_000):
+    random.seed(0)
+    quants = [random.randint(1, 1_000_000) for _ in range(rows)]
+    percents = [random.choice((1, 2, 3)) for _ in range(rows)]
+    quants_arr = np.asarray(quants, dtype=np.float64)
+    percents_arr = np.asarray(percents, dtype=np.float64)
+    quant_units = np.asarray(quants, dtype=np.int64) * 10 ** FEE_DECIMALS
+
+    converter = CurrencyConverter(RateProvider(StaticRateSource({"TRX": 0.29, "USDT": 1.0, "USDD": 1.0}), cache_file=""))
+
+    print(f"\n📊 rows = {rows:,}")
+    print("[手續費]")
+    loop = _timeit("scalar loop", lambda: [calc_fee_and_realquant(q, p, 0.5) for q, p in zip(quants, percents)])
+    vec = _timeit("bulk float64", lambda: calc_fee_and_realquant_bulk(quants_arr, percents_arr, 0.5))
+    _timeit("bulk exact (→ int units)", lambda: calc_fee_and_realquant_bulk(quants, percents, "0.5", exact=True))
+    _timeit("bulk exact (int units)", lambda: calc_fee_and_realquant_units_bulk(quant_units, percents_arr, 50_000_000))
+    print(f"  speedup (float64): {loop / vec:.1f}x")
+
+    print("[幣別換算]")
+    loop = _timeit("scalar loop", lambda: [converter.convert(q, "TRX", "USDT") for q in quants])
+    vec = _timeit("bulk float64", lambda: converter.convert_bulk(quants_arr, "TRX", "USDT"))
+    _timeit("bulk exact (Decimal loop)", lambda: converter.convert_bulk(quants, "TRX", "USDT", exact=True))
+    print(f"  speedup (float64): {loop / vec:.1f}x\n")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 300_000)
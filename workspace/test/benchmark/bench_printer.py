@@ -0,0 +1,54 @@
+# workspace/test/benchmark/bench_printer.py
+"""
+Printer 排版效能（只量測規則查詢 + 字串組合，不含 console I/O）
+輸出導向計數用的 sink，避免終端機速度影響結果。
+執行：
+    python -m workspace.test.benchmark.bench_printer [行數]
+"""
+
+import sys
+import time
+
+from workspace.config.print_registry import PRINT_REGISTRY
+from workspace.config.error_code import ResultCode
+from workspace.tools.loader.print_rule_loader import apply_global_print_rules
+from workspace.tools.printer.output_sink import OutputSink, set_sink, ConsoleSink
+from workspace.tools.printer.error_printer import print_result
+from workspace.tools.printer.debug_printer import debug_print
+from workspace.tools.printer.step_printer import print_step
+
+
+class _CountingSink(OutputSink):
+    def __init__(self):
+        self.lines = 0
+
+    def write(self, text, kind="text", prefix=""):
+        self.lines += 1
+
+
+def _timeit(label: str, rows: int, func):
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    print(f"  {label:<28}{elapsed * 1000:>10.1f} ms{rows / elapsed:>14,.0f} lines/s")
+    return elapsed
+
+
+def main(rows: int = 100_000):
+    apply_global_print_rules({**PRINT_REGISTRY, "output": None, "run_log": None})
+    sink = set_sink(_CountingSink())
+    branch = [True, True]
+    codes = [ResultCode.SUCCESS, ResultCode.task_api_failed, ResultCode.tools_file_not_found]
+
+    print(f"\n📊 rows = {rows:,}")
+    try:
+        _timeit("print_result", rows, lambda: [print_result(codes[i % 3], branch, "OPS") for i in range(rows)])
+        _timeit("debug_print", rows, lambda: [debug_print(True, "API 請求完成", "OPS", branch) for _ in range(rows)])
+        _timeit("print_step", rows, lambda: [print_step("Loader", i, "讀取系統設定", branch) for i in range(rows)])
+    finally:
+        set_sink(ConsoleSink())
+    print(f"  emitted: {sink.lines:,} lines\n")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
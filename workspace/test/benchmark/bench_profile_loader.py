@@ -0,0 +1,81 @@
+# workspace/test/benchmark/bench_profile_loader.py
+"""
+Profile CSV 載入效能比較（載入時間 + 峰值記憶體）
+每種模式於獨立子行程執行，峰值記憶體互不干擾。
+執行：
+    python -m workspace.test.benchmark.bench_profile_loader [筆數]
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+# 標籤 → 子行程模式（stream = 逐筆讀取但不保留）
+MODES = {
+    "pandas (legacy)": "pandas_list",
+    "csv -> list":     "csv_list",
+    "auto -> list":    "auto_list",
+    "csv stream":      "csv_stream",
+}
+
+
+def _peak_rss_mb() -> float:
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Linux 單位為 KB、macOS 為 bytes
+        return peak / 1024 / (1024 if sys.platform == "darwin" else 1)
+    except ImportError:
+        return float("nan")
+
+
+def _child(mode: str, path: str):
+    start = time.perf_counter()
+    if mode == "pandas_list":
+        import pandas as pd
+        rows = pd.read_csv(path, dtype=str).fillna("").to_dict(orient="records")
+        count = len(rows)
+    else:
+        from workspace.tools.loader.loader import iter_profile_csv
+        engine, how = mode.split("_")
+        stream, _ = iter_profile_csv(path, engine=engine)
+        if how == "list":
+            rows = list(stream)
+            count = len(rows)
+        else:
+            count = sum(1 for _ in stream)
+    elapsed = time.perf_counter() - start
+    print(f"{count}\t{elapsed:.3f}\t{_peak_rss_mb():.1f}")
+
+
+def _write_profile(path: str, rows: int):
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        f.write("name,password,email,modetype\n")
+        for i in range(rows):
+            f.write(f"代理{i % 9973}號,Pass@{i:06d},user{i}@example.com,{1 + i % 2}\n")
+
+
+def main(rows: int = 1_000_000):
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "names.csv")
+        _write_profile(path, rows)
+        size_mb = os.path.getsize(path) / 1024 / 1024
+
+        print(f"\n📊 rows = {rows:,}  file = {size_mb:.1f} MB")
+        print(f"  {'mode':<20}{'records':>10}{'time(s)':>10}{'peak RSS(MB)':>15}")
+        for label, mode in MODES.items():
+            out = subprocess.run(
+                [sys.executable, "-m", "workspace.test.benchmark.bench_profile_loader", "--child", mode, path],
+                capture_output=True, text=True, check=True,
+            ).stdout.strip().split("\t")
+            print(f"  {label:<20}{int(out[0]):>10,}{float(out[1]):>10.2f}{float(out[2]):>15.1f}")
+        print()
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "--child":
+        _child(sys.argv[2], sys.argv[3])
+    else:
+        main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
@@ -0,0 +1,56 @@
+# workspace/test/benchmark/bench_startup.py
+"""
+CLI 啟動時間（python -X importtime）
+每個情境於獨立子行程執行多次，取中位數。
+執行：
+    python -m workspace.test.benchmark.bench_startup [次數]
+"""
+
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", ".."))
+
+# 標籤 → 子行程參數
+SCENARIOS = {
+    "main.py list":           ["main.py", "list"],
+    "import main_controller": ["-c", "import workspace.controllers.main_controller"],
+}
+
+
+def _run(args):
+    """:return: (wall 秒數, import 總計微秒, 最慢的 5 個頂層模組)"""
+    start = time.perf_counter()
+    proc = subprocess.run([sys.executable, "-X", "importtime", *args], cwd=ROOT, capture_output=True, text=True)
+    wall = time.perf_counter() - start
+
+    total, top = 0, []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|", 2)
+        # 只計頂層（縮排僅一格）的模組，避免重複計算
+        if not cumulative.strip().isdigit() or name.startswith("  "):
+            continue
+        total += int(cumulative)
+        top.append((int(cumulative), name.strip()))
+    return wall, total, sorted(top, reverse=True)[:5]
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    print(f"{'情境':<24}{'wall (ms)':>12}{'imports (ms)':>14}")
+    for label, args in SCENARIOS.items():
+        results = [_run(args) for _ in range(runs)]
+        wall = statistics.median(r[0] for r in results) * 1000
+        imports = statistics.median(r[1] for r in results) / 1000
+        print(f"{label:<24}{wall:>12.1f}{imports:>14.1f}")
+        for us, name in results[-1][2]:
+            print(f"    {name:<40}{us / 1000:>8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+# workspace/test/unit/config/test_task_registry.py
+"""
+Task Registry / CLI 啟動測試
+    - 註冊表以 import 字串登記，取用時才載入
+    - `python -X importtime main.py list` 不得載入控制器、任務或重量級第三方套件（啟動時間回歸測試）
+"""
+
+import os
+import subprocess
+import sys
+import pytest
+from workspace.config import task_registry
+from workspace.config.error_code import ResultCode
+
+pytestmark = [pytest.mark.unit]
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "..", ".."))
+
+# list 模式不應載入的模組（前綴比對）
+HEAVY_PREFIXES = (
+    "workspace.controllers", "workspace.tasks",
+    "requests", "urllib3", "rich", "dotenv", "pyotp", "pandas", "numpy", "openpyxl", "pyarrow",
+)
+# 載入控制器時仍應延後到實際使用才 import 的第三方套件
+DEFERRED_PREFIXES = ("requests", "urllib3", "rich", "dotenv", "pyotp", "pandas", "openpyxl")
+
+
+def _imported_modules(*args) -> dict:
+    """以 -X importtime 執行，回傳 {模組: 累計微秒}"""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", *args],
+        cwd=ROOT, capture_output=True, text=True, timeout=60,
+    )
+    assert proc.returncode == 0, proc.stderr
+    modules = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|", 2)
+        if cumulative.strip().isdigit():
+            modules[name.strip()] = int(cumulative)
+    return modules
+
+
+def _loaded(modules: dict, prefixes: tuple) -> list:
+    return sorted(m for m in modules if any(m == p or m.startswith(p + ".") for p in prefixes))
+
+
+def test_list_does_not_import_tasks_or_heavy_packages():
+    modules = _imported_modules("main.py", "list")
+    assert "workspace.config.task_registry" in modules
+    assert _loaded(modules, HEAVY_PREFIXES) == []
+
+
+def test_controller_import_defers_third_party_packages():
+    modules = _imported_modules("-c", "import workspace.controllers.main_controller")
+    assert "workspace.controllers.ops_controller" in modules
+    assert _loaded(modules, DEFERRED_PREFIXES) == []
+
+
+def test_get_task_resolves_import_string(monkeypatch):
+    from workspace.controllers.main_controller import run_main_controller
+
+    assert isinstance(task_registry.TASK_REGISTRY["controller"]["main"], str)
+    assert task_registry.get_task("controller", "main") is run_main_controller
+    assert task_registry.get_task("controller", "nope") is None
+
+    monkeypatch.setitem(task_registry.TASK_REGISTRY["tool"], "ghost", "workspace.tools.not_there:run")
+    monkeypatch.setitem(task_registry.TASK_REGISTRY["tool"], "no_attr", "workspace.tools.otp.otp_generator:nope")
+    assert task_registry.get_task("tool", "ghost") is None
+    assert task_registry.get_task("tool", "no_attr") is None
+
+
+def test_plugins_discovered_from_entry_points(monkeypatch):
+    from importlib import metadata
+    from importlib.metadata import EntryPoint
+
+    eps = {
+        "walletmint.tasks": [EntryPoint("hello", "workspace.tools.otp.otp_generator:generate_otp", "walletmint.tasks")],
+        "walletmint.tools": [],
+    }
+    monkeypatch.setattr(metadata, "entry_points", lambda group: eps[group])
+    monkeypatch.setattr(task_registry, "_plugins_loaded", False)
+    monkeypatch.setattr(task_registry, "TASK_REGISTRY", {cat: dict(m) for cat, m in task_registry.TASK_REGISTRY.items()})
+
+    spec = task_registry.get_spec("task", "hello")
+    assert spec["plugin"] and spec["requires"] == ()
+    assert callable(task_registry.get_task("task", "hello"))
+    assert "hello" in task_registry.node_specs()
+
+
+def test_task_controller_runs_registered_nodes_concurrently(monkeypatch, tmp_path):
+    import threading
+    from workspace.controllers import task_controller
+
+    monkeypatch.setattr(task_registry, "_plugins_loaded", True)
+    monkeypatch.setattr(task_registry, "TASK_REGISTRY", {"task": {}, "tool": {}, "controller": {}})
+    calls = []
+    started = threading.Event()
+
+    def seed(context):
+        context["SEED"] = 1
+        return context, ResultCode.SUCCESS
+
+    def slow_sync(context):
+        # 在執行緒中等待 async 節點啟動 → 證明兩者同時執行
+        assert started.wait(timeout=2)
+        calls.append("sync")
+        return context, ResultCode.SUCCESS, [{"type": "info", "message": "sync done"}]
+
+    async def fast_async(context, role=None):
+        started.set()
+        calls.append(("async", role, context["SEED"]))
+        return context, ResultCode.SUCCESS, []
+
+    task_registry.register_task("task", "seed", seed)
+    task_registry.register_task("task", "a", slow_sync, requires=("seed",))
+    task_registry.register_task("tool", "b", fast_async, requires=("seed",), kwargs={"role": "OPS"})
+
+    context = task_controller.run_task_controller(["a", "b"], options={"x": 1})
+    assert context["OPTIONS"] == {"x": 1}
+    assert sorted(map(str, calls)) == sorted(map(str, ["sync", ("async", "OPS", 1)]))
@@ -0,0 +1,44 @@
+# workspace/test/unit/controllers/test_main_entry.py
+import sys
+import pytest
+import main as entry
+from workspace.config import task_registry
+
+pytestmark = [pytest.mark.unit, pytest.mark.controller]
+
+
+@pytest.fixture
+def run_main(monkeypatch):
+    monkeypatch.setattr(entry, "_apply_print_rules", lambda args: None)
+
+    def _run(func, *argv):
+        monkeypatch.setattr(task_registry, "get_task", lambda category, name: func)
+        monkeypatch.setattr(sys, "argv", ["main.py", "controller", "main", *argv])
+        entry.main()
+    return _run
+
+
+def test_controller_kwargs_follow_signature(run_main):
+    calls = []
+
+    def new_style(max_step=None, incremental=False):
+        calls.append((max_step, incremental))
+
+    def old_style():
+        calls.append("old")
+
+    run_main(new_style, "--step", "1", "--incremental")
+    run_main(old_style, "--step", "1", "--incremental")
+    assert calls == [(1, True), "old"]
+
+
+def test_type_error_inside_controller_is_not_retried(run_main):
+    calls = []
+
+    def controller(incremental=False):
+        calls.append(incremental)
+        raise TypeError("bug inside the flow")
+
+    with pytest.raises(TypeError):
+        run_main(controller, "--incremental")
+    assert calls == [True]  # 不會不帶參數再跑一次整個流程
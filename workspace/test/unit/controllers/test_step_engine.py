@@ -0,0 +1,99 @@
+# workspace/test/unit/controllers/test_step_engine.py
+import threading
+import pytest
+from workspace.controllers import step_engine, loader_controller
+from workspace.controllers.step_engine import derive_dependencies, run_steps
+from workspace.config.error_code import ResultCode
+
+pytestmark = [pytest.mark.unit, pytest.mark.controller]
+
+
+@pytest.fixture(autouse=True)
+def _no_debug(monkeypatch):
+    monkeypatch.setattr(step_engine, "is_debug", lambda context=None: False)
+
+
+def test_dependencies_follow_declared_reads_and_writes():
+    steps = [
+        {"outputs": ("COMMON",)},
+        {"outputs": ("INDEX",)},
+        {"inputs": ("COMMON", "INDEX"), "outputs": ("API",)},
+        {"inputs": ("COMMON.OPS.OTP_SECRET",), "outputs": ("COMMON.OPS.LOGIN_OTP",)},
+        {"inputs": ("COMMON.OPS.LOGIN_OTP",), "outputs": ("COMMON.OPS.SSID",)},
+        {"inputs": ("COMMON.OPS.OTP_SECRET",), "outputs": ("COMMON.OPS.LOGIN_OTP",)},
+        {"inputs": ("INDEX.agent",), "outputs": ("INDEX.agent.account",)},
+        {"inputs": ("INDEX.merchant",), "outputs": ("BALANCES",)},
+    ]
+    graph = derive_dependencies(steps)
+    assert graph[0] == set() and graph[1] == set()   # 系統設定與名稱設定互不相依
+    assert graph[2] == {0, 1}
+    assert graph[4] == {0, 2, 3}                       # 先寫後讀（OTP）＋ 先讀後寫（assemble 讀 COMMON）
+    assert 4 in graph[5]                               # 先讀後寫：重新產生 OTP 需等登入讀完
+    assert graph[6] == {1, 2}
+    assert graph[7] == {1}                             # 與 agent 步驟無衝突 → 可同時執行
+
+
+def test_independent_steps_run_concurrently_and_failures_stop_dependents(capsys):
+    barrier = threading.Barrier(2, timeout=2)
+    ran = []
+
+    def load_common(context):
+        barrier.wait()  # 兩個步驟同時執行才會通過
+        context["COMMON"] = {"A": 1}
+        return ResultCode.SUCCESS, []
+
+    def load_index(context):
+        barrier.wait()
+        context["INDEX"] = {"x": 1}
+        return ResultCode.task_name_duplicate, [{"type": "error", "message": "名稱重複"}, {"type": "debug", "message": "hidden"}]
+
+    async def assemble(context):
+        ran.append("assemble")
+        return ResultCode.SUCCESS, []
+
+    steps = [
+        {"no": 1, "title": "common", "run": load_common, "outputs": ("COMMON",)},
+        {"no": 2, "title": "index", "run": load_index, "outputs": ("INDEX",)},
+        {"no": 3, "title": "assemble", "run": assemble, "inputs": ("COMMON", "INDEX"), "outputs": ("API",)},
+    ]
+    context, code, timings = run_steps(steps, {}, "Loader", [])
+
+    assert code == ResultCode.task_name_duplicate
+    assert context["COMMON"] == {"A": 1}
+    assert ran == []
+    assert [(no, step_code) for no, _, _, step_code in timings] == [
+        (1, ResultCode.SUCCESS), (2, ResultCode.task_name_duplicate), (3, ResultCode.tools_graph_skipped),
+    ]
+    out = capsys.readouterr().out
+    assert "名稱重複" in out and "hidden" not in out
+
+
+def test_loader_controller_assembles_context(monkeypatch):
+    monkeypatch.setattr(loader_controller, "load_system_context", lambda: ({"DEBUG": False}, ResultCode.SUCCESS))
+    monkeypatch.setattr(loader_controller, "load_profile_context_with_errors", lambda: ({"小明": {}}, ResultCode.SUCCESS, []))
+
+    context = loader_controller.run_loader_controller()
+    assert context["COMMON"] == {"DEBUG": False}
+    assert context["INDEX"] == {"小明": {}}
+    assert "ENDPOINTS" in context["API"]
+
+    monkeypatch.setattr(loader_controller, "load_system_context", lambda: ({}, ResultCode.task_env_missing_key))
+    assert loader_controller.run_loader_controller() == {}
+
+
+def test_loader_steps_declare_every_written_key(monkeypatch):
+    # 組合步驟會覆寫 COMMON / INDEX，outputs 必須涵蓋實際寫入的鍵，相依推導才正確
+    captured = {}
+
+    def fake_run_steps(steps, *args, **kwargs):
+        captured["steps"] = steps
+        return {}, ResultCode.SUCCESS, []
+
+    monkeypatch.setattr(loader_controller, "run_steps", fake_run_steps)
+    loader_controller.run_loader_controller(incremental=True)
+    assemble_step = next(step for step in captured["steps"] if step["run"] is loader_controller._assemble)
+
+    context = {"COMMON": {"DEBUG": False}, "INDEX": {"小明": {}}}
+    code, _ = loader_controller._assemble(context)
+    assert code == ResultCode.SUCCESS
+    assert set(context) <= set(assemble_step["outputs"])
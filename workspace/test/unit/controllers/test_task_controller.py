@@ -0,0 +1,51 @@
+# workspace/test/unit/controllers/test_task_controller.py
+import time
+import pytest
+from workspace.controllers import task_controller
+from workspace.controllers.task_controller import run_task_controller
+from workspace.tasks.common import common_async_task
+from workspace.tasks.common.common_async_task import send_batch_api_requests
+from workspace.config.task_registry import _normalize
+from workspace.config.error_code import ResultCode
+
+pytestmark = [pytest.mark.unit, pytest.mark.controller]
+
+LATENCY = 0.2
+
+
+def test_independent_async_nodes_run_concurrently(monkeypatch):
+    class FakeResp:
+        status_code = 200
+        text = "{}"
+
+    def slow_post(url, json=None, headers=None, timeout=None):
+        time.sleep(LATENCY)  # 同步阻塞的 Requester
+        return FakeResp(), ResultCode.SUCCESS
+
+    monkeypatch.setattr(common_async_task.Requester, "post", staticmethod(slow_post))
+    monkeypatch.setattr(common_async_task.ResponseParser, "parse_json", staticmethod(lambda resp: ({"Code": 0}, ResultCode.SUCCESS)))
+    monkeypatch.setattr(task_controller, "is_debug", lambda context=None: False)
+
+    def node(path_key):
+        async def query(context):
+            scoped = {
+                "COMMON": {"BACKEND_RA_BASE_URL": "https://ra", "OPS": {"SSID": "sid"}},
+                "API": {"ENDPOINTS": {path_key: f"/{path_key.lower()}"}},
+            }
+            results = await send_batch_api_requests(
+                context=scoped, role="OPS", api_group="ENDPOINTS", path_key=path_key,
+                payload_sources=[("小明", {})], detail=False,
+            )
+            return context, results[0][1], []
+        return query
+
+    specs = {
+        "query_agent": _normalize(node("QUERY_AGENT_ACCOUNT")),
+        "query_merchant": _normalize(node("QUERY_MERCHANT_ACCOUNT")),
+    }
+    monkeypatch.setattr(task_controller, "node_specs", lambda: specs)
+
+    started = time.perf_counter()
+    run_task_controller(["query_agent", "query_merchant"])
+    elapsed = time.perf_counter() - started
+    assert elapsed < 2 * LATENCY * 0.9  # 依序執行需 0.4 秒
@@ -0,0 +1,56 @@
+# workspace/test/unit/tasks/chain/test_balance_scan_task.py
+import pytest
+from workspace.tasks.chain import balance_scan_task as balance_scan_module
+from workspace.tasks.chain.balance_scan_task import balance_scan_task, USDT_CONTRACT
+from workspace.config import paths
+from workspace.config.task_registry import get_spec
+from workspace.config.error_code import ResultCode
+
+pytestmark = [pytest.mark.unit, pytest.mark.task, pytest.mark.chain]
+
+
+class _FakeLedger:
+    def __init__(self, failing=()):
+        self.failing = set(failing)
+        self.calls = []
+
+    def get_trc20_balances_with_fallback(self, address, tokens):
+        self.calls.append((address, tokens))
+        if address in self.failing:
+            return {contract: None for contract, _ in tokens}, ResultCode.tools_ledger_trc20_balance_error
+        return {contract: 1.5 for contract, _ in tokens}, ResultCode.SUCCESS
+
+
+def test_scan_writes_balances_and_reports_failures():
+    ledger = _FakeLedger(failing={"T2"})
+    context = {"OPTIONS": {"addresses": ["T1", "T2", "T1"]}}
+
+    context, code, records = balance_scan_task(context, ledger=ledger)
+
+    assert code == ResultCode.tools_ledger_trc20_balance_error
+    assert context["BALANCES"] == {"T1": {USDT_CONTRACT: 1.5}, "T2": {USDT_CONTRACT: None}}
+    assert sorted(address for address, _ in ledger.calls) == ["T1", "T2"]  # 重複地址只查一次
+    assert [r["type"] for r in records] == ["error", "info"]
+
+
+def test_scan_requires_addresses():
+    _, code, records = balance_scan_task({"OPTIONS": {}}, ledger=_FakeLedger())
+    assert code == ResultCode.task_invalid_context
+    assert records[0]["type"] == "error"
+
+
+def test_scan_fails_loudly_without_node_url(tmp_path, monkeypatch):
+    env = tmp_path / ".env"
+    env.write_text("DEBUG=false\n", encoding="utf-8")
+    monkeypatch.setattr(paths, "ENV_FILE", str(env))
+
+    _, code, records = balance_scan_task({"OPTIONS": {"addresses": ["T1"]}})
+    assert code == ResultCode.task_env_missing_key  # 不退回測試網預設節點
+    assert "--node-url" in records[0]["message"]
+
+    env.write_text("TRON_NODE_URL=https://api.trongrid.io\n", encoding="utf-8")
+    assert balance_scan_module._env_node_url() == "https://api.trongrid.io"
+
+
+def test_scan_does_not_require_profile_loader():
+    assert get_spec("tool", "balance_scan")["requires"] == ()
@@ -0,0 +1,68 @@
+import asyncio
+import threading
+import time
+import pytest
+from workspace.tasks.common import common_async_task
+from workspace.tasks.common.common_async_task import send_batch_api_requests
+from workspace.config.error_code import ResultCode
+
+pytestmark = [pytest.mark.unit, pytest.mark.task]
+
+LATENCY = 0.2
+
+
+class FakeResp:
+    status_code = 200
+    text = "{}"
+
+
+@pytest.fixture
+def slow_post(monkeypatch):
+    """假的 POST：每筆阻塞 LATENCY 秒，並記錄同時進行中的最大請求數"""
+    state = {"running": 0, "peak": 0}
+    lock = threading.Lock()
+
+    def fake_post(url, json=None, headers=None, timeout=None):
+        with lock:
+            state["running"] += 1
+            state["peak"] = max(state["peak"], state["running"])
+        time.sleep(LATENCY)
+        with lock:
+            state["running"] -= 1
+        return FakeResp(), ResultCode.SUCCESS
+
+    monkeypatch.setattr(common_async_task.Requester, "post", staticmethod(fake_post))
+    monkeypatch.setattr(common_async_task.ResponseParser, "parse_json", staticmethod(lambda resp: ({"Code": 0}, ResultCode.SUCCESS)))
+    return state
+
+
+def _context(sessions: int):
+    members = ["OPS"] + [f"OPS{i}" for i in range(2, sessions + 1)]
+    common = {"BACKEND_RA_BASE_URL": "https://ra"}
+    for member in members:
+        common[member] = {"SSID": f"sid-{member}"}
+    common["OPS"]["ACTIVE"] = members
+    return {"COMMON": common, "API": {"ENDPOINTS": {"CREATE_AGENT_ACCOUNT": "/agent/create"}}}
+
+
+def _run(context, count, **kwargs):
+    started = time.perf_counter()
+    results = asyncio.run(send_batch_api_requests(
+        context=context, role="OPS", api_group="ENDPOINTS", path_key="CREATE_AGENT_ACCOUNT",
+        payload_sources=[(f"n{i}", {}) for i in range(count)], **kwargs,
+    ))
+    assert [code for _, code, _ in results] == [ResultCode.SUCCESS] * count
+    return time.perf_counter() - started
+
+
+def test_requests_do_not_block_event_loop(slow_post):
+    serial = 8 * LATENCY
+    elapsed = _run(_context(4), 8)
+    assert slow_post["peak"] > 1
+    assert elapsed < serial / 2  # 依序送出需 1.6 秒
+
+
+def test_concurrency_is_bounded(slow_post):
+    elapsed = _run(_context(4), 6, concurrency=2)
+    assert slow_post["peak"] == 2
+    assert elapsed >= 3 * LATENCY * 0.9
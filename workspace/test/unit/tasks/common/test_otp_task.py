@@ -0,0 +1,33 @@
+import pytest
+from workspace.tasks.common import otp_task
+from workspace.tasks.common.otp_task import generate_role_otp
+from workspace.config.error_code import ResultCode
+
+pytestmark = [pytest.mark.unit, pytest.mark.task]
+
+
+def test_writes_login_otp(monkeypatch):
+    class FakeProvider:
+        def fresh(self):
+            return "123456", ResultCode.SUCCESS
+
+    monkeypatch.setattr(otp_task, "get_otp_provider", lambda secret: (FakeProvider(), ResultCode.SUCCESS))
+    context, code = generate_role_otp({"COMMON": {"OPS": {"OTP_SECRET": "S"}}}, "OPS")
+    assert code == ResultCode.SUCCESS
+    assert context["COMMON"]["OPS"]["LOGIN_OTP"] == "123456"
+
+
+def test_missing_role_or_secret():
+    assert generate_role_otp({"COMMON": {}}, "OPS")[1] == ResultCode.task_invalid_context
+    assert generate_role_otp({"COMMON": {"OPS": {"USERNAME": "acc"}}}, "OPS")[1] == ResultCode.tools_otp_invalid_secret
+
+
+def test_unexpected_exception_returns_generate_error(monkeypatch):
+    def boom(secret):
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(otp_task, "get_otp_provider", boom)
+    monkeypatch.setattr(otp_task, "emit", lambda *args, **kwargs: None)
+    context, code = generate_role_otp({"COMMON": {"OPS": {"OTP_SECRET": "S"}}}, "OPS")
+    assert code == ResultCode.tools_otp_generate_error
+    assert "LOGIN_OTP" not in context["COMMON"]["OPS"]
@@ -0,0 +1,101 @@
+# workspace/test/unit/tasks/common/test_payload_template.py
+import asyncio
+import pytest
+from workspace.tasks.common import common_async_task
+from workspace.tasks.common.common_async_task import _extract_from_context, send_batch_api_requests
+from workspace.tasks.common.payload_template import PayloadTemplate, NAME
+from workspace.tasks.ops.create_agent_task import CREATE_AGENT_PAYLOAD
+from workspace.tasks.ops.create_merchant_task import CREATE_MERCHANT_PAYLOAD
+from workspace.tools.common.compact_index import CompactIndex
+from workspace.tools.helpers.debug_helper import RunConfig
+from workspace.config.error_code import ResultCode
+
+pytestmark = [pytest.mark.unit, pytest.mark.task]
+
+
+def _context():
+    index = CompactIndex()
+    index.add("小明", "Pass@123", "xm@example.com", 1)
+    index.add("小華", "Abc@456", "xh@example.com", 2)
+    index["小明"]["agent"]["uuid"] = "ag-uuid-1"
+    return {
+        "COMMON": {"BACKEND_RA_BASE_URL": "https://ra", "OPS": {"LOGIN_OTP": "123456", "SSID": "sid"}},
+        "INDEX": index,
+        "API": {"ENDPOINTS": {"CREATE_AGENT_ACCOUNT": "/agent/create"}},
+    }
+
+
+def test_template_matches_legacy_path_resolution():
+    context = _context()
+    build = CREATE_AGENT_PAYLOAD.bind(context)
+    for name in ("小明", "小華"):
+        legacy = {
+            "Name": name,
+            "Password": _extract_from_context(context, ("INDEX", name, "agent", "password")),
+            "Mail": _extract_from_context(context, ("INDEX", name, "agent", "email")),
+            "OtpCode": _extract_from_context(context, ("COMMON", "OPS", "LOGIN_OTP")),
+        }
+        assert build(name) == legacy
+
+
+def test_template_drop_empty_and_missing_fields():
+    build = CREATE_MERCHANT_PAYLOAD.bind(_context())
+    assert build("小明") == {
+        "AgUuid": "ag-uuid-1", "Name": "小明", "Mail": "xm@example.com",
+        "Password": "Pass@123", "Mode": 1, "OtpCode": "123456",
+    }
+    assert "AgUuid" not in build("小華")  # 尚未取得 uuid → 不送出
+
+    deep = PayloadTemplate({"X": ("INDEX", NAME, "agent", "password", "nested"), "Y": ("COMMON", "NOPE")})
+    assert deep.bind(_context())("小明") == {"X": None, "Y": None}
+
+
+def test_template_rejects_name_outside_index():
+    with pytest.raises(ValueError):
+        PayloadTemplate({"Bad": ("COMMON", NAME)})
+
+
+def test_batch_sends_template_payloads(monkeypatch):
+    sent = []
+
+    class FakeResp:
+        status_code = 200
+        text = '{"Code": 0}'
+
+    def fake_post(url, json=None, headers=None, timeout=None):
+        sent.append((url, json, headers))
+        return FakeResp(), ResultCode.SUCCESS
+
+    monkeypatch.setattr(common_async_task.Requester, "post", staticmethod(fake_post))
+    monkeypatch.setattr(common_async_task.ResponseParser, "parse_json", staticmethod(lambda resp: ({"Code": 0}, ResultCode.SUCCESS)))
+
+    results = asyncio.run(send_batch_api_requests(
+        context=_context(), role="OPS", api_group="ENDPOINTS", path_key="CREATE_AGENT_ACCOUNT",
+        template=CREATE_AGENT_PAYLOAD, names=["小華"],
+    ))
+    assert [(name, code) for name, code, _ in results] == [("小華", ResultCode.SUCCESS)]
+    assert sent == [(
+        "https://ra/agent/create",
+        {"Name": "小華", "Password": "Abc@456", "Mail": "xh@example.com", "OtpCode": "123456"},
+        {"Sid": "sid"},
+    )]
+
+
+def test_batch_without_detail_keeps_only_parsed(monkeypatch):
+    class FakeResp:
+        status_code = 200
+        text = '{"Code": 0}'
+
+    monkeypatch.setattr(common_async_task.Requester, "post", staticmethod(lambda *a, **k: (FakeResp(), ResultCode.SUCCESS)))
+    monkeypatch.setattr(common_async_task.ResponseParser, "parse_json", staticmethod(lambda resp: ({"Code": 0}, ResultCode.SUCCESS)))
+
+    context = _context()
+    context["RUN"] = RunConfig(debug=False, records=False)
+    ((name, code, records),) = asyncio.run(send_batch_api_requests(
+        context=context, role="OPS", api_group="ENDPOINTS", path_key="CREATE_AGENT_ACCOUNT",
+        template=CREATE_AGENT_PAYLOAD, names=["小明"],
+    ))
+    assert code == ResultCode.SUCCESS
+    (record,) = records
+    assert record.pop("elapsed") >= 0
+    assert record == {"type": "debug", "response": {"parsed": {"Code": 0}}, "code": ResultCode.SUCCESS, "name": "小明"}
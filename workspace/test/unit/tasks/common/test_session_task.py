@@ -0,0 +1,141 @@
+import asyncio
+import pytest
+from workspace.tasks.common import session_task, common_async_task
+from workspace.tasks.common.session_task import ensure_session, ensure_session_pool
+from workspace.tasks.common.common_async_task import send_batch_api_requests
+from workspace.tools.file.session_store import save_session
+from workspace.config import paths
+from workspace.config.error_code import ResultCode
+
+pytestmark = [pytest.mark.unit, pytest.mark.task]
+
+
+@pytest.fixture
+def logins(monkeypatch, tmp_path):
+    """假的 OTP / 登入：每次登入發一個新的 Sid"""
+    monkeypatch.setattr(paths, "SESSION_FILE", str(tmp_path / "sessions.json"))
+    calls = []
+
+    def fake_otp(context, role, debug=False):
+        context["COMMON"][role]["LOGIN_OTP"] = "123456"
+        return context, ResultCode.SUCCESS
+
+    def fake_login(context, role="OPS", debug=False):
+        calls.append(role)
+        context["COMMON"][role].update(SSID=f"sid-{len(calls)}", UUID="uuid")
+        return context, ResultCode.SUCCESS, []
+
+    monkeypatch.setattr(session_task, "generate_role_otp", fake_otp)
+    monkeypatch.setattr(session_task, "common_login", fake_login)
+    return calls
+
+
+def _context():
+    return {
+        "COMMON": {"BACKEND_RA_BASE_URL": "https://ra", "OPS": {"USERNAME": "acc", "PASSWORD": "pw", "OTP_SECRET": "S"}},
+        "API": {"ENDPOINTS": {"QUERY_AGENT_ACCOUNT": "/agent/list", "CREATE_AGENT_ACCOUNT": "/agent/create"}},
+    }
+
+
+def test_reuses_valid_saved_session(monkeypatch, logins):
+    probed = []
+
+    def fake_probe(context, role, url, payload=None, method="POST", use_header=True, timeout=5):
+        probed.append(context["COMMON"][role]["SSID"])
+        return {"Code": 0}, ResultCode.SUCCESS
+
+    monkeypatch.setattr(session_task, "send_api_request", fake_probe)
+
+    context, code, _ = ensure_session(_context())
+    assert code == ResultCode.SUCCESS and logins == ["OPS"]
+    assert probed == []  # 沒有保存的 Session → 直接登入，不需驗證
+
+    # 下一次執行：沿用保存的 Session（驗證一次，不再登入）
+    context, code, records = ensure_session(_context())
+    assert code == ResultCode.SUCCESS and logins == ["OPS"]
+    assert probed == ["sid-1"] and context["COMMON"]["OPS"]["SSID"] == "sid-1"
+    assert records[0]["type"] == "info"
+
+
+def test_relogins_when_saved_session_invalid(monkeypatch, logins):
+    context = _context()
+    save_session(paths.SESSION_FILE, session_task._key(context, "OPS"), "old", "uuid")
+    monkeypatch.setattr(session_task, "send_api_request", lambda *a, **k: ({}, ResultCode.tools_request_unauthorized))
+
+    context, code, _ = ensure_session(context)
+    assert code == ResultCode.SUCCESS and logins == ["OPS"]
+    assert context["COMMON"]["OPS"]["SSID"] == "sid-1"
+
+
+def test_batch_relogins_once_on_unauthorized(monkeypatch, logins):
+    class FakeResp:
+        status_code = 200
+        text = "{}"
+
+    def fake_post(url, json=None, headers=None, timeout=None):
+        if headers.get("Sid") == "expired":
+            return None, ResultCode.tools_request_unauthorized
+        return FakeResp(), ResultCode.SUCCESS
+
+    monkeypatch.setattr(common_async_task.Requester, "post", staticmethod(fake_post))
+    monkeypatch.setattr(common_async_task.ResponseParser, "parse_json", staticmethod(lambda resp: ({"Code": 0}, ResultCode.SUCCESS)))
+
+    context = _context()
+    context["COMMON"]["OPS"]["SSID"] = "expired"
+    results = asyncio.run(send_batch_api_requests(
+        context=context, role="OPS", api_group="ENDPOINTS", path_key="CREATE_AGENT_ACCOUNT",
+        payload_sources=[("小明", {}), ("小華", {}), ("小美", {})],
+    ))
+
+    assert [code for _, code, _ in results] == [ResultCode.SUCCESS] * 3
+    assert logins == ["OPS"]  # 多筆同時失效，只重新登入一次
+    assert context["COMMON"]["OPS"]["SSID"] == "sid-1"
+    assert any("重新登入" in r.get("message", "") for _, _, records in results for r in records)
+
+
+def test_pool_logs_in_concurrently_and_skips_failures(monkeypatch, logins):
+    context = _context()
+    context["COMMON"]["OPS"]["POOL"] = ["OPS", "OPS2", "OPS3"]
+    context["COMMON"]["OPS2"] = {"USERNAME": "b", "PASSWORD": "pw", "OTP_SECRET": "S2", "LOGIN_ROLE": "OPS"}
+    context["COMMON"]["OPS3"] = {}  # 缺少登入資料 → 略過
+
+    context, code, records = asyncio.run(ensure_session_pool(context))
+    assert code == ResultCode.SUCCESS
+    assert context["COMMON"]["OPS"]["ACTIVE"] == ["OPS", "OPS2"]
+    assert sorted(logins) == ["OPS", "OPS2"]
+    assert "略過：OPS3" in records[-1]["message"]
+
+
+def test_batch_requests_round_robin_across_pool(monkeypatch):
+    class FakeResp:
+        status_code = 200
+        text = "{}"
+
+    used = []
+
+    def fake_post(url, json=None, headers=None, timeout=None):
+        used.append((json["Name"], headers["Sid"]))
+        return FakeResp(), ResultCode.SUCCESS
+
+    monkeypatch.setattr(common_async_task.Requester, "post", staticmethod(fake_post))
+    monkeypatch.setattr(common_async_task.ResponseParser, "parse_json", staticmethod(lambda resp: ({"Code": 0}, ResultCode.SUCCESS)))
+
+    context = _context()
+    context["COMMON"]["OPS"].update(SSID="sid-a", ACTIVE=["OPS", "OPS2"])
+    context["COMMON"]["OPS2"] = {"SSID": "sid-b"}
+    asyncio.run(send_batch_api_requests(
+        context=context, role="OPS", api_group="ENDPOINTS", path_key="CREATE_AGENT_ACCOUNT",
+        payload_sources=[(f"n{i}", {"Name": f"n{i}"}) for i in range(4)],
+    ))
+    assert sorted(used) == [("n0", "sid-a"), ("n1", "sid-b"), ("n2", "sid-a"), ("n3", "sid-b")]
+
+
+def test_pool_member_session_is_probed_before_reuse(monkeypatch, logins):
+    context = _context()
+    context["COMMON"]["OPS2"] = {"USERNAME": "b", "PASSWORD": "pw", "OTP_SECRET": "S2", "LOGIN_ROLE": "OPS"}
+    save_session(paths.SESSION_FILE, session_task._key(context, "OPS2"), "revoked", "uuid")
+    monkeypatch.setattr(session_task, "send_api_request", lambda *a, **k: ({}, ResultCode.tools_request_unauthorized))
+
+    context, code, _ = ensure_session(context, "OPS2")
+    assert code == ResultCode.SUCCESS and logins == ["OPS2"]  # 已撤銷的 Session 不沿用
+    assert context["COMMON"]["OPS2"]["SSID"] == "sid-1"
@@ -0,0 +1,62 @@
+import asyncio
+import pytest
+from workspace.tasks.common import common_async_task
+from workspace.tasks.common.wait_for_sync_task import wait_for_sync, make_query_probe
+from workspace.tools.common.compact_index import CompactIndex
+from workspace.config.error_code import ResultCode
+
+pytestmark = [pytest.mark.unit, pytest.mark.task]
+
+
+def _context():
+    index = CompactIndex()
+    for i, name in enumerate(("小明", "小華", "小美")):
+        index.add(name, "pw", f"{i}@x.com", 1)
+    index["小華"]["agent"]["account"] = "acc-2"
+    index["小美"]["agent"]["account"] = "acc-3"
+    return {
+        "COMMON": {"BACKEND_RA_BASE_URL": "https://ra", "OPS": {"SSID": "sid"}},
+        "INDEX": index,
+        "API": {"ENDPOINTS": {"QUERY_AGENT_ACCOUNT": "/agent/list"}},
+    }
+
+
+def test_wait_returns_when_probe_ready():
+    answers = iter([(False, None), (True, "ok")])
+    context, code, records = asyncio.run(wait_for_sync(_context(), probe=lambda: next(answers), interval=0.01, show=False))
+    assert code == ResultCode.SUCCESS
+    assert records[0]["type"] == "info" and "第 2 次探測" in records[0]["message"]
+
+
+def test_wait_times_out():
+    _, code, records = asyncio.run(wait_for_sync(_context(), wait_seconds=0.05, probe=lambda: (False, 0), interval=0.01, show=False))
+    assert code == ResultCode.tools_poll_timeout
+    assert records[0]["type"] == "error"
+
+
+def test_query_probe_checks_created_accounts(monkeypatch):
+    queried = []
+    visible = {"acc-2"}
+
+    class FakeResp:
+        status_code = 200
+        text = "{}"
+
+    def fake_get(url, params=None, headers=None, timeout=None):
+        queried.append(params["Account"])
+        return FakeResp(), ResultCode.SUCCESS
+
+    def fake_parse(resp):
+        account = queried[-1]
+        items = [{"Account": account}] if account in visible else []
+        return {"Code": 0, "Result": {"Items": items}}, ResultCode.SUCCESS
+
+    monkeypatch.setattr(common_async_task.Requester, "get", staticmethod(fake_get))
+    monkeypatch.setattr(common_async_task.ResponseParser, "parse_json", staticmethod(fake_parse))
+
+    probe = make_query_probe(_context())
+    assert asyncio.run(probe()) == (False, 1)
+    assert sorted(queried) == ["acc-2", "acc-3"]   # 只查已建立帳號的名稱
+
+    visible.add("acc-3")
+    assert asyncio.run(probe()) == (True, 2)
@@ -1,8 +1,9 @@
 # workspace/test/unit/tasks/test_load_context_task.py
 import os
 import pytest
+from workspace.tasks.loader import load_profile_context_task
 from workspace.tasks.loader.load_system_context_task import load_system_context
-from workspace.tasks.loader.load_profile_context_task import load_profile_context
+from workspace.tasks.loader.load_profile_context_task import load_profile_context, load_profile_context_with_errors
 from workspace.tasks.loader.assemble_context_task import assemble_context
 from workspace.config import paths
 from workspace.config.error_code import ResultCode
@@ -18,6 +19,7 @@ def temp_profiles_dir(tmp_path, monkeypatch):
     profiles_dir = tmp_path / "profiles"
     profiles_dir.mkdir()
     monkeypatch.setattr(paths, "PROFILE_FILE_PATH", str(profiles_dir / "names"))
+    monkeypatch.setattr(paths, "PROFILE_CACHE_FILE", str(tmp_path / ".cache" / "profile_index.pkl"))
     return profiles_dir
 
 
@@ -44,6 +46,22 @@ def test_env_missing_required_key(tmp_path, monkeypatch):
     assert code == ResultCode.task_env_missing_key
 
 
+def test_env_ops_pool(valid_env_file):
+    valid_env_file.write_text(
+        valid_env_file.read_text(encoding="utf-8")
+        + "OPS3_USERNAME=c\nOPS3_PASSWORD=p3\nOPS3_OTP_SECRET=K3\nOPS2_USERNAME=b\nOPS2_PASSWORD=p2\nOPS2_OTP_SECRET=K2\n",
+        encoding="utf-8",
+    )
+    ctx, code = load_system_context()
+    assert code == ResultCode.SUCCESS
+    assert ctx["OPS"]["POOL"] == ["OPS", "OPS2", "OPS3"]
+    assert ctx["OPS2"] == {"USERNAME": "b", "PASSWORD": "p2", "OTP_SECRET": "K2", "LOGIN_ROLE": "OPS"}
+
+    # 帳號池群組欄位不完整
+    valid_env_file.write_text(valid_env_file.read_text(encoding="utf-8") + "OPS4_USERNAME=d\n", encoding="utf-8")
+    assert load_system_context()[1] == ResultCode.task_env_missing_key
+
+
 # ------------------------------------------------------------
 # 🧩 Profiles 錯誤情境覆蓋
 # ------------------------------------------------------------
@@ -52,11 +70,23 @@ def test_no_profile_file(temp_profiles_dir, valid_env_file):
     assert code == ResultCode.task_name_file_missing
 
 
-def test_multiple_profile_files(temp_profiles_dir, valid_env_file):
-    (temp_profiles_dir / "names.env").write_text("a_name=小明\na_password=123\na_email=xm@example.com\na_modetype=1\n", encoding="utf-8")
-    (temp_profiles_dir / "names.csv").write_text("name,password,email,modetype\n小華,456,xh@example.com,2\n", encoding="utf-8")
+def test_multiple_profile_files_merged(temp_profiles_dir, valid_env_file):
+    (temp_profiles_dir / "names.env").write_text("a_name=小明\na_password=Pass@123\na_email=xm@example.com\na_modetype=1\n", encoding="utf-8")
+    (temp_profiles_dir / "names.csv").write_text("name,password,email,modetype\n小華,Abc@456,xh@example.com,2\n", encoding="utf-8")
     ctx, code = load_profile_context()
-    assert code == ResultCode.task_name_multiple_files_detected
+    assert code == ResultCode.SUCCESS
+    assert list(ctx) == ["小華", "小明"]  # 依檔名排序：names.csv → names.env
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_shard_duplicate_names(temp_profiles_dir, valid_env_file, workers):
+    (temp_profiles_dir / "names_01.csv").write_text("name,password,email,modetype\n小明,Pass@123,xm@example.com,1\n小華,Abc@456,xh@example.com,2\n", encoding="utf-8")
+    (temp_profiles_dir / "names_02.json").write_text('[{"name": "小美", "password": "Abc@456", "email": "xb@example.com", "modetype": "1"}, {"name": "小華", "password": "Abc@456", "email": "xh@example.com", "modetype": "2"}]', encoding="utf-8")
+    ctx, code, errors = load_profile_context_with_errors(workers=workers)
+    assert ctx == {}
+    assert code == ResultCode.task_name_duplicate
+    assert [(e["file"], e["row"]) for e in errors] == [("names_02.json", 2)]
+    assert "names_01.csv 第 2 筆" in errors[0]["message"]
 
 
 def test_name_empty(temp_profiles_dir, valid_env_file):
@@ -156,6 +186,17 @@ def test_profile_csv_success(temp_profiles_dir, valid_env_file):
     assert "小明" in ctx
 
 
+def test_profile_xlsx_success(temp_profiles_dir, valid_env_file):
+    from openpyxl import Workbook
+    wb = Workbook()
+    wb.active.append(["name", "password", "email", "modetype"])
+    wb.active.append(["小明", "Pass@123", "xm@example.com", 1])
+    wb.save(temp_profiles_dir / "names.xlsx")
+    ctx, code = load_profile_context()
+    assert code == ResultCode.SUCCESS
+    assert ctx["小明"]["merchant"]["modetype"] == 1
+
+
 def test_full_assemble_success(temp_profiles_dir, valid_env_file):
     csv_path = temp_profiles_dir / "names.csv"
     csv_path.write_text("name,password,email,modetype\n小明,Pass@123,xm@example.com,1\n小華,Abc@456,xh@example.com,2\n", encoding="utf-8")
@@ -169,3 +210,110 @@ def test_full_assemble_success(temp_profiles_dir, valid_env_file):
     assert "COMMON" in full_ctx
     assert "INDEX" in full_ctx
     assert "API" in full_ctx
+
+
+# ------------------------------------------------------------
+# 🧩 串流驗證：收集所有錯誤列 / 多行程分塊
+# ------------------------------------------------------------
+_MIXED_CSV = (
+    "name,password,email,modetype\n"
+    "小明,Pass@123,xm@example.com,1\n"
+    "A,Pass@123,a@example.com,1\n"
+    "小華,Abc@456,xh@example.com,2\n"
+    "小美,Abc@456,not-an-email,2\n"
+    "小強,Abc@456,xq@example.com,3\n"
+)
+
+
+def test_collect_all_row_errors(temp_profiles_dir, valid_env_file):
+    (temp_profiles_dir / "names.csv").write_text(_MIXED_CSV, encoding="utf-8")
+    ctx, code, errors = load_profile_context_with_errors(workers=1)
+    assert ctx == {}
+    assert code == ResultCode.task_name_invalid_key_length
+    assert [(e["row"], e["result_code"]) for e in errors] == [
+        (2, ResultCode.task_name_invalid_key_length),
+        (4, ResultCode.task_email_invalid_format),
+        (5, ResultCode.task_mode_type_invalid_value),
+    ]
+
+
+def test_first_error_follows_row_order(temp_profiles_dir, valid_env_file):
+    (temp_profiles_dir / "names.csv").write_text(
+        "name,password,email,modetype\n"
+        "小明,Pass@123,xm@example.com,1\n"
+        "小明,Pass@123,xm@example.com,1\n"   # 第 2 筆：名稱重複
+        "A,Pass@123,a@example.com,1\n",      # 第 3 筆：名稱長度不符
+        encoding="utf-8",
+    )
+    ctx, code, errors = load_profile_context_with_errors(workers=1)
+    assert code == ResultCode.task_name_duplicate
+    assert [e["row"] for e in errors] == [2, 3]
+
+
+def test_small_profiles_skip_process_pool(temp_profiles_dir, valid_env_file, monkeypatch):
+    import concurrent.futures
+
+    def _no_pool(*args, **kwargs):
+        raise AssertionError("小檔不應啟動子行程")
+
+    monkeypatch.setattr(concurrent.futures, "ProcessPoolExecutor", _no_pool)
+    rows = "".join(f"代理{chr(0x4e00 + i)},Pass@123,u{i}@example.com,1\n" for i in range(20))
+    (temp_profiles_dir / "names_01.csv").write_text("name,password,email,modetype\n" + rows, encoding="utf-8")
+    ctx, code, _ = load_profile_context_with_errors(chunk_size=5, use_cache=False)  # 單檔 4 個區塊
+    assert code == ResultCode.SUCCESS and len(ctx) == 20
+
+    (temp_profiles_dir / "names_02.csv").write_text("name,password,email,modetype\n小明,Pass@123,xm@example.com,1\n", encoding="utf-8")
+    ctx, code, _ = load_profile_context_with_errors(use_cache=False)  # 多檔
+    assert code == ResultCode.SUCCESS and len(ctx) == 21
+
+
+def test_parallel_chunks_same_errors(temp_profiles_dir, valid_env_file):
+    (temp_profiles_dir / "names.csv").write_text(_MIXED_CSV, encoding="utf-8")
+    serial = load_profile_context_with_errors(workers=1, chunk_size=2)
+    parallel = load_profile_context_with_errors(workers=2, chunk_size=2)
+    assert serial == parallel
+
+
+def test_parallel_chunks_success(temp_profiles_dir, valid_env_file):
+    rows = "".join(f"代理{chr(0x4e00 + i)},Pass@123,u{i}@example.com,{1 + i % 2}\n" for i in range(50))
+    (temp_profiles_dir / "names.csv").write_text("name,password,email,modetype\n" + rows, encoding="utf-8")
+    ctx, code, errors = load_profile_context_with_errors(workers=2, chunk_size=7)
+    assert code == ResultCode.SUCCESS
+    assert errors == []
+    assert len(ctx) == 50
+    assert list(ctx)[0] == "代理一"
+    assert ctx["代理一"]["merchant"]["modetype"] == 1
+
+
+# ------------------------------------------------------------
+# 🧩 已驗證 INDEX 快取
+# ------------------------------------------------------------
+def test_profile_cache_hit_skips_parsing(temp_profiles_dir, valid_env_file, monkeypatch):
+    csv_path = temp_profiles_dir / "names.csv"
+    csv_path.write_text("name,password,email,modetype\n小明,Pass@123,xm@example.com,1\n", encoding="utf-8")
+    first, code = load_profile_context()
+    assert code == ResultCode.SUCCESS
+
+    def _fail(_):
+        raise AssertionError("快取命中時不應重新讀檔")
+
+    monkeypatch.setattr(load_profile_context_task, "_open_records", _fail)
+    second, code = load_profile_context()
+    assert code == ResultCode.SUCCESS
+    assert second == first
+    assert second is not first
+
+
+def test_profile_cache_invalidated_on_change(temp_profiles_dir, valid_env_file):
+    csv_path = temp_profiles_dir / "names.csv"
+    csv_path.write_text("name,password,email,modetype\n小明,Pass@123,xm@example.com,1\n", encoding="utf-8")
+    load_profile_context()
+
+    csv_path.write_text("name,password,email,modetype\n小明,Pass@123,xm@example.com,1\n小華,Abc@456,xh@example.com,2\n", encoding="utf-8")
+    ctx, code = load_profile_context()
+    assert code == ResultCode.SUCCESS
+    assert set(ctx) == {"小明", "小華"}
+
+    csv_path.write_text("name,password,email,modetype\n小明,Pass@123,xm@example.com,3\n", encoding="utf-8")
+    ctx, code = load_profile_context()
+    assert code == ResultCode.task_mode_type_invalid_value
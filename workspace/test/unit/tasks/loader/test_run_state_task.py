@@ -0,0 +1,125 @@
+# workspace/test/unit/tasks/loader/test_run_state_task.py
+import asyncio
+import hashlib
+import json
+import os
+import pytest
+from workspace.config import paths
+from workspace.config.error_code import ResultCode
+from workspace.tasks.loader.run_state_task import apply_previous_run, save_run_state, count_pending
+from workspace.tasks.ops import create_agent_task as create_agent_module
+
+pytestmark = [pytest.mark.unit, pytest.mark.task, pytest.mark.loader]
+
+
+def _entry(password="Pass@123", email="a@example.com", modetype=1):
+    return {
+        "agent": {"account": None, "password": password, "email": email},
+        "merchant": {"account": None, "password": password, "email": email, "modetype": modetype},
+    }
+
+
+def _done(entry, tag):
+    entry["agent"].update(account=f"ag_{tag}", uuid=f"ag-uuid-{tag}")
+    entry["merchant"].update(account=f"me_{tag}", uuid=f"me-uuid-{tag}")
+    return entry
+
+
+@pytest.fixture
+def state_file(tmp_path, monkeypatch):
+    path = tmp_path / ".state" / "last_run_index.json"
+    monkeypatch.setattr(paths, "RUN_STATE_FILE", str(path))
+    monkeypatch.setattr(paths, "STATE_SECRET_FILE", str(tmp_path / ".state" / "state_secret"))
+    return path
+
+
+def test_no_previous_run_all_pending(state_file):
+    context = {"INDEX": {"小明": _entry(), "小華": _entry()}}
+    context, code, records = apply_previous_run(context)
+    assert code == ResultCode.SUCCESS
+    assert count_pending(context["INDEX"]) == 2
+
+
+def test_diff_reuses_unchanged_and_reschedules_changed(state_file):
+    first = {"INDEX": {
+        "小明": _done(_entry(), "a"),
+        "小華": _done(_entry(email="h@example.com"), "b"),
+        "小美": _entry(),  # 上次失敗（未取得帳號）
+        "小強": _done(_entry(), "d"),
+    }}
+    first["INDEX"]["小美"]["agent"]["account"] = "ag_c"
+    assert save_run_state(first) == ResultCode.SUCCESS
+    # 不保存密碼明文
+    assert "Pass@123" not in state_file.read_text(encoding="utf-8")
+
+    second = {"INDEX": {
+        "小明": _entry(),                               # 未變動 → 沿用
+        "小華": _entry(email="new@example.com"),        # 變更 → 重跑
+        "小美": _entry(),                               # 未變動但未完成 → 接續
+        "小新": _entry(),                               # 新增
+    }}
+    context, code, records = apply_previous_run(second)
+    index = context["INDEX"]
+    assert code == ResultCode.SUCCESS
+    assert index["小明"]["merchant"]["uuid"] == "me-uuid-a"
+    assert index["小華"]["agent"]["account"] is None
+    assert index["小美"]["agent"]["account"] == "ag_c"
+    assert index["小美"]["agent"].get("uuid") is None
+    assert count_pending(index) == 3
+    assert "已移除 1" in records[-1]["message"]
+
+    # 已移除的名稱紀錄仍保留
+    save_run_state(context)
+    saved = json.loads(state_file.read_text(encoding="utf-8"))["index"]
+    assert saved["小強"]["agent"]["uuid"] == "ag-uuid-d"
+
+
+def test_profile_hash_is_keyed_and_files_are_private(state_file):
+    context = {"INDEX": {"小明": _done(_entry(), "a")}}
+    assert save_run_state(context) == ResultCode.SUCCESS
+
+    saved = json.loads(state_file.read_text(encoding="utf-8"))["index"]["小明"]["profile"]
+    unsalted = hashlib.sha256(json.dumps(["Pass@123", "a@example.com", 1]).encode("utf-8")).hexdigest()
+    assert saved != unsalted  # 沒有金鑰無法以字典比對
+    assert os.stat(state_file).st_mode & 0o777 == 0o600
+    assert os.stat(paths.STATE_SECRET_FILE).st_mode & 0o777 == 0o600
+
+    # 不同安裝（不同金鑰）雜湊不同
+    os.remove(paths.STATE_SECRET_FILE)
+    save_run_state(context)
+    assert json.loads(state_file.read_text(encoding="utf-8"))["index"]["小明"]["profile"] != saved
+
+
+def test_legacy_state_still_matches_and_is_upgraded(state_file):
+    def legacy(password, email, modetype):
+        return hashlib.sha256(json.dumps([password, email, modetype], ensure_ascii=False).encode("utf-8")).hexdigest()
+
+    done = {"account": "x", "uuid": "x-uuid"}
+    state_file.parent.mkdir(parents=True)
+    state_file.write_text(json.dumps({"version": 1, "index": {
+        "小明": {"profile": legacy("Pass@123", "a@example.com", 1), "agent": done, "merchant": done},
+        "小強": {"profile": legacy("old", "d@example.com", 1), "agent": done, "merchant": done},
+    }}), encoding="utf-8")
+
+    context, code, _ = apply_previous_run({"INDEX": {"小明": _entry()}})
+    assert code == ResultCode.SUCCESS
+    assert count_pending(context["INDEX"]) == 0  # 升級後不會把已完成的名稱重跑
+
+    save_run_state(context)
+    state = json.loads(state_file.read_text(encoding="utf-8"))
+    assert state["version"] == 2
+    assert state["index"]["小明"]["profile"] != legacy("Pass@123", "a@example.com", 1)
+    assert "profile" not in state["index"]["小強"]  # 未出現的名稱保留舊雜湊，不被當成 HMAC
+
+
+def test_create_agent_skips_existing_accounts(monkeypatch):
+    sent = []
+
+    async def fake_batch(context, role, api_group, path_key, names=None, **kwargs):
+        sent.extend(names)
+        return []
+
+    monkeypatch.setattr(create_agent_module, "send_batch_api_requests", fake_batch)
+    context = {"INDEX": {"小明": _done(_entry(), "a"), "小新": _entry()}}
+    asyncio.run(create_agent_module.create_agent_task(context))
+    assert sent == ["小新"]
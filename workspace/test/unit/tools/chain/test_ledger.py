@@ -0,0 +1,115 @@
+# workspace/test/unit/tools/chain/test_ledger.py
+import pytest
+from workspace.tools.chain.ledger import Ledger
+from workspace.tools.common.money import Amount
+from workspace.config.error_code import ResultCode
+
+pytestmark = [pytest.mark.unit, pytest.mark.tool, pytest.mark.chain]
+
+USDT = "TR7NHqjeKQxGTCi8q8ZY4pL8otSzgjLj6t"
+USDD = "TPYmHEhy5n8TCEfYGqW2rPxsghSfzghPDn"
+
+
+# ------------------------------------------------------------
+# fixture：RPC 一律失敗的假 client + 計數用假 Session
+# ------------------------------------------------------------
+class _FakeTronpy:
+    def get_contract(self, _):
+        raise RuntimeError("mock rpc down")
+
+
+class _FakeClient:
+    node_url = "https://api.trongrid.io"
+    client = _FakeTronpy()
+
+
+class _FakeResponse:
+    status_code = 200
+
+    def __init__(self, tokens):
+        self._tokens = tokens
+
+    def json(self):
+        return {"data": self._tokens}
+
+
+class _FakeSession:
+    def __init__(self, tokens):
+        self.tokens = tokens
+        self.calls = 0
+
+    def get(self, url, params=None, timeout=None):
+        self.calls += 1
+        return _FakeResponse(self.tokens)
+
+
+@pytest.fixture
+def fake_session(monkeypatch):
+    session = _FakeSession([
+        {"tokenId": USDT, "tokenAbbr": "USDT", "tokenName": "Tether USD", "balance": "12500000", "tokenDecimal": 6},
+        {"tokenId": USDD, "tokenAbbr": "USDD", "tokenName": "Decentralized USD", "balance": "3000000000000000000", "tokenDecimal": 18},
+    ])
+    monkeypatch.setattr(Ledger, "_session", session)
+    Ledger.clear_tronscan_cache()
+    yield session
+    Ledger.clear_tronscan_cache()
+
+
+# ------------------------------------------------------------
+# 🧩 Tronscan 備援：快取與索引
+# ------------------------------------------------------------
+def test_fallback_by_contract(fake_session):
+    balance, code = Ledger(_FakeClient()).get_trc20_balance_with_fallback("TAddr", USDT, symbol="XXX")
+    assert code == ResultCode.SUCCESS
+    assert balance == 12.5
+
+
+def test_fallback_by_symbol(fake_session):
+    balance, code = Ledger(_FakeClient()).get_trc20_balance_with_fallback("TAddr", "", symbol="USDD")
+    assert code == ResultCode.SUCCESS
+    assert balance == 3.0
+
+
+def test_fallback_cached_within_ttl(fake_session):
+    ledger = Ledger(_FakeClient())
+    ledger.get_trc20_balance_with_fallback("TAddr", USDT)
+    ledger.get_trc20_balance_with_fallback("TAddr", USDD, symbol="USDD")
+    assert fake_session.calls == 1
+
+
+def test_fallback_refetch_after_ttl(fake_session):
+    ledger = Ledger(_FakeClient(), cache_ttl=0)
+    ledger.get_trc20_balance_with_fallback("TAddr", USDT)
+    ledger.get_trc20_balance_with_fallback("TAddr", USDT)
+    assert fake_session.calls == 2
+
+
+def test_fallback_token_not_found(fake_session):
+    balance, code = Ledger(_FakeClient()).get_trc20_balance_with_fallback("TAddr", "TUnknown", symbol="BTT")
+    assert balance is None
+    assert code == ResultCode.tools_ledger_trc20_balance_error
+
+
+def test_batch_balances_single_fetch(fake_session):
+    balances, code = Ledger(_FakeClient()).get_trc20_balances_with_fallback(
+        "TAddr", [(USDT, "USDT"), (USDD, "USDD")]
+    )
+    assert code == ResultCode.SUCCESS
+    assert balances == {USDT: 12.5, USDD: 3.0}
+    assert fake_session.calls == 1
+
+
+def test_testnet_skips_tronscan(fake_session):
+    client = _FakeClient()
+    client.node_url = "https://nile.trongrid.io"
+    balance, code = Ledger(client).get_trc20_balance_with_fallback("TAddr", USDT)
+    assert code == ResultCode.tools_ledger_trc20_balance_error
+    assert fake_session.calls == 0
+
+
+def test_fallback_exact_amount(fake_session):
+    balance, code = Ledger(_FakeClient()).get_trc20_balance_with_fallback("TAddr", USDD, symbol="USDD", exact=True)
+    assert code == ResultCode.SUCCESS
+    assert isinstance(balance, Amount)
+    assert balance.units == 3_000_000_000_000_000_000
+    assert balance.decimals == 18
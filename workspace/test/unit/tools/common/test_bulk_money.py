@@ -0,0 +1,65 @@
+# workspace/test/unit/tools/common/test_bulk_money.py
+from decimal import Decimal
+import numpy as np
+import pytest
+from workspace.tools.common.fee_calculator import calc_fee_and_realquant, calc_fee_and_realquant_bulk
+from workspace.tools.common.currency_converter import CurrencyConverter
+from workspace.tools.common.rate_provider import RateProvider, StaticRateSource
+from workspace.config.error_code import ResultCode
+
+pytestmark = [pytest.mark.unit, pytest.mark.tool, pytest.mark.currency]
+
+RATES = {"TRX": 0.2875, "USDT": 1.0001, "USDD": 0.9993}
+
+
+# ------------------------------------------------------------
+# 🧩 批次手續費計算
+# ------------------------------------------------------------
+def test_bulk_fee_matches_scalar():
+    quants = [100, 2500, 7, 123456, 1]
+    percents = [1, 2, 3, 0, 5]
+    golds = 0.5
+    fees, reals = calc_fee_and_realquant_bulk(quants, percents, golds)
+    for i, q in enumerate(quants):
+        fee, real = calc_fee_and_realquant(q, percents[i], golds)
+        assert fees[i] == pytest.approx(fee, abs=1e-8)
+        assert reals[i] == pytest.approx(real, abs=1e-8)
+
+
+def test_bulk_fee_exact_mode():
+    fees, reals = calc_fee_and_realquant_bulk([10, 20], 3, "0.1", exact=True)
+    assert fees.dtype == object
+    assert list(fees) == [Decimal("0.40000000"), Decimal("0.70000000")]
+    assert list(reals) == [Decimal("9.60000000"), Decimal("19.30000000")]
+
+
+def test_bulk_fee_exact_sum_is_exact():
+    fees, _ = calc_fee_and_realquant_bulk([0.1] * 10, 0, 0.2, exact=True)
+    assert sum(fees) == Decimal("2")
+
+
+# ------------------------------------------------------------
+# 🧩 批次幣別換算
+# ------------------------------------------------------------
+def test_convert_bulk_matches_scalar():
+    converter = CurrencyConverter(RateProvider(StaticRateSource(RATES), cache_file=""))
+    amounts = np.array([1.0, 12.5, 99999.0])
+    result, code = converter.convert_bulk(amounts, "TRX", "USDT")
+    assert code == ResultCode.SUCCESS
+    for i, amount in enumerate(amounts):
+        expected, _ = converter.convert(float(amount), "TRX", "USDT")
+        assert result[i] == expected
+
+
+def test_convert_bulk_exact():
+    converter = CurrencyConverter(RateProvider(StaticRateSource({"TRX": 0.25, "USDT": 1, "USDD": 1}), cache_file=""))
+    result, code = converter.convert_bulk([4, "0.4"], "TRX", "USDT", exact=True)
+    assert code == ResultCode.SUCCESS
+    assert list(result) == [Decimal("1.00"), Decimal("0.100")]
+
+
+def test_convert_bulk_not_supported():
+    converter = CurrencyConverter(RateProvider(StaticRateSource(RATES), cache_file=""))
+    result, code = converter.convert_bulk([1], "BTC", "USDT")
+    assert result is None
+    assert code == ResultCode.tools_currency_not_supported
@@ -0,0 +1,61 @@
+# workspace/test/unit/tools/common/test_compact_index.py
+import json
+import pickle
+import pytest
+from workspace.tools.common.compact_index import CompactIndex
+
+pytestmark = [pytest.mark.unit, pytest.mark.tool]
+
+
+def _plain(name_suffix=""):
+    return {
+        "agent": {"account": None, "password": "Pass@123", "email": f"a{name_suffix}@example.com"},
+        "merchant": {"account": None, "password": "Pass@123", "email": f"a{name_suffix}@example.com", "modetype": 2},
+    }
+
+
+def _compact():
+    index = CompactIndex()
+    index.add("小明", "Pass@123", "a1@example.com", 2)
+    index.add("小華", "Pass@123", "a2@example.com", 2)
+    return index
+
+
+def test_dict_like_view_matches_plain_dict():
+    index = _compact()
+    assert index == {"小明": _plain("1"), "小華": _plain("2")}
+    assert list(index) == ["小明", "小華"]
+    assert index["小明"]["merchant"]["modetype"] == 2
+    assert index["小明"]["agent"].get("uuid") is None
+    with pytest.raises(KeyError):
+        index["小明"]["agent"]["uuid"]
+
+
+def test_writes_go_to_columns_and_credentials_are_shared():
+    index = _compact()
+    index["小明"]["agent"]["account"] = "ag001"
+    index["小明"]["agent"]["uuid"] = "u-1"
+    assert index["小明"]["agent"].to_dict() == {
+        "account": "ag001", "password": "Pass@123", "email": "a1@example.com", "uuid": "u-1",
+    }
+    assert index.names_missing("agent", "account") == ["小華"]
+    assert index.column("agent", "uuid") == ["u-1", None]
+
+    # 個別改寫 merchant 信箱不影響 agent
+    index["小華"]["merchant"]["email"] = "m2@example.com"
+    assert index["小華"]["agent"]["email"] == "a2@example.com"
+    assert index["小華"]["merchant"]["email"] == "m2@example.com"
+    assert index._passwords[0] is index._passwords[1]
+
+
+def test_pickle_json_and_clear():
+    index = _compact()
+    index["小華"]["merchant"]["account"] = "me002"
+    restored = pickle.loads(pickle.dumps(index))
+    assert restored == index
+    assert json.loads(json.dumps(index.to_dict(), ensure_ascii=False)) == index
+
+    del restored["小明"]
+    assert list(restored) == ["小華"]
+    restored.clear()
+    assert restored == {}
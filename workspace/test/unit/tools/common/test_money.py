@@ -0,0 +1,137 @@
+# workspace/test/unit/tools/common/test_money.py
+from decimal import Decimal
+import numpy as np
+import pytest
+from workspace.tools.common.money import Amount, to_units, to_units_array, sum_units, div_round
+from workspace.tools.common.fee_calculator import (
+    calc_fee_and_realquant,
+    calc_fee_and_realquant_units,
+    calc_fee_and_realquant_units_bulk,
+)
+from workspace.tools.chain.builder import TronBuilder
+from workspace.config.error_code import ResultCode
+
+pytestmark = [pytest.mark.unit, pytest.mark.tool, pytest.mark.currency]
+
+
+# ------------------------------------------------------------
+# 🧩 to_units / Amount
+# ------------------------------------------------------------
+def test_to_units_float_is_exact():
+    # int(4.35 * 10**6) == 4349999，定點換算需為 4350000
+    assert to_units(4.35, 6) == 4_350_000
+    assert to_units("0.1", 6) == 100_000
+    assert to_units(Decimal("1.0000005"), 6) == 1_000_000   # 五成雙
+    assert to_units(7, 6) == 7_000_000
+
+
+def test_div_round_half_even():
+    assert div_round(5, 2) == 2
+    assert div_round(7, 2) == 4
+    assert div_round(-5, 2) == -2
+    assert div_round(11, 4) == 3
+
+
+def test_amount_arithmetic():
+    a = Amount.of("1.5")
+    b = Amount.of("0.25", decimals=8)
+    total = a + b
+    assert total.decimals == 8
+    assert total.to_decimal() == Decimal("1.75")
+    assert a - "0.5" == Amount.of(1)
+    assert float(Amount(12_500_000)) == 12.5
+    with pytest.raises(AttributeError):
+        a.units = 0
+
+
+def test_sum_units_exact():
+    units = to_units_array([0.1] * 1000, 6)
+    assert units.dtype == np.int64
+    assert sum_units(units) == 100_000_000
+
+
+def test_to_units_array_large_values_do_not_overflow():
+    big = 10 ** 12  # × 10^8 超出 int64
+    units = to_units_array([big, "0.5"], 8)
+    assert units.dtype == object
+    assert list(units) == [big * 10 ** 8, 50_000_000]
+    assert to_units_array(np.array([big], dtype=np.int64), 8).dtype == object
+
+
+# ------------------------------------------------------------
+# 🧩 手續費定點計算
+# ------------------------------------------------------------
+def test_fee_scalar_compat():
+    assert calc_fee_and_realquant(100, 3, 0.5) == (3.5, 96.5)
+    assert calc_fee_and_realquant(10, 3, 0.1) == (0.4, 9.6)
+
+
+def test_fee_units_fractional_percent():
+    fee, real = calc_fee_and_realquant_units(1_000_000, Decimal("0.35"), 0)
+    assert (fee, real) == (3_500, 996_500)
+
+
+def test_fee_percent_keeps_full_precision():
+    # 0.123456% 超過 4 位小數：不應捨入成 0.1235%
+    fee, _ = calc_fee_and_realquant_units(10 ** 12, Decimal("0.123456"), 0)
+    assert fee == 1_234_560_000
+    assert calc_fee_and_realquant(1000, 0.123456, 0)[0] == 1.23456
+
+    fees, _ = calc_fee_and_realquant_units_bulk(np.array([10 ** 12, 10 ** 10]), np.array([0.123456, 0.5]), 0)
+    assert list(fees) == [1_234_560_000, 50_000_000]
+
+
+def test_fee_units_bulk_matches_scalar():
+    quants = np.array([100_000_000, 2_500_000, 7, 123_456_789], dtype=np.int64)
+    fees, reals = calc_fee_and_realquant_units_bulk(quants, 3, 50)
+    for i, q in enumerate(quants):
+        assert (fees[i], reals[i]) == calc_fee_and_realquant_units(int(q), 3, 50)
+
+
+def test_fee_units_bulk_overflow_falls_back():
+    quants = np.array([2 ** 62], dtype=np.int64)
+    fees, reals = calc_fee_and_realquant_units_bulk(quants, 3.5, 0)
+    assert fees[0] == calc_fee_and_realquant_units(2 ** 62, Decimal("3.5"), 0)[0]
+
+
+# ------------------------------------------------------------
+# 🧩 TRC20 builder 金額換算
+# ------------------------------------------------------------
+class _FakeCall:
+    def __init__(self, sink, amount):
+        sink.append(amount)
+
+    def with_owner(self, _):
+        return self
+
+    def fee_limit(self, _):
+        return self
+
+    def build(self):
+        return "raw-tx"
+
+
+class _FakeContract:
+    def __init__(self):
+        self.amounts = []
+        sink = self.amounts
+
+        class _Functions:
+            @staticmethod
+            def transfer(to_address, amount):
+                return _FakeCall(sink, amount)
+
+        self.functions = _Functions()
+
+
+def test_builder_trc20_amount_units():
+    contract = _FakeContract()
+    txn, code = TronBuilder.build_trc20_transfer_tx(contract, "TFrom", "TTo", 4.35)
+    assert code == ResultCode.SUCCESS
+    assert contract.amounts == [4_350_000]
+
+
+def test_builder_trc20_invalid_amount():
+    txn, code = TronBuilder.build_trc20_transfer_tx(_FakeContract(), "TFrom", "TTo", "abc")
+    assert txn is None
+    assert code == ResultCode.tools_builder_invalid_params
@@ -0,0 +1,136 @@
+# workspace/test/unit/tools/common/test_rate_provider.py
+import json
+import threading
+import pytest
+from workspace.tools.common.rate_provider import RateProvider, StaticRateSource
+from workspace.tools.common.currency_converter import CurrencyConverter
+from workspace.config.error_code import ResultCode
+
+pytestmark = [pytest.mark.unit, pytest.mark.tool, pytest.mark.currency]
+
+RATES = {"TRX": 0.25, "USDT": 1.0, "USDD": 1.0}
+
+
+class _CountingSource:
+    def __init__(self, rates):
+        self.rates = rates
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        return dict(self.rates), ResultCode.SUCCESS
+
+
+# ------------------------------------------------------------
+# 🧩 CurrencyConverter 不需先 fetch_rates
+# ------------------------------------------------------------
+def test_convert_without_fetch():
+    converter = CurrencyConverter(RateProvider(StaticRateSource(RATES), cache_file=""))
+    value, code = converter.convert(100, "trx", "usdt")
+    assert code == ResultCode.SUCCESS
+    assert value == 25.0
+
+
+def test_convert_not_supported():
+    converter = CurrencyConverter(RateProvider(StaticRateSource(RATES), cache_file=""))
+    value, code = converter.convert(1, "BTC", "USDT")
+    assert value is None
+    assert code == ResultCode.tools_currency_not_supported
+
+
+def test_convert_source_failed():
+    provider = RateProvider(lambda: ({}, ResultCode.tools_currency_fetch_error), cache_file="")
+    value, code = CurrencyConverter(provider).convert(1, "TRX", "USDT")
+    assert value is None
+    assert code == ResultCode.tools_currency_fetch_error
+
+
+# ------------------------------------------------------------
+# 🧩 TTL 快取 / 背景更新
+# ------------------------------------------------------------
+def test_fresh_rates_hit_cache():
+    source = _CountingSource(RATES)
+    provider = RateProvider(source, ttl=60, cache_file="")
+    for _ in range(100):
+        provider.get_rates()
+    assert source.calls == 1
+
+
+def test_stale_rates_returned_then_refreshed():
+    source = _CountingSource(RATES)
+    provider = RateProvider(source, ttl=0, cache_file="")
+    provider.get_rates()
+
+    source.rates = {"TRX": 0.5, "USDT": 1.0, "USDD": 1.0}
+    rates, code = provider.get_rates()
+    assert code == ResultCode.SUCCESS
+    assert rates["TRX"] == 0.25          # 先回傳舊值
+
+    provider.wait_refresh(timeout=5)
+    assert provider.get_rates()[0]["TRX"] == 0.5
+
+
+def test_background_refresh_does_not_block():
+    release = threading.Event()
+
+    class _SlowSource:
+        calls = 0
+
+        def __call__(self):
+            self.calls += 1
+            if self.calls > 1:
+                release.wait(5)
+            return dict(RATES), ResultCode.SUCCESS
+
+    provider = RateProvider(_SlowSource(), ttl=0, cache_file="")
+    provider.get_rates()
+    rates, code = provider.get_rates()     # 背景更新卡住時仍立即回傳
+    assert code == ResultCode.SUCCESS
+    release.set()
+    provider.wait_refresh(timeout=5)
+
+
+# ------------------------------------------------------------
+# 🧩 磁碟快取
+# ------------------------------------------------------------
+def test_disk_cache_reused_across_instances(tmp_path):
+    cache_file = str(tmp_path / "rates.json")
+    RateProvider(StaticRateSource(RATES), cache_file=cache_file).get_rates()
+
+    source = _CountingSource({"TRX": 9.0, "USDT": 1.0, "USDD": 1.0})
+    rates, code = RateProvider(source, ttl=3600, cache_file=cache_file).get_rates()
+    assert code == ResultCode.SUCCESS
+    assert rates["TRX"] == 0.25
+    assert source.calls == 0
+
+
+def test_disk_cache_corrupted(tmp_path):
+    cache_file = tmp_path / "rates.json"
+    cache_file.write_text("{broken", encoding="utf-8")
+    rates, code = RateProvider(StaticRateSource(RATES), cache_file=str(cache_file)).get_rates()
+    assert code == ResultCode.SUCCESS
+    assert json.loads(cache_file.read_text(encoding="utf-8"))["rates"]["TRX"] == 0.25
+
+
+def test_ancient_disk_rates_not_served(tmp_path):
+    cache_file = tmp_path / "rates.json"
+    cache_file.write_text(json.dumps({"rates": RATES, "fetched_at": 0}), encoding="utf-8")
+
+    failing = RateProvider(lambda: ({}, ResultCode.tools_currency_fetch_error), cache_file=str(cache_file), max_stale=3600)
+    assert failing.get_rates() == ({}, ResultCode.tools_currency_rates_expired)
+
+    # 可更新時同步取得新匯率
+    source = _CountingSource({"TRX": 0.5, "USDT": 1.0, "USDD": 1.0})
+    rates, code = RateProvider(source, cache_file=str(cache_file), max_stale=3600).get_rates()
+    assert code == ResultCode.SUCCESS and rates["TRX"] == 0.5
+
+
+def test_concurrent_saves_leave_no_temp_files(tmp_path):
+    provider = RateProvider(StaticRateSource(RATES), cache_file=str(tmp_path / "rates.json"))
+    threads = [threading.Thread(target=provider.refresh) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert [p.name for p in tmp_path.iterdir()] == ["rates.json"]
+    assert json.loads((tmp_path / "rates.json").read_text(encoding="utf-8"))["rates"] == RATES
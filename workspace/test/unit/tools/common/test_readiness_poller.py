@@ -0,0 +1,59 @@
+import asyncio
+import pytest
+from workspace.tools.common.readiness_poller import poll_until_ready
+from workspace.config.error_code import ResultCode
+
+pytestmark = [pytest.mark.unit, pytest.mark.tool]
+
+
+class FakeClock:
+    """以假時鐘取代 monotonic / sleep，記錄每次等待秒數"""
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    async def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def _poll(probe, clock, **kwargs):
+    return asyncio.run(poll_until_ready(probe, sleep=clock.sleep, clock=clock, **kwargs))
+
+
+def test_returns_as_soon_as_ready_with_backoff():
+    clock = FakeClock()
+    answers = iter([(False, 0), (False, 1), (False, 2), (True, 3)])
+    assert _poll(lambda: next(answers), clock, timeout=140) == (3, ResultCode.SUCCESS)
+    assert clock.sleeps == [1.0, 2.0, 4.0]
+
+
+def test_timeout_bounds_total_wait():
+    clock = FakeClock()
+    value, code = _poll(lambda: (False, "pending"), clock, timeout=20, max_interval=8)
+    assert (value, code) == ("pending", ResultCode.tools_poll_timeout)
+    # 1 + 2 + 4 + 8 = 15，最後一次縮短為 5 秒剛好到上限
+    assert clock.sleeps == [1.0, 2.0, 4.0, 8.0, 5.0]
+    assert sum(clock.sleeps) == 20
+
+
+def test_async_probe_and_exceptions():
+    clock = FakeClock()
+    calls = []
+
+    async def probe():
+        calls.append(1)
+        if len(calls) == 1:
+            raise ConnectionError("暫時無法連線")
+        return True, "ok"
+
+    assert _poll(probe, clock) == ("ok", ResultCode.SUCCESS)
+
+    def broken():
+        raise ConnectionError("down")
+
+    assert _poll(broken, FakeClock(), timeout=3) == (None, ResultCode.tools_poll_probe_error)
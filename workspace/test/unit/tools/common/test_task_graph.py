@@ -0,0 +1,96 @@
+# workspace/test/unit/tools/common/test_task_graph.py
+import asyncio
+import pytest
+from workspace.tools.common.task_graph import expand_requires, build_graph, topo_levels, run_graph
+from workspace.config.error_code import ResultCode
+
+pytestmark = [pytest.mark.unit, pytest.mark.tool]
+
+REQUIRES = {"load": (), "login": ("load",), "create": ("login",), "query": ("login",), "scan": ("load",)}
+AFTER = {"query": ("create",)}
+
+
+def test_expand_and_order():
+    nodes, code = expand_requires(["query", "scan"], REQUIRES)
+    assert code == ResultCode.SUCCESS
+    assert set(nodes) == {"query", "login", "load", "scan"}
+
+    # after 只在兩者都被選取時生效
+    graph, _ = build_graph(nodes, REQUIRES, AFTER)
+    assert graph["query"] == {"login"}
+    graph, _ = build_graph(nodes + ["create"], REQUIRES, AFTER)
+    assert graph["query"] == {"login", "create"}
+
+    levels, _ = topo_levels(graph)
+    assert levels[0] == ["load"]
+    assert levels.index(["create"]) < levels.index(["query"])
+
+
+def test_unknown_node_and_cycle():
+    assert expand_requires(["nope"], REQUIRES)[1] == ResultCode.tools_graph_unknown_node
+    assert build_graph(["a", "b"], {"a": ("b",), "b": ("a",)})[1] == ResultCode.tools_graph_cycle
+
+
+def test_independent_nodes_run_concurrently():
+    graph, _ = build_graph(["load", "login", "scan"], REQUIRES)
+    login_started = asyncio.Event()
+
+    async def run_node(name):
+        if name == "login":
+            login_started.set()
+        if name == "scan":
+            # scan 與 login 同時執行才會等到 login 啟動
+            await asyncio.wait_for(login_started.wait(), timeout=1)
+        await asyncio.sleep(0)
+        return ResultCode.SUCCESS
+
+    results, code = asyncio.run(run_graph(graph, run_node))
+    assert code == ResultCode.SUCCESS
+    assert set(results) == {"load", "login", "scan"}
+
+
+def test_failure_skips_required_dependents_but_not_after():
+    nodes = ["load", "login", "create", "query", "scan"]
+    graph, _ = build_graph(nodes, REQUIRES, AFTER)
+    ran = []
+
+    async def run_node(name):
+        ran.append(name)
+        if name == "create":
+            return ResultCode.task_create_agent_failed
+        if name == "scan":
+            raise RuntimeError("boom")
+        return ResultCode.SUCCESS
+
+    results, code = asyncio.run(run_graph(graph, run_node, requires=REQUIRES))
+    assert code in (ResultCode.task_create_agent_failed, ResultCode.tools_graph_node_exception)
+    assert results["create"]["code"] == ResultCode.task_create_agent_failed
+    assert results["query"]["code"] == ResultCode.SUCCESS  # 只是排序在 create 之後
+    assert results["scan"]["code"] == ResultCode.tools_graph_node_exception
+    assert ran.index("create") < ran.index("query")
+
+    failing = {"load": (), "login": ("load",), "create": ("login",)}
+    graph, _ = build_graph(failing, failing)
+
+    async def fail_load(name):
+        return ResultCode.tools_loader_file_not_found if name == "load" else ResultCode.SUCCESS
+
+    results, code = asyncio.run(run_graph(graph, fail_load))
+    assert code == ResultCode.tools_loader_file_not_found
+    assert results["login"]["code"] == results["create"]["code"] == ResultCode.tools_graph_skipped
+
+
+def test_max_concurrency_limits_running_nodes():
+    graph = {name: set() for name in "abcd"}
+    active, peak = 0, 0
+
+    async def run_node(name):
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0.01)
+        active -= 1
+        return ResultCode.SUCCESS
+
+    asyncio.run(run_graph(graph, run_node, max_concurrency=2))
+    assert peak == 2
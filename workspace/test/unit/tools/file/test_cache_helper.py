@@ -0,0 +1,79 @@
+import os
+import pytest
+from workspace.tools.file.cache_helper import (
+    file_fingerprint,
+    fingerprint_sources,
+    load_parsed_cache,
+    save_parsed_cache,
+    clear_parsed_cache,
+)
+from workspace.config.error_code import ResultCode
+
+pytestmark = [pytest.mark.unit, pytest.mark.tool, pytest.mark.file]
+
+
+@pytest.fixture
+def source(tmp_path):
+    path = tmp_path / "names.csv"
+    path.write_text("name\n小明\n", encoding="utf-8")
+    return str(path)
+
+
+def test_cache_roundtrip(tmp_path, source):
+    cache = str(tmp_path / "cache" / "index.pkl")
+    assert load_parsed_cache(cache, [source], 1) == (None, ResultCode.tools_cache_miss)
+    assert save_parsed_cache(cache, [source], 1, {"小明": 1}) == ResultCode.SUCCESS
+    assert load_parsed_cache(cache, [source], 1) == ({"小明": 1}, ResultCode.SUCCESS)
+    # 版本不同 → 未命中
+    assert load_parsed_cache(cache, [source], 2)[1] == ResultCode.tools_cache_miss
+
+
+def test_cache_touch_same_content_still_hits(tmp_path, source):
+    cache = str(tmp_path / "index.pkl")
+    save_parsed_cache(cache, [source], 1, "payload")
+    st = os.stat(source)
+    os.utime(source, ns=(st.st_atime_ns, st.st_mtime_ns + 5_000_000_000))
+    assert load_parsed_cache(cache, [source], 1) == ("payload", ResultCode.SUCCESS)
+
+
+def test_cache_same_size_different_content_misses(tmp_path, source):
+    cache = str(tmp_path / "index.pkl")
+    save_parsed_cache(cache, [source], 1, "payload")
+    st = os.stat(source)
+    with open(source, "w", encoding="utf-8") as f:
+        f.write("name\n小華\n")
+    os.utime(source, ns=(st.st_atime_ns, st.st_mtime_ns + 5_000_000_000))
+    assert load_parsed_cache(cache, [source], 1) == (None, ResultCode.tools_cache_miss)
+
+
+def test_cache_not_written_when_source_changes_during_parse(tmp_path, source):
+    cache = str(tmp_path / "index.pkl")
+    sources, code = fingerprint_sources([source])  # 解析前取指紋
+    assert code == ResultCode.SUCCESS
+
+    st = os.stat(source)
+    with open(source, "w", encoding="utf-8") as f:
+        f.write("name\n小華\n小美\n")  # 解析期間被修改
+    os.utime(source, ns=(st.st_atime_ns, st.st_mtime_ns + 5_000_000_000))
+
+    assert save_parsed_cache(cache, [source], 1, "舊內容", sources=sources) == ResultCode.tools_cache_miss
+    assert not os.path.exists(cache)
+
+    sources, _ = fingerprint_sources([source])
+    assert save_parsed_cache(cache, [source], 1, "新內容", sources=sources) == ResultCode.SUCCESS
+    assert load_parsed_cache(cache, [source], 1) == ("新內容", ResultCode.SUCCESS)
+
+
+def test_cache_corrupted_and_clear(tmp_path, source):
+    cache = tmp_path / "index.pkl"
+    cache.write_bytes(b"not a pickle")
+    assert load_parsed_cache(str(cache), [source], 1) == (None, ResultCode.tools_cache_read_failed)
+    assert clear_parsed_cache(str(cache)) == ResultCode.SUCCESS
+    assert not cache.exists()
+
+
+def test_fingerprint_hash(source):
+    fp, code = file_fingerprint(source)
+    assert code == ResultCode.SUCCESS
+    assert fp["size"] == os.path.getsize(source)
+    assert len(fp["sha256"]) == 64
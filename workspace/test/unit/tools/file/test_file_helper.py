@@ -1,6 +1,6 @@
 import os
 import pytest
-from workspace.tools.file.file_helper import list_files_by_ext, file_exists, list_all_files
+from workspace.tools.file.file_helper import list_files_by_ext, file_exists, list_all_files, read_json, write_json_atomic, load_or_create_secret
 from workspace.config.error_code import ResultCode
 
 pytestmark = [pytest.mark.unit, pytest.mark.tool, pytest.mark.file]
@@ -137,3 +137,51 @@ def test_list_all_files_success(tmp_path):
     files, code = list_all_files(str(tmp_path))
     assert code == ResultCode.SUCCESS
     assert len(files) == 2
+
+
+# ------------------------------------------------------------
+# 🧩 read_json / write_json_atomic 測試
+# ------------------------------------------------------------
+def test_json_roundtrip(tmp_path):
+    path = str(tmp_path / "state" / "data.json")
+    data, code = read_json(path)
+    assert data is None
+    assert code == ResultCode.tools_file_not_found
+
+    assert write_json_atomic(path, {"名稱": [1, 2]}) == ResultCode.SUCCESS
+    assert read_json(path) == ({"名稱": [1, 2]}, ResultCode.SUCCESS)
+    assert not os.path.exists(path + ".tmp")
+
+
+def test_write_json_atomic_mode_and_secret(tmp_path):
+    path = str(tmp_path / "state" / "data.json")
+    assert write_json_atomic(path, {}, mode=0o600) == ResultCode.SUCCESS
+    assert os.stat(path).st_mode & 0o777 == 0o600
+
+    secret_path = str(tmp_path / "state" / "secret")
+    secret, code = load_or_create_secret(secret_path)
+    assert code == ResultCode.SUCCESS and len(secret) == 32
+    assert os.stat(secret_path).st_mode & 0o777 == 0o600
+    assert load_or_create_secret(secret_path) == (secret, ResultCode.SUCCESS)
+    assert sorted(os.listdir(tmp_path / "state")) == ["data.json", "secret"]  # 暫存檔已移除
+
+
+def test_private_writes_without_fchmod(tmp_path, monkeypatch):
+    monkeypatch.delattr(os, "fchmod", raising=False)  # Windows（Python < 3.13）沒有 os.fchmod
+    path = str(tmp_path / "state" / "data.json")
+    assert write_json_atomic(path, {"a": 1}, mode=0o600) == ResultCode.SUCCESS
+    secret, code = load_or_create_secret(str(tmp_path / "state" / "secret"))
+    assert code == ResultCode.SUCCESS and len(secret) == 32
+    assert sorted(os.listdir(tmp_path / "state")) == ["data.json", "secret"]
+
+
+def test_failed_write_removes_temp_file(tmp_path):
+    path = str(tmp_path / "data.json")
+    assert write_json_atomic(path, {"a": object()}, mode=0o600) == ResultCode.tools_file_write_failed
+    assert os.listdir(tmp_path) == []
+
+
+def test_read_json_invalid(tmp_path):
+    path = tmp_path / "bad.json"
+    path.write_text("{bad", encoding="utf-8")
+    assert read_json(str(path)) == (None, ResultCode.tools_file_read_failed)
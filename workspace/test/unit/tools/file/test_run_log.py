@@ -0,0 +1,156 @@
+import json
+import pytest
+from workspace.tools.file import run_log
+from workspace.tools.file.run_log import RunLog, configure_run_log, log_records, query_run_log
+from workspace.config.error_code import ResultCode
+
+pytestmark = [pytest.mark.unit, pytest.mark.tool, pytest.mark.file]
+
+
+@pytest.fixture
+def log_path(tmp_path):
+    path = str(tmp_path / "logs" / "run_log.jsonl")
+    configure_run_log(path)
+    yield path
+    configure_run_log(None)
+
+
+def _records():
+    return [
+        {
+            "type": "debug",
+            "name": "小明",
+            "message": "[OPS] API 請求完成",
+            "code": ResultCode.SUCCESS,
+            "elapsed": 0.12345,
+            "request": {"method": "POST", "url": "http://x/api", "headers": {"Sid": "secret-sid"},
+                        "payload": {"Name": "小明", "Password": "pw", "OtpCode": "123456"}},
+            "response": {"status_code": 200, "text": "{}", "parsed": {}},
+        },
+        {"type": "error", "message": "[小華] API 回傳錯誤"},
+    ]
+
+
+def test_log_records_writes_masked_lines(log_path):
+    assert log_records(_records(), "OPS", 4, "批次新增代理商帳號", ResultCode.task_api_failed, 1.5) == ResultCode.SUCCESS
+    run_log.get_run_log().flush()
+
+    with open(log_path, encoding="utf-8") as f:
+        lines = [json.loads(line) for line in f]
+    assert [line["type"] for line in lines] == ["debug", "error", "step"]
+
+    request_entry, error_entry, step_entry = lines
+    assert request_entry["name"] == "小明" and request_entry["code"] == 0
+    assert request_entry["request"]["headers"] == {"Sid": "***"}
+    assert request_entry["request"]["payload"] == {"Name": "小明", "Password": "***", "OtpCode": "***"}
+    assert "parsed" not in request_entry["response"]
+    # record 沒有自己的 code → 沿用步驟 code
+    assert error_entry["code"] == ResultCode.task_api_failed
+    assert step_entry["elapsed"] == 1.5 and step_entry["message"] == "批次新增代理商帳號"
+
+
+def test_compact_records_keep_name_code_elapsed(log_path):
+    compact = {"type": "debug", "response": {"parsed": {"Code": 0}}, "code": ResultCode.SUCCESS, "elapsed": 0.05, "name": "小明"}
+    assert log_records([compact], "Task", "create_agent", "建立代理", ResultCode.SUCCESS, 1.0) == ResultCode.SUCCESS
+    run_log.get_run_log().flush()
+
+    entries, _ = query_run_log(log_path, name="小明")
+    assert len(entries) == 1
+    assert (entries[0]["code"], entries[0]["elapsed"]) == (int(ResultCode.SUCCESS), 0.05)
+    assert "request" not in entries[0] and "response" not in entries[0]
+
+
+def test_unconfigured_log_is_noop(tmp_path):
+    configure_run_log(None)
+    assert log_records(_records(), "OPS", 1) == ResultCode.SUCCESS
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_rotation_keeps_bounded_backups(tmp_path):
+    path = str(tmp_path / "run_log.jsonl")
+    writer = RunLog(path, max_bytes=200, backups=2)
+    for i in range(20):
+        assert writer.write([{"i": i, "pad": "x" * 50}]) == ResultCode.SUCCESS
+    writer.close()
+
+    files = sorted(p.name for p in tmp_path.iterdir())
+    assert files == ["run_log.jsonl", "run_log.jsonl.1", "run_log.jsonl.2"]
+    assert all(p.stat().st_size <= 200 for p in tmp_path.iterdir())
+
+    # 查詢會依序讀取輪替檔（由舊到新），最後一筆一定保留
+    entries, code = query_run_log(path)
+    assert code == ResultCode.SUCCESS
+    indices = [e["i"] for e in entries]
+    assert indices == sorted(indices) and indices[-1] == 19
+
+
+def test_query_filters(log_path):
+    log_records(_records(), "OPS", 4, "批次新增代理商帳號", ResultCode.SUCCESS, 1.0)
+    log_records([], "Loader", 1, "讀取系統設定", ResultCode.SUCCESS, 0.1)
+    run_log.get_run_log().flush()
+
+    assert len(query_run_log(log_path, stage="OPS")[0]) == 3
+    assert len(query_run_log(log_path, stage="OPS.4")[0]) == 3
+    assert len(query_run_log(log_path, stage="OPS.5")[0]) == 0
+    assert [e["name"] for e in query_run_log(log_path, name="小明")[0]] == ["小明"]
+    assert [e["type"] for e in query_run_log(log_path, rtype="step")[0]] == ["step", "step"]
+    assert len(query_run_log(log_path, run="last")[0]) == 4
+
+
+def test_task_level_failures_queryable_by_code_and_name(log_path, monkeypatch):
+    import asyncio
+    from workspace.tasks.ops import query_agent_uuid_task as task_module
+
+    async def fake_batch(context, role, api_group, path_key, names=None, **kwargs):
+        return [
+            ("小明", ResultCode.SUCCESS, [{"type": "debug", "name": "小明", "response": {"parsed": {"Code": 7}}}]),
+            ("小華", ResultCode.tools_request_timeout, []),
+        ]
+
+    monkeypatch.setattr(task_module, "send_batch_api_requests", fake_batch)
+    context = {"INDEX": {"小明": {"agent": {}}, "小華": {"agent": {}}}}
+    _, code, records = asyncio.run(task_module.query_agent_uuid_task(context))
+    log_records(records, "Task", "query_agent", "查詢代理帳號 UUID", code)
+    run_log.get_run_log().flush()
+
+    entries, _ = query_run_log(log_path, code=int(ResultCode.task_query_agent_code_invalid))
+    assert [(e["type"], e["name"]) for e in entries] == [("error", "小明")]
+    entries, _ = query_run_log(log_path, name="小華")
+    assert [(e["type"], e["code"]) for e in entries] == [("error", int(ResultCode.tools_request_timeout))]
+
+
+def test_query_skips_broken_lines_and_missing_file(tmp_path):
+    path = tmp_path / "run_log.jsonl"
+    assert query_run_log(str(path)) == ([], ResultCode.tools_file_not_found)
+
+    path.write_text('{"stage": "OPS", "code": 0}\n{"stage": "OP', encoding="utf-8")
+    entries, code = query_run_log(str(path), code=0)
+    assert code == ResultCode.SUCCESS and len(entries) == 1
+
+
+def test_no_credentials_reach_the_log(log_path, monkeypatch):
+    import os
+    import stat
+    from workspace.tasks.common import login_task
+
+    monkeypatch.setattr(login_task, "send_api_request", lambda **kwargs: (
+        {"Code": 0, "Result": {"Sid": "sid-Secret42", "Uuid": "uuid-1"}}, ResultCode.SUCCESS))
+    context = {
+        "COMMON": {"BACKEND_RA_BASE_URL": "https://ra",
+                   "OPS": {"USERNAME": "admin", "PASSWORD": "Hunter2pw", "OTP_SECRET": "JBSWY3DP", "LOGIN_OTP": "654321"}},
+        "API": {"LOGIN_PATHS": {"OPS": "/operator/login"}},
+    }
+    _, code, records = login_task.common_login(context, "OPS")
+    assert code == ResultCode.SUCCESS
+
+    records.append({"type": "debug", "message": "[OPS] Payload: {'Password': 'Hunter2pw', 'OtpCode': '654321'}",
+                    "request": {"payload": {"Items": [{"Password": "Hunter2pw"}]}, "headers": {"Sid": "sid-Secret42"}},
+                    "response": {"status_code": 200, "text": '{"Result": {"Sid": "sid-Secret42"}}'}})
+    log_records(records, "OPS", 1, "取得登入 Session", code)
+    run_log.get_run_log().flush()
+
+    content = open(log_path, encoding="utf-8").read()
+    for secret in ("Hunter2pw", "654321", "JBSWY3DP", "sid-Secr"):
+        assert secret not in content
+    if os.name == "posix":
+        assert stat.S_IMODE(os.stat(log_path).st_mode) == 0o600
@@ -0,0 +1,47 @@
+import os
+import stat
+import pytest
+from workspace.tools.file.session_store import session_key, load_session, save_session, clear_session
+from workspace.config.error_code import ResultCode
+
+pytestmark = [pytest.mark.unit, pytest.mark.tool, pytest.mark.file]
+
+
+def test_session_roundtrip_and_expiry(tmp_path):
+    path = str(tmp_path / "state" / "sessions.json")
+    key = session_key("https://ra", "OPS", "acc", "pw", "SECRET")
+    assert load_session(path, key, 60) == (None, ResultCode.tools_session_miss)
+
+    assert save_session(path, key, "sid-1", "uuid-1", now=1000) == ResultCode.SUCCESS
+    session, code = load_session(path, key, 60, now=1030)
+    assert code == ResultCode.SUCCESS
+    assert (session["SSID"], session["UUID"]) == ("sid-1", "uuid-1")
+
+    # 超過 max_age → 未命中
+    assert load_session(path, key, 60, now=1061) == (None, ResultCode.tools_session_miss)
+
+    assert clear_session(path, key) == ResultCode.SUCCESS
+    assert load_session(path, key, 60, now=1030) == (None, ResultCode.tools_session_miss)
+
+
+def test_session_file_is_private_and_hashed(tmp_path):
+    path = str(tmp_path / "sessions.json")
+    key = session_key("https://ra", "OPS", "acc", "pw", "SECRET")
+    save_session(path, key, "sid-1", "uuid-1")
+
+    if os.name == "posix":
+        assert stat.S_IMODE(os.stat(path).st_mode) == 0o600
+    content = open(path, encoding="utf-8").read()
+    assert "acc" not in content and "pw" not in content and "SECRET" not in content
+
+    # 密碼變更 → 索引不同，舊 Session 不會被沿用
+    assert load_session(path, session_key("https://ra", "OPS", "acc", "pw2", "SECRET"), 60)[1] == ResultCode.tools_session_miss
+
+
+def test_corrupted_session_file(tmp_path):
+    path = tmp_path / "sessions.json"
+    path.write_text("{not json", encoding="utf-8")
+    assert load_session(str(path), "k", 60) == (None, ResultCode.tools_session_read_failed)
+    # 寫入時覆蓋損毀的檔案
+    assert save_session(str(path), "k", "sid", None) == ResultCode.SUCCESS
+    assert load_session(str(path), "k", 60)[1] == ResultCode.SUCCESS
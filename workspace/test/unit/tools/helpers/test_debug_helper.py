@@ -0,0 +1,44 @@
+import sys
+import pytest
+from workspace.tools.helpers.debug_helper import RunConfig, get_run_config, is_debug, resolve_run_config
+from workspace.tools.file.run_log import configure_run_log
+
+pytestmark = [pytest.mark.unit, pytest.mark.tool]
+
+
+@pytest.fixture(autouse=True)
+def _plain_argv(monkeypatch):
+    monkeypatch.setattr(sys, "argv", ["main.py", "controller", "main"])
+    configure_run_log(None)
+
+
+def test_context_debug_resolved_once_and_cached():
+    context = {"COMMON": {"DEBUG": "true"}}
+    assert is_debug(context) is True
+    assert context["RUN"] == RunConfig(debug=True, records=True)
+
+    # 已解析 → 之後改 COMMON 不再影響本次執行
+    context["COMMON"]["DEBUG"] = False
+    assert is_debug(context) is True
+
+
+def test_cli_flag_overrides_context(monkeypatch):
+    monkeypatch.setattr(sys, "argv", ["main.py", "--No-Debug"])
+    assert is_debug({"COMMON": {"DEBUG": True}}) is False
+    monkeypatch.setattr(sys, "argv", ["main.py", "--debug"])
+    assert is_debug({"COMMON": {"DEBUG": False}}) is True
+
+
+def test_no_cache_before_system_settings_loaded():
+    context = {}
+    assert get_run_config(context) == RunConfig(debug=False, records=False)
+    assert "RUN" not in context
+
+
+def test_run_log_does_not_force_full_records(tmp_path):
+    configure_run_log(str(tmp_path / "run_log.jsonl"))
+    try:
+        # run_log 預設開啟：仍走精簡記錄（run_log 只寫 name / code / elapsed）
+        assert resolve_run_config({"COMMON": {"DEBUG": False}}) == RunConfig(debug=False, records=False)
+    finally:
+        configure_run_log(None)
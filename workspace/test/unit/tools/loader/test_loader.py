@@ -1,12 +1,16 @@
 # workspace/test/unit/tools/test_loader.py
 import os
+import sys
 import json
+import subprocess
 import pytest
 import pandas as pd
 from workspace.tools.loader.loader import (
     load_system_env,
     load_profile_env,
     load_profile_file,
+    iter_profile_csv,
+    iter_profile_xlsx,
     load_to_env,
     get_env,
     get_all_env,
@@ -132,3 +136,146 @@ def test_load_to_env_and_getters(tmp_path):
     all_env, code2 = get_all_env()
     assert code2 == ResultCode.SUCCESS
     assert "HELLO" in all_env
+
+
+# ------------------------------------------------------------
+# 🧩 CSV 串流讀取
+# ------------------------------------------------------------
+def _write_csv(tmp_path, text):
+    csv_file = tmp_path / "names.csv"
+    csv_file.write_text(text, encoding="utf-8")
+    return str(csv_file)
+
+
+def test_csv_stream_is_lazy(tmp_path):
+    path = _write_csv(tmp_path, "name,password,email,modetype\n小明,Pass@123,xm@example.com,1\n小華,Abc@456,xh@example.com,2\n")
+    stream, code = iter_profile_csv(path, engine="csv")
+    assert code == ResultCode.SUCCESS
+    it = iter(stream)
+    assert next(it)["name"] == "小明"
+    assert stream.count == 1
+    assert next(it)["name"] == "小華"
+
+
+@pytest.mark.parametrize("engine", ["csv", "auto", "pandas"])
+def test_csv_engines_match_pandas_semantics(tmp_path, engine):
+    path = _write_csv(
+        tmp_path,
+        "\ufeffname,password,email,modetype\n"
+        "小明,Pass@123,xm@example.com,1\n"
+        "\"A, b\",,x@y.com,\n"
+        "\n"
+        "小華,Abc@456,xh@example.com\n",
+    )
+    data, code = load_profile_file(path, csv_engine=engine)
+    assert code == ResultCode.SUCCESS
+    assert data["records"] == [
+        {"name": "小明", "password": "Pass@123", "email": "xm@example.com", "modetype": "1"},
+        {"name": "A, b", "password": "", "email": "x@y.com", "modetype": ""},
+        {"name": "小華", "password": "Abc@456", "email": "xh@example.com", "modetype": ""},
+    ]
+
+
+@pytest.mark.parametrize("engine", ["csv", "auto"])
+@pytest.mark.parametrize("text", [
+    "name,password,name,modetype\n小明,Pass@123,小華,1\n",            # 欄位名稱重複
+    "name,password,email,modetype\n小明,Pass@123,xm@example.com,1,多的\n",  # 多出有值的欄位
+])
+def test_csv_rejects_ambiguous_columns(tmp_path, engine, text):
+    data, code = load_profile_file(_write_csv(tmp_path, text), csv_engine=engine)
+    assert code == ResultCode.tools_loader_read_failed
+
+
+def test_csv_ignores_trailing_empty_cells(tmp_path):
+    path = _write_csv(tmp_path, "name,password\n小明,Pass@123,,\n")
+    data, code = load_profile_file(path, csv_engine="csv")
+    assert code == ResultCode.SUCCESS
+    assert data["records"] == [{"name": "小明", "password": "Pass@123"}]
+
+
+def test_csv_stream_unknown_engine(tmp_path):
+    path = _write_csv(tmp_path, "name\n小明\n")
+    stream, code = iter_profile_csv(path, engine="xlsx")
+    assert stream is None
+    assert code == ResultCode.tools_loader_unsupported_format
+
+
+def test_csv_load_does_not_import_pandas(tmp_path):
+    path = _write_csv(tmp_path, "name,password,email,modetype\n小明,Pass@123,xm@example.com,1\n")
+    script = (
+        "import sys\n"
+        "from workspace.tools.loader.loader import load_profile_file\n"
+        f"data, code = load_profile_file({path!r})\n"
+        "assert code == 0 and data['records'][0]['name'] == '小明'\n"
+        "print('pandas' in sys.modules)\n"
+    )
+    root = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "..", "..", ".."))
+    out = subprocess.run([sys.executable, "-c", script], cwd=root, capture_output=True, text=True, check=True)
+    assert out.stdout.strip() == "False"
+
+
+# ------------------------------------------------------------
+# 🧩 XLSX 串流讀取
+# ------------------------------------------------------------
+def _write_xlsx(tmp_path, rows):
+    from openpyxl import Workbook
+    wb = Workbook()
+    ws = wb.active
+    for row in rows:
+        ws.append(row)
+    path = tmp_path / "names.xlsx"
+    wb.save(path)
+    return str(path)
+
+
+def test_xlsx_success_same_shape_as_csv(tmp_path):
+    path = _write_xlsx(tmp_path, [
+        ["name", "password", "email", "modetype"],
+        ["小明", "Pass@123", "xm@example.com", 1],
+        [None, None, None, None],
+        ["小華", "Abc@456", None, 2.0],
+    ])
+    data, code = load_profile_file(path)
+    assert code == ResultCode.SUCCESS
+    assert data["meta"] == {"path": path, "source_type": ".xlsx", "record_count": 2}
+    assert data["records"] == [
+        {"name": "小明", "password": "Pass@123", "email": "xm@example.com", "modetype": "1"},
+        {"name": "小華", "password": "Abc@456", "email": "", "modetype": "2"},
+    ]
+
+
+def test_xlsx_stream_is_lazy(tmp_path):
+    path = _write_xlsx(tmp_path, [["name"], ["小明"], ["小華"]])
+    stream, code = iter_profile_xlsx(path)
+    assert code == ResultCode.SUCCESS
+    it = iter(stream)
+    assert next(it) == {"name": "小明"}
+    assert stream.count == 1
+
+
+def test_xlsx_workbook_opened_once(tmp_path, monkeypatch):
+    import openpyxl
+
+    path = _write_xlsx(tmp_path, [["name"], ["小明"]])
+    opened = []
+    real = openpyxl.load_workbook
+    monkeypatch.setattr(openpyxl, "load_workbook", lambda *a, **k: opened.append(a) or real(*a, **k))
+    data, code = load_profile_file(path)
+    assert code == ResultCode.SUCCESS and data["records"] == [{"name": "小明"}]
+    assert len(opened) == 1
+
+
+def test_xlsx_corrupted_stream_reports_code(tmp_path):
+    path = tmp_path / "names.xlsx"
+    path.write_text("不是 xlsx", encoding="utf-8")
+    stream, code = iter_profile_xlsx(str(path))
+    assert code == ResultCode.SUCCESS
+    assert list(stream) == []
+    assert stream.code == ResultCode.tools_loader_read_failed
+
+
+def test_xlsx_corrupted_file(tmp_path):
+    path = tmp_path / "names.xlsx"
+    path.write_text("不是 xlsx", encoding="utf-8")
+    data, code = load_profile_file(str(path))
+    assert code == ResultCode.tools_loader_read_failed
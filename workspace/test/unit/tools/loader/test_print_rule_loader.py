@@ -0,0 +1,35 @@
+import pytest
+from workspace.tools.loader.print_rule_loader import build_rule_tables
+from workspace.tools.printer.rule_table import PrinterRule
+
+pytestmark = [pytest.mark.unit, pytest.mark.tool, pytest.mark.loader]
+
+
+REGISTRY = {
+    "indent_unit": 2,
+    "controller_level": {"Main": 0, "OPS": 1},
+    "printer_rules": {
+        "step": {"enabled": True, "symbol": "└─ ", "offset": 0},
+        "debug": {"enabled": True, "symbol": "└─ ", "offset": 2},
+    },
+    "overrides": {"step": {"Main": {"enabled": False}}},
+}
+
+
+def test_rule_table_precomputes_indent_and_symbol():
+    tables = build_rule_tables(REGISTRY)
+
+    assert tables["step"].get("OPS") == PrinterRule(True, "  ", " └─ ", "   └─ ")
+    # 覆寫關閉畫線 → 不顯示符號
+    assert tables["step"].get("Main") == PrinterRule(False, "", "", "")
+    assert tables["debug"].get("OPS").lead == " " * 6 + " └─ "   # (層級 1 + offset 2) × 2 格
+
+
+def test_unknown_prefix_uses_default_rule():
+    tables = build_rule_tables(REGISTRY)
+
+    # 未登記的 prefix（例如批次記錄用的 "OPS-小明"）→ 層級 0 + printer offset
+    assert "OPS-小明" not in tables["debug"]
+    assert tables["debug"].get("OPS-小明") == PrinterRule(True, "    ", " └─ ", "     └─ ")
+    # 未定義的 printer 類型 → 不畫線、不縮排
+    assert tables["context"].get("OPS") == PrinterRule(False, "  ", "", "  ")
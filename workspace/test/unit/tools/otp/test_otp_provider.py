@@ -0,0 +1,115 @@
+import asyncio
+import pyotp
+import pytest
+from workspace.tools.otp import otp_generator
+from workspace.tools.otp.otp_generator import OtpProvider, get_otp_provider
+from workspace.tasks.common import common_async_task
+from workspace.tasks.common.common_async_task import send_batch_api_requests
+from workspace.tasks.ops.create_agent_task import CREATE_AGENT_PAYLOAD
+from workspace.config.error_code import ResultCode
+
+pytestmark = [pytest.mark.unit, pytest.mark.tool]
+
+SECRET = "JBSWY3DPEHPK3PXP"
+
+
+class FakeClock:
+    def __init__(self, now: float):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class CountingTotp(pyotp.TOTP):
+    calls = 0
+
+    def generate_otp(self, input):
+        CountingTotp.calls += 1
+        return super().generate_otp(input)
+
+
+def test_provider_caches_otp_per_window():
+    clock = FakeClock(1_000_000 * 30 + 5)
+    CountingTotp.calls = 0
+    provider = OtpProvider(CountingTotp(SECRET), clock=clock)
+    expected = pyotp.TOTP(SECRET)
+
+    first, code = provider.now()
+    assert code == ResultCode.SUCCESS
+    assert first == expected.at(clock.now)
+    assert provider.remaining() == pytest.approx(25)
+
+    clock.now += 10
+    assert provider.now() == (first, ResultCode.SUCCESS)
+    assert CountingTotp.calls == 1
+
+    clock.now += 20  # 跨越時間窗 → 重新計算
+    assert provider.now()[0] == expected.at(clock.now)
+    assert CountingTotp.calls == 2
+
+
+def test_fresh_waits_for_next_window_when_about_to_expire(monkeypatch):
+    clock = FakeClock(1_000_000 * 30 + 28.5)
+    provider = OtpProvider(pyotp.TOTP(SECRET), clock=clock)
+    slept = []
+
+    def fake_sleep(seconds):
+        slept.append(seconds)
+        clock.now += seconds
+
+    monkeypatch.setattr(otp_generator.time, "sleep", fake_sleep)
+    otp, code = provider.fresh(min_validity=3)
+    assert code == ResultCode.SUCCESS
+    assert slept and slept[0] > 1.5
+    assert otp == pyotp.TOTP(SECRET).at(1_000_001 * 30)
+
+    # 仍有足夠有效時間 → 不等待
+    slept.clear()
+    provider.fresh(min_validity=3)
+    assert slept == []
+
+
+def test_get_provider_validates_secret():
+    assert get_otp_provider("") == (None, ResultCode.tools_otp_invalid_secret)
+    assert get_otp_provider("not base32 !!")[1] == ResultCode.tools_otp_generate_error
+
+    provider, code = get_otp_provider(SECRET)
+    assert code == ResultCode.SUCCESS
+    assert get_otp_provider(SECRET)[0] is provider
+
+
+def test_batch_requests_take_fresh_otp_per_request(monkeypatch):
+    class FakeProvider:
+        def __init__(self):
+            self.count = 0
+
+        async def fresh_async(self, min_validity=3.0):
+            self.count += 1
+            return f"{self.count:06d}", ResultCode.SUCCESS
+
+    class FakeResp:
+        status_code = 200
+        text = "{}"
+
+    sent = []
+
+    def fake_post(url, json=None, headers=None, timeout=None):
+        sent.append(json)
+        return FakeResp(), ResultCode.SUCCESS
+
+    monkeypatch.setattr(common_async_task, "get_otp_provider", lambda secret: (FakeProvider(), ResultCode.SUCCESS))
+    monkeypatch.setattr(common_async_task.Requester, "post", staticmethod(fake_post))
+    monkeypatch.setattr(common_async_task.ResponseParser, "parse_json", staticmethod(lambda resp: ({"Code": 0}, ResultCode.SUCCESS)))
+
+    context = {
+        "COMMON": {"BACKEND_RA_BASE_URL": "https://ra", "OPS": {"SSID": "sid", "OTP_SECRET": SECRET, "LOGIN_OTP": "stale"}},
+        "INDEX": {"小明": {"agent": {"password": "p", "email": "a@x"}}, "小華": {"agent": {"password": "p", "email": "b@x"}}},
+        "API": {"ENDPOINTS": {"CREATE_AGENT_ACCOUNT": "/agent/create"}},
+    }
+    asyncio.run(send_batch_api_requests(
+        context=context, role="OPS", api_group="ENDPOINTS", path_key="CREATE_AGENT_ACCOUNT",
+        template=CREATE_AGENT_PAYLOAD, names=["小明", "小華"], detail=False, otp_field="OtpCode",
+    ))
+
+    assert sorted(payload["OtpCode"] for payload in sent) == ["000001", "000002"]
@@ -0,0 +1,86 @@
+import asyncio
+import time
+import pytest
+from workspace.tools.printer import batch_dashboard
+from workspace.tools.printer.batch_dashboard import BatchProgress
+from workspace.tasks.common import common_async_task
+from workspace.tasks.common.common_async_task import send_batch_api_requests
+from workspace.config.error_code import ResultCode
+
+pytestmark = [pytest.mark.unit, pytest.mark.tool]
+
+
+def test_progress_counts_and_percentiles():
+    progress = BatchProgress(live=False)
+    progress.start_stage("OPS:CREATE", 4)
+    for i, ok in enumerate((True, True, False)):
+        progress.begin("OPS:CREATE")
+        progress.finish("OPS:CREATE", ok, (i + 1) / 10)
+    progress.begin("OPS:CREATE")
+
+    (row,) = progress.snapshot()
+    assert (row["total"], row["completed"], row["failed"], row["in_flight"]) == (4, 3, 1, 1)
+    assert (row["p50"], row["p99"]) == (0.2, 0.3)
+    assert row["rps"] > 0
+
+    # 表格可繪製（不啟動 Live）
+    assert progress.render().row_count == 1
+
+
+def test_dashboard_disabled_when_not_tty():
+    with batch_dashboard.batch_dashboard() as progress:
+        assert progress is None
+        assert batch_dashboard.get_batch_progress() is None
+
+
+def test_batch_requests_report_progress(monkeypatch):
+    class FakeResp:
+        status_code = 200
+        text = "{}"
+
+    codes = iter([0, 5])
+    monkeypatch.setattr(common_async_task.Requester, "post", staticmethod(lambda *a, **k: (FakeResp(), ResultCode.SUCCESS)))
+    monkeypatch.setattr(common_async_task.ResponseParser, "parse_json", staticmethod(lambda resp: ({"Code": next(codes)}, ResultCode.SUCCESS)))
+    progress = BatchProgress(live=False)
+    monkeypatch.setattr(batch_dashboard, "_progress", progress)
+
+    context = {
+        "COMMON": {"BACKEND_RA_BASE_URL": "https://ra", "OPS": {"SSID": "sid"}},
+        "API": {"ENDPOINTS": {"CREATE_AGENT_ACCOUNT": "/agent/create"}},
+    }
+    asyncio.run(send_batch_api_requests(
+        context=context, role="OPS", api_group="ENDPOINTS", path_key="CREATE_AGENT_ACCOUNT",
+        payload_sources=[("小明", {}), ("小華", {})],
+    ))
+
+    (row,) = progress.snapshot()
+    assert row["stage"] == "OPS:CREATE_AGENT_ACCOUNT"
+    # API Code 非 0 視為失敗
+    assert (row["total"], row["completed"], row["failed"], row["in_flight"]) == (2, 2, 1, 0)
+
+
+def test_in_flight_and_rps_reflect_concurrent_requests(monkeypatch):
+    progress = BatchProgress(live=False)
+    seen = []
+
+    def slow_post(*args, **kwargs):
+        seen.append(progress.snapshot()[0]["in_flight"])
+        time.sleep(0.1)
+        return object(), ResultCode.SUCCESS
+
+    monkeypatch.setattr(common_async_task.Requester, "post", staticmethod(slow_post))
+    monkeypatch.setattr(common_async_task.ResponseParser, "parse_json", staticmethod(lambda resp: ({"Code": 0}, ResultCode.SUCCESS)))
+    monkeypatch.setattr(batch_dashboard, "_progress", progress)
+
+    context = {
+        "COMMON": {"BACKEND_RA_BASE_URL": "https://ra", "OPS": {"SSID": "sid"}},
+        "API": {"ENDPOINTS": {"CREATE_AGENT_ACCOUNT": "/agent/create"}},
+    }
+    asyncio.run(send_batch_api_requests(
+        context=context, role="OPS", api_group="ENDPOINTS", path_key="CREATE_AGENT_ACCOUNT",
+        payload_sources=[(f"n{i}", {}) for i in range(8)], concurrency=4,
+    ))
+
+    (row,) = progress.snapshot()
+    assert max(seen) == 4  # 同時進行中的請求數 = 併發上限，而非 0 / 1
+    assert row["rps"] > 1 / 0.1  # 每秒請求數高於單筆延遲的倒數
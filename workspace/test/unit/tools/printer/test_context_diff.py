@@ -0,0 +1,66 @@
+import pytest
+from workspace.tools.printer import context_printer
+from workspace.tools.printer.context_diff import snapshot, diff_snapshots, format_value
+from workspace.tools.printer.output_sink import ConsoleSink, set_sink
+from workspace.tools.common.compact_index import CompactIndex
+
+pytestmark = [pytest.mark.unit, pytest.mark.tool]
+
+
+def _context():
+    index = CompactIndex()
+    index.add("小明", "pw1", "a@x.com", 1)
+    index.add("小華", "pw2", "b@x.com", 2)
+    return {"COMMON": {"OPS": {"SSID": None, "OTP": "111111"}}, "INDEX": index}
+
+
+def test_snapshot_only_watches_declared_paths():
+    context = _context()
+    paths = [("COMMON", "OPS", "SSID"), ("INDEX", "agent", "account")]
+    before = snapshot(context, paths)
+    assert set(before) == {
+        ("COMMON", "OPS", "SSID"),
+        ("INDEX", "小明", "agent", "account"),
+        ("INDEX", "小華", "agent", "account"),
+    }
+
+    context["COMMON"]["OPS"]["SSID"] = "sid"
+    context["COMMON"]["OPS"]["OTP"] = "222222"     # 未宣告的路徑不列入
+    context["INDEX"]["小華"]["agent"]["account"] = "acc2"
+    changes = diff_snapshots(before, snapshot(context, paths))
+    assert changes == [
+        ("~", ("COMMON", "OPS", "SSID"), None, "sid"),
+        ("~", ("INDEX", "小華", "agent", "account"), None, "acc2"),
+    ]
+
+
+def test_diff_full_context_added_and_removed():
+    before = snapshot({"A": {"x": 1, "y": [1, 2]}})
+    after = snapshot({"A": {"y": [1, 2, 3]}, "B": {}})
+    assert diff_snapshots(before, after) == [
+        ("~", ("A", "y"), (1, 2), (1, 2, 3)),
+        ("+", ("B",), None, {}),
+        ("-", ("A", "x"), 1, None),
+    ]
+
+
+def test_format_value_truncates():
+    assert format_value(tuple(range(10)), max_items=3) == "[0, 1, 2, …（共 10 項）]"
+    text = format_value("x" * 500, max_len=20)
+    assert text.startswith("'xxxxxxxxxxxxxxxxxxx…") and text.endswith("（共 502 字）")
+
+
+def test_print_context_diff_limits_items(capsys):
+    set_sink(ConsoleSink())
+    context_printer.set_diff_limits({"max_items": 2})
+    try:
+        changes = [("+", ("INDEX", f"n{i}", "agent", "account"), None, f"acc{i}") for i in range(5)]
+        context_printer.print_context_diff(changes, "OPS", 4)
+    finally:
+        context_printer.set_diff_limits({"max_items": 50})
+
+    out = capsys.readouterr().out.splitlines()
+    assert "Context 變更（5 項）" in out[0]
+    assert out[1].strip() == "+ INDEX.n0.agent.account: 'acc0'"
+    assert out[-1].strip() == "…其餘 3 項未顯示"
+    assert len(out) == 4
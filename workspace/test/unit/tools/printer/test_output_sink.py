@@ -0,0 +1,74 @@
+# workspace/test/unit/tools/printer/test_output_sink.py
+import json
+import threading
+import pytest
+from workspace.tools.printer import output_sink
+from workspace.tools.printer.output_sink import (
+    OutputSink, ConsoleSink, BufferedSink, ThreadedSink, configure_output, set_sink, flush_output,
+)
+from workspace.tools.printer.debug_printer import debug_print
+from workspace.tools.printer.error_printer import print_result
+from workspace.config.error_code import ResultCode
+
+pytestmark = [pytest.mark.unit, pytest.mark.tool]
+
+
+class _Collect(OutputSink):
+    def __init__(self, gate=None):
+        self.lines = []
+        self.gate = gate
+
+    def write(self, text, kind="text", prefix=""):
+        if self.gate is not None:
+            self.gate.wait(timeout=2)
+        self.lines.append((text, kind, prefix))
+
+
+@pytest.fixture(autouse=True)
+def _restore_console():
+    yield
+    set_sink(ConsoleSink())
+
+
+def test_threaded_sink_does_not_block_writer():
+    gate = threading.Event()
+    inner = _Collect(gate)
+    sink = ThreadedSink(inner)
+
+    for i in range(200):
+        sink.write(f"line {i}")      # 背景輸出被卡住時仍可立即返回
+    assert len(inner.lines) <= 1
+
+    gate.set()
+    sink.flush()
+    assert [text for text, _, _ in inner.lines] == [f"line {i}" for i in range(200)]
+    sink.close()
+
+
+def test_buffered_sink_writes_in_batches():
+    inner = _Collect()
+    sink = BufferedSink(inner, max_lines=3, max_delay=60)
+    sink.write("a")
+    sink.write("b")
+    assert inner.lines == []
+    sink.write("c")
+    assert [t for t, _, _ in inner.lines] == ["a", "b", "c"]
+    sink.write("d")
+    sink.flush()
+    assert [t for t, _, _ in inner.lines][-1] == "d"
+
+
+def test_printers_go_through_configured_sink(tmp_path, capsys):
+    path = tmp_path / "out.jsonl"
+    configure_output("thread", jsonl=str(path))
+
+    debug_print(True, "hello", prefix="OPS")
+    print_result(ResultCode.SUCCESS, branch_state=[], prefix="OPS")
+    flush_output()
+    set_sink(ConsoleSink())  # 關閉檔案
+
+    out = capsys.readouterr().out
+    assert "[DEBUG] hello" in out and "code=0" in out
+    rows = [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+    assert [(r["kind"], r["prefix"]) for r in rows] == [("debug", "OPS"), ("error", "OPS")]
+    assert isinstance(output_sink.get_sink(), ConsoleSink)
@@ -5,6 +5,7 @@ TRON Transaction Builder 工具
 
 from workspace.config.error_code import ResultCode
 from workspace.tools.chain.client import TronClient
+from workspace.tools.common.money import USDT_DECIMALS, to_units
 
 
 class TronBuilder:
@@ -60,15 +61,23 @@ class TronBuilder:
         :param contract: TRC20 合約物件 (先用 get_trc20_contract 取得)
         :param from_address: 來源地址
         :param to_address: 目標地址
-        :param amount: 金額 (單位: token 的最小單位，例如 USDT=10^6)
+        :param amount: 金額 (單位: token，例如 1.5 USDT；可傳 int / float / str / Decimal / Amount)
         :return: (raw_tx, ResultCode)
         """
         try:
-            if not contract or not from_address or not to_address or amount <= 0:
+            if not contract or not from_address or not to_address:
+                return None, ResultCode.tools_builder_invalid_params
+
+            # 以定點整數換算最小單位（USDT 預設 6 位小數），避免 float 乘法截斷誤差
+            try:
+                amount_units = to_units(amount, USDT_DECIMALS)
+            except Exception:
+                return None, ResultCode.tools_builder_invalid_params
+            if amount_units <= 0:
                 return None, ResultCode.tools_builder_invalid_params
 
             txn = (
-                contract.functions.transfer(to_address, int(amount * (10 ** 6)))  # USDT 預設 6 位小數
+                contract.functions.transfer(to_address, amount_units)
                 .with_owner(from_address)
                 .fee_limit(5_000_000)
                 .build()
@@ -1,14 +1,35 @@
 from workspace.config.error_code import ResultCode
+from workspace.tools.printer.output_sink import emit
+import threading
+import time
 import requests
+from requests.adapters import HTTPAdapter
+from workspace.tools.common.money import Amount, USDT_DECIMALS, to_units
+
+
+# ===========================================================
+# Tronscan 備援查詢設定
+# ===========================================================
+TRONSCAN_TOKENS_URL = "https://apilist.tronscanapi.com/api/account/tokens"
+TRONSCAN_CACHE_TTL = 30      # 同一地址 token 清單快取秒數
+TRONSCAN_POOL_SIZE = 16      # 連線池大小（所有 Ledger 共用）
 
 
 class Ledger:
-    def __init__(self, client):
+    # 所有 Ledger 實例共用同一個 Session（連線重用）與 token 清單快取
+    _session: requests.Session | None = None
+    _session_lock = threading.Lock()
+    _token_cache: dict[str, tuple[float, dict]] = {}
+    _cache_lock = threading.Lock()
+
+    def __init__(self, client, cache_ttl: float = TRONSCAN_CACHE_TTL):
         self.client = client
+        self.cache_ttl = cache_ttl
 
-    def get_trc20_balance(self, address: str, contract_address: str):
+    def get_trc20_balance(self, address: str, contract_address: str, exact: bool = False):
         """
         查詢 TRC20 餘額（優先使用 tronpy 合約介面）
+        :param exact: True → 回傳 Amount（整數最小單位，精確）；False → float
         """
         try:
             if not contract_address or not address:
@@ -21,42 +42,164 @@ class Ledger:
 
 
             # 預設 USDT 6 位小數
-            return balance / (10 ** 6), ResultCode.SUCCESS
+            return _to_balance(int(balance), USDT_DECIMALS, exact), ResultCode.SUCCESS
 
         except Exception as e:
-            
+
             return None, ResultCode.tools_ledger_trc20_balance_error
 
-    def get_trc20_balance_with_fallback(self, address: str, contract_address: str, symbol: str = "USDT"):
+    def get_trc20_balance_with_fallback(self, address: str, contract_address: str, symbol: str = "USDT", exact: bool = False):
         """
         查 TRC20 餘額：
         - 測試網 (Nile/Shasta) → 只用 RPC (tronpy contract.functions)
-        - 主網 → RPC 失敗才打 Tronscan API
+        - 主網 → RPC 失敗才打 Tronscan API（共用連線池 + 短期快取）
+        :param exact: True → 回傳 Amount；False → float
         """
-        balance, code = self.get_trc20_balance(address, contract_address)
+        balance, code = self.get_trc20_balance(address, contract_address, exact=exact)
         if code == ResultCode.SUCCESS and balance is not None:
             return balance, code
 
-        if "nile" in self.client.node_url or "shasta" in self.client.node_url:
+        if self._is_testnet():
             return None, ResultCode.tools_ledger_trc20_balance_error
 
-        try:
-            url = f"https://apilist.tronscanapi.com/api/account/tokens?address={address}"
-            resp = requests.get(url, timeout=10)
-            if resp.status_code == 200:
-                data = resp.json()
-                tokens = data.get("data", [])
-                for t in tokens:
-                    if (
-                        t.get("tokenAbbr") == symbol
-                        or t.get("tokenId") == contract_address
-                        or t.get("tokenName") == symbol
-                    ):
-                        raw_balance = float(t.get("balance", 0))
-                        decimals = int(t.get("tokenDecimal", 6))
-                        print(f"[DEBUG][Ledger] Tronscan Raw balance({address}) = {raw_balance}")
-                        return raw_balance / (10 ** decimals), ResultCode.SUCCESS
+        index, code = self._get_tronscan_index(address)
+        if code != ResultCode.SUCCESS:
+            return None, code
+
+        token = self._match_token(index, contract_address, symbol)
+        if token is None:
             return None, ResultCode.tools_ledger_trc20_balance_error
-        except Exception as e:
-            
+
+        raw_balance, decimals = token
+        emit(f"[DEBUG][Ledger] Tronscan Raw balance({address}) = {raw_balance}", "debug", "Ledger")
+        return _to_balance(raw_balance, decimals, exact), ResultCode.SUCCESS
+
+    def get_trc20_balances_with_fallback(self, address: str, tokens: list[tuple[str, str]], exact: bool = False):
+        """
+        一次查詢同一地址的多個 TRC20 餘額
+        - 每個 token 先走 RPC；RPC 失敗者統一由「同一次」Tronscan 查詢回答
+        :param address: TRON 地址
+        :param tokens: [(contract_address, symbol), ...]
+        :param exact: True → 餘額為 Amount；False → float
+        :return: ({contract_address: balance | None}, ResultCode)
+                 任一 token 查無餘額時 code 為 tools_ledger_trc20_balance_error
+        """
+        balances: dict[str, float | Amount | None] = {}
+        pending: list[tuple[str, str]] = []
+
+        for contract_address, symbol in tokens:
+            balance, code = self.get_trc20_balance(address, contract_address, exact=exact)
+            if code == ResultCode.SUCCESS and balance is not None:
+                balances[contract_address] = balance
+            else:
+                balances[contract_address] = None
+                pending.append((contract_address, symbol))
+
+        if not pending:
+            return balances, ResultCode.SUCCESS
+        if self._is_testnet():
+            return balances, ResultCode.tools_ledger_trc20_balance_error
+
+        index, code = self._get_tronscan_index(address)
+        if code != ResultCode.SUCCESS:
+            return balances, code
+
+        all_found = True
+        for contract_address, symbol in pending:
+            token = self._match_token(index, contract_address, symbol)
+            if token is None:
+                all_found = False
+                continue
+            raw_balance, decimals = token
+            balances[contract_address] = _to_balance(raw_balance, decimals, exact)
+
+        if not all_found:
+            return balances, ResultCode.tools_ledger_trc20_balance_error
+        return balances, ResultCode.SUCCESS
+
+    @classmethod
+    def clear_tronscan_cache(cls, address: str | None = None):
+        """清除 Tronscan token 清單快取（不指定地址則全部清除）"""
+        with cls._cache_lock:
+            if address is None:
+                cls._token_cache.clear()
+            else:
+                cls._token_cache.pop(address, None)
+
+    # ---------------- Tronscan 內部工具 ----------------
+
+    def _is_testnet(self) -> bool:
+        node_url = self.client.node_url
+        return "nile" in node_url or "shasta" in node_url
+
+    @classmethod
+    def _get_session(cls) -> requests.Session:
+        """取得共用 Session（首次使用才建立，掛載固定大小連線池）"""
+        if cls._session is None:
+            with cls._session_lock:
+                if cls._session is None:
+                    session = requests.Session()
+                    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=TRONSCAN_POOL_SIZE)
+                    session.mount("https://", adapter)
+                    cls._session = session
+        return cls._session
+
+    def _get_tronscan_index(self, address: str):
+        """
+        取得地址的 token 索引（TTL 內直接回傳快取）
+        :return: (index, ResultCode)
+        """
+        now = time.monotonic()
+        with self._cache_lock:
+            cached = self._token_cache.get(address)
+        if cached and now - cached[0] < self.cache_ttl:
+            return cached[1], ResultCode.SUCCESS
+
+        try:
+            resp = self._get_session().get(TRONSCAN_TOKENS_URL, params={"address": address}, timeout=10)
+            if resp.status_code != 200:
+                return None, ResultCode.tools_ledger_trc20_balance_error
+            tokens = resp.json().get("data", []) or []
+        except Exception:
             return None, ResultCode.tools_ledger_trc20_balance_error
+
+        index = self._build_token_index(tokens)
+        with self._cache_lock:
+            self._token_cache[address] = (time.monotonic(), index)
+        return index, ResultCode.SUCCESS
+
+    @staticmethod
+    def _build_token_index(tokens: list) -> dict:
+        """
+        將 Tronscan token 清單建成索引：
+            {"contract": {tokenId: (raw_balance, decimals)},   # raw_balance 為最小單位整數
+             "symbol":   {tokenAbbr / tokenName: (raw_balance, decimals)}}
+        同名 symbol 以清單中第一個出現者為準（與原本線性掃描一致）
+        """
+        by_contract, by_symbol = {}, {}
+        for t in tokens:
+            try:
+                entry = (to_units(t.get("balance", 0) or 0, 0), int(t.get("tokenDecimal", 6)))
+            except (TypeError, ValueError, ArithmeticError):
+                continue
+            token_id = t.get("tokenId")
+            if token_id:
+                by_contract.setdefault(token_id, entry)
+            for key in (t.get("tokenAbbr"), t.get("tokenName")):
+                if key:
+                    by_symbol.setdefault(key, entry)
+        return {"contract": by_contract, "symbol": by_symbol}
+
+    @staticmethod
+    def _match_token(index: dict, contract_address: str, symbol: str):
+        """合約地址優先，其次 symbol"""
+        token = index["contract"].get(contract_address)
+        if token is None and symbol:
+            token = index["symbol"].get(symbol)
+        return token
+
+
+def _to_balance(raw_balance: int, decimals: int, exact: bool):
+    """最小單位整數 → Amount（精確）或 float（int / int 正確捨入）"""
+    amount = Amount(raw_balance, decimals)
+    return amount if exact else float(amount)
@@ -0,0 +1,227 @@
+# workspace/tools/common/compact_index.py
+"""
+Compact Index 工具模組（大量名稱用的精簡 INDEX）
+------------------------------------------------
+職責：
+    - 以「欄位陣列」(struct-of-arrays) 保存 INDEX，取代每個名稱兩層巢狀 dict
+    - 提供與原本 dict 相同的存取方式，既有任務不需修改：
+        index[name]["agent"]["account"] = account
+        index[name].get("merchant", {}).get("modetype")
+        for name, data in index.items(): ...
+
+記憶體設計：
+    - 密碼 / 信箱 agent 與 merchant 共用同一份字串（sys.intern，重複密碼只存一份）
+    - account / uuid 各自為一個 list，modetype 為 array('B')
+    - 個別名稱改寫 merchant 密碼 / 信箱或新增自訂欄位時，才另外記錄（不影響其他名稱）
+
+輸出：
+    - to_dict() 轉回原本的巢狀 dict（印出 Context / 比對用）
+    - 可 pickle（快取時只序列化幾個大陣列，載入比巢狀 dict 快）
+"""
+
+import sys
+from array import array
+from collections.abc import Mapping, MutableMapping
+
+
+ROLES = ("agent", "merchant")
+RESULT_FIELDS = ("account", "uuid")
+_BASE_KEYS = {
+    "agent": ("account", "password", "email"),
+    "merchant": ("account", "password", "email", "modetype"),
+}
+_MISSING = object()
+
+
+class CompactIndex(MutableMapping):
+    """名稱 → {"agent": {...}, "merchant": {...}} 的精簡版 INDEX"""
+
+    def __init__(self, data: Mapping | None = None):
+        self._rows: dict[str, int] = {}       # name → row（保留插入順序）
+        self._passwords: list[str | None] = []
+        self._emails: list[str | None] = []
+        self._modetypes = array("B")
+        self._results = {(role, field): [] for role in ROLES for field in RESULT_FIELDS}
+        self._overrides: dict[tuple[int, str, str], object] = {}  # (row, role, key) → 個別改寫值
+        if data:
+            for name, entry in data.items():
+                self[name] = entry
+
+    # ---------------- 建構 ----------------
+    def add(self, name: str, password: str, email: str, modetype: int):
+        """新增 / 覆寫一筆（loader 驗證完成後呼叫，不建立任何中間 dict）"""
+        row = self._rows.get(name)
+        if row is None:
+            row = len(self._passwords)
+            self._rows[name] = row
+            self._passwords.append(sys.intern(password) if password else password)
+            self._emails.append(sys.intern(email) if email else email)
+            self._modetypes.append(modetype)
+            for column in self._results.values():
+                column.append(None)
+            return
+
+        self._passwords[row] = sys.intern(password) if password else password
+        self._emails[row] = sys.intern(email) if email else email
+        self._modetypes[row] = modetype
+        for column in self._results.values():
+            column[row] = None
+        self._drop_overrides(row)
+
+    # ---------------- Mapping 介面 ----------------
+    def __getitem__(self, name: str) -> "EntryView":
+        return EntryView(self, self._rows[name])
+
+    def __setitem__(self, name: str, entry: Mapping):
+        agent = entry.get("agent", {})
+        merchant = entry.get("merchant", {})
+        self.add(name, agent.get("password"), agent.get("email"), merchant.get("modetype") or 0)
+        view = self[name]
+        for role, values in (("agent", agent), ("merchant", merchant)):
+            role_view = view[role]
+            for key, value in values.items():
+                if role_view.get(key, _MISSING) != value:
+                    role_view[key] = value
+
+    def __delitem__(self, name: str):
+        # 只移除索引（陣列位置保留），避免 O(n) 搬移
+        row = self._rows.pop(name)
+        self._drop_overrides(row)
+
+    def __iter__(self):
+        return iter(self._rows)
+
+    def __len__(self):
+        return len(self._rows)
+
+    def __contains__(self, name):
+        return name in self._rows
+
+    def clear(self):
+        self.__init__()
+
+    # ---------------- 批次掃描 ----------------
+    def column(self, role: str, field: str) -> list:
+        """取得整欄 account / uuid（依名稱順序），供大量掃描使用"""
+        values = self._results[(role, field)]
+        return [values[row] for row in self._rows.values()]
+
+    def names_missing(self, role: str, field: str) -> list[str]:
+        """列出某欄仍為空的名稱（例如尚未建立帳號者）"""
+        values = self._results[(role, field)]
+        return [name for name, row in self._rows.items() if not values[row]]
+
+    def names_incomplete(self) -> list[str]:
+        """列出任一 account / uuid 仍為空的名稱（尚有步驟未完成）"""
+        columns = list(self._results.values())
+        return [name for name, row in self._rows.items() if not all(col[row] for col in columns)]
+
+    # ---------------- 輸出 ----------------
+    def to_dict(self) -> dict:
+        return {name: self[name].to_dict() for name in self._rows}
+
+    def __repr__(self):
+        return f"CompactIndex({len(self)} names)"
+
+    # ---------------- 內部 ----------------
+    def _drop_overrides(self, row: int):
+        if self._overrides:
+            for key in [k for k in self._overrides if k[0] == row]:
+                del self._overrides[key]
+
+
+class EntryView(Mapping):
+    """單一名稱的唯讀外層 view：{"agent": RoleView, "merchant": RoleView}"""
+
+    __slots__ = ("_index", "_row")
+
+    def __init__(self, index: CompactIndex, row: int):
+        self._index = index
+        self._row = row
+
+    def __getitem__(self, role: str) -> "RoleView":
+        if role not in ROLES:
+            raise KeyError(role)
+        return RoleView(self._index, self._row, role)
+
+    def __iter__(self):
+        return iter(ROLES)
+
+    def __len__(self):
+        return len(ROLES)
+
+    def to_dict(self) -> dict:
+        return {role: self[role].to_dict() for role in ROLES}
+
+    def __repr__(self):
+        return repr(self.to_dict())
+
+
+class RoleView(MutableMapping):
+    """agent / merchant 欄位 view，讀寫直接對應 CompactIndex 的欄位陣列"""
+
+    __slots__ = ("_index", "_row", "_role")
+
+    def __init__(self, index: CompactIndex, row: int, role: str):
+        self._index = index
+        self._row = row
+        self._role = role
+
+    def __getitem__(self, key: str):
+        index, row, role = self._index, self._row, self._role
+        override = index._overrides.get((row, role, key), _MISSING)
+        if override is not _MISSING:
+            return override
+
+        if key == "account":
+            return index._results[(role, key)][row]
+        if key == "uuid":
+            value = index._results[(role, key)][row]
+            if value is None:
+                raise KeyError(key)  # 與原本 dict 相同：查詢成功前沒有 uuid 欄位
+            return value
+        if key == "password":
+            return index._passwords[row]
+        if key == "email":
+            return index._emails[row]
+        if key == "modetype" and role == "merchant":
+            return index._modetypes[row]
+        raise KeyError(key)
+
+    def __setitem__(self, key: str, value):
+        index, row, role = self._index, self._row, self._role
+        if key in RESULT_FIELDS:
+            index._results[(role, key)][row] = value
+        elif key == "modetype" and role == "merchant" and isinstance(value, int) and 0 <= value < 256:
+            index._modetypes[row] = value
+            index._overrides.pop((row, role, key), None)
+        else:
+            # 個別改寫（例如 merchant 改用不同信箱）或自訂欄位
+            index._overrides[(row, role, key)] = value
+
+    def __delitem__(self, key: str):
+        index, row, role = self._index, self._row, self._role
+        if index._overrides.pop((row, role, key), _MISSING) is not _MISSING:
+            return
+        if key in RESULT_FIELDS:
+            index._results[(role, key)][row] = None
+            return
+        raise KeyError(key)
+
+    def __iter__(self):
+        keys = list(_BASE_KEYS[self._role])
+        if self._index._results[(self._role, "uuid")][self._row] is not None:
+            keys.append("uuid")
+        for (row, role, key) in self._index._overrides:
+            if row == self._row and role == self._role and key not in keys:
+                keys.append(key)
+        return iter(keys)
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def to_dict(self) -> dict:
+        return {key: self[key] for key in self}
+
+    def __repr__(self):
+        return repr(self.to_dict())
@@ -2,45 +2,37 @@
 """
 Currency Converter 工具模組
 支援 TRX / USDT / USDD 之間的換算
+匯率統一由 rate_provider 取得（TTL 快取 + 背景更新 + 磁碟快取）
+numpy 只在批次換算時才 import（單筆換算不需載入）
 """
 
-import requests
 from workspace.config.error_code import ResultCode
+from workspace.tools.common.rate_provider import RateProvider, get_default_provider
 
 
 class CurrencyConverter:
     SUPPORTED = ["TRX", "USDT", "USDD"]
 
-    def __init__(self):
+    def __init__(self, provider: RateProvider | None = None):
+        # 匯率提供者（未指定則使用全域共用實例）
+        self.provider = provider or get_default_provider()
         # 緩存匯率 (單位: 1 token = ? USD)
         self.rates: dict[str, float] = {}
 
     def fetch_rates(self) -> int:
         """
-        從 CoinGecko 抓取最新匯率
+        強制向匯率來源更新（同步，會打網路）
         :return: ResultCode
         """
-        try:
-            url = "https://api.coingecko.com/api/v3/simple/price"
-            params = {
-                "ids": "tron,tether,usdd",
-                "vs_currencies": "usd",
-            }
-            resp = requests.get(url, params=params, timeout=5)
-            data = resp.json()
-
-            self.rates = {
-                "TRX": data["tron"]["usd"],
-                "USDT": data["tether"]["usd"],
-                "USDD": data["usdd"]["usd"],
-            }
-            return ResultCode.SUCCESS
-        except Exception:
-            return ResultCode.tools_currency_fetch_error
+        code = self.provider.refresh()
+        if code != ResultCode.SUCCESS:
+            return code
+        self.rates, code = self.provider.get_rates()
+        return code
 
     def convert(self, amount: float, from_token: str, to_token: str) -> tuple[float | None, int]:
         """
-        幣別互轉
+        幣別互轉（不需先呼叫 fetch_rates；匯率取自共用快取，過期時背景更新）
         :param amount: 數量
         :param from_token: 來源幣種 (TRX / USDT / USDD)
         :param to_token: 目標幣種
@@ -53,6 +45,10 @@ class CurrencyConverter:
             return None, ResultCode.tools_currency_not_supported
 
         try:
+            rates, code = self.provider.get_rates()
+            if code == ResultCode.SUCCESS:
+                self.rates = rates
+
             if from_token not in self.rates or to_token not in self.rates:
                 return None, ResultCode.tools_currency_fetch_error
 
@@ -61,3 +57,45 @@ class CurrencyConverter:
             return result, ResultCode.SUCCESS
         except Exception:
             return None, ResultCode.tools_currency_convert_error
+
+    def convert_bulk(self, amounts, from_token: str, to_token: str, exact: bool = False) -> tuple["np.ndarray | None", int]:
+        """
+        批次幣別互轉（整欄一次換算，匯率只取一次）
+        :param amounts: 數量（list / ndarray）
+        :param from_token: 來源幣種
+        :param to_token: 目標幣種
+        :param exact: True → 逐筆 Decimal 計算（未向量化；匯率比為任意有理數，無法以固定精度整數表示，回傳 object 陣列）
+                      False → float64 向量化
+        :return: (換算後陣列, ResultCode)
+        """
+        import numpy as np
+        from workspace.tools.common.fee_calculator import to_decimal
+
+        from_token = from_token.upper()
+        to_token = to_token.upper()
+
+        if from_token not in self.SUPPORTED or to_token not in self.SUPPORTED:
+            return None, ResultCode.tools_currency_not_supported
+
+        try:
+            rates, code = self.provider.get_rates()
+            if code == ResultCode.SUCCESS:
+                self.rates = rates
+
+            if from_token not in self.rates or to_token not in self.rates:
+                return None, ResultCode.tools_currency_fetch_error
+
+            if exact:
+                factor = to_decimal(self.rates[from_token]) / to_decimal(self.rates[to_token])
+                src = np.asarray(amounts, dtype=object)
+                result = np.empty(src.shape, dtype=object)
+                for i, amount in enumerate(src.flat):
+                    result.flat[i] = to_decimal(amount) * factor
+                return result, ResultCode.SUCCESS
+
+            # 與 convert 相同運算順序（先乘來源匯率再除目標匯率），結果逐筆一致
+            src = np.asarray(amounts, dtype=np.float64)
+            result = src * self.rates[from_token] / self.rates[to_token]
+            return result, ResultCode.SUCCESS
+        except Exception:
+            return None, ResultCode.tools_currency_convert_error
@@ -1,8 +1,150 @@
+from decimal import Decimal
+from functools import lru_cache
+
+import numpy as np
+
+from workspace.tools.common.money import (
+    FEE_DECIMALS,
+    div_round,
+    div_round_array,
+    to_units,
+    to_units_array,
+)
+
+
 def calc_fee_and_realquant(quant: int, fee_percent: int, fee_gold: float) -> tuple[float, float]:
     """
     根據交易數量、費率百分比、固定手續費計算
     回傳 (fee, real_quant)
+    內部以 10^-8 整數定點計算，結果等同精確值四捨六入五成雙到小數 8 位
     """
-    fee = quant * (fee_percent / 100.0) + fee_gold
-    real_quant = quant - fee
-    return round(fee, 8), round(real_quant, 8)
+    quant_units = to_units(quant, FEE_DECIMALS)
+    fee_units, real_units = calc_fee_and_realquant_units(
+        quant_units, fee_percent, to_units(fee_gold, FEE_DECIMALS)
+    )
+    scale = 10 ** FEE_DECIMALS
+    return fee_units / scale, real_units / scale
+
+
+def calc_fee_and_realquant_units(quant_units: int, fee_percent, fee_gold_units: int) -> tuple[int, int]:
+    """
+    整數定點版：所有金額皆為同一精度的最小單位整數
+    :param quant_units: 交易數量（最小單位）
+    :param fee_percent: 費率百分比（可含小數；依十進位值完整計算，不捨入費率）
+    :param fee_gold_units: 固定手續費（最小單位）
+    :return: (fee_units, real_quant_units)
+    """
+    if isinstance(fee_percent, int):
+        fee_units = div_round(quant_units * fee_percent, 100) + fee_gold_units
+    else:
+        percent_units, places = _percent_units_cached(fee_percent)
+        fee_units = div_round(quant_units * percent_units, 100 * 10 ** places) + fee_gold_units
+    return fee_units, quant_units - fee_units
+
+
+@lru_cache(maxsize=1024)
+def _percent_units_cached(fee_percent) -> tuple[int, int]:
+    """費率通常只有少數幾種，換算結果快取（單筆迴圈不必每次建立 Decimal）"""
+    return _percent_units(to_decimal(fee_percent))
+
+
+def _percent_units(percent: Decimal) -> tuple[int, int]:
+    """費率 → (整數, 小數位數)，percent == 整數 × 10^-小數位數（精確，不捨入）"""
+    if not percent.is_finite():
+        raise ValueError(f"無效的費率百分比：{percent}")
+    places = max(0, -percent.as_tuple().exponent)
+    return int(percent.scaleb(places)), places
+
+
+def calc_fee_and_realquant_units_bulk(quant_units, fee_percents, fee_gold_units) -> tuple[np.ndarray, np.ndarray]:
+    """
+    整數定點批次版（int64 向量化，精確且不經 float / Decimal）
+    :param quant_units: 交易數量陣列（最小單位）
+    :param fee_percents: 費率百分比（純量或陣列；依十進位值完整計算，不捨入費率）
+    :param fee_gold_units: 固定手續費（最小單位，純量或陣列）
+    :return: (fee_units, real_quant_units) 皆為 int64 陣列
+             （乘積可能超出 int64 時自動改用 Python int 的 object 陣列）
+    """
+    q = _int_array(quant_units)
+    p, places = _percent_units_array(fee_percents)
+    g = _int_array(fee_gold_units)
+    denominator = 100 * 10 ** places
+
+    max_q = max((abs(int(v)) for v in (q.min(initial=0), q.max(initial=0))))
+    max_p = max((abs(int(v)) for v in (p.min(initial=0), p.max(initial=0))))
+    if max_q * max_p > np.iinfo(np.int64).max or object in (q.dtype, p.dtype, g.dtype):
+        q, p, g = q.astype(object), p.astype(object), g.astype(object)
+
+    fee = div_round_array(q * p, denominator) + g
+    return fee, q - fee
+
+
+def calc_fee_and_realquant_bulk(quants, fee_percents, fee_golds, exact: bool = False) -> tuple[np.ndarray, np.ndarray]:
+    """
+    批次版 calc_fee_and_realquant（整欄一次計算）
+    :param quants: 交易數量（list / ndarray）
+    :param fee_percents: 費率百分比（純量或與 quants 等長）
+    :param fee_golds: 固定手續費（純量或與 quants 等長）
+    :param exact: True → 轉成 10^-8 整數定點後走 calc_fee_and_realquant_units_bulk（int64 向量化），
+                         結果轉回 Decimal（object 陣列，與單筆版相同的四捨六入五成雙）
+                  False → float64 向量化計算（回傳 float64 陣列）
+    :return: (fees, real_quants)
+    """
+    if exact:
+        shape = np.shape(quants)
+        quant_units = to_units_array(quants, FEE_DECIMALS).reshape(shape)
+        gold_units = to_units_array(fee_golds, FEE_DECIMALS).reshape(np.shape(fee_golds))
+        fee_units, real_units = calc_fee_and_realquant_units_bulk(quant_units, fee_percents, gold_units)
+        return _units_to_decimal(fee_units, FEE_DECIMALS), _units_to_decimal(real_units, FEE_DECIMALS)
+
+    q = np.asarray(quants, dtype=np.float64)
+    p = np.asarray(fee_percents, dtype=np.float64)
+    g = np.asarray(fee_golds, dtype=np.float64)
+    fee = q * (p / 100.0) + g
+    return np.round(fee, 8), np.round(q - fee, 8)
+
+
+def _int_array(values) -> np.ndarray:
+    """整數陣列（已是 object 陣列的大整數保留為 object，避免 int64 溢位）"""
+    arr = np.asarray(values)
+    return arr if arr.dtype == object else arr.astype(np.int64)
+
+
+def _percent_units_array(fee_percents) -> tuple[np.ndarray, int]:
+    """
+    費率陣列 → (整數陣列, 共同小數位數)，不捨入任何小數位
+    整數費率直接使用；其餘只對不重複的值做一次 Decimal 換算
+    """
+    arr = np.asarray(fee_percents)
+    if arr.dtype.kind in "iub":
+        return arr.astype(np.int64), 0
+
+    unique, inverse = np.unique(arr.ravel(), return_inverse=True)
+    parts = [_percent_units(to_decimal(v)) for v in unique.tolist()]
+    places = max((p for _, p in parts), default=0)
+    scaled = [units * 10 ** (places - p) for units, p in parts]
+    dtype = np.int64 if all(_fits_int64(v) for v in scaled) else object
+    return np.array(scaled, dtype=dtype)[inverse].reshape(arr.shape), places
+
+
+def _fits_int64(value: int) -> bool:
+    return np.iinfo(np.int64).min <= value <= np.iinfo(np.int64).max
+
+
+def _units_to_decimal(units: np.ndarray, decimals: int) -> np.ndarray:
+    """最小單位整數陣列 → Decimal object 陣列（僅型別轉換，運算已在整數域完成）"""
+    units = np.asarray(units)
+    result = np.empty(units.size, dtype=object)
+    result[:] = [Decimal(unit).scaleb(-decimals) for unit in units.ravel().tolist()]
+    return result.reshape(units.shape)
+
+
+def to_decimal(value) -> Decimal:
+    """float 先轉字串，避免把二進位誤差帶進 Decimal"""
+    if isinstance(value, Decimal):
+        return value
+    if isinstance(value, (float, np.floating)):
+        return Decimal(repr(float(value)))
+    if isinstance(value, np.integer):
+        return Decimal(int(value))
+    return Decimal(value)
@@ -0,0 +1,173 @@
+# workspace/tools/common/money.py
+"""
+Money 工具模組（整數最小單位定點數）
+------------------------------------------------
+職責：
+    - 以「最小單位整數」表示金額（TRX=sun、USDT=10^-6），全程不經 float
+    - 提供單筆 Amount 型別與 NumPy int64 批次運算
+    - 供 fee_calculator / ledger / builder 共用，確保大量加總仍精確
+
+換算規則：
+    - float 先以 repr 轉 Decimal，避免把二進位誤差帶入（例：4.35 → 4350000，而非 4349999）
+    - 超出小數位數時一律 ROUND_HALF_EVEN
+"""
+
+from decimal import Decimal, ROUND_HALF_EVEN
+
+import numpy as np
+
+
+TRX_DECIMALS = 6      # 1 TRX  = 10^6 sun
+USDT_DECIMALS = 6     # 1 USDT = 10^6 最小單位
+FEE_DECIMALS = 8      # 手續費計算精度（與舊版 round(..., 8) 相同）
+PERCENT_DECIMALS = 4  # 常見費率百分比精度（0.0001%）；更多小數位仍會完整保留，只是乘數較大
+PERCENT_SCALE = 10 ** PERCENT_DECIMALS
+_INT64 = np.iinfo(np.int64)
+
+
+# ===========================================================
+# 🟩 A. 單筆換算
+# ===========================================================
+def to_units(value, decimals: int) -> int:
+    """將金額（int / float / str / Decimal / Amount）轉成最小單位整數"""
+    if isinstance(value, Amount):
+        return value.rescale(decimals).units
+    if isinstance(value, (int, np.integer)) and not isinstance(value, bool):
+        return int(value) * 10 ** decimals
+    if isinstance(value, (float, np.floating)):
+        value = Decimal(repr(float(value)))
+    elif not isinstance(value, Decimal):
+        value = Decimal(str(value))
+    return int(value.scaleb(decimals).to_integral_value(rounding=ROUND_HALF_EVEN))
+
+
+def div_round(numerator: int, denominator: int) -> int:
+    """整數除法（ROUND_HALF_EVEN），denominator 必須 > 0"""
+    q, r = divmod(numerator, denominator)
+    twice = 2 * r
+    if twice > denominator or (twice == denominator and q % 2):
+        q += 1
+    return q
+
+
+class Amount:
+    """不可變的定點金額：units × 10^-decimals"""
+
+    __slots__ = ("units", "decimals")
+
+    def __init__(self, units: int, decimals: int = USDT_DECIMALS):
+        object.__setattr__(self, "units", int(units))
+        object.__setattr__(self, "decimals", decimals)
+
+    def __setattr__(self, key, value):
+        raise AttributeError("Amount 為不可變物件")
+
+    # ---------------- 建構 ----------------
+    @classmethod
+    def of(cls, value, decimals: int = USDT_DECIMALS) -> "Amount":
+        """由一般數值建立（例：Amount.of("12.5") → 12500000 units）"""
+        return cls(to_units(value, decimals), decimals)
+
+    # ---------------- 轉換 ----------------
+    def rescale(self, decimals: int) -> "Amount":
+        if decimals == self.decimals:
+            return self
+        if decimals > self.decimals:
+            return Amount(self.units * 10 ** (decimals - self.decimals), decimals)
+        return Amount(div_round(self.units, 10 ** (self.decimals - decimals)), decimals)
+
+    def to_decimal(self) -> Decimal:
+        return Decimal(self.units).scaleb(-self.decimals)
+
+    def __float__(self) -> float:
+        # int / int 為正確捨入的 true division
+        return self.units / 10 ** self.decimals
+
+    # ---------------- 運算 ----------------
+    def _align(self, other) -> tuple[int, int, int]:
+        if isinstance(other, Amount):
+            decimals = max(self.decimals, other.decimals)
+            return self.rescale(decimals).units, other.rescale(decimals).units, decimals
+        return self.units, to_units(other, self.decimals), self.decimals
+
+    def __add__(self, other):
+        a, b, d = self._align(other)
+        return Amount(a + b, d)
+
+    __radd__ = __add__
+
+    def __sub__(self, other):
+        a, b, d = self._align(other)
+        return Amount(a - b, d)
+
+    def __rsub__(self, other):
+        a, b, d = self._align(other)
+        return Amount(b - a, d)
+
+    def __neg__(self):
+        return Amount(-self.units, self.decimals)
+
+    def __eq__(self, other):
+        try:
+            a, b, _ = self._align(other)
+        except Exception:
+            return NotImplemented
+        return a == b
+
+    def __lt__(self, other):
+        a, b, _ = self._align(other)
+        return a < b
+
+    def __le__(self, other):
+        a, b, _ = self._align(other)
+        return a <= b
+
+    def __gt__(self, other):
+        a, b, _ = self._align(other)
+        return a > b
+
+    def __ge__(self, other):
+        a, b, _ = self._align(other)
+        return a >= b
+
+    def __hash__(self):
+        return hash(self.to_decimal())
+
+    def __repr__(self):
+        return f"Amount({self.to_decimal()}, decimals={self.decimals})"
+
+    def __str__(self):
+        return str(self.to_decimal())
+
+
+# ===========================================================
+# 🟩 B. 批次運算（NumPy int64）
+# ===========================================================
+def to_units_array(values, decimals: int) -> np.ndarray:
+    """
+    整欄金額 → int64 最小單位陣列（整數欄位直接向量化；其餘每筆走 to_units，確保精確）
+    換算後超出 int64 範圍時回傳 Python int 的 object 陣列（不溢位）
+    """
+    arr = np.asarray(values)
+    limit = _INT64.max // 10 ** decimals
+    if arr.dtype.kind in "iu" and (arr.size == 0 or (int(arr.max()) <= limit and int(arr.min()) >= -limit)):
+        return arr.astype(np.int64).ravel() * 10 ** decimals
+    units = [to_units(v, decimals) for v in np.asarray(values, dtype=object).ravel().tolist()]
+    if units and (max(units) > _INT64.max or min(units) < _INT64.min):
+        return np.array(units, dtype=object)
+    return np.array(units, dtype=np.int64)
+
+
+def sum_units(units) -> int:
+    """加總最小單位（以 Python int 累加，不會 int64 溢位）"""
+    if isinstance(units, np.ndarray):
+        return int(units.sum(dtype=object))
+    return sum(int(u) for u in units)
+
+
+def div_round_array(numerator: np.ndarray, denominator: int) -> np.ndarray:
+    """div_round 的 NumPy 版（ROUND_HALF_EVEN，支援 int64 與 object 陣列）"""
+    q, r = numerator // denominator, numerator % denominator
+    twice = 2 * r
+    bump = (twice > denominator) | ((twice == denominator) & (q % 2 == 1))
+    return q + bump
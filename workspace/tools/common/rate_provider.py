@@ -0,0 +1,219 @@
+# workspace/tools/common/rate_provider.py
+"""
+Rate Provider 工具模組
+------------------------------------------------
+職責：
+    - 提供全程共用的匯率來源（1 token = ? USD）
+    - TTL 快取：有效期內直接回傳，不打網路
+    - 過期後先回傳舊值，同時於背景執行緒更新（stale-while-revalidate）
+    - 舊值超過 max_stale 不再沿用：同步更新，失敗回傳 tools_currency_rates_expired
+    - 匯率寫入磁碟，下次執行可直接沿用
+    - 匯率來源可替換（例如離線測試用 StaticRateSource）
+
+來源介面：
+    source() -> (rates: dict[str, float], ResultCode)
+"""
+
+import json
+import os
+import tempfile
+import threading
+import time
+from typing import Callable
+
+import requests
+
+from workspace.config import paths
+from workspace.config.error_code import ResultCode
+
+
+COINGECKO_URL = "https://api.coingecko.com/api/v3/simple/price"
+COINGECKO_IDS = {"TRX": "tron", "USDT": "tether", "USDD": "usdd"}
+DEFAULT_TTL = 60  # 秒
+DEFAULT_MAX_STALE = 24 * 60 * 60  # 舊匯率最長可沿用秒數（超過即不再回傳）
+
+
+# ===========================================================
+# 🟩 A. 匯率來源
+# ===========================================================
+def fetch_coingecko_rates() -> tuple[dict, int]:
+    """從 CoinGecko 抓取最新匯率（網路來源）"""
+    try:
+        params = {
+            "ids": ",".join(COINGECKO_IDS.values()),
+            "vs_currencies": "usd",
+        }
+        resp = requests.get(COINGECKO_URL, params=params, timeout=5)
+        data = resp.json()
+        rates = {token: data[cg_id]["usd"] for token, cg_id in COINGECKO_IDS.items()}
+        return rates, ResultCode.SUCCESS
+    except Exception:
+        return {}, ResultCode.tools_currency_fetch_error
+
+
+class StaticRateSource:
+    """固定匯率來源（離線測試 / 手動指定匯率用）"""
+
+    def __init__(self, rates: dict[str, float]):
+        self.rates = {k.upper(): v for k, v in rates.items()}
+
+    def __call__(self) -> tuple[dict, int]:
+        return dict(self.rates), ResultCode.SUCCESS
+
+
+# ===========================================================
+# 🟩 B. 共用匯率提供者
+# ===========================================================
+class RateProvider:
+    def __init__(
+        self,
+        source: Callable[[], tuple[dict, int]] | None = None,
+        ttl: float = DEFAULT_TTL,
+        cache_file: str | None = None,
+        max_stale: float = DEFAULT_MAX_STALE,
+    ):
+        """
+        :param source: 匯率來源（預設 CoinGecko）
+        :param ttl: 快取有效秒數
+        :param max_stale: 過期匯率最長可沿用秒數（含磁碟快取）
+        :param cache_file: 磁碟快取路徑；None 表示使用 paths.RATE_CACHE_FILE，"" 表示不落地
+        """
+        self.source = source or fetch_coingecko_rates
+        self.ttl = ttl
+        self.max_stale = max_stale
+        self.cache_file = paths.RATE_CACHE_FILE if cache_file is None else cache_file
+
+        self._rates: dict[str, float] = {}
+        self._fetched_at = 0.0          # epoch 秒（可跨執行比較）
+        self._lock = threading.Lock()
+        self._refreshing = False
+        self._disk_loaded = False
+        self._thread: threading.Thread | None = None
+
+    # -------------------------------------------------------
+    # 對外 API
+    # -------------------------------------------------------
+    def get_rates(self) -> tuple[dict, int]:
+        """
+        取得匯率（熱路徑用）
+        - 新鮮 → 直接回傳
+        - 過期但有舊值（未超過 max_stale）→ 回傳舊值並觸發背景更新
+        - 舊值超過 max_stale → 同步更新；失敗回傳 tools_currency_rates_expired
+        - 完全沒有資料（含磁碟） → 同步抓取一次
+        """
+        if not self._disk_loaded:
+            self._load_from_disk()
+
+        if self._rates and self._age() > self.max_stale:
+            if self.refresh() != ResultCode.SUCCESS:
+                return {}, ResultCode.tools_currency_rates_expired
+            return dict(self._rates), ResultCode.SUCCESS
+
+        if self._rates:
+            rates = dict(self._rates)
+            if self.is_stale():
+                self._refresh_in_background()
+            return rates, ResultCode.SUCCESS
+
+        code = self.refresh()
+        return dict(self._rates), code
+
+    def refresh(self) -> int:
+        """同步向來源更新匯率，成功時寫入磁碟"""
+        rates, code = self.source()
+        if code != ResultCode.SUCCESS or not rates:
+            return code if code != ResultCode.SUCCESS else ResultCode.tools_currency_fetch_error
+
+        with self._lock:
+            self._rates = dict(rates)
+            self._fetched_at = time.time()
+        self._save_to_disk()
+        return ResultCode.SUCCESS
+
+    def is_stale(self) -> bool:
+        return self._age() >= self.ttl
+
+    def _age(self) -> float:
+        return time.time() - self._fetched_at
+
+    def wait_refresh(self, timeout: float | None = None):
+        """等待背景更新結束（測試 / 程式結束前使用）"""
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    # -------------------------------------------------------
+    # 內部：背景更新與磁碟快取
+    # -------------------------------------------------------
+    def _refresh_in_background(self):
+        with self._lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+
+        def _run():
+            try:
+                self.refresh()
+            finally:
+                with self._lock:
+                    self._refreshing = False
+
+        self._thread = threading.Thread(target=_run, name="rate-refresh", daemon=True)
+        self._thread.start()
+
+    def _load_from_disk(self):
+        self._disk_loaded = True
+        if not self.cache_file or not os.path.exists(self.cache_file):
+            return
+        try:
+            with open(self.cache_file, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            rates = data.get("rates") or {}
+            if rates:
+                with self._lock:
+                    self._rates = {k: float(v) for k, v in rates.items()}
+                    self._fetched_at = float(data.get("fetched_at", 0))
+        except Exception:
+            # 快取損毀視同沒有快取
+            pass
+
+    def _save_to_disk(self):
+        if not self.cache_file:
+            return
+        # 在鎖內取快照；每次寫入使用各自的暫存檔，同時更新時不會互相覆寫
+        with self._lock:
+            snapshot = {"rates": dict(self._rates), "fetched_at": self._fetched_at}
+        tmp_path = None
+        try:
+            directory = os.path.dirname(self.cache_file) or "."
+            os.makedirs(directory, exist_ok=True)
+            with tempfile.NamedTemporaryFile("w", encoding="utf-8", dir=directory, suffix=".tmp", delete=False) as f:
+                tmp_path = f.name
+                json.dump(snapshot, f)
+            os.replace(tmp_path, self.cache_file)
+        except Exception:
+            # 寫檔失敗不影響本次換算
+            if tmp_path and os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+
+# ===========================================================
+# 🟩 C. 全域共用實例
+# ===========================================================
+_default_provider: RateProvider | None = None
+_default_lock = threading.Lock()
+
+
+def get_default_provider() -> RateProvider:
+    """取得全域共用的 RateProvider（首次呼叫才建立）"""
+    global _default_provider
+    if _default_provider is None:
+        with _default_lock:
+            if _default_provider is None:
+                _default_provider = RateProvider()
+    return _default_provider
+
+
+def set_default_provider(provider: RateProvider | None):
+    """替換全域 RateProvider（例如測試時注入 StaticRateSource）"""
+    global _default_provider
+    _default_provider = provider
@@ -0,0 +1,77 @@
+# workspace/tools/common/readiness_poller.py
+"""
+Readiness Poller 工具模組（就緒輪詢）
+------------------------------------------------
+職責：
+    - 反覆呼叫探測函式，資料可見即返回；未就緒時以指數退避等待下一次探測
+    - 總等待時間不超過 timeout（最後一次等待會縮短到剛好截止）
+    - 僅回傳結果與錯誤碼，不印 log、不 raise Exception
+
+探測函式：
+    probe() → (ready: bool, value)，可為 async；探測拋出例外視為暫時未就緒
+    on_attempt(attempt, elapsed, ready, value) 每次探測後呼叫（顯示進度用，可省略）
+
+錯誤碼範圍：
+    tools_poll_xxx (1301–1320)
+"""
+
+import asyncio
+import inspect
+import time
+from workspace.config.error_code import ResultCode
+
+
+async def poll_until_ready(
+    probe,
+    timeout: float = 140,
+    interval: float = 1.0,
+    max_interval: float = 15.0,
+    factor: float = 2.0,
+    on_attempt=None,
+    sleep=asyncio.sleep,
+    clock=time.monotonic,
+):
+    """
+    輪詢直到就緒或超時
+
+    Parameters
+    ----------
+    interval : 第一次未就緒後的等待秒數
+    max_interval : 退避上限
+    sleep / clock : 可替換（測試用）
+
+    Returns
+    -------
+    (value, code)
+        就緒：最後一次探測的 value, SUCCESS
+        超時：最後一次探測的 value, tools_poll_timeout
+        超時且最後一次探測拋出例外：None, tools_poll_probe_error
+    """
+    started = clock()
+    delay = interval
+    attempt = 0
+    value, failed = None, False
+
+    while True:
+        attempt += 1
+        try:
+            result = probe()
+            if inspect.isawaitable(result):
+                result = await result
+            ready, value = result
+            failed = False
+        except Exception:
+            ready, value, failed = False, None, True
+
+        elapsed = clock() - started
+        if on_attempt is not None:
+            on_attempt(attempt, elapsed, ready, value)
+        if ready:
+            return value, ResultCode.SUCCESS
+
+        remaining = timeout - elapsed
+        if remaining <= 0:
+            return value, ResultCode.tools_poll_probe_error if failed else ResultCode.tools_poll_timeout
+
+        await sleep(min(delay, remaining))
+        delay = min(delay * factor, max_interval)
@@ -0,0 +1,170 @@
+# workspace/tools/common/task_graph.py
+"""
+Task Graph 工具模組（DAG 排程）
+------------------------------------------------
+職責：
+    - 依節點相依關係展開、排序並執行 DAG
+    - 相依節點全部成功後才啟動；互不相依的節點同時執行（asyncio）
+    - 僅回傳結果與錯誤碼，不印 log、不 raise Exception
+
+相依類型：
+    requires : 硬相依。展開時自動帶入，且必須成功，否則下游節點略過
+    after    : 僅排序。兩個節點都在圖中時才生效（不會自動帶入）
+
+錯誤碼範圍：
+    tools_graph_xxx (1281–1300)
+"""
+
+import asyncio
+import time
+from typing import Awaitable, Callable, Iterable
+from workspace.config.error_code import ResultCode
+
+
+# ------------------------------------------------------------
+# 🔹 展開與排序
+# ------------------------------------------------------------
+def expand_requires(targets: Iterable[str], requires: dict) -> tuple[list[str], int]:
+    """
+    由目標節點沿 requires 展開出完整節點集合（保留首次出現順序）
+    :param requires: {節點: [硬相依節點, ...]}（所有已知節點都需列出）
+    :return: (節點列表, code)
+    """
+    nodes, stack = [], list(targets)[::-1]
+    seen = set()
+    while stack:
+        name = stack.pop()
+        if name in seen:
+            continue
+        if name not in requires:
+            return [], ResultCode.tools_graph_unknown_node
+        seen.add(name)
+        nodes.append(name)
+        stack.extend(reversed(list(requires[name])))
+    return nodes, ResultCode.SUCCESS
+
+
+def build_graph(nodes: Iterable[str], requires: dict, after: dict | None = None) -> tuple[dict, int]:
+    """
+    建立節點 → 前置節點集合；after 只保留同樣在圖中的節點
+    :return: ({節點: set(前置節點)}, code)
+    """
+    nodes = list(nodes)
+    members = set(nodes)
+    after = after or {}
+    graph = {}
+    for name in nodes:
+        deps = set(requires.get(name, ()))
+        if not deps <= members:
+            return {}, ResultCode.tools_graph_unknown_node
+        deps.update(dep for dep in after.get(name, ()) if dep in members)
+        graph[name] = deps
+
+    _, code = topo_levels(graph)
+    if code != ResultCode.SUCCESS:
+        return {}, code
+    return graph, ResultCode.SUCCESS
+
+
+def topo_levels(graph: dict) -> tuple[list[list[str]], int]:
+    """
+    分層拓樸排序（同一層互不相依，可同時執行）
+    :return: ([[節點, ...], ...], code)；有循環時回傳 tools_graph_cycle
+    """
+    remaining = {name: set(deps) for name, deps in graph.items()}
+    levels = []
+    while remaining:
+        ready = [name for name, deps in remaining.items() if not deps]
+        if not ready:
+            return [], ResultCode.tools_graph_cycle
+        levels.append(ready)
+        for name in ready:
+            del remaining[name]
+        for deps in remaining.values():
+            deps.difference_update(ready)
+    return levels, ResultCode.SUCCESS
+
+
+# ------------------------------------------------------------
+# 🔹 執行
+# ------------------------------------------------------------
+async def run_graph(
+    graph: dict,
+    run_node: Callable[[str], Awaitable[int]],
+    requires: dict | None = None,
+    max_concurrency: int | None = None,
+) -> tuple[dict, int]:
+    """
+    執行 DAG：前置節點完成後立即啟動下游節點
+
+    Parameters
+    ----------
+    graph : {節點: set(前置節點)}（build_graph 的結果）
+    run_node : async 函式，參數為節點名稱，回傳 ResultCode
+    requires : 硬相依；失敗時下游回報 tools_graph_skipped（after 相依失敗不影響）
+               未提供時視所有前置節點皆為硬相依
+    max_concurrency : 同時執行的節點上限（None = 不限）
+
+    Returns
+    -------
+    ({節點: {"code": code, "elapsed": 秒數}}, code)
+        code 為第一個失敗節點的錯誤碼（依完成順序），全部成功為 SUCCESS
+    """
+    _, code = topo_levels(graph)
+    if code != ResultCode.SUCCESS:
+        return {}, code
+
+    hard = {name: set(deps) for name, deps in graph.items()} if requires is None else {
+        name: set(requires.get(name, ())) & set(graph) for name in graph
+    }
+    pending = {name: set(deps) for name, deps in graph.items()}
+    limit = asyncio.Semaphore(max_concurrency) if max_concurrency else None
+    results: dict[str, dict] = {}
+    first_error = ResultCode.SUCCESS
+    running: dict[asyncio.Task, str] = {}
+
+    async def _run(name: str):
+        start = time.perf_counter()
+        try:
+            if limit is None:
+                result = await run_node(name)
+            else:
+                async with limit:
+                    result = await run_node(name)
+        except Exception:
+            result = ResultCode.tools_graph_node_exception
+        return result, time.perf_counter() - start
+
+    def _schedule_ready():
+        # 略過的節點會立即釋放下游，因此重複掃描直到沒有新的可執行節點
+        ready = [n for n, deps in pending.items() if not deps]
+        while ready:
+            for name in ready:
+                del pending[name]
+                if any(results[dep]["code"] != ResultCode.SUCCESS for dep in hard[name]):
+                    results[name] = {"code": ResultCode.tools_graph_skipped, "elapsed": 0.0}
+                    _release(name)
+                    continue
+                running[asyncio.create_task(_run(name))] = name
+            ready = [n for n, deps in pending.items() if not deps]
+
+    def _release(name: str):
+        for deps in pending.values():
+            deps.discard(name)
+
+    _schedule_ready()
+    while running or pending:
+        if not running:
+            # 只剩等待中的節點卻沒有在執行的 → 理論上不會發生（已檢查循環）
+            return results, ResultCode.tools_graph_cycle
+        done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+        for task in done:
+            name = running.pop(task)
+            node_code, elapsed = task.result()
+            results[name] = {"code": node_code, "elapsed": elapsed}
+            if node_code != ResultCode.SUCCESS and first_error == ResultCode.SUCCESS:
+                first_error = node_code
+            _release(name)
+        _schedule_ready()
+
+    return results, first_error
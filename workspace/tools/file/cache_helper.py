@@ -0,0 +1,187 @@
+"""
+cache_helper.py
+-----------------
+用途：
+    - 將「解析 + 驗證後」的結果存成 pickle 快取，來源檔未變動時直接載入
+    - 快取鍵：來源檔路徑、大小、mtime 與內容 SHA-256
+    - 僅回傳結果與錯誤碼，不印 log、不 raise Exception
+
+命中規則：
+    1. 快取版本一致，且每個來源檔的 (路徑, 大小, mtime) 與快取記錄相同 → 直接命中（不讀來源檔）
+    2. 大小相同但 mtime 不同（例如被 touch / 複製）→ 重新計算 SHA-256，內容相同仍算命中
+    3. 其餘情況一律視為未命中，由呼叫端重新解析後再寫入
+
+寫入時機：
+    - 呼叫端應在「讀取來源檔之前」以 fingerprint_sources() 取得指紋，解析完成後傳入 save_parsed_cache()；
+      寫入前再比對一次 (大小, mtime)，解析期間來源檔被修改就不寫入，避免舊內容配上新指紋
+
+錯誤碼範圍：
+    tools_cache_xxx (1261–1280)
+"""
+
+import hashlib
+import os
+import pickle
+from typing import Any, List, Tuple
+from workspace.config.error_code import ResultCode
+
+
+_HASH_CHUNK = 1 << 20  # 計算雜湊時每次讀取 1 MB
+
+
+# ------------------------------------------------------------
+# 🔹 來源檔指紋
+# ------------------------------------------------------------
+def file_fingerprint(file_path: str, with_hash: bool = True) -> Tuple[dict, int]:
+    """
+    取得檔案指紋 {"path", "size", "mtime_ns", "sha256"}
+
+    Parameters
+    ----------
+    with_hash : bool
+        False 時不讀檔內容（sha256 為 None），僅取 stat 資訊
+    """
+    if not file_path or not isinstance(file_path, str):
+        return {}, ResultCode.tools_file_invalid_path
+
+    try:
+        st = os.stat(file_path)
+        fingerprint = {
+            "path": os.path.abspath(file_path),
+            "size": st.st_size,
+            "mtime_ns": st.st_mtime_ns,
+            "sha256": _sha256(file_path) if with_hash else None,
+        }
+        return fingerprint, ResultCode.SUCCESS
+    except PermissionError:
+        return {}, ResultCode.tools_file_permission_denied
+    except Exception:
+        return {}, ResultCode.tools_cache_read_failed
+
+
+def fingerprint_sources(source_paths: List[str]) -> Tuple[list, int]:
+    """取得多個來源檔的完整指紋（含 SHA-256）；任一失敗即回傳該錯誤碼"""
+    sources = []
+    for path in source_paths:
+        fingerprint, code = file_fingerprint(path)
+        if code != ResultCode.SUCCESS:
+            return [], code
+        sources.append(fingerprint)
+    return sources, ResultCode.SUCCESS
+
+
+def _sha256(file_path: str) -> str:
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for block in iter(lambda: f.read(_HASH_CHUNK), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+# ------------------------------------------------------------
+# 🔹 讀取快取
+# ------------------------------------------------------------
+def load_parsed_cache(cache_path: str, source_paths: List[str], version) -> Tuple[Any, int]:
+    """
+    依來源檔指紋讀取快取內容
+
+    Returns
+    -------
+    (payload, code)
+        命中：payload, SUCCESS
+        未命中：None, tools_cache_miss
+        快取檔損毀：None, tools_cache_read_failed
+    """
+    if not cache_path or not os.path.exists(cache_path):
+        return None, ResultCode.tools_cache_miss
+
+    try:
+        with open(cache_path, "rb") as f:
+            entry = pickle.load(f)
+    except Exception:
+        return None, ResultCode.tools_cache_read_failed
+
+    if not isinstance(entry, dict) or entry.get("version") != version:
+        return None, ResultCode.tools_cache_miss
+
+    cached_sources = entry.get("sources") or []
+    if len(cached_sources) != len(source_paths):
+        return None, ResultCode.tools_cache_miss
+
+    for path, cached in zip(source_paths, cached_sources):
+        current, code = file_fingerprint(path, with_hash=False)
+        if code != ResultCode.SUCCESS:
+            return None, ResultCode.tools_cache_miss
+        if current["path"] != cached["path"] or current["size"] != cached["size"]:
+            return None, ResultCode.tools_cache_miss
+        if current["mtime_ns"] == cached["mtime_ns"]:
+            continue
+        # mtime 不同：比對內容雜湊
+        try:
+            if _sha256(path) != cached["sha256"]:
+                return None, ResultCode.tools_cache_miss
+        except Exception:
+            return None, ResultCode.tools_cache_miss
+
+    return entry.get("payload"), ResultCode.SUCCESS
+
+
+# ------------------------------------------------------------
+# 🔹 寫入快取
+# ------------------------------------------------------------
+def save_parsed_cache(cache_path: str, source_paths: List[str], version, payload, sources: list | None = None) -> int:
+    """
+    寫入快取（先寫暫存檔再 os.replace，避免中途中斷留下半個檔案）
+    快取可能含敏感欄位，檔案權限設為僅擁有者可讀寫
+
+    Parameters
+    ----------
+    sources : list | None
+        解析前由 fingerprint_sources() 取得的指紋；來源檔此後有變動 → 不寫入，回傳 tools_cache_miss
+        None → 於此時計算（僅限呼叫端能保證解析期間來源檔不變）
+    """
+    if not cache_path or not isinstance(cache_path, str):
+        return ResultCode.tools_file_invalid_path
+
+    if sources is None:
+        sources, code = fingerprint_sources(source_paths)
+        if code != ResultCode.SUCCESS:
+            return code
+    elif len(sources) != len(source_paths):
+        return ResultCode.tools_cache_miss
+    else:
+        for path, before in zip(source_paths, sources):
+            current, code = file_fingerprint(path, with_hash=False)
+            if code != ResultCode.SUCCESS:
+                return code
+            if (current["path"], current["size"], current["mtime_ns"]) != (before["path"], before["size"], before["mtime_ns"]):
+                return ResultCode.tools_cache_miss
+
+    entry = {"version": version, "sources": sources, "payload": payload}
+    tmp_path = cache_path + ".tmp"
+    try:
+        os.makedirs(os.path.dirname(cache_path) or ".", exist_ok=True)
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "wb") as f:
+            pickle.dump(entry, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, cache_path)
+        return ResultCode.SUCCESS
+    except PermissionError:
+        return ResultCode.tools_file_permission_denied
+    except Exception:
+        return ResultCode.tools_cache_write_failed
+
+
+# ------------------------------------------------------------
+# 🔹 清除快取
+# ------------------------------------------------------------
+def clear_parsed_cache(cache_path: str) -> int:
+    """刪除快取檔（不存在視為成功）"""
+    try:
+        if cache_path and os.path.exists(cache_path):
+            os.remove(cache_path)
+        return ResultCode.SUCCESS
+    except PermissionError:
+        return ResultCode.tools_file_permission_denied
+    except Exception:
+        return ResultCode.tools_file_unknown_error
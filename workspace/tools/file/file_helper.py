@@ -12,6 +12,7 @@ file_helper.py
 """
 
 import os
+import json
 from typing import Tuple, List
 from workspace.config.error_code import ResultCode
 
@@ -106,3 +107,120 @@ def list_all_files(directory: str) -> Tuple[List[str], int]:
         return [], ResultCode.tools_file_permission_denied
     except Exception:
         return [], ResultCode.tools_file_list_failed
+
+
+# ------------------------------------------------------------
+# 🔹 讀取 JSON 檔
+# ------------------------------------------------------------
+def read_json(file_path: str) -> Tuple[object, int]:
+    """
+    讀取 JSON 檔。
+
+    Returns
+    -------
+    (data, code)
+        檔案不存在時回傳 (None, tools_file_not_found)
+    """
+    if not file_path or not isinstance(file_path, str):
+        return None, ResultCode.tools_file_invalid_path
+
+    if not os.path.exists(file_path):
+        return None, ResultCode.tools_file_not_found
+
+    try:
+        with open(file_path, "r", encoding="utf-8") as f:
+            return json.load(f), ResultCode.SUCCESS
+    except PermissionError:
+        return None, ResultCode.tools_file_permission_denied
+    except Exception:
+        return None, ResultCode.tools_file_read_failed
+
+
+# ------------------------------------------------------------
+# 🔹 寫入 JSON 檔（原子寫入）
+# ------------------------------------------------------------
+def write_json_atomic(file_path: str, data, mode: int | None = None) -> int:
+    """
+    先寫入暫存檔再 os.replace，避免中途中斷留下半個檔案。
+    上層資料夾不存在時自動建立。
+    mode: 指定檔案權限（例如 0o600）；None → 依 umask
+    """
+    if not file_path or not isinstance(file_path, str):
+        return ResultCode.tools_file_invalid_path
+
+    tmp_path = file_path + ".tmp"
+    try:
+        os.makedirs(os.path.dirname(file_path) or ".", exist_ok=True)
+        if mode is None:
+            f = open(tmp_path, "w", encoding="utf-8")
+        else:
+            fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, mode)
+            if hasattr(os, "fchmod"):
+                os.fchmod(fd, mode)  # 暫存檔已存在時 os.open 不會套用 mode（Windows 無 fchmod）
+            f = os.fdopen(fd, "w", encoding="utf-8")
+        with f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(tmp_path, file_path)
+        return ResultCode.SUCCESS
+    except PermissionError:
+        _remove_quietly(tmp_path)
+        return ResultCode.tools_file_permission_denied
+    except Exception:
+        _remove_quietly(tmp_path)
+        return ResultCode.tools_file_write_failed
+
+
+# ------------------------------------------------------------
+# 🔹 讀取 / 建立本機金鑰檔
+# ------------------------------------------------------------
+def load_or_create_secret(file_path: str, size: int = 32) -> Tuple[bytes | None, int]:
+    """
+    讀取金鑰檔；不存在時產生 size 位元組的隨機金鑰並建立（權限 0600）。
+    先寫暫存檔再 os.link 到正式路徑，多個程序同時建立時只會有一份生效。
+
+    Returns
+    -------
+    (secret, code)
+    """
+    if not file_path or not isinstance(file_path, str):
+        return None, ResultCode.tools_file_invalid_path
+
+    tmp_path = f"{file_path}.{os.getpid()}.tmp"
+    try:
+        if not os.path.exists(file_path):
+            os.makedirs(os.path.dirname(file_path) or ".", exist_ok=True)
+            fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            try:
+                if hasattr(os, "fchmod"):
+                    os.fchmod(fd, 0o600)
+                os.write(fd, os.urandom(size).hex().encode("ascii"))
+            finally:
+                os.close(fd)
+            try:
+                os.link(tmp_path, file_path)
+            except FileExistsError:
+                pass  # 其他程序已先建立 → 沿用對方的金鑰
+            finally:
+                _remove_quietly(tmp_path)
+
+        with open(file_path, "r", encoding="ascii") as f:
+            secret = f.read().strip()
+        if not secret:
+            return None, ResultCode.tools_file_read_failed
+        return bytes.fromhex(secret), ResultCode.SUCCESS
+    except PermissionError:
+        _remove_quietly(tmp_path)
+        return None, ResultCode.tools_file_permission_denied
+    except ValueError:
+        return None, ResultCode.tools_file_read_failed
+    except Exception:
+        _remove_quietly(tmp_path)
+        return None, ResultCode.tools_file_write_failed
+
+
+def _remove_quietly(path: str):
+    """失敗路徑清除暫存檔（不存在或無法刪除皆略過）"""
+    try:
+        os.remove(path)
+    except OSError:
+        pass
@@ -0,0 +1,276 @@
+"""
+run_log.py
+-----------------
+用途：
+    - 結構化執行紀錄（JSON Lines）：每筆 record 寫成一行，事後可查詢，不必重跑 --debug
+    - 檔案超過大小上限時輪替（run_log.jsonl → run_log.jsonl.1 → ... → 最多保留 backups 份）
+    - 提供查詢：依 stage / code / name / type / run 篩選
+    - 僅回傳結果與錯誤碼，不印 log、不 raise Exception
+
+每行欄位：
+    ts      : 寫入時間（epoch 秒）
+    run     : 本次執行 ID（同一個 process 相同）
+    stage   : 控制器 prefix（例如 "OPS"、"Loader"、"Task"）
+    step    : 步驟編號或節點名稱
+    title   : 步驟標題
+    type    : record 類型（error / info / debug）；步驟摘要為 "step"
+    name    : 名稱索引（批次請求才有）
+    code    : record 自身的 ResultCode（"code"，任務層驗證記錄為 "result_code"），沒有時為步驟的 ResultCode
+    elapsed : 耗時秒數（單筆請求或整個步驟）
+    message / request / response
+
+注意：
+    - request 中的密碼、OTP、Session ID 會以 "***" 遮蔽（巢狀 dict / list 一併處理）
+    - message 與 response text 中形如 Password: xxx / "Sid": "xxx" / SSID=xxx 的片段也會遮蔽
+    - response 只保留 status_code 與原始 text（不重複寫入已解析的 parsed）；
+      非 debug 模式的精簡記錄沒有 request / response，只寫入 name / code / elapsed
+    - 紀錄檔權限僅擁有者可讀寫（0600）
+
+錯誤碼範圍：
+    沿用 tools_file_xxx (1241–1260)
+"""
+
+import atexit
+import json
+import os
+import re
+import threading
+import time
+from typing import List, Tuple
+from workspace.config.error_code import ResultCode
+
+
+RUN_ID = time.strftime("%Y%m%d-%H%M%S") + f"-{os.getpid()}"
+
+_SENSITIVE_KEYS = {
+    "password", "otpcode", "otp", "login_otp", "otp_secret", "secret",
+    "sid", "ssid", "session_id", "authorization", "token",
+}
+_MASK = "***"
+# 自由文字中的 key: value / key=value（key 可帶引號，value 可帶引號）
+_SENSITIVE_TEXT = re.compile(
+    r"""(?P<key>(?<!\w)["']?(?:%s)["']?\s*[:=]\s*)(?P<quote>["']?)(?P<value>[^"',}\s]+)(?P=quote)"""
+    % "|".join(sorted(_SENSITIVE_KEYS, key=len, reverse=True)),
+    re.IGNORECASE,
+)
+
+
+class RunLog:
+    """附加寫入 + 大小輪替的 JSONL 寫入器（執行緒安全）"""
+
+    def __init__(self, path: str, max_bytes: int = 5 * 1024 * 1024, backups: int = 3):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self._file = None
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def write(self, entries: List[dict]) -> int:
+        """寫入多筆紀錄，回傳 ResultCode"""
+        if not entries:
+            return ResultCode.SUCCESS
+        try:
+            lines = [json.dumps(entry, ensure_ascii=False, default=str) + "\n" for entry in entries]
+            with self._lock:
+                for line in lines:
+                    size = len(line.encode("utf-8"))
+                    if self._file is None:
+                        self._open()
+                    if self._size and self._size + size > self.max_bytes:
+                        self._rotate()
+                    self._file.write(line)
+                    self._size += size
+            return ResultCode.SUCCESS
+        except PermissionError:
+            return ResultCode.tools_file_permission_denied
+        except Exception:
+            return ResultCode.tools_file_write_failed
+
+    def flush(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.flush()
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def _open(self):
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        fd = os.open(self.path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o600)
+        if hasattr(os, "fchmod"):
+            os.fchmod(fd, 0o600)  # 舊版建立的紀錄檔一併收緊權限
+        self._file = os.fdopen(fd, "a", encoding="utf-8", buffering=1 << 16)
+        self._size = self._file.seek(0, os.SEEK_END)
+
+    def _rotate(self):
+        self._file.close()
+        self._file = None
+        if self.backups > 0:
+            for i in range(self.backups - 1, 0, -1):
+                src = f"{self.path}.{i}"
+                if os.path.exists(src):
+                    os.replace(src, f"{self.path}.{i + 1}")
+            os.replace(self.path, f"{self.path}.1")
+        else:
+            os.remove(self.path)
+        self._open()
+
+
+# ------------------------------------------------------------
+# 🔹 全域寫入器（未設定時 log_records 不做任何事）
+# ------------------------------------------------------------
+_run_log: RunLog | None = None
+
+
+def configure_run_log(path: str | None, max_bytes: int = 5 * 1024 * 1024, backups: int = 3) -> RunLog | None:
+    """設定全域寫入器；path 為 None 時關閉"""
+    global _run_log
+    old, _run_log = _run_log, (RunLog(path, max_bytes, backups) if path else None)
+    if old is not None:
+        old.close()
+    return _run_log
+
+
+def get_run_log() -> RunLog | None:
+    return _run_log
+
+
+def log_records(records, stage: str, step=None, title: str = "", code=None, elapsed: float | None = None) -> int:
+    """
+    將一個步驟的 records 與步驟摘要寫入執行紀錄
+    :param code: 步驟的 ResultCode（record 沒有自己的 code 時沿用）
+    :param elapsed: 步驟耗時
+    """
+    run_log = _run_log
+    if run_log is None:
+        return ResultCode.SUCCESS
+
+    ts = round(time.time(), 3)
+    base = {"ts": ts, "run": RUN_ID, "stage": stage, "step": step, "title": title}
+    entries = [_entry(base, record, code) for record in records or []]
+    entries.append({**base, "type": "step", "name": None, "code": _int(code),
+                    "elapsed": _round(elapsed), "message": title})
+    return run_log.write(entries)
+
+
+def _entry(base: dict, record: dict, code) -> dict:
+    entry = {
+        **base,
+        "type": record.get("type"),
+        "name": record.get("name"),
+        "code": _int(record.get("code", record.get("result_code", code))),
+        "elapsed": _round(record.get("elapsed")),
+        "message": _scrub(record.get("message", "")),
+    }
+    request = record.get("request")
+    if request:
+        entry["request"] = _mask(request)
+    response = record.get("response")
+    if response and ("status_code" in response or "text" in response):
+        entry["response"] = {"status_code": response.get("status_code"), "text": _scrub(response.get("text"))}
+    return entry
+
+
+def _mask(data):
+    """遞迴遮蔽敏感欄位（dict / list / tuple）"""
+    if isinstance(data, dict):
+        return {k: (_MASK if str(k).lower() in _SENSITIVE_KEYS and v else _mask(v)) for k, v in data.items()}
+    if isinstance(data, (list, tuple)):
+        return [_mask(v) for v in data]
+    if isinstance(data, str):
+        return _scrub(data)
+    return data
+
+
+def _scrub(text):
+    """遮蔽自由文字中的敏感片段"""
+    if not isinstance(text, str) or not text:
+        return text
+    return _SENSITIVE_TEXT.sub(lambda m: f"{m.group('key')}{m.group('quote')}{_MASK}{m.group('quote')}", text)
+
+
+def _int(code):
+    return int(code) if code is not None else None
+
+
+def _round(value):
+    return round(value, 4) if isinstance(value, (int, float)) else None
+
+
+# ------------------------------------------------------------
+# 🔹 查詢
+# ------------------------------------------------------------
+def query_run_log(
+    path: str,
+    stage: str | None = None,
+    code: int | None = None,
+    name: str | None = None,
+    rtype: str | None = None,
+    run: str | None = None,
+    include_rotated: bool = True,
+) -> Tuple[List[dict], int]:
+    """
+    讀取執行紀錄並篩選（由舊到新）
+
+    Parameters
+    ----------
+    stage : "OPS" 符合整個控制器；"OPS.4" / "Task.create_agent" 只符合該步驟
+    code : ResultCode（整數）
+    run : 執行 ID；"last" 代表最後一次執行
+
+    Returns
+    -------
+    (entries, code)
+        紀錄檔不存在時回傳 ([], tools_file_not_found)；損毀的行會略過
+    """
+    if not path or not isinstance(path, str):
+        return [], ResultCode.tools_file_invalid_path
+    if not os.path.exists(path):
+        return [], ResultCode.tools_file_not_found
+
+    files = [path]
+    if include_rotated:
+        i = 1
+        while os.path.exists(f"{path}.{i}"):
+            files.insert(0, f"{path}.{i}")
+            i += 1
+
+    entries = []
+    try:
+        for file_path in files:
+            with open(file_path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entries.append(json.loads(line))
+                    except ValueError:
+                        continue  # 中斷寫入造成的不完整行
+    except PermissionError:
+        return [], ResultCode.tools_file_permission_denied
+    except Exception:
+        return [], ResultCode.tools_file_read_failed
+
+    if run == "last" and entries:
+        run = entries[-1].get("run")
+
+    def _match(entry):
+        if stage is not None and stage not in (entry.get("stage"), f"{entry.get('stage')}.{entry.get('step')}"):
+            return False
+        if code is not None and entry.get("code") != int(code):
+            return False
+        if name is not None and entry.get("name") != name:
+            return False
+        if rtype is not None and entry.get("type") != rtype:
+            return False
+        if run is not None and entry.get("run") != run:
+            return False
+        return True
+
+    return [entry for entry in entries if _match(entry)], ResultCode.SUCCESS
+
+
+# 結束時寫出緩衝內容
+atexit.register(lambda: _run_log and _run_log.close())
@@ -0,0 +1,119 @@
+"""
+session_store.py
+-----------------
+用途：
+    - 保存登入 Session（Sid / Uuid），下次執行可直接沿用，不必重新產生 OTP 與登入
+    - 僅回傳結果與錯誤碼，不印 log、不 raise Exception
+
+安全性：
+    - 檔案權限僅擁有者可讀寫（0600），先寫暫存檔再 os.replace
+    - 以 session_key() 的雜湊值為索引，不保存帳號、密碼、OTP Secret 明文；
+      雜湊包含密碼與 OTP Secret，憑證變更後舊 Session 自然失效
+    - 超過 max_age 的 Session 視為未命中（不打 API 就能淘汰）
+
+錯誤碼範圍：
+    tools_session_xxx (1321–1340)
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Tuple
+from workspace.config.error_code import ResultCode
+
+
+SESSION_STORE_VERSION = 1
+_write_lock = threading.Lock()  # 帳號池同時登入時，避免讀改寫互相覆蓋
+
+
+def session_key(*parts) -> str:
+    """由 (Base URL, 角色, 帳號, 密碼, OTP Secret …) 組出 Session 索引（SHA-256）"""
+    raw = "\x1f".join("" if part is None else str(part) for part in parts)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+# ------------------------------------------------------------
+# 🔹 讀取 Session
+# ------------------------------------------------------------
+def load_session(path: str, key: str, max_age: float, now: float | None = None) -> Tuple[dict | None, int]:
+    """
+    讀取保存的 Session
+
+    Returns
+    -------
+    (session, code)
+        命中：{"SSID", "UUID", "saved_at"}, SUCCESS
+        無紀錄 / 已過期：None, tools_session_miss
+        檔案損毀：None, tools_session_read_failed
+    """
+    sessions, code = _read(path)
+    if code != ResultCode.SUCCESS:
+        return None, code
+
+    session = sessions.get(key)
+    if not isinstance(session, dict) or not session.get("SSID"):
+        return None, ResultCode.tools_session_miss
+
+    now = time.time() if now is None else now
+    if now - session.get("saved_at", 0) > max_age:
+        return None, ResultCode.tools_session_miss
+    return session, ResultCode.SUCCESS
+
+
+# ------------------------------------------------------------
+# 🔹 寫入 / 清除 Session
+# ------------------------------------------------------------
+def save_session(path: str, key: str, sid: str, uuid: str | None, now: float | None = None) -> int:
+    """保存（覆寫）一組 Session；其他索引的紀錄保留"""
+    with _write_lock:
+        sessions, code = _read(path)
+        if code not in (ResultCode.SUCCESS, ResultCode.tools_session_miss):
+            sessions = {}
+        sessions[key] = {"SSID": sid, "UUID": uuid, "saved_at": time.time() if now is None else now}
+        return _write(path, sessions)
+
+
+def clear_session(path: str, key: str) -> int:
+    """移除一組 Session（不存在視為成功）"""
+    with _write_lock:
+        sessions, code = _read(path)
+        if code != ResultCode.SUCCESS or key not in sessions:
+            return ResultCode.SUCCESS
+        del sessions[key]
+        return _write(path, sessions)
+
+
+def _read(path: str) -> Tuple[dict, int]:
+    if not path or not isinstance(path, str):
+        return {}, ResultCode.tools_file_invalid_path
+    if not os.path.exists(path):
+        return {}, ResultCode.tools_session_miss
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except PermissionError:
+        return {}, ResultCode.tools_file_permission_denied
+    except Exception:
+        return {}, ResultCode.tools_session_read_failed
+    if not isinstance(data, dict) or data.get("version") != SESSION_STORE_VERSION:
+        return {}, ResultCode.tools_session_miss
+    return data.get("sessions") or {}, ResultCode.SUCCESS
+
+
+def _write(path: str, sessions: dict) -> int:
+    if not path or not isinstance(path, str):
+        return ResultCode.tools_file_invalid_path
+    tmp_path = path + ".tmp"
+    try:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump({"version": SESSION_STORE_VERSION, "sessions": sessions}, f)
+        os.replace(tmp_path, path)
+        return ResultCode.SUCCESS
+    except PermissionError:
+        return ResultCode.tools_file_permission_denied
+    except Exception:
+        return ResultCode.tools_session_write_failed
@@ -7,9 +7,48 @@ Debug Helper
     - CLI 可用:
         --debug     強制開啟
         --no-debug  強制關閉
+    - 系統設定載入後一次解析成 RunConfig 存入 context["RUN"]，之後 is_debug() 只讀取該物件
 """
 
 import sys
+from dataclasses import dataclass
+from functools import lru_cache
+
+
+@dataclass(frozen=True)
+class RunConfig:
+    """
+    本次執行的設定（載入系統設定後解析一次）
+    debug   : 是否開啟 Debug 模式
+    records : 是否需要完整的請求記錄（僅 debug 時）；關閉時成功請求只組精簡記錄
+              （parsed / code / elapsed），run_log 預設開啟也不會讓批次路徑組完整 request / response
+    """
+    debug: bool = False
+    records: bool = False
+
+    def to_dict(self) -> dict:
+        return {"debug": self.debug, "records": self.records}
+
+
+def resolve_run_config(context: dict | None = None) -> RunConfig:
+    """依 CLI / context 解析 RunConfig（不寫入 context）"""
+    debug = _resolve_debug(context)
+    return RunConfig(debug=debug, records=debug)
+
+
+def get_run_config(context: dict | None = None) -> RunConfig:
+    """
+    取得 RunConfig：context 已有 "RUN" 直接回傳；
+    否則即時解析，並在系統設定（COMMON）已載入時存回 context 供後續使用
+    """
+    if context:
+        run = context.get("RUN")
+        if run is not None:
+            return run
+    run = resolve_run_config(context)
+    if context and "COMMON" in context:
+        context["RUN"] = run
+    return run
 
 
 def is_debug(context: dict | None = None) -> bool:
@@ -20,13 +59,14 @@ def is_debug(context: dict | None = None) -> bool:
         2. context["COMMON"]["DEBUG"] (.env)
         3. 預設 False
     """
-    argv_lower = [arg.lower() for arg in sys.argv]
+    return get_run_config(context).debug
 
-    # Step 1. CLI 強制開關判斷
-    if "--debug" in argv_lower:
-        return True
-    if "--no-debug" in argv_lower:
-        return False
+
+def _resolve_debug(context: dict | None) -> bool:
+    # Step 1. CLI 強制開關判斷（同一組 argv 只解析一次）
+    forced = _cli_debug(tuple(sys.argv))
+    if forced is not None:
+        return forced
 
     # Step 2. 從 context 讀取 (.env 載入結果)
     try:
@@ -42,3 +82,13 @@ def is_debug(context: dict | None = None) -> bool:
 
     # Step 3. 預設關閉
     return False
+
+
+@lru_cache(maxsize=4)
+def _cli_debug(argv: tuple) -> bool | None:
+    argv_lower = [arg.lower() for arg in argv]
+    if "--debug" in argv_lower:
+        return True
+    if "--no-debug" in argv_lower:
+        return False
+    return None
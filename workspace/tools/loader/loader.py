@@ -5,7 +5,8 @@
 支援：
   - .env（系統設定 / profiles 任務自行指定）
   - .json
-  - .csv
+  - .csv（串流讀取：標準庫 csv，安裝 pyarrow 時自動改用 pyarrow；pandas 僅在指定時載入）
+  - .xlsx（openpyxl read-only 串流讀取第一個工作表）
 
 設計理念：
   ✅ 完全不內建任何業務邏輯或欄位名稱
@@ -17,8 +18,7 @@ import os
 import json
 import csv
 import re
-import pandas as pd
-from dotenv import load_dotenv, dotenv_values
+from typing import Iterator
 from workspace.config.error_code import ResultCode
 
 
@@ -30,6 +30,7 @@ def load_system_env(file_path: str) -> tuple[dict, int]:
     if not file_path or not os.path.exists(file_path):
         return {}, ResultCode.tools_loader_file_not_found
     try:
+        from dotenv import dotenv_values
         data = dict(dotenv_values(file_path))
         wrapped = {
             "records": [data],
@@ -54,6 +55,7 @@ def load_profile_env(file_path: str, required_fields: set[str] | None = None) ->
     if not file_path or not os.path.exists(file_path):
         return {}, ResultCode.tools_loader_file_not_found
     try:
+        from dotenv import dotenv_values
         data = dict(dotenv_values(file_path))
         code = _validate_env_keys(data, required_fields)
         if code != ResultCode.SUCCESS:
@@ -67,10 +69,12 @@ def load_profile_env(file_path: str, required_fields: set[str] | None = None) ->
 
 
 # ===========================================================
-# 🟩 C. profiles 其他格式 (.json / .csv)
+# 🟩 C. profiles 其他格式 (.json / .csv / .xlsx)
 # ===========================================================
-def load_profile_file(file_path: str) -> tuple[dict, int]:
-    """讀取非 .env 類 profiles 設定檔，統一輸出格式。"""
+def load_profile_file(file_path: str, csv_engine: str = "auto") -> tuple[dict, int]:
+    """讀取非 .env 類 profiles 設定檔，統一輸出格式。
+       csv_engine: "auto"（pyarrow 可用時優先，否則標準庫 csv）/ "csv" / "pyarrow" / "pandas"
+    """
     if not file_path or not os.path.exists(file_path):
         return {}, ResultCode.tools_loader_file_not_found
 
@@ -80,8 +84,19 @@ def load_profile_file(file_path: str) -> tuple[dict, int]:
             with open(file_path, "r", encoding="utf-8") as f:
                 data = json.load(f)
         elif ext == ".csv":
-            df = pd.read_csv(file_path, dtype=str).fillna("")
-            data = df.to_dict(orient="records")
+            stream, code = iter_profile_csv(file_path, engine=csv_engine)
+            if code != ResultCode.SUCCESS:
+                return {}, code
+            data = list(stream)
+            if stream.code != ResultCode.SUCCESS:
+                return {}, stream.code
+        elif ext == ".xlsx":
+            stream, code = iter_profile_xlsx(file_path)
+            if code != ResultCode.SUCCESS:
+                return {}, code
+            data = list(stream)
+            if stream.code != ResultCode.SUCCESS:
+                return {}, stream.code
         else:
             return {}, ResultCode.tools_loader_unsupported_format
 
@@ -93,6 +108,224 @@ def load_profile_file(file_path: str) -> tuple[dict, int]:
         return {}, ResultCode.tools_loader_read_failed
 
 
+# ===========================================================
+# 🟩 C-2. CSV 串流讀取（逐筆產出，記憶體固定）
+# ===========================================================
+class RecordStream:
+    """
+    逐筆產出 records 的可迭代物件（工具層不 raise）
+    - 迭代中途讀檔失敗 → 停止產出，並將錯誤碼寫入 self.code
+    - self.count 為目前已產出筆數
+    """
+
+    def __init__(self, generator: Iterator[dict], path: str, source_type: str):
+        self._generator = generator
+        self.path = path
+        self.source_type = source_type
+        self.code = ResultCode.SUCCESS
+        self.count = 0
+
+    def __iter__(self):
+        try:
+            for record in self._generator:
+                self.count += 1
+                yield record
+        except PermissionError:
+            self.code = ResultCode.tools_loader_permission_denied
+        except Exception:
+            self.code = ResultCode.tools_loader_read_failed
+
+    def close(self):
+        self._generator.close()
+
+
+def iter_profile_csv(file_path: str, engine: str = "auto") -> tuple[RecordStream | None, int]:
+    """
+    以串流方式讀取 CSV，回傳 (RecordStream, ResultCode)
+    - 所有欄位一律為字串，空值為 ""（與舊版 pandas dtype=str + fillna("") 相同）
+    - 欄位名稱重複、或資料列多出有值的欄位 → 停止產出，stream.code = tools_loader_read_failed
+      （不靜默覆蓋 / 捨棄資料；列尾多出的空欄位視為 Excel 另存的格式，直接忽略）
+    - engine: "auto" / "csv" / "pyarrow" / "pandas"
+    """
+    if not file_path or not os.path.exists(file_path):
+        return None, ResultCode.tools_loader_file_not_found
+
+    if engine == "auto":
+        engine = "auto" if _has_pyarrow() else "csv"
+
+    readers = {
+        "auto": _iter_csv_auto,
+        "csv": _iter_csv_stdlib,
+        "pyarrow": _iter_csv_pyarrow,
+        "pandas": _iter_csv_pandas,
+    }
+    reader = readers.get(engine)
+    if reader is None:
+        return None, ResultCode.tools_loader_unsupported_format
+
+    try:
+        # 先開檔一次：不存在 / 權限問題在此回報，而非迭代時
+        with open(file_path, "rb"):
+            pass
+    except PermissionError:
+        return None, ResultCode.tools_loader_permission_denied
+    except Exception:
+        return None, ResultCode.tools_loader_read_failed
+
+    return RecordStream(reader(file_path), file_path, ".csv"), ResultCode.SUCCESS
+
+
+_PYARROW_AVAILABLE = None
+
+
+def _has_pyarrow() -> bool:
+    global _PYARROW_AVAILABLE
+    if _PYARROW_AVAILABLE is None:
+        import importlib.util
+        _PYARROW_AVAILABLE = importlib.util.find_spec("pyarrow") is not None
+    return _PYARROW_AVAILABLE
+
+
+def _check_csv_header(header: list[str]):
+    """欄位名稱重複時 raise（由 RecordStream 轉為 tools_loader_read_failed）"""
+    if len(set(header)) != len(header):
+        duplicated = sorted({name for name in header if header.count(name) > 1})
+        raise ValueError(f"CSV 欄位名稱重複：{duplicated}")
+
+
+def _iter_csv_stdlib(file_path: str) -> Iterator[dict]:
+    """標準庫 csv：utf-8-sig 處理 Excel 另存的 BOM"""
+    with open(file_path, "r", encoding="utf-8-sig", newline="") as f:
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if not header:
+            return
+        _check_csv_header(header)
+        width = len(header)
+        for row in reader:
+            if not row:
+                continue
+            if len(row) < width:
+                row = row + [""] * (width - len(row))
+            elif len(row) > width:
+                if any(row[width:]):
+                    raise ValueError(f"CSV 第 {reader.line_num} 行欄位數多於標題列")
+                row = row[:width]
+            yield dict(zip(header, row))
+
+
+def _iter_csv_pyarrow(file_path: str, block_size: int = 1 << 20) -> Iterator[dict]:
+    """pyarrow 串流讀取：以 block 為單位解析，再逐筆轉為 dict"""
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+
+    with open(file_path, "r", encoding="utf-8-sig", newline="") as f:
+        header = next(csv.reader(f), None)
+    if not header:
+        return
+    _check_csv_header(header)
+
+    reader = pa_csv.open_csv(
+        file_path,
+        read_options=pa_csv.ReadOptions(block_size=block_size, encoding="utf8"),
+        convert_options=pa_csv.ConvertOptions(
+            column_types={name: pa.string() for name in header},
+            strings_can_be_null=False,
+            quoted_strings_can_be_null=False,
+        ),
+    )
+    for batch in reader:
+        columns = [col.to_pylist() for col in batch.columns]
+        names = [name.lstrip("\ufeff") for name in batch.schema.names]
+        for values in zip(*columns):
+            yield dict(zip(names, values))
+
+
+def _iter_csv_auto(file_path: str) -> Iterator[dict]:
+    """
+    pyarrow 優先；遇到 pyarrow 無法解析的列（例如欄位數不足）時，
+    改由標準庫 csv 從下一筆接續（兩者對合法列的輸出完全一致）
+    """
+    produced = 0
+    try:
+        for record in _iter_csv_pyarrow(file_path):
+            produced += 1
+            yield record
+        return
+    except PermissionError:
+        raise
+    except Exception:
+        pass
+
+    for i, record in enumerate(_iter_csv_stdlib(file_path)):
+        if i >= produced:
+            yield record
+
+
+def _iter_csv_pandas(file_path: str, chunksize: int = 50_000) -> Iterator[dict]:
+    """pandas 相容路徑（僅在指定時才 import pandas）"""
+    import pandas as pd
+
+    for chunk in pd.read_csv(file_path, dtype=str, chunksize=chunksize):
+        yield from chunk.fillna("").to_dict(orient="records")
+
+
+# ===========================================================
+# 🟩 C-3. XLSX 串流讀取（openpyxl read-only，不建整本活頁簿）
+# ===========================================================
+def iter_profile_xlsx(file_path: str) -> tuple[RecordStream | None, int]:
+    """
+    以 openpyxl read-only 模式逐列讀取第一個工作表，回傳 (RecordStream, ResultCode)
+    - 第一列為欄位名稱
+    - 所有欄位一律轉為字串，空儲存格為 ""（與 CSV 輸出一致）
+    - 活頁簿只在迭代時開啟一次（shared strings / 工作表資訊只解析一次）；
+      非 xlsx 檔或損毀時，迭代結束後由 stream.code 回報 tools_loader_read_failed
+    """
+    if not file_path or not os.path.exists(file_path):
+        return None, ResultCode.tools_loader_file_not_found
+
+    try:
+        # 只檢查可讀取（與 CSV 相同，不解析活頁簿）：權限問題在此回報
+        with open(file_path, "rb"):
+            pass
+    except PermissionError:
+        return None, ResultCode.tools_loader_permission_denied
+    except Exception:
+        return None, ResultCode.tools_loader_read_failed
+
+    return RecordStream(_iter_xlsx_rows(file_path), file_path, ".xlsx"), ResultCode.SUCCESS
+
+
+def _iter_xlsx_rows(file_path: str) -> Iterator[dict]:
+    from openpyxl import load_workbook
+
+    wb = load_workbook(file_path, read_only=True, data_only=True)
+    try:
+        rows = wb.worksheets[0].iter_rows(values_only=True)
+        header = next(rows, None)
+        if not header:
+            return
+        names = [_xlsx_cell_to_str(v) for v in header]
+        for row in rows:
+            values = [_xlsx_cell_to_str(v) for v in row]
+            if not any(values):
+                continue
+            if len(values) < len(names):
+                values += [""] * (len(names) - len(values))
+            yield dict(zip(names, values))
+    finally:
+        wb.close()
+
+
+def _xlsx_cell_to_str(value) -> str:
+    """儲存格值轉字串：None → ""，整數值的 float（Excel 數字）→ 不帶 .0"""
+    if value is None:
+        return ""
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+
 # ===========================================================
 # 🟩 D. 驗證工具（可由任務指定 required_fields）
 # ===========================================================
@@ -174,6 +407,7 @@ def load_to_env(file_path: str) -> int:
     if not file_path or not os.path.exists(file_path):
         return ResultCode.tools_loader_file_not_found
     try:
+        from dotenv import load_dotenv
         load_dotenv(file_path, override=True)
         return ResultCode.SUCCESS
     except PermissionError:
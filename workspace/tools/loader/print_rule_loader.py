@@ -6,43 +6,37 @@ Printer 規則載入器（支援數字縮排 + 覆寫 + 符號對齊版）
     - INDENT_UNIT 可為數字（空格數）或字串（例如 "\t"）。
     - 所有符號統一「空格 → 符號 → 文字」的視覺格式。
     - 自動注入 label_map（顯示名稱映射）給各 Printer。
+    - 啟動時一次算好每個 (printer 類型, prefix) 的規則表並注入，印出時不再合併規則 / 計算縮排。
+    - 套用輸出後端（output）、批次儀表板（dashboard）與結構化執行紀錄（run_log）設定。
 """
 
 from workspace.tools.printer.step_printer import (
-    set_line_rule as set_step_line,
-    set_symbol_rule as set_step_symbol,
-    set_indent_rule as set_step_indent,
+    set_rules as set_step_rules,
     set_label_map as set_step_label,   # ✅ 新增
 )
-from workspace.tools.printer.debug_printer import (
-    set_line_rule as set_debug_line,
-    set_symbol_rule as set_debug_symbol,
-    set_indent_rule as set_debug_indent,
-)
-from workspace.tools.printer.error_printer import (
-    set_line_rule as set_error_line,
-    set_symbol_rule as set_error_symbol,
-    set_indent_rule as set_error_indent,
-)
+from workspace.tools.printer.debug_printer import set_rules as set_debug_rules
+from workspace.tools.printer.error_printer import set_rules as set_error_rules
 from workspace.tools.printer.context_printer import (
-    set_line_rule as set_context_line,
-    set_symbol_rule as set_context_symbol,
-    set_indent_rule as set_context_indent,
+    set_rules as set_context_rules,
     set_label_map as set_context_label,   # ✅ 新增
+    set_diff_limits as set_context_diff_limits,
 )
+from workspace.tools.printer.rule_table import PrinterRule, RuleTable
 
+from workspace.tools.printer.output_sink import configure_output
+from workspace.tools.printer.batch_dashboard import configure_dashboard
+from workspace.tools.file.run_log import configure_run_log
 
-def apply_global_print_rules(registry: dict):
+
+PRINT_TYPES = ("step", "debug", "error", "context")
+
+
+def build_rule_tables(registry: dict) -> dict:
     """
-    根據註冊表設定所有 Printer 規則。
-    縮排 = 控制器層級 + Printer offset
-    支援：
-        - 數字型 INDENT_UNIT（自動轉為空格）
-        - 控制器覆寫（enabled/symbol）
-        - 符號自動補空格（確保先空格再畫線）
-        - label_map 注入（顯示名稱）
+    依註冊表預先計算所有 Printer 規則
+    縮排 = 控制器層級 + Printer offset；控制器覆寫（enabled/symbol/offset）在此合併
+    :return: {printer 類型: RuleTable}
     """
-
     # ------------------------------------------------------------
     # 取得縮排單位（數字 → 空格字串）
     # ------------------------------------------------------------
@@ -53,90 +47,69 @@ def apply_global_print_rules(registry: dict):
     controller_levels = registry.get("controller_level", {})
     printer_rules = registry.get("printer_rules", {})
     overrides = registry.get("overrides", {})
-    label_map = registry.get("label_map", {})  # ✅ 讀取 label_map
 
-    # ------------------------------------------------------------
-    # 規則合併（default + override + 符號前空格）
-    # ------------------------------------------------------------
-    def get_rule(print_type: str, prefix: str):
-        base = printer_rules.get(print_type, {}).copy()
-        over = overrides.get(print_type, {}).get(prefix, {})
-        base.update(over)
+    def make_rule(print_type: str, prefix: str | None) -> PrinterRule:
+        rule = {**printer_rules.get(print_type, {}), **overrides.get(print_type, {}).get(prefix, {})}
+        enabled = rule.get("enabled", False)
 
-        # 🔧 統一符號：確保前面多一格空白（視覺一致）
-        symbol = base.get("symbol", "")
+        # 🔧 統一符號：確保前面多一格空白（視覺一致）；未開啟畫線則不顯示符號
+        symbol = rule.get("symbol", "") if enabled else ""
         if symbol and not symbol.startswith(" "):
-            base["symbol"] = " " + symbol
+            symbol = " " + symbol
 
-        return base
+        indent = indent_unit * (controller_levels.get(prefix, 0) + rule.get("offset", 0))
+        return PrinterRule(enabled, indent, symbol, indent + symbol)
 
-    # ------------------------------------------------------------
-    # 共用縮排計算函式
-    # ------------------------------------------------------------
-    def calc_indent(prefix: str, print_type: str):
-        ctrl_level = controller_levels.get(prefix, 0)
-        rule = get_rule(print_type, prefix)
-        offset = rule.get("offset", 0)
-        return indent_unit * (ctrl_level + offset)
+    tables = {}
+    for print_type in PRINT_TYPES:
+        prefixes = set(controller_levels) | set(overrides.get(print_type, {}))
+        tables[print_type] = RuleTable(
+            {prefix: make_rule(print_type, prefix) for prefix in prefixes},
+            default=make_rule(print_type, None),
+        )
+    return tables
 
-    # ============================================================
-    # Step Printer
-    # ============================================================
-    def step_line(prefix, step_no, title):
-        rule = get_rule("step", prefix)
-        return rule.get("enabled", False)
 
-    def step_symbol(prefix, step_no, title, is_last):
-        rule = get_rule("step", prefix)
-        return rule.get("symbol", "")
+def apply_global_print_rules(registry: dict):
+    """
+    根據註冊表設定所有 Printer 規則。
+    支援：
+        - 數字型 INDENT_UNIT（自動轉為空格）
+        - 控制器覆寫（enabled/symbol）
+        - 符號自動補空格（確保先空格再畫線）
+        - label_map 注入（顯示名稱）
+    """
+    tables = build_rule_tables(registry)
+    label_map = registry.get("label_map", {})  # ✅ 讀取 label_map
 
-    set_step_line(step_line)
-    set_step_symbol(step_symbol)
-    set_step_indent(lambda p, b: calc_indent(p, "step"))
+    set_step_rules(tables["step"])
     set_step_label(label_map)  # ✅ 注入 label_map
+    set_debug_rules(tables["debug"])
+    set_error_rules(tables["error"])
+    set_context_rules(tables["context"])
+    set_context_label(label_map)  # ✅ 注入 label_map
+    set_context_diff_limits(registry.get("context_diff"))
 
     # ============================================================
-    # Debug Printer
+    # 輸出後端（未設定時維持 console）
     # ============================================================
-    def debug_line(prefix, step_no, title):
-        rule = get_rule("debug", prefix)
-        return rule.get("enabled", False)
-
-    def debug_symbol(prefix, step_no, title, is_last):
-        rule = get_rule("debug", prefix)
-        return rule.get("symbol", "")
-
-    set_debug_line(debug_line)
-    set_debug_symbol(debug_symbol)
-    set_debug_indent(lambda p, b: calc_indent(p, "debug"))
+    output = registry.get("output")
+    if output:
+        configure_output(output.get("mode", "console"), output.get("file"), output.get("jsonl"))
 
     # ============================================================
-    # Error Printer
+    # 批次請求儀表板
     # ============================================================
-    def error_line(prefix, step_no, title):
-        rule = get_rule("error", prefix)
-        return rule.get("enabled", False)
-
-    def error_symbol(prefix, step_no, title, is_last):
-        rule = get_rule("error", prefix)
-        return rule.get("symbol", "")
-
-    set_error_line(error_line)
-    set_error_symbol(error_symbol)
-    set_error_indent(lambda p, b: calc_indent(p, "error"))
+    dashboard = registry.get("dashboard")
+    if dashboard:
+        configure_dashboard(**dashboard)
 
     # ============================================================
-    # Context Printer
+    # 結構化執行紀錄（未設定時不寫入）
     # ============================================================
-    def context_line(prefix, step_no, title):
-        rule = get_rule("context", prefix)
-        return rule.get("enabled", False)
+    run_log = registry.get("run_log")
+    if run_log:
+        from workspace.config import paths
 
-    def context_symbol(prefix, step_no, title, is_last):
-        rule = get_rule("context", prefix)
-        return rule.get("symbol", "")
-
-    set_context_line(context_line)
-    set_context_symbol(context_symbol)
-    set_context_indent(lambda p, b: calc_indent(p, "context"))
-    set_context_label(label_map)  # ✅ 注入 label_map
+        path = (run_log.get("file") or paths.RUN_LOG_FILE) if run_log.get("enabled", True) else None
+        configure_run_log(path, run_log.get("max_bytes", 5 * 1024 * 1024), run_log.get("backups", 3))
@@ -1,7 +1,19 @@
-import pyotp
+"""
+OTP 工具模組
+功能：
+    - generate_otp / verify_otp：單次產生 / 驗證
+    - OtpProvider：快取 TOTP 物件與目前時間窗的 OTP，知道剩餘有效秒數；
+      剩餘時間不足時等到下一個時間窗再取（批次請求逐筆取用，避免 OTP 在批次中途過期）
+"""
+
+import asyncio
+import time
 from workspace.config.error_code import ResultCode
 
 
+_WINDOW_EDGE = 0.05  # 等待下一個時間窗時多等一點，避免計時誤差仍落在舊時間窗
+
+
 def generate_otp(secret: str, digits: int = 6, interval: int = 30) -> tuple[str | None, int]:
     """
     根據 Secret Key 產生動態 OTP
@@ -14,6 +26,7 @@ def generate_otp(secret: str, digits: int = 6, interval: int = 30) -> tuple[str
         if not secret:
             return None, ResultCode.tools_otp_invalid_secret
 
+        import pyotp
         totp = pyotp.TOTP(secret, digits=digits, interval=interval)
         return totp.now(), ResultCode.SUCCESS
     except Exception:
@@ -33,7 +46,82 @@ def verify_otp(secret: str, otp: str, digits: int = 6, interval: int = 30) -> tu
         if not secret:
             return False, ResultCode.tools_otp_invalid_secret
 
+        import pyotp
         totp = pyotp.TOTP(secret, digits=digits, interval=interval)
         return totp.verify(otp), ResultCode.SUCCESS
     except Exception:
         return False, ResultCode.tools_otp_verify_error
+
+
+class OtpProvider:
+    """
+    TOTP 提供者（同一組 secret 共用一個實例，見 get_otp_provider）
+    - 每個時間窗只計算一次 OTP
+    - fresh(min_validity)：剩餘有效時間不足 min_validity 秒時，先等到下一個時間窗
+    """
+
+    def __init__(self, totp, interval: int = 30, clock=time.time):
+        self._totp = totp
+        self.interval = interval
+        self._clock = clock
+        self._cached = (None, None)  # (時間窗編號, OTP)；整組替換，跨執行緒讀取不會拿到不一致的組合
+
+    def now(self) -> tuple[str | None, int]:
+        """目前時間窗的 OTP"""
+        window = int(self._clock() // self.interval)
+        cached_window, otp = self._cached
+        if window != cached_window:
+            try:
+                otp = self._totp.generate_otp(window)
+            except Exception:
+                return None, ResultCode.tools_otp_generate_error
+            self._cached = (window, otp)
+        return otp, ResultCode.SUCCESS
+
+    def remaining(self) -> float:
+        """目前 OTP 剩餘有效秒數"""
+        return self.interval - self._clock() % self.interval
+
+    def fresh(self, min_validity: float = 3.0) -> tuple[str | None, int]:
+        """取得至少還有 min_validity 秒有效的 OTP（同步版，必要時 sleep）"""
+        remaining = self.remaining()
+        if remaining < min_validity:
+            time.sleep(remaining + _WINDOW_EDGE)
+        return self.now()
+
+    async def fresh_async(self, min_validity: float = 3.0) -> tuple[str | None, int]:
+        """取得至少還有 min_validity 秒有效的 OTP（async 版，必要時 await sleep）"""
+        remaining = self.remaining()
+        if remaining < min_validity:
+            await asyncio.sleep(remaining + _WINDOW_EDGE)
+        return self.now()
+
+
+_providers: dict[tuple, OtpProvider] = {}
+
+
+def get_otp_provider(secret: str, digits: int = 6, interval: int = 30) -> tuple[OtpProvider | None, int]:
+    """
+    取得（快取的）OtpProvider
+    :return: (provider, ResultCode)；secret 無效時回傳 (None, 錯誤碼)
+    """
+    if not secret:
+        return None, ResultCode.tools_otp_invalid_secret
+
+    key = (secret, digits, interval)
+    provider = _providers.get(key)
+    if provider is not None:
+        return provider, ResultCode.SUCCESS
+
+    try:
+        import pyotp
+        provider = OtpProvider(pyotp.TOTP(secret, digits=digits, interval=interval), interval)
+    except Exception:
+        return None, ResultCode.tools_otp_generate_error
+
+    # 先產生一次，確認 secret 可用（非 Base32 會在此失敗）
+    _, code = provider.now()
+    if code != ResultCode.SUCCESS:
+        return None, code
+    _providers[key] = provider
+    return provider, ResultCode.SUCCESS
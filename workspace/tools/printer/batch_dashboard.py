@@ -0,0 +1,171 @@
+# workspace/tools/printer/batch_dashboard.py
+"""
+批次請求即時儀表板（rich Live）
+職責：
+    - send_batch_api_requests 回報每筆請求的開始 / 結束（含耗時與成敗）
+    - 依階段（role:path_key）統計：完成 / 失敗 / 進行中、每秒請求數、延遲 p50 / p90 / p99
+    - 由 rich Live 的背景執行緒以固定頻率重繪，刷新次數與請求量無關；請求端只更新計數
+
+使用方式：
+    with batch_dashboard("OPS 批次請求"):
+        run_steps(...)            # 期間所有批次請求都會顯示在同一張表
+    - 只在 stdout 為終端機且設定開啟時啟用；第一個批次階段開始才顯示表格
+    - 未啟用時 get_batch_progress() 回傳 None，請求端不做任何統計
+"""
+
+import sys
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from workspace.tools.printer.output_sink import flush_output
+
+
+_config = {"enabled": True, "refresh_per_second": 4, "max_samples": 10_000}
+_progress = None
+
+
+def configure_dashboard(enabled: bool = True, refresh_per_second: float = 4, max_samples: int = 10_000):
+    """由 print_rule_loader 依 print_registry 設定"""
+    _config.update(enabled=enabled, refresh_per_second=refresh_per_second, max_samples=max_samples)
+
+
+def get_batch_progress():
+    """:return: 目前啟用中的 BatchProgress 或 None"""
+    return _progress
+
+
+class _StageStats:
+    __slots__ = ("total", "completed", "failed", "in_flight", "started", "finished", "latencies")
+
+    def __init__(self, max_samples: int):
+        self.total = self.completed = self.failed = self.in_flight = 0
+        self.started = time.monotonic()
+        self.finished = None
+        self.latencies = deque(maxlen=max_samples)  # 只保留最近的樣本計算百分位
+
+
+class BatchProgress:
+    """各階段請求統計；計數更新在事件迴圈執行緒，繪製在 rich 背景執行緒，以 lock 保護"""
+
+    def __init__(self, title: str = "批次請求", refresh_per_second: float = 4, max_samples: int = 10_000, live: bool = True):
+        self.title = title
+        self.refresh_per_second = refresh_per_second
+        self.max_samples = max_samples
+        self._use_live = live
+        self._stages: dict[str, _StageStats] = {}
+        self._lock = threading.Lock()
+        self._live = None
+
+    # ---------------- 請求端回報 ----------------
+    def start_stage(self, stage: str, total: int):
+        with self._lock:
+            stats = self._stages.get(stage)
+            if stats is None:
+                stats = self._stages[stage] = _StageStats(self.max_samples)
+            stats.total += total
+            stats.finished = None
+        if self._use_live and self._live is None:
+            self._start_live()
+
+    def begin(self, stage: str):
+        with self._lock:
+            self._stages[stage].in_flight += 1
+
+    def finish(self, stage: str, ok: bool, elapsed: float):
+        with self._lock:
+            stats = self._stages[stage]
+            stats.in_flight -= 1
+            stats.completed += 1
+            if not ok:
+                stats.failed += 1
+            stats.latencies.append(elapsed)
+            if stats.completed >= stats.total:
+                stats.finished = time.monotonic()
+
+    # ---------------- 統計 / 繪製 ----------------
+    def snapshot(self) -> list[dict]:
+        """各階段統計列：stage, total, completed, failed, in_flight, rps, p50, p90, p99, elapsed"""
+        now = time.monotonic()
+        with self._lock:
+            items = [(stage, s.total, s.completed, s.failed, s.in_flight, s.started, s.finished, list(s.latencies))
+                     for stage, s in self._stages.items()]
+
+        rows = []
+        for stage, total, completed, failed, in_flight, started, finished, latencies in items:
+            elapsed = (finished or now) - started
+            latencies.sort()
+            rows.append({
+                "stage": stage,
+                "total": total,
+                "completed": completed,
+                "failed": failed,
+                "in_flight": in_flight,
+                "rps": completed / elapsed if elapsed > 0 else 0.0,
+                "p50": _percentile(latencies, 0.50),
+                "p90": _percentile(latencies, 0.90),
+                "p99": _percentile(latencies, 0.99),
+                "elapsed": elapsed,
+            })
+        return rows
+
+    def render(self):
+        from rich.table import Table
+
+        table = Table(title=self.title)
+        for column in ("階段", "完成/總數", "失敗", "進行中", "req/s", "p50", "p90", "p99", "耗時"):
+            table.add_column(column, justify="left" if column == "階段" else "right")
+        for row in self.snapshot():
+            table.add_row(
+                row["stage"],
+                f"{row['completed']}/{row['total']}",
+                f"[red]{row['failed']}[/red]" if row["failed"] else "0",
+                str(row["in_flight"]),
+                f"{row['rps']:.1f}",
+                _ms(row["p50"]),
+                _ms(row["p90"]),
+                _ms(row["p99"]),
+                f"{row['elapsed']:.1f}s",
+            )
+        return table
+
+    def _start_live(self):
+        from rich.live import Live
+
+        flush_output()  # rich 直接寫終端機，先把佇列中的輸出寫完
+        self._live = Live(get_renderable=self.render, refresh_per_second=self.refresh_per_second)
+        self._live.start()
+
+    def stop(self):
+        if self._live is not None:
+            flush_output()
+            self._live.stop()  # 停止前會再繪製一次，最終統計留在畫面上
+            self._live = None
+
+
+@contextmanager
+def batch_dashboard(title: str = "批次請求"):
+    """在區塊內啟用儀表板（非終端機或設定關閉時不啟用）"""
+    global _progress
+    if not _config["enabled"] or _progress is not None or not sys.stdout.isatty():
+        yield None
+        return
+
+    progress = BatchProgress(title, _config["refresh_per_second"], _config["max_samples"])
+    _progress = progress
+    try:
+        yield progress
+    finally:
+        _progress = None
+        progress.stop()
+
+
+def _percentile(sorted_values: list, q: float):
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values) - 1, int(q * len(sorted_values)))
+    return sorted_values[index]
+
+
+def _ms(value) -> str:
+    return "-" if value is None else f"{value * 1000:.0f}ms"
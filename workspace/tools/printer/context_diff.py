@@ -0,0 +1,109 @@
+# workspace/tools/printer/context_diff.py
+"""
+Context Diff 工具模組（debug 模式的 Context 變更比對）
+------------------------------------------------
+職責：
+    - 步驟執行前後各取一次快照，只比對該步驟宣告會寫入的路徑（outputs）
+    - 產出新增 / 修改 / 刪除的葉節點清單，交給 context_printer 輸出
+    - 取代每步 json.dumps 整個 Context：成本與「步驟寫入的範圍」成正比，而非 Context 大小 × 步驟數
+
+路徑規則（與 step_engine 相同）：
+    - 以 tuple 表示，例如 ("COMMON", "OPS", "SSID")
+    - INDEX 路徑省略名稱層：("INDEX", "agent", "account") 代表所有名稱的 agent.account
+    - paths 為 None 時比對整個 Context
+
+快照格式：
+    {完整路徑 tuple: 葉節點值}；list / tuple 以淺層 tuple 複本保存
+"""
+
+from collections.abc import Mapping
+
+
+ADDED, CHANGED, REMOVED = "+", "~", "-"
+
+
+def snapshot(context, paths=None) -> dict:
+    """
+    取得 context（或指定路徑下）所有葉節點的快照
+    :param paths: [("COMMON", "OPS"), ("INDEX", "agent", "account"), ...] 或 None
+    """
+    leaves = {}
+    if paths is None:
+        _flatten(context, (), leaves)
+        return leaves
+    for path in paths:
+        for full_path, value in _resolve(context, tuple(path)):
+            _flatten(value, full_path, leaves)
+    return leaves
+
+
+def diff_snapshots(before: dict, after: dict) -> list[tuple]:
+    """
+    比對兩份快照
+    :return: [(kind, path, old, new), ...]，依 after 的順序（刪除項目排在最後）
+    """
+    changes = []
+    for path, new in after.items():
+        if path not in before:
+            changes.append((ADDED, path, None, new))
+        elif before[path] != new:
+            changes.append((CHANGED, path, before[path], new))
+    for path, old in before.items():
+        if path not in after:
+            changes.append((REMOVED, path, old, None))
+    return changes
+
+
+def format_path(path: tuple) -> str:
+    return ".".join(str(key) for key in path)
+
+
+def format_value(value, max_len: int = 200, max_items: int = 5) -> str:
+    """單一值轉為顯示字串：長 list 只列前幾項，長字串截斷"""
+    if isinstance(value, tuple):
+        shown = ", ".join(repr(v) for v in value[:max_items])
+        text = f"[{shown}, …（共 {len(value)} 項）]" if len(value) > max_items else f"[{shown}]"
+    else:
+        text = repr(value)
+    if len(text) > max_len:
+        text = text[:max_len] + f"…（共 {len(text)} 字）"
+    return text
+
+
+# ============================================================
+# 🔹 內部：路徑展開 / 攤平
+# ============================================================
+def _resolve(context, path: tuple):
+    """展開路徑（INDEX 補上名稱層），回傳存在的 (完整路徑, 值)"""
+    if path and path[0] == "INDEX" and len(path) > 1:
+        index = context.get("INDEX") if isinstance(context, Mapping) else None
+        if not isinstance(index, Mapping):
+            return
+        for name, entry in index.items():
+            found, value = _get(entry, path[1:])
+            if found:
+                yield ("INDEX", name) + path[1:], value
+        return
+    found, value = _get(context, path)
+    if found:
+        yield path, value
+
+
+def _get(data, path: tuple):
+    for key in path:
+        if not isinstance(data, Mapping) or key not in data:
+            return False, None
+        data = data[key]
+    return True, data
+
+
+def _flatten(value, path: tuple, leaves: dict):
+    if isinstance(value, Mapping):
+        if not value:
+            leaves[path] = {}
+        for key, child in value.items():
+            _flatten(child, path + (key,), leaves)
+    elif isinstance(value, (list, tuple)):
+        leaves[path] = tuple(value)
+    else:
+        leaves[path] = value
@@ -1,14 +1,15 @@
 import json
+from workspace.tools.printer.output_sink import emit
+from workspace.tools.printer.context_diff import format_path, format_value
+from workspace.tools.printer.rule_table import EMPTY_TABLE
 
-_line_rule = None
-_symbol_rule = None
-_indent_rule = None
+_rules = EMPTY_TABLE
 _label_map = {}
+_diff_limits = {"max_items": 50, "max_value_len": 200, "max_list_items": 5}
 
-def set_line_rule(rule_func):  global _line_rule; _line_rule = rule_func
-def set_symbol_rule(rule_func):  global _symbol_rule; _symbol_rule = rule_func
-def set_indent_rule(rule_func):  global _indent_rule; _indent_rule = rule_func
+def set_rules(table):  global _rules; _rules = table or EMPTY_TABLE
 def set_label_map(label_dict):  global _label_map; _label_map = label_dict or {}
+def set_diff_limits(limits):  _diff_limits.update(limits or {})
 
 def print_context(
     context: dict,
@@ -17,33 +18,77 @@ def print_context(
     branch_state: list[bool] | None = None,
     is_last: bool = False,
 ):
-    branch_state = branch_state or []
-    indent = _indent_rule(prefix, branch_state) if _indent_rule else ""
-    show_line = _line_rule(prefix, step_no or 0, "context") if _line_rule else True
-    branch_symbol = _symbol_rule(prefix, step_no or 0, "context", is_last) if (_symbol_rule and show_line) else ""
-
-    if branch_symbol and not branch_symbol.startswith(" "):
-        branch_symbol = " " + branch_symbol
-
-    label = _label_map.get(prefix, prefix)
+    indent, branch_symbol, label = _layout(prefix, step_no, branch_state, is_last)
 
     # === 標題行 ===
     if step_no is not None:
         title = f"{label}Step {step_no} 結束時 Context 狀態："
     else:
         title = f"{label} 控制器 Context 狀態："
-    print(f"{indent}{branch_symbol}{title}")
+    header = f"{indent}{branch_symbol}{title}"
 
     # === 印出 Context JSON ===
     if not context:
-        print(f"{indent}  (空)")
+        emit(f"{header}\n{indent}  (空)", "context", prefix)
         return
 
-    formatted = json.dumps(context, indent=2, ensure_ascii=False)
+    formatted = json.dumps(context, indent=2, ensure_ascii=False, default=_to_jsonable)
 
     # ✅ 補上符號寬度 + 額外兩格縮排
     symbol_space = " " * len(branch_symbol)
     block_indent = indent + symbol_space + "  "
 
-    for line in formatted.splitlines():
-        print(f"{block_indent}{line}")
+    # 整段合併成一次輸出（大型 Context 不逐行呼叫）
+    body = "\n".join(block_indent + line for line in formatted.splitlines())
+    emit(f"{header}\n{body}", "context", prefix)
+
+
+def print_context_diff(
+    changes: list[tuple],
+    prefix: str,
+    step_no: int | None = None,
+    branch_state: list[bool] | None = None,
+    is_last: bool = False,
+):
+    """
+    只印出本步驟變更的 Context 欄位（changes 由 context_diff.diff_snapshots 產生）
+    超過 max_items 的項目只顯示筆數；長字串 / 長 list 依 _diff_limits 截斷
+    """
+    indent, branch_symbol, label = _layout(prefix, step_no, branch_state, is_last)
+    where = f"Step {step_no} " if step_no is not None else " 控制器 "
+    header = f"{indent}{branch_symbol}{label}{where}Context 變更（{len(changes)} 項）："
+
+    block_indent = indent + " " * len(branch_symbol) + "  "
+    if not changes:
+        emit(f"{header}\n{block_indent}(無變更)", "context", prefix)
+        return
+
+    max_items = _diff_limits["max_items"]
+
+    def fmt(value):
+        return format_value(value, _diff_limits["max_value_len"], _diff_limits["max_list_items"])
+
+    lines = []
+    for kind, path, old, new in changes[:max_items]:
+        if kind == "~":
+            lines.append(f"{block_indent}~ {format_path(path)}: {fmt(old)} → {fmt(new)}")
+        elif kind == "+":
+            lines.append(f"{block_indent}+ {format_path(path)}: {fmt(new)}")
+        else:
+            lines.append(f"{block_indent}- {format_path(path)}")
+    if len(changes) > max_items:
+        lines.append(f"{block_indent}…其餘 {len(changes) - max_items} 項未顯示")
+    emit(header + "\n" + "\n".join(lines), "context", prefix)
+
+
+def _layout(prefix, step_no, branch_state, is_last):
+    """依規則表取得 (縮排, 分支符號, 顯示名稱)"""
+    rule = _rules.get(prefix)
+    return rule.indent, rule.symbol, _label_map.get(prefix, prefix)
+
+
+def _to_jsonable(obj):
+    """CompactIndex 等 dict-like 物件 → 一般 dict"""
+    if hasattr(obj, "to_dict"):
+        return obj.to_dict()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
@@ -6,6 +6,7 @@ Error Printer 工具模組（穩定對齊版）
     - 完全相容現有註冊表與 loader
 """
 
+from functools import lru_cache
 from workspace.config.error_code import (
     ResultCode,
     ERROR_MESSAGES,
@@ -14,15 +15,13 @@ from workspace.config.error_code import (
     TASK_ERROR_CODES,
     CTRL_ERROR_CODES,
 )
+from workspace.tools.printer.output_sink import emit
+from workspace.tools.printer.rule_table import EMPTY_TABLE
 
-_line_rule = None
-_symbol_rule = None
-_indent_rule = None
+_rules = EMPTY_TABLE
 
 
-def set_line_rule(rule_func):  global _line_rule; _line_rule = rule_func
-def set_symbol_rule(rule_func):  global _symbol_rule; _symbol_rule = rule_func
-def set_indent_rule(rule_func):  global _indent_rule; _indent_rule = rule_func
+def set_rules(table):  global _rules; _rules = table or EMPTY_TABLE
 
 
 # ==============================================================
@@ -44,40 +43,25 @@ def format_symbol(symbol: str, width: int = 3) -> str:
 # ==============================================================
 
 def print_result(code: int, branch_state: list[bool], prefix: str = "Main", is_last: bool = False):
-    indent = _indent_rule(prefix, branch_state) if _indent_rule else ""
-    show_line = _line_rule(prefix, 0, "error") if _line_rule else True
-    branch_symbol = _symbol_rule(prefix, 0, "error", is_last) if (_symbol_rule and show_line) else ""
+    emit(f"{_rules.get(prefix).lead}{_result_text(code)}", "error", prefix)
 
-    if branch_symbol and not branch_symbol.startswith(" "):
-        branch_symbol = " " + branch_symbol
 
+@lru_cache(maxsize=None)
+def _result_text(code: int) -> str:
+    """錯誤碼 → 符號 + 分類 + 訊息（與縮排無關，每個錯誤碼只組一次）"""
     msg = ERROR_MESSAGES.get(code, f"未知錯誤碼: {code}")
 
-    def render(symbol, text):
-        """符號補齊對齊、視覺固定長度"""
-        sym_fixed = format_symbol(symbol, width=2)  # 保留 2 寬度區
-        return f"{indent}{branch_symbol}{sym_fixed}[{text}] code={code} msg={msg}"
-
-    # --- 成功 ---
+    # --- 成功 / 工具層 / 任務層 / 控制器層 / 其他 ---
     if code in SUCCESS_CODES:
-        print(render("✅", "成功"))
-        return
-
-    # --- 工具層錯誤 ---
-    if code in TOOL_ERROR_CODES:
-        print(render("⚠", "工具失敗"))
-        return
-
-    # --- 任務層錯誤 ---
-    if code in TASK_ERROR_CODES:
-        print(render("❌", "任務失敗"))
-        return
-
-    # --- 控制器層錯誤 ---
-    if code in CTRL_ERROR_CODES:
-        print(render("❌", "控制器失敗"))
-        return
-
-    # --- 其他未知錯誤 ---
-    print(render("❌", "未知失敗"))
-
+        symbol, text = "✅", "成功"
+    elif code in TOOL_ERROR_CODES:
+        symbol, text = "⚠", "工具失敗"
+    elif code in TASK_ERROR_CODES:
+        symbol, text = "❌", "任務失敗"
+    elif code in CTRL_ERROR_CODES:
+        symbol, text = "❌", "控制器失敗"
+    else:
+        symbol, text = "❌", "未知失敗"
+
+    # 符號補齊對齊、視覺固定長度（保留 2 寬度區）
+    return f"{format_symbol(symbol, width=2)}[{text}] code={code} msg={msg}"
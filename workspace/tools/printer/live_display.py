@@ -2,14 +2,16 @@
 
 import asyncio
 import time
-from rich.live import Live
-from rich.table import Table
-from typing import Callable, Awaitable
+from typing import Callable, Awaitable, TYPE_CHECKING
+from workspace.tools.printer.output_sink import flush_output
+
+if TYPE_CHECKING:
+    from rich.table import Table
 
 
 def run_live_display(
     title: str,
-    make_table: Callable[[int], Table],
+    make_table: Callable[[int], "Table"],
     total_steps: int,
     refresh_per_second: int = 2,
 ):
@@ -20,6 +22,9 @@ def run_live_display(
     :param total_steps: 總倒數次數
     :param refresh_per_second: 每秒刷新次數
     """
+    from rich.live import Live
+
+    flush_output()  # rich 直接寫終端機，先把佇列中的輸出寫完
     with Live(make_table(total_steps), refresh_per_second=refresh_per_second) as live:
         for remaining in range(total_steps, 0, -1):
             time.sleep(1)
@@ -27,7 +32,7 @@ def run_live_display(
 
 
 async def run_live_display_async(
-    make_table: Callable[[], Table],
+    make_table: Callable[[], "Table"],
     task_coro: Awaitable,
     refresh_per_second: int = 2,
 ):
@@ -38,11 +43,15 @@ async def run_live_display_async(
     :param refresh_per_second: 每秒刷新次數
     :return: 任務回傳值
     """
+    from rich.live import Live
+
+    flush_output()
     with Live(make_table(), refresh_per_second=refresh_per_second) as live:
         task = asyncio.create_task(task_coro)
 
+        # 任務完成立即返回（不必等到下一次刷新）
         while not task.done():
-            await asyncio.sleep(1)
+            await asyncio.wait({task}, timeout=1 / refresh_per_second)
             live.update(make_table())
 
         return await task
@@ -0,0 +1,249 @@
+# workspace/tools/printer/output_sink.py
+"""
+Output Sink 工具模組（所有 Printer 的輸出後端）
+------------------------------------------------
+職責：
+    - Printer 只負責排版，實際輸出統一交給目前設定的 sink（emit）
+    - 可替換的輸出後端：
+        console  : 直接寫 stdout（預設，與原本 print 行為相同）
+        buffered : 累積多行後一次寫出（減少 syscall）
+        thread   : 丟進佇列由背景執行緒寫出，呼叫端不會被 console I/O 阻塞
+        file / jsonl : 另外寫入純文字檔或 JSON Lines 檔（可與 console 同時使用）
+    - 由 print_registry 的 OUTPUT 設定或 CLI 參數決定（print_rule_loader 套用）
+
+注意：
+    - 其他直接寫 stdout 的元件（例如 rich Live）開始前請先呼叫 flush_output()，避免順序錯亂
+"""
+
+import atexit
+import json
+import os
+import queue
+import sys
+import threading
+import time
+
+
+class OutputSink:
+    """輸出後端基底類別"""
+
+    def write(self, text: str, kind: str = "text", prefix: str = ""):
+        raise NotImplementedError
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.flush()
+
+
+class ConsoleSink(OutputSink):
+    """直接寫 stdout（每次呼叫時取 sys.stdout，相容測試擷取與重導）"""
+
+    def write(self, text, kind="text", prefix=""):
+        sys.stdout.write(text + "\n")
+
+    def flush(self):
+        sys.stdout.flush()
+
+
+class BufferedSink(OutputSink):
+    """累積到指定行數或時間間隔才寫出"""
+
+    def __init__(self, inner: OutputSink | None = None, max_lines: int = 256, max_delay: float = 0.2):
+        self.inner = inner or ConsoleSink()
+        self.max_lines = max_lines
+        self.max_delay = max_delay
+        self._lines: list[tuple[str, str, str]] = []
+        self._last_flush = time.monotonic()
+        self._lock = threading.Lock()
+
+    def write(self, text, kind="text", prefix=""):
+        with self._lock:
+            self._lines.append((text, kind, prefix))
+            if len(self._lines) < self.max_lines and time.monotonic() - self._last_flush < self.max_delay:
+                return
+            lines, self._lines = self._lines, []
+            self._last_flush = time.monotonic()
+            _write_many(self.inner, lines)
+
+    def flush(self):
+        with self._lock:
+            lines, self._lines = self._lines, []
+            self._last_flush = time.monotonic()
+            _write_many(self.inner, lines)
+        self.inner.flush()
+
+    def close(self):
+        self.flush()
+        self.inner.close()
+
+
+class ThreadedSink(OutputSink):
+    """佇列 + 背景執行緒：write 只做 put，實際 I/O 在背景批次寫出"""
+
+    _STOP = object()
+
+    def __init__(self, inner: OutputSink | None = None, batch: int = 512):
+        self.inner = inner or ConsoleSink()
+        self.batch = batch
+        self._queue: queue.Queue = queue.Queue()
+        self._thread = threading.Thread(target=self._worker, name="output-sink", daemon=True)
+        self._thread.start()
+
+    def write(self, text, kind="text", prefix=""):
+        self._queue.put((text, kind, prefix))
+
+    def flush(self):
+        """等待佇列內容全部寫出"""
+        if self._thread.is_alive():
+            self._queue.join()
+        self.inner.flush()
+
+    def close(self):
+        if self._thread.is_alive():
+            self._queue.put(self._STOP)
+            self._thread.join()
+        self.inner.close()
+
+    def _worker(self):
+        while True:
+            item = self._queue.get()
+            lines, stop = [], item is self._STOP
+            if not stop:
+                lines.append(item)
+            # 一次取出目前累積的所有行，合併寫出
+            while not stop and len(lines) < self.batch:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is self._STOP:
+                    stop = True
+                else:
+                    lines.append(item)
+            try:
+                _write_many(self.inner, lines)
+                self.inner.flush()
+            except Exception:
+                pass  # 輸出失敗不可影響主流程
+            for _ in range(len(lines) + (1 if stop else 0)):
+                self._queue.task_done()
+            if stop:
+                return
+
+
+class FileSink(OutputSink):
+    """寫入純文字檔（附加模式）"""
+
+    def __init__(self, path: str):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._file = open(path, "a", encoding="utf-8", buffering=1 << 16)
+        self._lock = threading.Lock()
+
+    def write(self, text, kind="text", prefix=""):
+        with self._lock:
+            self._file.write(text + "\n")
+
+    def flush(self):
+        with self._lock:
+            self._file.flush()
+
+    def close(self):
+        with self._lock:
+            if not self._file.closed:
+                self._file.close()
+
+
+class JsonlSink(FileSink):
+    """寫入 JSON Lines：{"ts", "kind", "prefix", "text"}"""
+
+    def write(self, text, kind="text", prefix=""):
+        line = json.dumps({"ts": round(time.time(), 3), "kind": kind, "prefix": prefix, "text": text}, ensure_ascii=False)
+        with self._lock:
+            self._file.write(line + "\n")
+
+
+class TeeSink(OutputSink):
+    """同時寫入多個 sink"""
+
+    def __init__(self, *sinks: OutputSink):
+        self.sinks = sinks
+
+    def write(self, text, kind="text", prefix=""):
+        for sink in self.sinks:
+            sink.write(text, kind, prefix)
+
+    def flush(self):
+        for sink in self.sinks:
+            sink.flush()
+
+    def close(self):
+        for sink in self.sinks:
+            sink.close()
+
+
+# ============================================================
+# 🔹 全域 sink
+# ============================================================
+_sink: OutputSink = ConsoleSink()
+
+
+def emit(text: str, kind: str = "text", prefix: str = ""):
+    """Printer 統一輸出入口"""
+    _sink.write(text, kind, prefix)
+
+
+def get_sink() -> OutputSink:
+    return _sink
+
+
+def set_sink(sink: OutputSink) -> OutputSink:
+    """替換 sink（舊 sink 會先寫完並關閉），回傳新 sink"""
+    global _sink
+    old, _sink = _sink, sink
+    if old is not sink:
+        old.close()
+    return sink
+
+
+def flush_output():
+    _sink.flush()
+
+
+def configure_output(mode: str = "console", file: str | None = None, jsonl: str | None = None) -> OutputSink:
+    """
+    依設定建立 sink
+    :param mode: "console" | "buffered" | "thread"
+    :param file: 另外寫入的純文字檔路徑
+    :param jsonl: 另外寫入的 JSONL 檔路徑
+    """
+    targets: list[OutputSink] = [ConsoleSink()]
+    if file:
+        targets.append(FileSink(file))
+    if jsonl:
+        targets.append(JsonlSink(jsonl))
+    inner = targets[0] if len(targets) == 1 else TeeSink(*targets)
+
+    if mode == "thread":
+        sink = ThreadedSink(inner)
+    elif mode == "buffered":
+        sink = BufferedSink(inner)
+    else:
+        sink = inner
+    return set_sink(sink)
+
+
+def _write_many(sink: OutputSink, lines: list[tuple[str, str, str]]):
+    if not lines:
+        return
+    if isinstance(sink, ConsoleSink):
+        # console：合併成一次 write
+        sys.stdout.write("".join(text + "\n" for text, _, _ in lines))
+        return
+    for text, kind, prefix in lines:
+        sink.write(text, kind, prefix)
+
+
+# 結束時把尚未寫出的內容寫完（背景執行緒為 daemon，不會自行等待）
+atexit.register(lambda: _sink.close())
@@ -0,0 +1,43 @@
+# workspace/tools/printer/rule_table.py
+"""
+Printer 規則表（啟動時預先計算）
+職責：
+    - 每個 (printer 類型, prefix) 對應一筆不可變的 PrinterRule
+    - 由 print_rule_loader 依註冊表一次建好後注入各 Printer，印出時只做 dict 查詢
+    - 未登記的 prefix（例如 "OPS-小明"）使用該 printer 的預設規則
+"""
+
+from types import MappingProxyType
+from typing import NamedTuple
+
+
+class PrinterRule(NamedTuple):
+    enabled: bool   # 是否畫線（False → symbol 為空字串）
+    indent: str     # 縮排字串（控制器層級 + printer offset）
+    symbol: str     # 已補前導空白的分支符號
+    lead: str       # indent + symbol，印出時直接接在最前面
+
+
+DEFAULT_RULE = PrinterRule(True, "", "", "")
+
+
+class RuleTable:
+    """prefix → PrinterRule（唯讀），查不到時回傳 default"""
+
+    __slots__ = ("_rules", "default")
+
+    def __init__(self, rules: dict | None = None, default: PrinterRule = DEFAULT_RULE):
+        self._rules = MappingProxyType(dict(rules or {}))
+        self.default = default
+
+    def get(self, prefix: str) -> PrinterRule:
+        return self._rules.get(prefix, self.default)
+
+    def __contains__(self, prefix):
+        return prefix in self._rules
+
+    def __repr__(self):
+        return f"RuleTable({dict(self._rules)!r}, default={self.default!r})"
+
+
+EMPTY_TABLE = RuleTable()
@@ -1,8 +1,19 @@
-import requests
-import urllib3
 from workspace.config.error_code import ResultCode
+from workspace.tools.printer.output_sink import emit
 
-urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+
+_requests = None
+
+
+def _load_requests():
+    """第一次發送請求時才 import requests / urllib3（加快 CLI 啟動）"""
+    global _requests
+    if _requests is None:
+        import requests
+        import urllib3
+        urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+        _requests = requests
+    return _requests
 
 
 class Requester:
@@ -12,13 +23,16 @@ class Requester:
     def _check_response(resp):
         """共用的 HTTP 狀態檢查"""
         if not resp.ok:  # 非 2xx 狀態碼
-            print(f"[❌ Requester] HTTP 請求失敗 → {resp.status_code} {resp.reason}")
+            emit(f"[❌ Requester] HTTP 請求失敗 → {resp.status_code} {resp.reason}", "error", "Requester")
+            if resp.status_code in (401, 403):  # 未授權：上層可重新登入後重試
+                return None, ResultCode.tools_request_unauthorized
             return None, ResultCode.tools_request_error
         return resp, ResultCode.SUCCESS
 
     @staticmethod
     def get(url, params=None, headers=None, timeout=5):
         """發送 GET 請求"""
+        requests = _load_requests()
         try:
             resp = requests.get(url, params=params, headers=headers, timeout=timeout, verify=False)
             return Requester._check_response(resp)
@@ -30,6 +44,7 @@ class Requester:
     @staticmethod
     def post(url, data=None, json=None, headers=None, timeout=5):
         """發送 POST 請求"""
+        requests = _load_requests()
         try:
             resp = requests.post(url, data=data, json=json, headers=headers, timeout=timeout, verify=False)
             return Requester._check_response(resp)
@@ -41,6 +56,7 @@ class Requester:
     @staticmethod
     def put(url, data=None, json=None, headers=None, timeout=5):
         """發送 PUT 請求"""
+        requests = _load_requests()
         try:
             resp = requests.put(url, data=data, json=json, headers=headers, timeout=timeout, verify=False)
             return Requester._check_response(resp)